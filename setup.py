@@ -61,11 +61,25 @@ setup(
             "sphinx>=4.0",
             "sphinx-rtd-theme>=0.5",
         ],
+        "zstd": [
+            "zstandard>=0.15",
+        ],
+        "numpy": [
+            "numpy>=1.20",
+        ],
+        "numba": [
+            "numpy>=1.20",
+            "numba>=0.56",
+        ],
+        "lz4": [
+            "lz4>=3.0",
+        ],
     },
     entry_points={
         "console_scripts": [
             "waveform-reg-access-extractor=waveform_reg_access_extractor.cli:main",
             "wreg-extract=waveform_reg_access_extractor.cli:main",
+            "wreg-batch=waveform_reg_access_extractor.batch:main",
         ],
     },
     include_package_data=True,
@@ -5,6 +5,7 @@ __author__ = "Mohamed Barae Buri"
 __email__ = "mbaraeburi@outlook.com"
 
 from .parsers.vcd_parser import VCDParser
+from .parsers.fst_parser import FSTParser
 from .protocols.ahb import AHBProtocol
 from .register_maps.ipxact import IPXACTRegisterMap
 from .register_maps.yaml import YAMLRegisterMap
@@ -12,6 +13,7 @@ from .decoders.transaction_decoder import TransactionDecoder
 
 __all__ = [
     "VCDParser",
+    "FSTParser",
     "AHBProtocol", 
     "IPXACTRegisterMap",
     "YAMLRegisterMap",
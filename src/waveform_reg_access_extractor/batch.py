@@ -0,0 +1,473 @@
+"""Batch extraction over many waveform files.
+
+Waveforms are collected from directories, glob patterns and manifest files
+and extracted (and optionally decoded) in a pool of worker processes. Every
+worker loads the signal mapping configuration and the register map once and
+reuses them for all files it processes. Files are scheduled biggest first so
+that a large file picked up late does not stretch the end of the run.
+
+Each waveform gets its own output file under the output directory, mirroring
+the directory layout of the inputs, and a summary with per-file counts,
+errors and timings is written for the whole batch.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+import logging
+
+from .cli import get_protocol_parser, get_register_map_parser, get_waveform_parser
+from .config.signal_mapping import SignalMappingConfig
+from .decoders.transaction_decoder import TransactionDecoder
+from .parsers.vcd_parser import SAMPLING_MODES, VCD_ENGINES
+from .protocols.ahb import AHB_BURST_MODES
+from .protocols.vectorized import EXTRACTORS
+from .utils.file_utils import ensure_directory, is_compressed, validate_file
+from .utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Waveform extensions picked up from directories
+WAVEFORM_EXTENSIONS = ('.vcd', '.fst')
+
+# File name of the batch summary in the output directory
+SUMMARY_FILE = "batch_summary.json"
+
+
+class BatchSettings(NamedTuple):
+    """Settings shared by all files of a batch."""
+    protocol: str = "ahb"
+    config_file: Optional[str] = None
+    engine: str = "pyvcd"
+    sampling: str = "edge"
+    extractor: str = "python"
+    ahb_bursts: str = "flat"
+    start_time: Optional[int] = None
+    end_time: Optional[int] = None
+    register_map_file: Optional[str] = None     # Decode the transactions if given
+    output_format: str = "json"                 # Format of decoded output
+
+
+class _Worker:
+    """Per-process state: configuration and register map loaded once."""
+
+    def __init__(self, settings: BatchSettings):
+        """
+        Load everything a worker reuses across files.
+
+        Args:
+            settings: Batch settings
+        """
+        self.settings = settings
+        self.config = SignalMappingConfig(settings.config_file) if settings.config_file else None
+        self.decoder = None
+        if settings.register_map_file:
+            register_map = get_register_map_parser(settings.register_map_file)
+            register_map.load_from_file(settings.register_map_file)
+            self.decoder = TransactionDecoder(register_map)
+
+    def process(self, waveform: str, output_base: str) -> Dict[str, Any]:
+        """
+        Extract (and decode) one waveform.
+
+        Args:
+            waveform: Path to the waveform file
+            output_base: Output path without extension
+
+        Returns:
+            Result record of the file for the batch summary
+        """
+        settings = self.settings
+        result: Dict[str, Any] = {
+            "waveform": waveform,
+            "size": 0,
+            "status": "ok",
+            "transactions": 0,
+            "outputs": [],
+            "extract_seconds": 0.0,
+        }
+        try:
+            result["size"] = os.path.getsize(waveform)
+            output_file = output_base + ".json"
+            ensure_directory(os.path.dirname(output_file) or ".")
+            options = dict(engine=settings.engine, start_time=settings.start_time,
+                           end_time=settings.end_time, sampling=settings.sampling,
+                           extractor=settings.extractor)
+
+            started = time.perf_counter()
+            if self.config is not None and self.config.has_interfaces():
+                # Interfaces are merged so that every waveform has one output
+                interfaces = {
+                    interface.name: get_protocol_parser(interface.protocol, interface.signal_mappings,
+                                                        settings.ahb_bursts, interface.masters,
+                                                        self.config.protocol_definitions)
+                    for interface in self.config.get_interfaces()
+                }
+                parser = get_waveform_parser(waveform, next(iter(interfaces.values())), **options)
+                outputs = parser.parse_interfaces_and_save(waveform, interfaces, output_file, merge=True)
+                result["transactions"] = sum(output.count for output in outputs.values())
+            else:
+                signal_mapping = self.config.get_signal_mapping(settings.protocol) if self.config else None
+                definitions = self.config.protocol_definitions if self.config else None
+                protocol_parser = get_protocol_parser(settings.protocol, signal_mapping, settings.ahb_bursts,
+                                                      definitions=definitions)
+                parser = get_waveform_parser(waveform, protocol_parser, **options)
+                result["transactions"] = parser.parse_and_save(waveform, output_file)
+            result["extract_seconds"] = round(time.perf_counter() - started, 6)
+            result["outputs"].append(output_file)
+
+            if self.decoder is not None:
+                decoded_file = f"{output_base}_decoded.{settings.output_format}"
+                started = time.perf_counter()
+                self.decoder.decode_transactions_file(output_file, decoded_file, settings.output_format)
+                result["decode_seconds"] = round(time.perf_counter() - started, 6)
+                result["outputs"].append(decoded_file)
+        except Exception as e:
+            logger.error(f"Failed to process {waveform}: {e}")
+            result["status"] = "error"
+            result["error"] = f"{type(e).__name__}: {e}"
+            # Do not leave partial outputs behind
+            for path in (output_base + ".json", f"{output_base}_decoded.{settings.output_format}"):
+                if os.path.exists(path):
+                    os.remove(path)
+            result["outputs"] = []
+        return result
+
+
+# Worker state of the current process, set by the pool initializer
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(settings: BatchSettings, log_level: Optional[str]) -> None:
+    """Set up a pool process (logging, configuration and register map)."""
+    global _worker
+    if log_level:
+        logging.getLogger('waveform_reg_access_extractor').setLevel(getattr(logging, log_level.upper()))
+    _worker = _Worker(settings)
+
+
+def _process_in_worker(waveform: str, output_base: str) -> Dict[str, Any]:
+    """Process one waveform with the worker state of the current process."""
+    return _worker.process(waveform, output_base)
+
+
+def collect_waveforms(sources: Iterable[str]) -> List[str]:
+    """
+    Collect waveform files from directories, glob patterns and manifest files.
+
+    A directory contributes all ``.vcd`` (also compressed) and ``.fst`` files below it,
+    a glob pattern all files it matches, and any other file is read as a
+    manifest with one waveform path per line (blank lines and lines starting
+    with '#' are skipped, relative paths are relative to the manifest).
+
+    Args:
+        sources: Directories, glob patterns or manifest files
+
+    Returns:
+        Waveform paths without duplicates, in the order found
+    """
+    waveforms: List[str] = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                waveforms.extend(os.path.join(root, name) for name in sorted(files) if _is_waveform(name))
+        elif glob.has_magic(source):
+            waveforms.extend(path for path in sorted(glob.glob(source, recursive=True)) if os.path.isfile(path))
+        elif os.path.isfile(source) and _is_waveform(source):
+            waveforms.append(source)
+        elif os.path.isfile(source):
+            waveforms.extend(_read_manifest(source))
+        else:
+            raise ValueError(f"Batch source not found: {source}")
+    return list(dict.fromkeys(os.path.normpath(path) for path in waveforms))
+
+
+def schedule(waveforms: Iterable[str]) -> List[str]:
+    """
+    Order waveforms for processing, biggest file first.
+
+    Args:
+        waveforms: Waveform paths
+
+    Returns:
+        Paths sorted by decreasing file size (files that cannot be read last)
+    """
+    return sorted(waveforms, key=_file_size, reverse=True)
+
+
+def run_batch(waveforms: List[str], output_dir: str, settings: BatchSettings,
+              workers: Optional[int] = None, summary_file: Optional[str] = None,
+              log_level: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract (and optionally decode) many waveforms in a process pool.
+
+    Args:
+        waveforms: Waveform paths
+        output_dir: Directory receiving the per-file outputs and the summary
+        settings: Settings shared by all files
+        workers: Number of worker processes (default: number of CPUs)
+        summary_file: Path of the summary file (default: ``<output_dir>/batch_summary.json``)
+        log_level: Logging level inside the worker processes
+
+    Returns:
+        Batch summary (also written to ``summary_file``)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1, got {workers}")
+    if not ensure_directory(output_dir):
+        raise OSError(f"Cannot create output directory {output_dir}")
+    summary_file = summary_file or os.path.join(output_dir, SUMMARY_FILE)
+
+    output_bases = _output_bases(waveforms, output_dir)
+    ordered = schedule(waveforms)
+    logger.info(f"Processing {len(ordered)} waveforms with {workers} workers")
+
+    started = time.perf_counter()
+    results: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(ordered), 1)),
+                             initializer=_init_worker, initargs=(settings, log_level)) as executor:
+        # The pool hands out tasks in submission order: biggest files start first
+        futures = {executor.submit(_process_in_worker, path, output_bases[path]): path for path in ordered}
+        for future, path in futures.items():
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                # A worker failed outside of the per-file error handling (e.g. in its initializer)
+                results[path] = {"waveform": path, "status": "error", "error": f"{type(e).__name__}: {e}"}
+            if results[path]["status"] != "ok":
+                logger.warning(f"{path}: {results[path]['error']}")
+    wall_seconds = time.perf_counter() - started
+
+    files = [results[path] for path in waveforms]
+    failed = [result for result in files if result["status"] != "ok"]
+    summary = {
+        "metadata": {
+            "parser_version": "0.1.0",
+            "protocol": settings.protocol,
+            "config_file": settings.config_file,
+            "register_map": settings.register_map_file,
+            "workers": workers,
+        },
+        "totals": {
+            "files": len(files),
+            "succeeded": len(files) - len(failed),
+            "failed": len(failed),
+            "transactions": sum(result.get("transactions", 0) for result in files),
+            "bytes": sum(result.get("size", 0) for result in files),
+            "extract_seconds": round(sum(result.get("extract_seconds", 0.0) for result in files), 6),
+            "decode_seconds": round(sum(result.get("decode_seconds", 0.0) for result in files), 6),
+            "wall_seconds": round(wall_seconds, 6),
+        },
+        "files": files,
+    }
+    with open(summary_file, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    logger.info(f"Processed {len(files)} waveforms ({len(failed)} failed, "
+                f"{summary['totals']['transactions']} transactions) in {wall_seconds:.2f}s; "
+                f"summary written to {summary_file}")
+    return summary
+
+
+def _is_waveform(path: str) -> bool:
+    """Check whether a file name is a (possibly compressed) waveform."""
+    if is_compressed(path):
+        path = os.path.splitext(path)[0]
+    return os.path.splitext(path)[1].lower() in WAVEFORM_EXTENSIONS
+
+
+def _file_size(path: str) -> int:
+    """Get the size of a file, 0 if it cannot be read (it fails in its worker)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _read_manifest(manifest_file: str) -> List[str]:
+    """Read waveform paths from a manifest file."""
+    base_dir = os.path.dirname(manifest_file)
+    with open(manifest_file, 'r') as f:
+        lines = [line.strip() for line in f]
+    return [os.path.join(base_dir, line) for line in lines if line and not line.startswith('#')]
+
+
+def _output_bases(waveforms: List[str], output_dir: str) -> Dict[str, str]:
+    """
+    Map waveforms to output paths without extension.
+
+    The directory layout below the common parent of all waveforms is
+    mirrored in the output directory, so equally named waveforms from
+    different directories do not overwrite each other. Waveforms that only
+    differ in their extension (``x.vcd``, ``x.vcd.gz``, ``x.fst``) keep their
+    full file name (``x.vcd.gz.json``).
+
+    Args:
+        waveforms: Waveform paths
+        output_dir: Output directory
+
+    Returns:
+        Waveform path -> output path without extension
+    """
+    if not waveforms:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in waveforms])
+    names = {}
+    for path in waveforms:
+        relative = os.path.relpath(os.path.abspath(path), root)
+        stem = os.path.splitext(relative)[0] if is_compressed(relative) else relative
+        names[path] = (relative, os.path.splitext(stem)[0])
+    counts = Counter(stem for _, stem in names.values())
+    return {path: os.path.join(output_dir, stem if counts[stem] == 1 else relative)
+            for path, (relative, stem) in names.items()}
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the command-line argument parser of the batch entry point."""
+    parser = argparse.ArgumentParser(
+        prog="wreg-batch",
+        description="Extract (and optionally decode) register accesses from many waveforms in parallel",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Extract all VCDs below a regression directory with 8 worker processes
+  wreg-batch regression/ --protocol ahb --workers 8 --output-dir results
+
+  # Waveforms from a glob and a manifest (one path per line), decoded with an IP-XACT map
+  wreg-batch "runs/**/*.vcd.gz" nightly.lst --config signals.yaml --register-map map.xml
+        """
+    )
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        help="Directories (searched for .vcd files, also compressed, and .fst files), glob patterns or manifest files"
+    )
+    parser.add_argument(
+        "--output-dir", "-o",
+        default="batch_output",
+        help="Directory for per-file outputs and the summary (default: batch_output)"
+    )
+    parser.add_argument(
+        "--summary",
+        help=f"Summary file path (default: <output-dir>/{SUMMARY_FILE})"
+    )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        help="Number of worker processes (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--protocol", "-p",
+        type=str.lower,
+        default="ahb",
+        help="Protocol to extract: ahb, apb, axi or a protocol described in --config "
+             "(ignored if --config defines interfaces)"
+    )
+    parser.add_argument(
+        "--config",
+        help="Configuration file for signal mappings (an interfaces section gives one merged output per waveform)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=list(VCD_ENGINES),
+        default="pyvcd",
+        help="VCD reading engine (default: pyvcd)"
+    )
+    parser.add_argument(
+        "--sampling",
+        choices=list(SAMPLING_MODES),
+        default="edge",
+        help="Clock sampling mode (default: edge)"
+    )
+    parser.add_argument(
+        "--extractor",
+        choices=list(EXTRACTORS),
+        default="python",
+        help="Transaction extraction engine (default: python)"
+    )
+    parser.add_argument(
+        "--ahb-bursts",
+        choices=list(AHB_BURST_MODES),
+        default="flat",
+        help="AHB burst output: one transaction per beat or one record per burst (default: flat)"
+    )
+    parser.add_argument(
+        "--start-time",
+        type=int,
+        help="First timestamp to extract, in VCD time units"
+    )
+    parser.add_argument(
+        "--end-time",
+        type=int,
+        help="Last timestamp to extract, in VCD time units"
+    )
+    parser.add_argument(
+        "--register-map", "-r",
+        help="Register map file (IP-XACT XML or YAML); decodes every extracted file"
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["json", "txt"],
+        default="json",
+        help="Output format for decoded transactions (default: json)"
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Logging level (default: INFO)"
+    )
+    parser.add_argument(
+        "--log-file",
+        help="Log file path"
+    )
+    return parser
+
+
+def main():
+    """Batch CLI entry point."""
+    parser = create_parser()
+    args = parser.parse_args()
+
+    setup_logging(level=args.log_level, log_file=args.log_file)
+
+    try:
+        if args.register_map and not validate_file(args.register_map, ['.xml', '.yaml', '.yml']):
+            sys.exit(1)
+
+        waveforms = collect_waveforms(args.sources)
+        if not waveforms:
+            logger.error(f"No waveforms found in {args.sources}")
+            sys.exit(1)
+
+        settings = BatchSettings(
+            protocol=args.protocol,
+            config_file=args.config,
+            engine=args.engine,
+            sampling=args.sampling,
+            extractor=args.extractor,
+            ahb_bursts=args.ahb_bursts,
+            start_time=args.start_time,
+            end_time=args.end_time,
+            register_map_file=args.register_map,
+            output_format=args.output_format,
+        )
+        summary = run_batch(waveforms, args.output_dir, settings, workers=args.workers,
+                            summary_file=args.summary, log_level=args.log_level)
+        if summary["totals"]["failed"]:
+            sys.exit(1)
+
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
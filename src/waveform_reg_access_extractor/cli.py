@@ -4,13 +4,17 @@ import argparse
 import sys
 import os
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from .utils.logging_config import setup_logging
-from .utils.file_utils import validate_file, ensure_directory
-from .parsers.vcd_parser import VCDParser
-from .protocols.ahb import AHBProtocol
+from .utils.file_utils import STDIN_PATH, validate_file, ensure_directory
+from .parsers.vcd_parser import DEFAULT_FLUSH_INTERVAL, VCDParser, SAMPLING_MODES, VCD_ENGINES
+from .parsers.fst_parser import FSTParser, is_fst_file
+from .protocols.ahb import AHB_BURST_MODES, AHBProtocol
 from .protocols.apb import APBProtocol
+from .protocols.axi import AXIProtocol
+from .protocols.declarative import DeclarativeProtocol
+from .protocols.vectorized import EXTRACTORS
 from .register_maps.ipxact import IPXACTRegisterMap
 from .register_maps.yaml import YAMLRegisterMap
 from .decoders.transaction_decoder import TransactionDecoder
@@ -49,13 +53,22 @@ Examples:
   
   # Use YAML register map
   wreg-extract --decode --transactions transactions.json --register-map register_map.yaml
+  
+  # Extract all interfaces described in a config in one pass (soc_cpu.json, soc_uart.json, ...)
+  wreg-extract --waveform soc.vcd --config soc_interfaces.yaml --output soc.json
+  
+  # Extract transactions while the simulation is still writing the VCD
+  wreg-extract --protocol ahb --waveform sim.vcd --follow --follow-timeout 30
+  
+  # Read the VCD from standard input (or give the path of a named pipe)
+  simulator +dumpfile=/dev/stdout | wreg-extract --protocol ahb --waveform -
         """
     )
     
     # Input/Output arguments
     parser.add_argument(
         "--waveform", "-w",
-        help="Input VCD waveform file to parse (required for transaction extraction)"
+        help="Input waveform file to parse: VCD, optionally compressed (.vcd.gz, .vcd.xz, .vcd.bz2, .vcd.zst), FST (.fst), a named pipe or - for standard input (required for transaction extraction)"
     )
     parser.add_argument(
         "--output", "-o",
@@ -73,9 +86,89 @@ Examples:
     # Protocol selection
     parser.add_argument(
         "--protocol", "-p",
-        choices=["ahb", "apb"],
+        type=str.lower,
         default="ahb",
-        help="Protocol to use for VCD parsing (required when parsing VCD, optional for decode-only mode). Supported: AHB, APB"
+        help="Protocol to use for VCD parsing (required when parsing VCD, optional for decode-only mode). Supported: AHB, APB, AXI, or a protocol described in the protocol_definitions of --config"
+    )
+    
+    # VCD reading engine
+    parser.add_argument(
+        "--engine",
+        choices=list(VCD_ENGINES),
+        default="pyvcd",
+        help="VCD reading engine: pyvcd tokenizer or mmap byte-level scanner that only decodes mapped signals (default: pyvcd)"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes parsing byte ranges of the VCD in parallel (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--sampling",
+        choices=list(SAMPLING_MODES),
+        default="edge",
+        help="Clock sampling: edge samples rising (0->1) clock edges only, level samples every timestamp with the clock high (default: edge)"
+    )
+    
+    parser.add_argument(
+        "--extractor",
+        choices=list(EXTRACTORS),
+        default="python",
+        help="Transaction extraction: python state machines over streamed samples, numpy masks over the columns of the whole waveform (needs NumPy), or numba state machines compiled for those columns (needs Numba) (default: python)"
+    )
+    parser.add_argument(
+        "--ahb-bursts",
+        choices=list(AHB_BURST_MODES),
+        default="flat",
+        help="AHB burst output: flat for one transaction per beat, grouped for one record per INCR/WRAP burst holding its beats (default: flat)"
+    )
+    
+    # Time window
+    parser.add_argument(
+        "--start-time",
+        type=int,
+        help="First timestamp to extract, in VCD time units; seeks via a sidecar index (<waveform>.idx) built on first use"
+    )
+    parser.add_argument(
+        "--end-time",
+        type=int,
+        help="Last timestamp to extract, in VCD time units"
+    )
+    
+    # Live tail mode
+    parser.add_argument(
+        "--follow", "-f",
+        action="store_true",
+        help="Follow a VCD file or named pipe that is still being written and write transactions as they complete"
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        metavar="SECONDS",
+        help=f"With --follow, flush extracted transactions to the output file at least this often (default: {DEFAULT_FLUSH_INTERVAL})"
+    )
+    parser.add_argument(
+        "--follow-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="With --follow, stop when the waveform file has not grown for this long (default: follow until interrupted or the pipe is closed)"
+    )
+    
+    # Multiple interfaces
+    parser.add_argument(
+        "--interface",
+        action="append",
+        metavar="NAME",
+        help="Interface from the interfaces section of --config to extract (repeatable, default: all configured interfaces)"
+    )
+    parser.add_argument(
+        "--merge-interfaces",
+        action="store_true",
+        help="Write all interfaces to one output file, each transaction tagged with its interface (default: one <output>_<interface>.json per interface)"
     )
     
     # Mode selection
@@ -112,14 +205,63 @@ Examples:
     return parser
 
 
-def get_protocol_parser(protocol: str, signal_mapping: Optional[dict] = None):
-    """Get the appropriate protocol parser."""
+def get_protocol_parser(protocol: str, signal_mapping: Optional[dict] = None, ahb_bursts: str = "flat",
+                        masters: Optional[dict] = None, definitions: Optional[dict] = None):
+    """Get the appropriate protocol parser (built-in, or described in ``definitions``)."""
+    if definitions and protocol in definitions:
+        return DeclarativeProtocol(definitions[protocol], signal_mapping)
     if protocol == "ahb":
-        return AHBProtocol(signal_mapping)
+        return AHBProtocol(signal_mapping, burst_mode=ahb_bursts, masters=masters)
     elif protocol == "apb":
         return APBProtocol(signal_mapping)
+    elif protocol == "axi":
+        return AXIProtocol(signal_mapping)
     else:
-        raise ValueError(f"Unsupported protocol: {protocol}. Supported protocols: AHB, APB")
+        raise ValueError(f"Unsupported protocol: {protocol}. Supported protocols: AHB, APB, AXI "
+                         f"and protocol_definitions of the --config file")
+
+
+def get_waveform_parser(waveform: str, protocol_parser, **options) -> VCDParser:
+    """Get the waveform parser for the format of a waveform file (FST or VCD)."""
+    if is_fst_file(waveform):
+        if options.get("follow"):
+            raise ValueError(f"FST file {waveform} cannot be followed; dump VCD to use --follow")
+        return FSTParser(protocol_parser, **options)
+    return VCDParser(protocol_parser, **options)
+
+
+def validate_waveform(waveform: str) -> bool:
+    """Validate a waveform input; standard input and named pipes are read as VCD."""
+    return waveform == STDIN_PATH or validate_file(waveform, ['.vcd', '.fst'], allow_compressed=True,
+                                                   allow_pipe=True)
+
+
+def extract_transactions(args: argparse.Namespace, output_file: str, signal_mapping: Optional[dict] = None,
+                         config: Optional[SignalMappingConfig] = None, merge: bool = False) -> List[str]:
+    """Extract transactions for the protocol or all configured interfaces and return the files written."""
+    options = dict(engine=args.engine, jobs=args.jobs, start_time=args.start_time,
+                   end_time=args.end_time, sampling=args.sampling, extractor=args.extractor)
+    if args.follow:
+        options.update(follow=True, flush_interval=args.flush_interval, follow_timeout=args.follow_timeout)
+    
+    if config is None or not config.has_interfaces():
+        if args.interface:
+            raise ValueError("--interface requires a --config file with an interfaces section")
+        definitions = config.protocol_definitions if config is not None else None
+        protocol_parser = get_protocol_parser(args.protocol, signal_mapping, args.ahb_bursts, definitions=definitions)
+        get_waveform_parser(args.waveform, protocol_parser, **options).parse_and_save(args.waveform, output_file)
+        return [output_file]
+    
+    # One pass over the waveform for all selected interfaces
+    interfaces = {
+        interface.name: get_protocol_parser(interface.protocol, interface.signal_mappings, args.ahb_bursts,
+                                            interface.masters, config.protocol_definitions)
+        for interface in config.get_interfaces(args.interface)
+    }
+    logger.info(f"Extracting interfaces: {', '.join(interfaces)}")
+    vcd_parser = get_waveform_parser(args.waveform, next(iter(interfaces.values())), **options)
+    outputs = vcd_parser.parse_interfaces_and_save(args.waveform, interfaces, output_file, merge=merge)
+    return list(dict.fromkeys(output.output_file for output in outputs.values()))
 
 
 def get_register_map_parser(file_path: str):
@@ -143,12 +285,13 @@ def main():
     try:
         # Load signal mapping configuration if provided
         signal_mapping = None
+        config = None
         if args.config:
             config = SignalMappingConfig(args.config)
             signal_mapping = config.get_signal_mapping(args.protocol)
             if signal_mapping:
                 logger.info(f"Using custom signal mapping for {args.protocol}: {signal_mapping}")
-            else:
+            elif not config.has_interfaces():
                 logger.info(f"No custom signal mapping found for {args.protocol}, using defaults")
         
         if args.decode:
@@ -175,7 +318,7 @@ def main():
                     sys.exit(1)
                 
                 # Validate VCD file
-                if not validate_file(args.waveform, ['.vcd']):
+                if not validate_waveform(args.waveform):
                     sys.exit(1)
                 
                 # Use the user-specified intermediate file name
@@ -187,10 +330,9 @@ def main():
                 if output_dir and not ensure_directory(output_dir):
                     sys.exit(1)
                 
-                # Parse VCD file and save to intermediate file
-                protocol_parser = get_protocol_parser(args.protocol, signal_mapping)
-                vcd_parser = VCDParser(protocol_parser)
-                vcd_parser.parse_and_save(args.waveform, transactions_file)
+                # Parse VCD file and save to intermediate file (interfaces are
+                # merged so that a single file is decoded)
+                extract_transactions(args, transactions_file, signal_mapping, config, merge=True)
                 
                 logger.info(f"Extracted transactions written to {transactions_file}")
             elif args.transactions:
@@ -236,7 +378,7 @@ def main():
                 sys.exit(1)
             
             # Validate input file
-            if not validate_file(args.waveform, ['.vcd']):
+            if not validate_waveform(args.waveform):
                 sys.exit(1)
             
             # Set default output file if not provided
@@ -249,15 +391,16 @@ def main():
             if output_dir and not ensure_directory(output_dir):
                 sys.exit(1)
             
-            # Get protocol parser
-            protocol_parser = get_protocol_parser(args.protocol, signal_mapping)
-            
             # Parse VCD file
-            vcd_parser = VCDParser(protocol_parser)
-            vcd_parser.parse_and_save(args.waveform, args.output)
+            output_files = extract_transactions(args, args.output, signal_mapping, config,
+                                                merge=args.merge_interfaces)
             
-            logger.info(f"Extracted transactions written to {args.output}")
+            logger.info(f"Extracted transactions written to {', '.join(output_files)}")
             
+    except KeyboardInterrupt:
+        # Output files are closed as complete documents on the way out
+        logger.info("Interrupted")
+        sys.exit(130)
     except Exception as e:
         logger.error(f"Error: {e}")
         sys.exit(1)
@@ -2,11 +2,25 @@
 
 import yaml
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional
+from ..protocols import BUILTIN_PROTOCOLS
+from ..protocols.declarative import ProtocolDefinition
 
 logger = logging.getLogger(__name__)
 
 
+# Placeholder for the port name in the signal mappings of an interconnect
+PORT_PLACEHOLDER = "{port}"
+
+
+class InterfaceConfig(NamedTuple):
+    """Named bus interface of a waveform."""
+    name: str
+    protocol: str                       # Protocol name (e.g. 'ahb', 'apb')
+    signal_mappings: Dict[str, str]     # Standard signal name -> testbench signal name
+    masters: Optional[Dict[Any, str]] = None    # HMASTER value -> master name (AHB)
+
+
 class SignalMappingConfig:
     """Configuration parser for signal mappings."""
     
@@ -19,6 +33,8 @@ class SignalMappingConfig:
         """
         self.config_file = config_file
         self.signal_mappings = {}
+        self.interfaces: Dict[str, InterfaceConfig] = {}
+        self.protocol_definitions: Dict[str, ProtocolDefinition] = {}
         self._load_config()
     
     def _load_config(self) -> None:
@@ -43,6 +59,34 @@ class SignalMappingConfig:
                     if signal_mappings:
                         self.signal_mappings[protocol_name] = signal_mappings
                         logger.info(f"Loaded signal mappings for {protocol_name}: {list(signal_mappings.keys())}")
+            
+            # Compile protocol descriptions (custom buses)
+            definitions = config_data.get('protocol_definitions') or {}
+            for protocol_name, description in definitions.items():
+                protocol_name = str(protocol_name).lower()
+                if protocol_name in BUILTIN_PROTOCOLS:
+                    raise ValueError(f"Protocol definition {protocol_name} in {self.config_file} "
+                                     f"has the name of a built-in protocol")
+                self.protocol_definitions[protocol_name] = ProtocolDefinition(protocol_name, description)
+                logger.info(f"Compiled protocol definition {protocol_name}")
+            
+            # Extract named interfaces (several buses in one waveform)
+            interfaces = config_data.get('interfaces') or {}
+            for interface_name, interface_config in interfaces.items():
+                if not isinstance(interface_config, dict) or not interface_config.get('protocol'):
+                    raise ValueError(f"Interface {interface_name} in {self.config_file} has no protocol")
+                self.interfaces[str(interface_name)] = InterfaceConfig(
+                    str(interface_name),
+                    str(interface_config['protocol']).lower(),
+                    interface_config.get('signal_mappings') or {},
+                    interface_config.get('masters'),
+                )
+                logger.info(f"Loaded interface {interface_name} ({interface_config['protocol']})")
+            
+            # Expand interconnects into one interface per port
+            interconnects = config_data.get('interconnects') or {}
+            for interconnect_name, interconnect_config in interconnects.items():
+                self._load_interconnect(str(interconnect_name), interconnect_config)
                         
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {self.config_file}")
@@ -54,6 +98,40 @@ class SignalMappingConfig:
             logger.error(f"Failed to load configuration file {self.config_file}: {e}")
             raise
     
+    def _load_interconnect(self, name: str, interconnect_config: Any) -> None:
+        """
+        Load the ports of an interconnect as interfaces.
+        
+        The signal mappings of an interconnect are shared by its ports;
+        ``{port}`` in a signal name is replaced by the port name. A port
+        given as a mapping overrides signals of its own (e.g. an HSEL that
+        does not follow the naming pattern).
+        
+        Args:
+            name: Interconnect name
+            interconnect_config: Interconnect section with protocol, signal
+                mappings, ports and optional master names
+        """
+        if not isinstance(interconnect_config, dict) or not interconnect_config.get('protocol'):
+            raise ValueError(f"Interconnect {name} in {self.config_file} has no protocol")
+        ports = interconnect_config.get('ports') or {}
+        if isinstance(ports, list):
+            ports = dict.fromkeys(ports)
+        if not ports:
+            raise ValueError(f"Interconnect {name} in {self.config_file} has no ports")
+        
+        protocol = str(interconnect_config['protocol']).lower()
+        templates = interconnect_config.get('signal_mappings') or {}
+        for port, overrides in ports.items():
+            port = str(port)
+            if port in self.interfaces:
+                raise ValueError(f"Port {port} of interconnect {name} is already defined as an interface")
+            signal_mappings = {signal: str(template).replace(PORT_PLACEHOLDER, port)
+                               for signal, template in {**templates, **(overrides or {})}.items()}
+            self.interfaces[port] = InterfaceConfig(port, protocol, signal_mappings,
+                                                    interconnect_config.get('masters'))
+        logger.info(f"Loaded interconnect {name} ({protocol}) with ports {list(ports)}")
+    
     def get_signal_mapping(self, protocol: str) -> Dict[str, str]:
         """
         Get signal mapping for a specific protocol.
@@ -77,3 +155,29 @@ class SignalMappingConfig:
             True if mapping exists, False otherwise
         """
         return protocol.lower() in self.signal_mappings
+
+    def has_interfaces(self) -> bool:
+        """
+        Check if the configuration describes named interfaces.
+        
+        Returns:
+            True if an interfaces section was loaded, False otherwise
+        """
+        return bool(self.interfaces)
+    
+    def get_interfaces(self, names: Optional[Iterable[str]] = None) -> List[InterfaceConfig]:
+        """
+        Get named interfaces in configuration order.
+        
+        Args:
+            names: Interface names to select (default: all interfaces)
+            
+        Returns:
+            List of interface configurations
+        """
+        if not names:
+            return list(self.interfaces.values())
+        unknown = [name for name in names if name not in self.interfaces]
+        if unknown:
+            raise ValueError(f"Unknown interfaces {unknown}, configured: {list(self.interfaces)}")
+        return [self.interfaces[name] for name in dict.fromkeys(names)]
@@ -1,14 +1,30 @@
 """Transaction decoder implementation."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, NamedTuple, Optional, TextIO, Tuple
 import json
 import logging
 
+from ..protocols.base_protocol import burst_beat_addresses
 from ..register_maps.base_register_map import BaseRegisterMap
 
 logger = logging.getLogger(__name__)
 
 
+class FieldPlan(NamedTuple):
+    """How to decode one field of a register value."""
+    name: str
+    shift: int
+    mask: int  # Applied after the shift
+    is_reserved: Optional[bool]  # None for unidentified bit ranges
+    bit_range: Optional[str]  # "low:high" of unidentified bit ranges, else None
+
+
+class RegisterPlan(NamedTuple):
+    """Immutable decoding plan of a register, compiled once per register."""
+    name: str
+    fields: Optional[Tuple[FieldPlan, ...]]  # None if the register has no fields
+
+
 class TransactionDecoder:
     """Transaction decoder that works with any register map format."""
 
@@ -21,6 +37,8 @@ class TransactionDecoder:
         """
         self.register_map = register_map
         self.logger = logger
+        # Decoding plans by register address, compiled on first access
+        self._plans: Dict[int, RegisterPlan] = {}
 
     def decode_transaction(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -32,109 +50,124 @@ class TransactionDecoder:
         Returns:
             Decoded transaction dictionary with register_info added
         """
+        if "Beats" in transaction:
+            return self.decode_burst(transaction)
+
         address = int(transaction["Address"], 16)
         value = int(transaction["Value"], 16)
         
         # Start with the original transaction
         decoded_transaction = transaction.copy()
         
-        # Find register by address
-        register_info = self.register_map.find_register_by_address(address)
+        plan = self._plans.get(address)
+        if plan is None:
+            plan = self._plans[address] = self.compile_register_plan(
+                self.register_map.find_register_by_address(address))
         
-        if register_info:
-            # Register found - decode fields
-            register_name = self.register_map.get_register_name(register_info)
-            fields = register_info.get("fields", {})
-            
-            if fields:
-                # Register has defined fields
-                decoded_fields = []
-                used_bits = set()
-                
-                # Process defined fields (including reserved)
-                for field_name, field_info in fields.items():
-                    bit_offset = field_info.get("bitoffset", 0)
-                    width = field_info.get("width", 1)
-                    is_reserved = field_info.get("is_reserved", False)
-                    mask = ((1 << width) - 1) << bit_offset
-                    field_value = (value & mask) >> bit_offset
-                    
-                    decoded_fields.append({
-                        "name": field_name,
-                        "value": f"0x{field_value:X}",
-                        "is_reserved": is_reserved
-                    })
-                    
-                    # Track used bits (reserved fields are still "used" - they're defined)
-                    for bit in range(bit_offset, bit_offset + width):
-                        used_bits.add(bit)
-                
-                # Find unused bits and create unidentified fields (split into ranges)
-                # Get register size from register map (supports 32-bit and 64-bit registers)
-                # Default to 32 bits if size is not specified (backward compatibility)
-                total_bits = register_info.get("size", 32)
-                unused_bits = []
-                for bit in range(total_bits):
-                    if bit not in used_bits:
-                        unused_bits.append(bit)
-                
-                if unused_bits:
-                    # Split unused bits into consecutive ranges
-                    unidentified_ranges = []
-                    current_range_start = unused_bits[0]
-                    current_range_end = unused_bits[0]
-                    
-                    for i in range(1, len(unused_bits)):
-                        if unused_bits[i] == current_range_end + 1:
-                            # Consecutive bit, extend current range
-                            current_range_end = unused_bits[i]
-                        else:
-                            # Gap found, save current range and start new one
-                            unidentified_ranges.append((current_range_start, current_range_end))
-                            current_range_start = unused_bits[i]
-                            current_range_end = unused_bits[i]
-                    
-                    # Don't forget the last range
-                    unidentified_ranges.append((current_range_start, current_range_end))
-                    
-                    # Create a field for each unidentified range
-                    for range_start, range_end in unidentified_ranges:
-                        width = range_end - range_start + 1
-                        mask = ((1 << width) - 1) << range_start
-                        field_value = (value & mask) >> range_start
-                        
-                        # Create descriptive name with bit range
-                        if range_start == range_end:
-                            field_name = f"unidentified[{range_start}]"
-                        else:
-                            field_name = f"unidentified[{range_start}:{range_end}]"
-                        
-                        decoded_fields.append({
-                            "name": field_name,
-                            "value": f"0x{field_value:X}",
-                            "bit_range": f"{range_start}:{range_end}"
-                        })
-                
-                decoded_transaction["register_info"] = {
-                    "name": register_name,
-                    "has_fields": True,
-                    "fields": decoded_fields
-                }
-            else:
-                # Register found but no fields defined
-                decoded_transaction["register_info"] = {
-                    "name": register_name,
-                    "has_fields": False
-                }
-        else:
-            # Register not found
+        if plan.fields is None:
+            # Register not found, or found without fields
             decoded_transaction["register_info"] = {
-                "name": "unidentified",
+                "name": plan.name,
                 "has_fields": False
             }
-            
+            return decoded_transaction
+        
+        decoded_fields = []
+        for name, shift, mask, is_reserved, bit_range in plan.fields:
+            if bit_range is None:
+                decoded_fields.append({"name": name, "value": f"0x{value >> shift & mask:X}",
+                                       "is_reserved": is_reserved})
+            else:
+                decoded_fields.append({"name": name, "value": f"0x{value >> shift & mask:X}",
+                                       "bit_range": bit_range})
+        decoded_transaction["register_info"] = {
+            "name": plan.name,
+            "has_fields": True,
+            "fields": decoded_fields
+        }
         return decoded_transaction
 
+    def compile_register_plan(self, register_info: Optional[Dict[str, Any]]) -> RegisterPlan:
+        """
+        Compile the decoding plan of a register.
+        
+        Args:
+            register_info: Register information dictionary, or None if no register was found
+            
+        Returns:
+            Plan with the defined fields (including reserved) in map order,
+            then the unidentified bit ranges in bit order
+        """
+        if not register_info:
+            return RegisterPlan("unidentified", None)
+        register_name = self.register_map.get_register_name(register_info)
+        fields = register_info.get("fields", {})
+        if not fields:
+            return RegisterPlan(register_name, None)
+        
+        plan = []
+        defined_ranges = []
+        for field_name, field_info in fields.items():
+            bit_offset = field_info.get("bitoffset", 0)
+            width = field_info.get("width", 1)
+            plan.append(FieldPlan(field_name, bit_offset, (1 << width) - 1,
+                                  field_info.get("is_reserved", False), None))
+            # Reserved fields are still "used" - they're defined
+            if width > 0:
+                defined_ranges.append((bit_offset, bit_offset + width))
+        
+        # Bits of the register that no field covers, as contiguous ranges
+        # Default to 32 bits if size is not specified (backward compatibility)
+        total_bits = register_info.get("size", 32)
+        next_bit = 0
+        for range_start, range_end in sorted(defined_ranges) + [(total_bits, total_bits)]:
+            gap_end = min(range_start, total_bits)
+            if gap_end > next_bit:
+                plan.append(self._unidentified_field(next_bit, gap_end - 1))
+            next_bit = max(next_bit, range_end)
+        return RegisterPlan(register_name, tuple(plan))
+
+    @staticmethod
+    def _unidentified_field(range_start: int, range_end: int) -> FieldPlan:
+        """
+        Build the plan of an unidentified bit range.
+        
+        Args:
+            range_start: Lowest bit
+            range_end: Highest bit
+            
+        Returns:
+            Field plan named after its bit range
+        """
+        if range_start == range_end:
+            field_name = f"unidentified[{range_start}]"
+        else:
+            field_name = f"unidentified[{range_start}:{range_end}]"
+        return FieldPlan(field_name, range_start, (1 << (range_end - range_start + 1)) - 1, None,
+                         f"{range_start}:{range_end}")
+
+    def decode_burst(self, burst: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decode every beat of an AHB or AXI burst record.
+        
+        The beat addresses are generated from the start address, burst type
+        and beat size of the record.
+        
+        Args:
+            burst: Burst record with its beats
+            
+        Returns:
+            Decoded burst record whose beats hold their address and register_info
+        """
+        addresses = burst_beat_addresses(int(burst["Address"], 16), burst["Burst"], burst["Size"],
+                                          len(burst["Beats"]))
+        decoded_burst = burst.copy()
+        decoded_burst["Beats"] = [
+            self.decode_transaction(dict(beat, Address=hex(address)))
+            for beat, address in zip(burst["Beats"], addresses)
+        ]
+        return decoded_burst
+
     def decode_transactions_file(self, input_file: str, output_file: str, output_format: str = "json") -> None:
         """
         Decode transactions from file and save to output file.
@@ -252,62 +285,82 @@ class TransactionDecoder:
         """
         with open(file_path, "w") as f:
             for transaction in transactions:
-                f.write(f"Time: {transaction['Time']}\n")
-                f.write(f"Address: {transaction['Address']}\n")
-                f.write(f"Operation: {transaction['Operation']}\n")
-                
-                # Include Response status if available
-                # Always show Response field for reverse engineering visibility
-                if "Response" in transaction:
-                    response = transaction["Response"]
-                    if response == "ERROR":
-                        f.write(f"Response: {response} (ERROR - Invalid address or access denied)\n")
-                    else:
-                        f.write(f"Response: {response}\n")
-                
-                f.write("Decoded Registers:\n")
+                if "Beats" in transaction:
+                    f.write(f"Time: {transaction['Time']}\n")
+                    f.write(f"Address: {transaction['Address']}\n")
+                    f.write(f"Operation: {transaction['Operation']}\n")
+                    f.write(f"Burst: {transaction['Burst']}, {len(transaction['Beats'])} beats "
+                            f"of {transaction['Size']} bytes\n")
+                    f.write(f"Response: {transaction['Response']}\n\n")
+                    for beat in transaction["Beats"]:
+                        self._write_transaction_txt(f, dict(beat, Operation=transaction["Operation"]))
+                else:
+                    self._write_transaction_txt(f, transaction)
+
+    def _write_transaction_txt(self, f: TextIO, transaction: Dict[str, Any]) -> None:
+        """
+        Write the text block of a decoded transaction.
+        
+        Args:
+            f: Open text file
+            transaction: Decoded transaction
+        """
+        f.write(f"Time: {transaction['Time']}\n")
+        f.write(f"Address: {transaction['Address']}\n")
+        f.write(f"Operation: {transaction['Operation']}\n")
+        
+        # Include Response status if available
+        # Always show Response field for reverse engineering visibility
+        if "Response" in transaction:
+            response = transaction["Response"]
+            if response == "ERROR":
+                f.write(f"Response: {response} (ERROR - Invalid address or access denied)\n")
+            else:
+                f.write(f"Response: {response}\n")
+        
+        f.write("Decoded Registers:\n")
 
-                # Handle register_info format
-                if "register_info" in transaction:
-                    reg_info = transaction["register_info"]
-                    f.write(f"  Register: {reg_info['name']}\n")
-                    if reg_info.get("has_fields", False) and "fields" in reg_info:
-                        f.write("  Fields:\n")
-                        for field in reg_info["fields"]:
-                            field_name = field['name']
-                            field_value = field['value']
-                            is_reserved = field.get('is_reserved', False)
-                            bit_range = field.get('bit_range', '')
-                            
-                            # Add reserved indicator
-                            if is_reserved:
-                                field_name = f"{field_name} (reserved)"
-                            
-                            # Add bit range for unidentified fields
-                            if 'unidentified' in field_name.lower() and bit_range:
-                                f.write(
-                                    f"    - Field Name: {field_name}, "
-                                    f"Value: {field_value}, "
-                                    f"Bits: {bit_range}\n"
-                                )
-                            else:
-                                f.write(
-                                    f"    - Field Name: {field_name}, "
-                                    f"Value: {field_value}\n"
-                                )
+        # Handle register_info format
+        if "register_info" in transaction:
+            reg_info = transaction["register_info"]
+            f.write(f"  Register: {reg_info['name']}\n")
+            if reg_info.get("has_fields", False) and "fields" in reg_info:
+                f.write("  Fields:\n")
+                for field in reg_info["fields"]:
+                    field_name = field['name']
+                    field_value = field['value']
+                    is_reserved = field.get('is_reserved', False)
+                    bit_range = field.get('bit_range', '')
+                    
+                    # Add reserved indicator
+                    if is_reserved:
+                        field_name = f"{field_name} (reserved)"
+                    
+                    # Add bit range for unidentified fields
+                    if 'unidentified' in field_name.lower() and bit_range:
+                        f.write(
+                            f"    - Field Name: {field_name}, "
+                            f"Value: {field_value}, "
+                            f"Bits: {bit_range}\n"
+                        )
                     else:
-                        f.write("  No fields decoded.\n")
+                        f.write(
+                            f"    - Field Name: {field_name}, "
+                            f"Value: {field_value}\n"
+                        )
+            else:
+                f.write("  No fields decoded.\n")
+        else:
+            # Fallback to old format
+            for decoded in transaction.get("Decoded", []):
+                f.write(f"  Register: {decoded['Register']}\n")
+                if decoded["Fields"]:
+                    f.write("  Fields:\n")
+                    for field in decoded["Fields"]:
+                        f.write(
+                            f"    - Field Name: {field['Field Name']}, "
+                            f"Value: {field['Field Value']}\n"
+                        )
                 else:
-                    # Fallback to old format
-                    for decoded in transaction.get("Decoded", []):
-                        f.write(f"  Register: {decoded['Register']}\n")
-                        if decoded["Fields"]:
-                            f.write("  Fields:\n")
-                            for field in decoded["Fields"]:
-                                f.write(
-                                    f"    - Field Name: {field['Field Name']}, "
-                                    f"Value: {field['Field Value']}\n"
-                                )
-                        else:
-                            f.write("  No fields decoded.\n")
-                f.write("\n")
+                    f.write("  No fields decoded.\n")
+        f.write("\n")
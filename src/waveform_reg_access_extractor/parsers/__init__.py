@@ -1,6 +1,7 @@
-"""VCD and protocol-specific parsers."""
+"""VCD, FST and protocol-specific parsers."""
 
 from .vcd_parser import VCDParser
+from .fst_parser import FSTParser
 from .base_parser import BaseParser
 
-__all__ = ["VCDParser", "BaseParser"]
+__all__ = ["VCDParser", "FSTParser", "BaseParser"]
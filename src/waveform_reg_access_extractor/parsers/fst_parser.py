@@ -0,0 +1,168 @@
+"""FST parser implementation."""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from .fst_reader import FSTReader
+from .vcd_hierarchy import ScopeIndex
+from .vcd_parser import RANGES_PER_JOB, VCDParser
+from .vcd_scanner import VarDeclaration
+from ..protocols.base_protocol import BaseProtocol
+
+logger = logging.getLogger(__name__)
+
+# Waveform file extensions read by the FST parser
+FST_EXTENSIONS = ('.fst',)
+
+
+def is_fst_file(file_path: str) -> bool:
+    """
+    Check whether a waveform file is in FST format.
+
+    Args:
+        file_path: Path to the waveform file
+
+    Returns:
+        True if the file has an FST extension
+    """
+    return file_path.lower().endswith(FST_EXTENSIONS)
+
+
+class FSTParser(VCDParser):
+    """FST parser that works with protocol-specific parsers.
+
+    The value changes of the mapped signals are read straight from the
+    compressed blocks of the FST file and fed into the same sampling,
+    streaming and multi-interface pipeline as VCD input, so protocols see
+    identical samples for a waveform dumped in either format.
+    """
+
+    def __init__(self, protocol_parser: BaseProtocol, engine: str = "pyvcd", jobs: int = 1,
+                 start_time: Optional[int] = None, end_time: Optional[int] = None,
+                 sampling: str = "edge", extractor: str = "python"):
+        """
+        Initialize FST parser with a protocol parser.
+
+        Args:
+            protocol_parser: Protocol-specific parser instance
+            engine: VCD reading engine (accepted for interface compatibility;
+                FST files are always read with the native FST reader)
+            jobs: Number of worker processes decoding value change blocks in parallel
+            start_time: First timestamp to extract (default: start of file)
+            end_time: Last timestamp to extract (default: end of file)
+            sampling: Clock sampling mode ("edge" or "level")
+            extractor: Transaction extraction engine ("python", "numpy" or "numba")
+        """
+        super().__init__(protocol_parser, engine=engine, jobs=jobs, start_time=start_time,
+                         end_time=end_time, sampling=sampling, extractor=extractor)
+        self.engine = "fst"
+        self.logger = logger
+
+    def _header_variables(self, fst_file_path: str) -> List[VarDeclaration]:
+        """
+        Read the variable declarations of an FST file.
+
+        Args:
+            fst_file_path: Path to the FST file
+
+        Returns:
+            Variable declarations in hierarchy order
+        """
+        with FSTReader(fst_file_path) as reader:
+            return reader.header.variables
+
+    def _iter_time_blocks(self, fst_file_path: str,
+                          mapped_signals: List[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Read value changes of mapped signals, grouped by timestamp.
+
+        Args:
+            fst_file_path: Path to the FST file
+            mapped_signals: Signal names to record
+
+        Yields:
+            (timestamp, {signal: value}) for every timestamp in the file
+        """
+        yield from self._iter_fst_blocks(fst_file_path, mapped_signals)
+
+    def _seek_time_blocks(self, fst_file_path: str, mapped_signals: List[str],
+                          state: Dict[str, Any]) -> Optional[Iterator[Tuple[int, Dict[str, Any]]]]:
+        """
+        Start reading at the value change block that contains start_time.
+
+        FST blocks record their time range and the values of all signals at
+        their start, so no sidecar index is needed: blocks before the window
+        are skipped without being decompressed.
+
+        Args:
+            fst_file_path: Path to the FST file
+            mapped_signals: Signal names to record
+            state: Signal values at the seek point (the first block read
+                carries them, so it is left empty)
+
+        Returns:
+            Iterator over the blocks from the seek point on
+        """
+        return self._iter_fst_blocks(fst_file_path, mapped_signals, self.start_time)
+
+    def _iter_fst_blocks(self, fst_file_path: str, mapped_signals: List[str],
+                         start_time: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Decode the value change blocks of mapped signals, serially or in a process pool.
+
+        Args:
+            fst_file_path: Path to the FST file
+            mapped_signals: Signal names to record
+            start_time: Time of the first block needed (default: read all blocks)
+
+        Yields:
+            (timestamp, {signal: value}) for every timestamp read
+        """
+        with FSTReader(fst_file_path) as reader:
+            signal_handles = ScopeIndex(reader.header.variables).resolve(mapped_signals)
+            handle_map = {int(handle): signal for handle, signal in signal_handles.items()}
+            first = reader.seek(start_time) if start_time is not None else 0
+            last = reader.block_count
+            if self.end_time is not None:
+                last = max(first + 1, reader.seek(self.end_time) + 1)
+            if self.jobs == 1 or last - first < 2:
+                yield from reader.iter_time_blocks(handle_map, first, last)
+                return
+
+        # Every worker opens the file and decodes a range of blocks
+        step = max(1, -(-(last - first) // (self.jobs * RANGES_PER_JOB)))
+        bounds = list(range(first, last, step)) + [last]
+        self.logger.info(f"Decoding {last - first} FST blocks in {len(bounds) - 1} ranges "
+                         f"with {self.jobs} worker processes")
+        count = len(bounds) - 1
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            results = pool.map(_read_block_range,
+                               [fst_file_path] * count,
+                               [handle_map] * count,
+                               bounds[:-1],
+                               bounds[1:])
+            for blocks in results:
+                yield from blocks
+
+
+def _read_block_range(fst_file_path: str, handle_map: Dict[int, str],
+                      first: int, last: int) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Decode a range of value change blocks (worker process entry point).
+
+    Every range starts with the values of the mapped signals at the start of
+    its first block; stitching the ranges in order restates values that are
+    already known, which leaves the signal state unchanged.
+
+    Args:
+        fst_file_path: Path to the FST file
+        handle_map: handle -> signal name for every handle to decode
+        first: Position of the first block
+        last: Position past the last block
+
+    Returns:
+        List of (timestamp, {signal: value}) blocks in time order
+    """
+    with FSTReader(fst_file_path) as reader:
+        return list(reader.iter_time_blocks(handle_map, first, last))
@@ -0,0 +1,697 @@
+"""Reader for FST (Fast Signal Trace) waveform files.
+
+FST is the compressed waveform format of GTKWave, also written natively by
+simulators such as Verilator, Icarus Verilog and NVC. A file is a sequence
+of blocks: a header, the hierarchy (variable declarations), a geometry
+block (width of every signal handle) and value change blocks. Every value
+change block covers a time range and holds
+
+1. a frame with the values of all handles at the start of the block,
+2. one compressed change chain per handle (zlib, LZ4 or FastLZ),
+3. an index locating the chain of every handle, and
+4. the table of timestamps the chains refer to.
+
+The reader locates the chains of the mapped handles through the index and
+decompresses only those, so the cost of reading a waveform grows with the
+activity of the mapped signals instead of the size of the design. Blocks
+before a requested start time are skipped using their time range.
+
+All integers are big-endian; variable-length integers are LEB128.
+"""
+
+import mmap
+from array import array
+import struct
+import tempfile
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+
+from .vcd_scanner import VarDeclaration, _split_var_reference, decode_vector
+
+try:
+    import lz4.block
+except ImportError:  # LZ4 compressed FST files need the optional lz4 extra
+    lz4 = None
+
+logger = logging.getLogger(__name__)
+
+# Block types
+FST_BL_HDR = 0
+FST_BL_VCDATA = 1
+FST_BL_BLACKOUT = 2
+FST_BL_GEOM = 3
+FST_BL_HIER = 4
+FST_BL_VCDATA_DYN_ALIAS = 5
+FST_BL_HIER_LZ4 = 6
+FST_BL_HIER_LZ4DUO = 7
+FST_BL_VCDATA_DYN_ALIAS2 = 8
+FST_BL_ZWRAPPER = 254
+FST_BL_SKIP = 255
+
+# Hierarchy record tags (variable types use 0..29)
+FST_ST_GEN_ATTRBEGIN = 252
+FST_ST_GEN_ATTREND = 253
+FST_ST_VCD_SCOPE = 254
+FST_ST_VCD_UPSCOPE = 255
+
+# Variable type names, indexed by FST variable type
+FST_VAR_TYPES = (
+    "event", "integer", "parameter", "real", "real_parameter", "reg", "supply0",
+    "supply1", "time", "tri", "triand", "trior", "trireg", "tri0", "tri1", "wand",
+    "wire", "wor", "port", "sparray", "realtime", "string", "bit", "logic", "int",
+    "shortint", "longint", "byte", "enum", "shortreal",
+)
+
+# States of single-bit changes that are not 0/1
+_SCALAR_STATES = "xzhuwl-?"
+
+# Geometry length of variable-length (string) handles
+_VARIABLE_LENGTH = 0xFFFFFFFF
+
+# Units of the timescale exponent, in steps of 10**3
+_TIME_UNITS = ("s", "ms", "us", "ns", "ps", "fs", "as", "zs")
+
+# Value used for uninitialized state, as for VCD input
+_UNINITIALIZED = {"u": "X", "U": "X"}
+
+# Number of timestamps grouped into change dictionaries at a time
+GROUP_WINDOW = 4096
+
+_U64 = struct.Struct(">Q")
+_U64X3 = struct.Struct(">QQQ")
+
+
+class FSTError(ValueError):
+    """Raised for files that are not FST or use unsupported features."""
+
+
+class FSTHeader(NamedTuple):
+    """Header information of an FST file."""
+
+    start_time: int
+    end_time: int
+    timescale: str
+    variables: List[VarDeclaration]     #: Declarations in hierarchy order; id codes are handle numbers
+
+
+class _Block(NamedTuple):
+    """Location of a value change block."""
+
+    offset: int                 #: File offset of the block length field
+    length: int                 #: Block length, including the length field
+    start_time: int
+    end_time: int
+
+
+class FSTReader:
+    """Random-access reader of an FST file that decodes only requested handles."""
+
+    def __init__(self, fst_file_path: str):
+        """
+        Open an FST file and read its header, geometry and hierarchy.
+
+        Args:
+            fst_file_path: Path to the FST file
+
+        Raises:
+            FSTError: If the file is not a supported FST file
+        """
+        self.fst_file_path = fst_file_path
+        self._file: BinaryIO = open(fst_file_path, 'rb')
+        self._mm: Any = None
+        try:
+            self._mm = _map_file(self._file)
+            if self._mm[0] == FST_BL_ZWRAPPER:
+                # Whole-file gzip wrapper: inflate into a temporary file
+                self._unwrap()
+            self._read_blocks()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Release the mapping and the file."""
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "FSTReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _unwrap(self) -> None:
+        """Replace a gzip-wrapped file by its inflated contents."""
+        logger.debug(f"Inflating gzip-wrapped FST file {self.fst_file_path}")
+        self._file.seek(1 + 8 + 8)      # Block type, length and uncompressed length
+        inflated = tempfile.TemporaryFile()
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        while True:
+            chunk = self._file.read(1 << 20)
+            if not chunk:
+                break
+            inflated.write(decompressor.decompress(chunk))
+        inflated.write(decompressor.flush())
+        inflated.flush()
+        self._mm.close()
+        self._file.close()
+        self._file = inflated
+        self._mm = _map_file(inflated)
+
+    def _read_blocks(self) -> None:
+        """Walk the block list and read header, geometry and hierarchy."""
+        mm = self._mm
+        size = len(mm)
+        self._blocks: List[_Block] = []
+        header = None
+        geometry = hierarchy = None
+        pos = 0
+        while pos + 9 <= size:
+            block_type = mm[pos]
+            length = _U64.unpack_from(mm, pos + 1)[0]
+            if length < 8 or pos + 1 + length > size:
+                raise FSTError(f"Truncated FST block at byte {pos} of {self.fst_file_path}")
+            offset = pos + 1
+            if block_type == FST_BL_HDR:
+                header = offset
+            elif block_type == FST_BL_VCDATA_DYN_ALIAS2:
+                start_time, end_time = struct.unpack_from(">QQ", mm, offset + 8)
+                self._blocks.append(_Block(offset, length, start_time, end_time))
+            elif block_type in (FST_BL_VCDATA, FST_BL_VCDATA_DYN_ALIAS):
+                raise FSTError(f"Unsupported FST value change block type {block_type} in "
+                               f"{self.fst_file_path} (written by an old FST writer)")
+            elif block_type == FST_BL_GEOM:
+                geometry = (offset, length)
+            elif block_type in (FST_BL_HIER, FST_BL_HIER_LZ4, FST_BL_HIER_LZ4DUO):
+                hierarchy = (block_type, offset, length)
+            elif block_type not in (FST_BL_BLACKOUT, FST_BL_SKIP):
+                raise FSTError(f"Unknown FST block type {block_type} at byte {pos} of {self.fst_file_path}")
+            pos = offset + length
+
+        if header is None:
+            raise FSTError(f"{self.fst_file_path} has no FST header block")
+        if geometry is None or hierarchy is None:
+            raise FSTError(f"{self.fst_file_path} has no geometry or hierarchy block (incomplete FST file)")
+
+        start_time, end_time = struct.unpack_from(">QQ", mm, header + 8)
+        self._real_format = ">d" if struct.unpack_from(">d", mm, header + 24)[0] == 2.718281828459045 else "<d"
+        exponent = struct.unpack_from(">b", mm, header + 72)[0]
+        self._read_geometry(*geometry)
+        variables = self._read_hierarchy(*hierarchy)
+        self.header = FSTHeader(start_time, end_time, _timescale(exponent), variables)
+
+    def _read_geometry(self, offset: int, length: int) -> None:
+        """
+        Read the width of every handle.
+
+        Args:
+            offset: File offset of the block length field
+            length: Block length
+        """
+        mm = self._mm
+        uncompressed_length, count = struct.unpack_from(">QQ", mm, offset + 8)
+        data = mm[offset + 24:offset + length]
+        if len(data) != uncompressed_length:
+            data = zlib.decompress(data)
+
+        # lengths[handle - 1]: bits, 0 for variable-length handles; reals are 8 bytes
+        self._lengths: List[int] = []
+        self._reals: List[bool] = []
+        self._frame_offsets: List[int] = []
+        frame_offset = 0
+        pos = 0
+        for _ in range(count):
+            value, pos = _read_varint(data, pos)
+            is_real = value == 0
+            if is_real:
+                value = 8
+            elif value == _VARIABLE_LENGTH:
+                value = 0
+            self._lengths.append(value)
+            self._reals.append(is_real)
+            self._frame_offsets.append(frame_offset)
+            frame_offset += value
+
+    def _read_hierarchy(self, block_type: int, offset: int, length: int) -> List[VarDeclaration]:
+        """
+        Read the variable declarations of the hierarchy block.
+
+        Args:
+            block_type: Hierarchy block type (gzip, LZ4 or double LZ4 compressed)
+            offset: File offset of the block length field
+            length: Block length
+
+        Returns:
+            Variable declarations in hierarchy order
+        """
+        mm = self._mm
+        uncompressed_length = _U64.unpack_from(mm, offset + 8)[0]
+        data = mm[offset + 16:offset + length]
+        if block_type == FST_BL_HIER:
+            data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+        else:
+            if block_type == FST_BL_HIER_LZ4DUO:
+                once_length, pos = _read_varint(data, 0)
+                data = _lz4_decompress(data[pos:], once_length, self.fst_file_path)
+            data = _lz4_decompress(data, uncompressed_length, self.fst_file_path)
+
+        variables: List[VarDeclaration] = []
+        scope: List[str] = []
+        handle = 0
+        pos = 0
+        size = len(data)
+        while pos < size:
+            tag = data[pos]
+            pos += 1
+            if tag == FST_ST_VCD_SCOPE:
+                end = data.index(b"\0", pos + 1)
+                scope.append(data[pos + 1:end].decode("utf-8", "replace"))
+                pos = data.index(b"\0", end + 1) + 1      # Skip the component name
+            elif tag == FST_ST_VCD_UPSCOPE:
+                if scope:
+                    scope.pop()
+            elif tag == FST_ST_GEN_ATTRBEGIN:
+                pos = data.index(b"\0", pos + 2) + 1
+                _, pos = _read_varint(data, pos)
+            elif tag == FST_ST_GEN_ATTREND:
+                pass
+            elif tag < len(FST_VAR_TYPES):
+                end = data.index(b"\0", pos + 1)            # Skip the direction byte
+                name = data[pos + 1:end].decode("utf-8", "replace")
+                size_bits, pos = _read_varint(data, end + 1)
+                alias, pos = _read_varint(data, pos)
+                if not alias:
+                    handle += 1
+                    alias = handle
+                variables.append(VarDeclaration(
+                    scope=tuple(scope),
+                    reference=_split_var_reference(name.split()) if name.strip() else name,
+                    id_code=str(alias),
+                    size=size_bits,
+                    var_type=FST_VAR_TYPES[tag],
+                ))
+            else:
+                raise FSTError(f"Unknown hierarchy record {tag} in {self.fst_file_path}")
+        return variables
+
+    @property
+    def block_count(self) -> int:
+        """Number of value change blocks."""
+        return len(self._blocks)
+
+    def seek(self, time: int) -> int:
+        """
+        Find the value change block to start reading from for a window starting at ``time``.
+
+        Args:
+            time: First timestamp of the window
+
+        Returns:
+            Position of the last block starting at or before ``time`` (0 if there is none)
+        """
+        position = 0
+        for candidate, block in enumerate(self._blocks):
+            if block.start_time > time:
+                break
+            position = candidate
+        return position
+
+    def iter_time_blocks(self, handle_map: Dict[int, str], first: int = 0,
+                         last: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Read the value changes of selected handles, grouped by timestamp.
+
+        The first timestamp handed out carries the values of all selected
+        handles at the start of block ``first``, so reading can start at any
+        block.
+
+        Args:
+            handle_map: handle -> signal name for every handle to decode
+            first: Position of the first value change block to read
+            last: Position past the last block to read (default: all blocks)
+
+        Yields:
+            (timestamp, {signal: value}) for every timestamp of the blocks read
+        """
+        last = len(self._blocks) if last is None else last
+        for position in range(first, last):
+            yield from self._read_value_changes(self._blocks[position], handle_map, position == first)
+
+    def _read_value_changes(self, block: _Block, handle_map: Dict[int, str],
+                            with_frame: bool) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Decode the chains of selected handles in one value change block.
+
+        Args:
+            block: Value change block
+            handle_map: handle -> signal name for every handle to decode
+            with_frame: Hand out the values at the start of the block with the first timestamp
+
+        Yields:
+            (timestamp, {signal: value}) for every timestamp of the block
+        """
+        mm = self._mm
+        end = block.offset + block.length
+
+        # Time table: cumulative varint deltas
+        time_uncompressed, time_compressed, time_count = _U64X3.unpack_from(mm, end - 24)
+        time_pos = end - 24 - time_compressed
+        data = mm[time_pos:time_pos + time_compressed]
+        if time_compressed != time_uncompressed:
+            data = zlib.decompress(data)
+        times: List[int] = []
+        time = 0
+        pos = 0
+        for _ in range(time_count):
+            delta, pos = _read_varint(data, pos)
+            time += delta
+            times.append(time)
+        if not times:
+            return
+
+        # Frame of initial values, followed by the chains of all handles
+        pos = block.offset + 8 + 24
+        frame_uncompressed, pos = _read_varint(mm, pos)
+        frame_compressed, pos = _read_varint(mm, pos)
+        _, pos = _read_varint(mm, pos)
+        initial: Dict[str, Any] = {}
+        if with_frame:
+            frame = mm[pos:pos + frame_compressed]
+            if frame_compressed != frame_uncompressed:
+                frame = zlib.decompress(frame)
+            for handle, signal in handle_map.items():
+                initial[signal] = self._frame_value(frame, handle)
+        pos += frame_compressed
+        handle_count, chains_start = _read_varint(mm, pos)
+        pack_type = mm[chains_start]
+
+        index_end = time_pos - 8
+        index_pos = index_end - _U64.unpack_from(mm, index_end)[0]
+        chains = _read_chain_index(mm[index_pos:index_end], handle_count, index_pos - chains_start)
+
+        columns = []
+        for handle, signal in handle_map.items():
+            if handle > handle_count:
+                continue
+            chain = chains[handle - 1]
+            if chain is None:
+                continue
+            chain_pos, chain_length = chain
+            start = chains_start + chain_pos
+            uncompressed, data_pos = _read_varint(mm, start)
+            data = mm[data_pos:start + chain_length]
+            if uncompressed:
+                data = self._decompress_chain(data, uncompressed, pack_type)
+            indices, values = self._decode_chain(data, handle)
+            columns.append([signal, indices, values, 0])
+
+        # Group the changes by timestamp a window at a time, so that only the
+        # decoded columns are held for the whole block
+        for window_start in range(0, len(times), GROUP_WINDOW):
+            window_end = min(window_start + GROUP_WINDOW, len(times))
+            changes: List[Dict[str, Any]] = [{} for _ in range(window_start, window_end)]
+            if window_start == 0:
+                changes[0].update(initial)
+            for column in columns:
+                signal, indices, values, k = column
+                count = len(indices)
+                while k < count and indices[k] < window_end:
+                    changes[indices[k] - window_start][signal] = values[k]
+                    k += 1
+                column[3] = k
+            yield from zip(times[window_start:window_end], changes)
+
+    def _frame_value(self, frame: bytes, handle: int) -> Any:
+        """Get the value of a handle from a block frame."""
+        length = self._lengths[handle - 1]
+        offset = self._frame_offsets[handle - 1]
+        if self._reals[handle - 1]:
+            return struct.unpack_from(self._real_format, frame, offset)[0]
+        if length == 0:
+            return None
+        if length == 1:
+            value = chr(frame[offset])
+            return _UNINITIALIZED.get(value, value)
+        return decode_vector(frame[offset:offset + length])
+
+    def _decompress_chain(self, data: bytes, uncompressed: int, pack_type: int) -> bytes:
+        """Decompress the change chain of one handle."""
+        if pack_type == 0x34:       # '4'
+            return _lz4_decompress(data, uncompressed, self.fst_file_path)
+        if pack_type == 0x46:       # 'F'
+            return _fastlz_decompress(data, uncompressed)
+        return zlib.decompress(data)
+
+    def _decode_chain(self, data: bytes, handle: int) -> Tuple[Any, List[Any]]:
+        """
+        Decode the change chain of one handle.
+
+        Args:
+            data: Uncompressed chain
+            handle: Handle of the chain
+
+        Returns:
+            (timestamp indices, values) of the changes, in time order
+        """
+        length = self._lengths[handle - 1]
+        indices = array('q')
+        values: List[Any] = []
+        add_index = indices.append
+        add_value = values.append
+        index = 0
+        pos = 0
+        size = len(data)
+        if length == 1:
+            while pos < size:
+                entry, pos = _read_varint(data, pos)
+                if entry & 1:
+                    index += entry >> 4
+                    value = _SCALAR_STATES[(entry >> 1) & 7]
+                    add_value(_UNINITIALIZED.get(value, value))
+                else:
+                    index += entry >> 2
+                    add_value("1" if entry & 2 else "0")
+                add_index(index)
+        elif self._reals[handle - 1]:
+            real_format = self._real_format
+            while pos < size:
+                entry, pos = _read_varint(data, pos)
+                index += entry >> 1
+                add_index(index)
+                add_value(struct.unpack_from(real_format, data, pos)[0])
+                pos += 8
+        elif length == 0:
+            while pos < size:
+                entry, pos = _read_varint(data, pos)
+                index += entry >> 1
+                value_length, pos = _read_varint(data, pos)
+                add_index(index)
+                add_value(bytes(data[pos:pos + value_length]).decode("utf-8", "replace"))
+                pos += value_length
+        else:
+            byte_count = (length + 7) >> 3
+            padding = (byte_count << 3) - length
+            while pos < size:
+                entry, pos = _read_varint(data, pos)
+                index += entry >> 1
+                add_index(index)
+                if entry & 1:
+                    add_value(decode_vector(bytes(data[pos:pos + length])))
+                    pos += length
+                else:
+                    add_value(int.from_bytes(data[pos:pos + byte_count], "big") >> padding)
+                    pos += byte_count
+        return indices, values
+
+def _read_chain_index(data: bytes, handle_count: int,
+                      index_offset: int) -> List[Optional[Tuple[int, int]]]:
+    """
+    Decode the chain index of a value change block.
+
+    Positive entries give the distance to the previous chain, negative
+    entries mark a handle whose chain is the one of an earlier handle
+    (zero repeats the last such alias), and even varints skip handles that
+    have no changes in the block.
+
+    Args:
+        data: Encoded index
+        handle_count: Number of handles in the block
+        index_offset: Offset of the index relative to the chains (end of the last chain)
+
+    Returns:
+        (chain offset, chain length) per handle (index: handle - 1), or None
+        for handles without changes in the block
+    """
+    offsets: List[int] = [0] * handle_count
+    aliases: Dict[int, int] = {}
+    present: List[int] = []
+    previous = 0
+    alias = 0
+    index = 0
+    pos = 0
+    size = len(data)
+    while pos < size and index < handle_count:
+        if data[pos] & 1:
+            value, pos = _read_signed_varint(data, pos)
+            value >>= 1
+            if value > 0:
+                previous += value
+                offsets[index] = previous
+                present.append(index)
+            else:
+                if value < 0:
+                    alias = -value - 1
+                aliases[index] = alias
+            index += 1
+        else:
+            value, pos = _read_varint(data, pos)
+            index += value >> 1
+
+    chains: List[Optional[Tuple[int, int]]] = [None] * handle_count
+    for current, following in zip(present, present[1:] + [None]):
+        end = offsets[following] if following is not None else index_offset
+        chains[current] = (offsets[current], end - offsets[current])
+    for index, target in aliases.items():
+        chains[index] = chains[target] if target < handle_count else None
+    return chains
+
+
+def _read_varint(data: Any, pos: int) -> Tuple[int, int]:
+    """
+    Read an unsigned LEB128 integer.
+
+    Args:
+        data: Bytes-like object
+        pos: Position of the first byte
+
+    Returns:
+        (value, position after the integer)
+    """
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        pos += 1
+        byte = data[pos]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos + 1
+        shift += 7
+
+
+def _read_signed_varint(data: Any, pos: int) -> Tuple[int, int]:
+    """
+    Read a signed LEB128 integer.
+
+    Args:
+        data: Bytes-like object
+        pos: Position of the first byte
+
+    Returns:
+        (value, position after the integer)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            if byte & 0x40:
+                value -= 1 << shift
+            return value, pos
+
+
+def _timescale(exponent: int) -> str:
+    """
+    Format a timescale exponent like a VCD ``$timescale``.
+
+    Args:
+        exponent: Power of ten of the time unit in seconds (e.g. -9)
+
+    Returns:
+        Timescale such as ``1ns`` or ``100ps``
+    """
+    step = min(max(-((-exponent + 2) // 3), -(len(_TIME_UNITS) - 1)), 0)
+    return f"{10 ** (exponent - 3 * step)}{_TIME_UNITS[-step]}"
+
+
+def _lz4_decompress(data: bytes, uncompressed: int, fst_file_path: str) -> bytes:
+    """Decompress an LZ4 block of known uncompressed size."""
+    if lz4 is None:
+        raise FSTError(f"Reading {fst_file_path} requires the optional 'lz4' package "
+                       f"(pip install waveform-reg-access-extractor[lz4])")
+    return lz4.block.decompress(data, uncompressed_size=uncompressed)
+
+
+def _fastlz_decompress(data: bytes, uncompressed: int) -> bytes:
+    """
+    Decompress a FastLZ block (level 1 or 2).
+
+    Args:
+        data: Compressed block
+        uncompressed: Size of the uncompressed data
+
+    Returns:
+        Uncompressed data
+    """
+    level = data[0] >> 5
+    output = bytearray()
+    size = len(data)
+    control = data[0] & 31
+    pos = 1
+    while True:
+        if control >= 32:
+            length = (control >> 5) - 1
+            distance = (control & 31) << 8
+            if length == 6:
+                if level:
+                    while True:
+                        code = data[pos]
+                        pos += 1
+                        length += code
+                        if code != 255:
+                            break
+                else:
+                    length += data[pos]
+                    pos += 1
+            code = data[pos]
+            pos += 1
+            distance += code
+            if level and code == 255 and distance == (31 << 8) + 255:
+                distance = ((data[pos] << 8) | data[pos + 1]) + 8191
+                pos += 2
+            length += 3
+            start = len(output) - distance - 1
+            if distance + 1 >= length:
+                output += output[start:start + length]
+            else:
+                # Overlapping copy repeats the last distance + 1 bytes
+                for i in range(length):
+                    output.append(output[start + i])
+        else:
+            control += 1
+            output += data[pos:pos + control]
+            pos += control
+        if pos >= size:
+            break
+        control = data[pos]
+        pos += 1
+    if len(output) != uncompressed:
+        raise FSTError(f"FastLZ chain decompressed to {len(output)} bytes, expected {uncompressed}")
+    return bytes(output)
+
+
+def _map_file(f: BinaryIO) -> Any:
+    """Memory-map a file read-only."""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        raise FSTError(f"{getattr(f, 'name', 'FST file')} is empty") from None
+
@@ -0,0 +1,202 @@
+"""Scope-aware resolution of signal mappings against a VCD header.
+
+Signal mappings may name VCD variables in three ways:
+
+1. A bare name (``hclk``), matched against the variable reference
+2. A full dotted path (``tb_top.dut.hclk``), matched against the scope path
+3. A glob pattern (``tb_top.*.hclk``, ``h*clk``), matched against the path if
+   it contains a dot and against the bare reference otherwise
+
+The header is indexed once by path and by bare name, so resolving a mapping
+costs one dictionary lookup per exact name and one combined regular
+expression match per variable for all glob patterns together. When a bare
+name or pattern matches several variables, the shallowest declaration wins
+(the first declared among equally deep ones).
+"""
+
+import fnmatch
+import re
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from .vcd_scanner import VarDeclaration
+
+logger = logging.getLogger(__name__)
+
+# Characters that turn a signal name into a glob pattern
+GLOB_CHARACTERS = frozenset("*?[")
+
+# Number of candidate paths listed in ambiguity warnings
+MAX_LISTED_CANDIDATES = 5
+
+
+def is_pattern(signal: str) -> bool:
+    """
+    Check whether a mapped signal name is a glob pattern.
+
+    Args:
+        signal: Mapped signal name
+
+    Returns:
+        True if the name contains glob characters
+    """
+    return not GLOB_CHARACTERS.isdisjoint(signal)
+
+
+def var_path(var: VarDeclaration) -> str:
+    """
+    Get the dotted hierarchical path of a variable.
+
+    Args:
+        var: Variable declaration
+
+    Returns:
+        Scope names and reference joined with dots
+    """
+    return ".".join(var.scope + (var.reference,))
+
+
+class ScopeIndex:
+    """Index of VCD header variables by hierarchical path and by bare name."""
+
+    def __init__(self, variables: Iterable[VarDeclaration]):
+        """
+        Index the variables of a VCD header.
+
+        Args:
+            variables: Variable declarations in header order
+        """
+        self.by_path: Dict[str, VarDeclaration] = {}
+        self.by_name: Dict[str, List[VarDeclaration]] = {}
+        for var in variables:
+            self.by_path.setdefault(var_path(var), var)
+            self.by_name.setdefault(var.reference, []).append(var)
+
+    def resolve(self, signals: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve mapped signal names to the id codes of header variables.
+        
+        Args:
+            signals: Mapped signal names (bare names, dotted paths or glob patterns)
+            
+        Returns:
+            id_code -> mapped signal name for every resolved signal
+        """
+        return {var.id_code: signal for signal, var in self.resolve_variables(signals).items()}
+
+    def resolve_variables(self, signals: Iterable[str]) -> Dict[str, VarDeclaration]:
+        """
+        Resolve mapped signal names to header variables.
+        
+        Args:
+            signals: Mapped signal names (bare names, dotted paths or glob patterns)
+            
+        Returns:
+            Mapped signal name -> variable for every resolved signal
+        """
+        resolved: Dict[str, VarDeclaration] = {}
+        patterns: List[str] = []
+        for signal in signals:
+            if is_pattern(signal):
+                patterns.append(signal)
+                continue
+            var = self.by_path.get(signal) if "." in signal else None
+            if var is None:
+                candidates = self.by_name.get(signal)
+                if candidates:
+                    var = _pick(signal, candidates)
+            if var is None:
+                logger.debug(f"Signal {signal} not found in VCD header")
+                continue
+            resolved[signal] = var
+
+        if patterns:
+            patterns = list(dict.fromkeys(patterns))
+            matches = self._match_patterns(patterns)
+            for signal in patterns:
+                candidates = matches.get(signal)
+                if not candidates:
+                    logger.debug(f"Signal pattern {signal} matches no variable in VCD header")
+                    continue
+                resolved[signal] = _pick(signal, candidates)
+
+        return resolved
+
+    def resolve_aliases(self, signals: Iterable[str]) -> Dict[str, str]:
+        """
+        Find mapped signal names that refer to the same variable.
+        
+        A variable can be named in several ways (``clk``, ``tb_top.clk``) and
+        can be declared in several scopes under the same id code.
+        
+        Args:
+            signals: Mapped signal names (bare names, dotted paths or glob patterns)
+            
+        Returns:
+            Mapped signal name -> first mapped name of the same variable, for
+            every resolved signal
+        """
+        first: Dict[str, str] = {}
+        return {signal: first.setdefault(var.id_code, signal)
+                for signal, var in self.resolve_variables(signals).items()}
+
+    def _match_patterns(self, patterns: List[str]) -> Dict[str, List[VarDeclaration]]:
+        """
+        Match glob patterns against all variables in one pass.
+
+        Args:
+            patterns: Glob patterns
+
+        Returns:
+            pattern -> matching variables in header order (a variable is
+            assigned to the first pattern it matches)
+        """
+        path_regex = _compile_patterns([p for p in patterns if "." in p], patterns)
+        name_regex = _compile_patterns([p for p in patterns if "." not in p], patterns)
+
+        matches: Dict[str, List[VarDeclaration]] = {}
+        for path, var in self.by_path.items():
+            match = path_regex.match(path) if path_regex else None
+            if match is None and name_regex:
+                match = name_regex.match(var.reference)
+            if match is not None:
+                matches.setdefault(patterns[int(match.lastgroup[1:])], []).append(var)
+        return matches
+
+
+def _compile_patterns(group: List[str], patterns: List[str]) -> Optional["re.Pattern[str]"]:
+    """
+    Combine glob patterns into one regular expression with a named group per pattern.
+
+    Args:
+        group: Patterns to combine
+        patterns: All patterns (group names are indices into this list)
+
+    Returns:
+        Compiled expression, or None if ``group`` is empty
+    """
+    if not group:
+        return None
+    alternatives = [f"(?P<p{patterns.index(p)}>{fnmatch.translate(p)})" for p in group]
+    return re.compile("|".join(alternatives))
+
+
+def _pick(signal: str, candidates: List[VarDeclaration]) -> VarDeclaration:
+    """
+    Choose the variable for a signal that matches several declarations.
+
+    Args:
+        signal: Mapped signal name
+        candidates: Matching variables in header order
+
+    Returns:
+        The shallowest variable (first declared among equally deep ones)
+    """
+    var = min(candidates, key=lambda candidate: len(candidate.scope))
+    if any(candidate.id_code != var.id_code for candidate in candidates):
+        listed = ", ".join(var_path(candidate) for candidate in candidates[:MAX_LISTED_CANDIDATES])
+        if len(candidates) > MAX_LISTED_CANDIDATES:
+            listed += ", ..."
+        logger.warning(f"Signal {signal} is ambiguous ({listed}), using {var_path(var)}; "
+                       f"use a dotted path to select another one")
+    return var
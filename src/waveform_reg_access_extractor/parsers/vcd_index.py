@@ -0,0 +1,175 @@
+"""Sidecar seek index for time-windowed VCD extraction.
+
+The index records the byte offset of every Nth ``#timestamp`` line of a VCD
+file together with a snapshot of the indexed signal values just before that
+timestamp. Extraction of a time window can then seek to the last checkpoint
+before the window, restore the signal state from its snapshot and only scan
+the bytes that actually cover the window.
+
+The index is stored next to the waveform (``<file>.idx``) as JSON and is
+tied to the size and modification time of the file it was built for.
+"""
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Suffix appended to the waveform path for the sidecar index file
+INDEX_SUFFIX = ".idx"
+
+# Index file format version (bumped on incompatible changes)
+INDEX_VERSION = 1
+
+# Default number of timestamps between two checkpoints
+DEFAULT_INDEX_INTERVAL = 1024
+
+
+class Checkpoint(NamedTuple):
+    """Seek point at the start of a timestamp block."""
+    time: int
+    offset: int                 # Byte offset of the '#' of the timestamp line
+    values: Dict[str, Any]      # id_code -> value before the block at ``offset``
+
+
+class VCDIndex:
+    """Checkpoints of a VCD file for seeking to a timestamp."""
+
+    def __init__(self, size: int, mtime_ns: int, interval: int,
+                 id_codes: Iterable[str], checkpoints: List[Checkpoint]):
+        """
+        Initialize the index.
+
+        Args:
+            size: Size of the indexed file in bytes
+            mtime_ns: Modification time of the indexed file in nanoseconds
+            interval: Number of timestamps between two checkpoints
+            id_codes: id codes whose values are stored in the snapshots
+            checkpoints: Checkpoints in file order
+        """
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.interval = interval
+        self.id_codes = frozenset(id_codes)
+        self.checkpoints = checkpoints
+        self._times = [checkpoint.time for checkpoint in checkpoints]
+
+    @staticmethod
+    def index_path(vcd_file_path: str) -> str:
+        """
+        Get the sidecar index path of a waveform file.
+
+        Args:
+            vcd_file_path: Path to the VCD file
+
+        Returns:
+            Path of the index file
+        """
+        return vcd_file_path + INDEX_SUFFIX
+
+    @classmethod
+    def load(cls, index_file_path: str) -> Optional["VCDIndex"]:
+        """
+        Load an index file.
+
+        Args:
+            index_file_path: Path to the index file
+
+        Returns:
+            Loaded index, or None if the file is missing or unreadable
+        """
+        try:
+            with open(index_file_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                logger.info(f"Ignoring index {index_file_path} with unsupported version {data.get('version')}")
+                return None
+            checkpoints = [Checkpoint(time, offset, values) for time, offset, values in data["checkpoints"]]
+            return cls(data["size"], data["mtime_ns"], data["interval"], data["id_codes"], checkpoints)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable index {index_file_path}: {e}")
+            return None
+
+    def save(self, index_file_path: str) -> bool:
+        """
+        Write the index file.
+
+        Args:
+            index_file_path: Path to the index file
+
+        Returns:
+            True if the index was written, False otherwise
+        """
+        data = {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "interval": self.interval,
+            "id_codes": sorted(self.id_codes),
+            "checkpoints": [list(checkpoint) for checkpoint in self.checkpoints],
+        }
+        try:
+            with open(index_file_path, 'w') as f:
+                json.dump(data, f)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to write index {index_file_path}: {e}")
+            return False
+
+    def is_current(self, vcd_file_path: str) -> bool:
+        """
+        Check that the index still matches the size and mtime of a file.
+
+        Args:
+            vcd_file_path: Path to the VCD file
+
+        Returns:
+            True if the file is unchanged since the index was built
+        """
+        try:
+            stat = os.stat(vcd_file_path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def covers(self, id_codes: Iterable[str]) -> bool:
+        """
+        Check that the snapshots hold the values of all given id codes.
+
+        Args:
+            id_codes: Required id codes
+
+        Returns:
+            True if every id code is indexed
+        """
+        return self.id_codes.issuperset(id_codes)
+
+    def seek(self, time: int) -> int:
+        """
+        Find the checkpoint to start reading from for a window starting at ``time``.
+
+        Args:
+            time: First timestamp of the window
+
+        Returns:
+            Position of the last checkpoint before ``time`` (0 if there is none)
+        """
+        return max(bisect_left(self._times, time) - 1, 0)
+
+    def stop(self, time: int) -> int:
+        """
+        Find the first checkpoint past a window ending at ``time``.
+
+        Args:
+            time: Last timestamp of the window
+
+        Returns:
+            Position of the first checkpoint after ``time`` (number of
+            checkpoints if there is none)
+        """
+        return bisect_right(self._times, time)
@@ -1,29 +1,115 @@
 """VCD parser implementation."""
 
-from typing import Dict, List, Any, Optional
+from collections import deque
+from contextlib import ExitStack
+from operator import itemgetter
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Tuple
+import heapq
 import logging
 import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from vcd.reader import tokenize, TokenKind
 
 from .base_parser import BaseParser
-from ..protocols.base_protocol import BaseProtocol
+from .vcd_index import DEFAULT_INDEX_INTERVAL, Checkpoint, VCDIndex
+from .vcd_preprocessor import NVCPreprocessingReader
+from .vcd_hierarchy import ScopeIndex
+from .vcd_scanner import (DEFAULT_WINDOW_SIZE, MmapVCDScanner, PrefixedReader, RecordingReader,
+                          ScannerFallback, StreamVCDScanner, VarDeclaration, VCDHeader)
+from .waveform_store import WaveformStore
+from ..protocols.base_protocol import BaseProtocol, SampleRow
+from ..protocols.kernels import njit
+from ..protocols.vectorized import COLUMNAR_EXTRACTORS, EXTRACTORS, np
+from ..utils.file_utils import FOLLOW_POLL_INTERVAL, FollowReader, is_compressed, is_stream_input, open_waveform
 
 logger = logging.getLogger(__name__)
 
+# Available VCD reading engines
+VCD_ENGINES = ("pyvcd", "mmap")
+
+# Clock sampling modes: rising (0 -> 1) edges only, or every timestamp with the clock high
+SAMPLING_MODES = ("edge", "level")
+
+# Byte ranges handed out per worker process (smaller ranges balance the load)
+RANGES_PER_JOB = 4
+
+# Bytes read at a time when only the header of a file is needed
+HEADER_READ_SIZE = 64 << 10
+
+# Bytes scanned at a time when following a file that is still being written
+FOLLOW_WINDOW_SIZE = 1 << 20
+
+# Seconds between flushes of the output while following a waveform
+DEFAULT_FLUSH_INTERVAL = 1.0
+
 
 class VCDParser(BaseParser):
     """VCD parser that works with protocol-specific parsers."""
 
-    def __init__(self, protocol_parser: BaseProtocol):
+    def __init__(self, protocol_parser: BaseProtocol, engine: str = "pyvcd", jobs: int = 1,
+                 start_time: Optional[int] = None, end_time: Optional[int] = None,
+                 sampling: str = "edge", follow: bool = False,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 follow_timeout: Optional[float] = None, extractor: str = "python"):
         """
         Initialize VCD parser with a protocol parser.
         
         Args:
             protocol_parser: Protocol-specific parser instance
+            engine: VCD reading engine ("pyvcd" tokenizer or "mmap" byte-level scanner)
+            jobs: Number of worker processes parsing byte ranges of the file in parallel
+            start_time: First timestamp to extract, in VCD time units (default: start of file)
+            end_time: Last timestamp to extract, in VCD time units (default: end of file)
+            sampling: Clock sampling mode ("edge": rising edges only, "level":
+                every timestamp at which the clock is high)
+            follow: Tail a VCD file or named pipe that is still being written
+            flush_interval: Seconds after which transactions written while
+                following are flushed to the output file
+            follow_timeout: Seconds without new data after which a followed
+                file is considered finished (default: until interrupted)
+            extractor: Transaction extraction engine ("python" state machines
+                over streamed samples, "numpy" masks over the columnar
+                waveform store, or "numba" state machines compiled for the
+                columnar waveform store)
         """
         super().__init__(protocol_parser.signal_mapping)
+        if engine not in VCD_ENGINES:
+            raise ValueError(f"Unsupported VCD engine: {engine}. Supported engines: {', '.join(VCD_ENGINES)}")
+        if jobs < 1:
+            raise ValueError(f"Number of jobs must be at least 1, got {jobs}")
+        if start_time is not None and end_time is not None and start_time > end_time:
+            raise ValueError(f"Start time {start_time} is after end time {end_time}")
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(f"Unsupported sampling mode: {sampling}. Supported modes: {', '.join(SAMPLING_MODES)}")
+        if flush_interval <= 0:
+            raise ValueError(f"Flush interval must be positive, got {flush_interval}")
+        if extractor not in EXTRACTORS:
+            raise ValueError(f"Unsupported extractor: {extractor}. Supported extractors: {', '.join(EXTRACTORS)}")
+        if extractor not in protocol_parser.extractors:
+            raise ValueError(f"The {protocol_parser.protocol_name} protocol does not support the {extractor} extractor. "
+                             f"Supported extractors: {', '.join(protocol_parser.extractors)}")
+        if extractor in COLUMNAR_EXTRACTORS and np is None:
+            raise ValueError(f"The {extractor} extractor requires NumPy (pip install waveform-reg-access-extractor[numpy])")
+        if extractor == "numba" and njit is None:
+            raise ValueError("The numba extractor requires Numba (pip install waveform-reg-access-extractor[numba])")
+        if extractor in COLUMNAR_EXTRACTORS and follow:
+            raise ValueError(f"The {extractor} extractor works on complete waveforms and cannot be used when following")
         self.protocol_parser = protocol_parser
+        self.engine = engine
+        self.jobs = jobs
+        self.start_time = start_time
+        self.end_time = end_time
+        self.sampling = sampling
+        self.follow = follow
+        self.flush_interval = flush_interval
+        self.follow_timeout = follow_timeout
+        self.extractor = extractor
+        self.index_interval = DEFAULT_INDEX_INTERVAL
         self.logger = logger
+        # Inputs read only once whose header was read ahead: path -> (header bytes, open stream)
+        self._rewound: Dict[str, Tuple[bytes, BinaryIO]] = {}
 
     def parse_vcd_file(self, vcd_file_path: str) -> List[Dict[str, Any]]:
         """
@@ -35,115 +121,322 @@ class VCDParser(BaseParser):
         Returns:
             List of parsed data items
         """
-        self.logger.info(f"Parsing VCD file: {vcd_file_path}")
-        
-        # Preprocess VCD file to handle NVC-specific extensions and compatibility issues
-        # NVC generates VCD files with:
-        # 1. $attrbegin/$attrend directives (not supported by vcd.reader)
-        # 2. vhdl_architecture scope names (some tools expect 'module')
-        # 3. 'u'/'U' for uninitialized values (some parsers prefer 'X')
-        import io
-        
-        # Read and filter the VCD file
-        filtered_content = io.BytesIO()
-        dumpvars_found = False
-        
-        with open(vcd_file_path, 'rb') as f:
-            for line in f:
-                try:
-                    line_str = line.decode('utf-8', errors='ignore')
-                    line_bytes = line
-                    
-                    # Skip $attrbegin and $attrend lines (NVC-specific extensions)
-                    if line_str.strip().startswith('$attrbegin') or line_str.strip().startswith('$attrend'):
-                        continue
-                    
-                    # Track when we've seen $dumpvars
-                    if '$dumpvars' in line_str:
-                        dumpvars_found = True
-                    
-                    # Replace vhdl_architecture with module (for compatibility)
-                    if 'vhdl_architecture' in line_str:
-                        line_str = line_str.replace('vhdl_architecture', 'module')
-                        line_bytes = line_str.encode('utf-8')
-                    
-                    # After $dumpvars, handle uninitialized values
-                    # Match the shell script logic: if line starts with 'u', replace first 'u' with 'X'
-                    # Otherwise replace all 'U'/'u' with 'X' (but not in VCD keywords)
-                    if dumpvars_found:
-                        stripped = line_str.strip()
-                        # Only process non-empty lines that don't start with '$' (not VCD keywords)
-                        if stripped and not stripped.startswith('$'):
-                            # If line starts with 'u', replace first 'u' with 'X'
-                            if stripped.startswith('u'):
-                                line_str = 'X' + line_str[1:]
-                                line_bytes = line_str.encode('utf-8')
-                            # Otherwise replace all 'U'/'u' with 'X' in the line
-                            elif 'u' in line_str or 'U' in line_str:
-                                line_str = line_str.replace('U', 'X').replace('u', 'X')
-                                line_bytes = line_str.encode('utf-8')
-                    
-                    filtered_content.write(line_bytes)
-                except Exception as e:
-                    # If decoding/encoding fails, write the line as-is
-                    self.logger.debug(f"Line processing warning: {e}, writing line as-is")
-                    filtered_content.write(line)
-        
-        filtered_content.seek(0)
-        
-        with filtered_content as f:
-            tokens = tokenize(f)
-            
-            # Initialize signal tracking
-            signal_id_codes = {}  # Store signal name -> id_code mapping
-            time_frames = {}      # Store changes grouped by timeframe
-            data_items = []       # List of complete data items
-
-            current_time = None
-            # Use mapped signal names (custom testbench signals) for VCD parsing
-            mapped_signals = list(self.protocol_parser.signal_mapping.values())
-            previous_values = {signal: None for signal in mapped_signals}
-
-            for token in tokens:
-                if token.kind is TokenKind.VAR:
-                    # Map signal names to their id_codes
-                    signal_name = token.data.reference
-                    if signal_name in mapped_signals:
-                        signal_id_codes[token.data.id_code] = signal_name
-
-                elif token.kind is TokenKind.CHANGE_TIME:
-                    # Update the current time when a timestamp is encountered
-                    current_time = token.data
-                    if current_time not in time_frames:
-                        time_frames[current_time] = {}
-
-                elif token.kind in [TokenKind.CHANGE_VECTOR, TokenKind.CHANGE_SCALAR]:
-                    # Record changes for protocol signals only
-                    if current_time is not None:
-                        id_code = token.data.id_code
-                        if id_code in signal_id_codes:
-                            signal_name = signal_id_codes[id_code]
-                            value = token.data.value
-                            if current_time not in time_frames:
-                                time_frames[current_time] = {}
-                            time_frames[current_time][signal_name] = value
-                            previous_values[signal_name] = value
-
-            # Build data items with complete signal states
-            for timestamp, changes in time_frames.items():
-                # Start with previous values and update with changes for the current timeframe
-                data_item = {signal: previous_values[signal] for signal in mapped_signals}
-                for signal, value in changes.items():
-                    data_item[signal] = value
-                    previous_values[signal] = value
-                
-                # Add timestamp and store the data item
-                data_item['timestamp'] = timestamp
-                data_items.append(data_item)
-
+        data_items = self.parse_waveform(vcd_file_path).to_data_items()
         self.logger.info(f"Parsed {len(data_items)} data items from VCD file")
         return data_items
 
+    def parse_waveform(self, vcd_file_path: str) -> WaveformStore:
+        """
+        Parse a VCD file into a columnar waveform store.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            
+        Returns:
+            Store with the value changes of all mapped signals
+        """
+        self.logger.info(f"Parsing VCD file: {vcd_file_path} (engine: {self.engine})")
+        
+        # Use mapped signal names (custom testbench signals) for VCD parsing
+        mapped_signals = list(self.protocol_parser.signal_mapping.values())
+        store = WaveformStore(mapped_signals)
+
+        if self.start_time is not None or self.end_time is not None:
+            blocks = self._iter_time_window(vcd_file_path, mapped_signals, store.previous)
+        else:
+            blocks = self._iter_time_blocks(vcd_file_path, mapped_signals)
+
+        for timestamp, changes in blocks:
+            store.append(timestamp, changes)
+
+        self.logger.info(f"Parsed {len(store)} timestamps from VCD file")
+        return store.finish()
+
+    def _iter_time_blocks(self, vcd_file_path: str,
+                          mapped_signals: List[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Read value changes of mapped signals, grouped by timestamp.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            mapped_signals: VCD signal names to record
+            
+        Yields:
+            (timestamp, {signal: value}) for every timestamp in the file
+        """
+        if self._reads_once(vcd_file_path):
+            yield from self._iter_sequential_blocks(vcd_file_path, mapped_signals)
+            return
+
+        if self.engine == "pyvcd" and self.jobs == 1:
+            yield from _iter_time_blocks_pyvcd(vcd_file_path, mapped_signals)
+            return
+
+        if is_compressed(vcd_file_path):
+            # Decompressed data can only be read sequentially
+            if self.jobs > 1:
+                self.logger.info(f"Compressed input {vcd_file_path} cannot be split into byte ranges, parsing serially")
+            if self.engine == "mmap":
+                yield from _iter_time_blocks_stream(vcd_file_path, mapped_signals)
+            else:
+                yield from _iter_time_blocks_pyvcd(vcd_file_path, mapped_signals)
+            return
+
+        try:
+            scanner = MmapVCDScanner(vcd_file_path)
+        except ScannerFallback as e:
+            self.logger.warning(f"Cannot scan {vcd_file_path} directly ({e}), falling back to serial pyvcd")
+            yield from _iter_time_blocks_pyvcd(vcd_file_path, mapped_signals)
+            return
+
+        with scanner:
+            signal_id_codes = _resolve_id_codes(scanner.header, mapped_signals)
+            if self.jobs == 1:
+                yield from _iter_time_blocks_mmap(scanner, signal_id_codes)
+                return
+            ranges = scanner.split_body(self.jobs * RANGES_PER_JOB)
+
+        yield from self._iter_time_blocks_parallel(vcd_file_path, signal_id_codes, ranges)
+
+    def _header_variables(self, vcd_file_path: str) -> List[VarDeclaration]:
+        """
+        Read the variable declarations of a waveform without its value changes.
+        
+        Args:
+            vcd_file_path: Path to the VCD file, named pipe or '-' for standard input
+            
+        Returns:
+            Variable declarations in header order
+        """
+        if not self._reads_once(vcd_file_path):
+            return _read_header_variables(vcd_file_path)
+
+        # The input cannot be opened again: keep the header bytes read here
+        # for the value change pass (see _iter_sequential_blocks)
+        raw = self._open_sequential(vcd_file_path)
+        recorder = RecordingReader(raw)
+        try:
+            variables = _read_stream_header_variables(recorder)
+        except BaseException:
+            raw.close()
+            raise
+        self._rewound[vcd_file_path] = (bytes(recorder.data), raw)
+        return variables
+
+    def _reads_once(self, vcd_file_path: str) -> bool:
+        """
+        Check whether a waveform is read in a single sequential pass.
+        
+        Standard input and named pipes cannot be reopened or seeked, and a
+        followed file is still being written, so neither can be split into
+        byte ranges, memory-mapped or indexed.
+        
+        Args:
+            vcd_file_path: Path to the VCD file, named pipe or '-' for standard input
+            
+        Returns:
+            True if the waveform is followed or can only be read once
+        """
+        return self.follow or is_stream_input(vcd_file_path)
+
+    def _open_sequential(self, vcd_file_path: str) -> BinaryIO:
+        """
+        Open a waveform that is read in a single sequential pass.
+        
+        Args:
+            vcd_file_path: Path to the VCD file, named pipe or '-' for standard input
+            
+        Returns:
+            Binary stream of the waveform; while following, a stream of the
+            complete lines written so far and from then on
+        """
+        if not self.follow:
+            return open_waveform(vcd_file_path)
+        if is_compressed(vcd_file_path):
+            raise ValueError(f"Compressed input {vcd_file_path} cannot be followed")
+        return FollowReader(vcd_file_path, poll_interval=min(FOLLOW_POLL_INTERVAL, self.flush_interval),
+                            idle_timeout=self.follow_timeout)
+
+    def _iter_sequential_blocks(self, vcd_file_path: str,
+                                mapped_signals: List[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Read value changes of mapped signals in one pass over a stream.
+        
+        If the header was already read (``_header_variables``), its bytes are
+        replayed before the rest of the open stream instead of reopening the
+        input. While following, a timestamp is handed out as soon as the next
+        timestamp line appears, so samples (and the transactions built from
+        them) lag the writer by one time step.
+        
+        Args:
+            vcd_file_path: Path to the VCD file, named pipe or '-' for standard input
+            mapped_signals: VCD signal names to record
+            
+        Yields:
+            (timestamp, {signal: value}) for every timestamp read
+        """
+        if self.jobs > 1:
+            self.logger.info(f"Input {vcd_file_path} is read in one pass, parsing serially")
+        if self.follow:
+            self.logger.info(f"Following {vcd_file_path} (flush interval: {self.flush_interval}s)")
+        header, raw = self._rewound.pop(vcd_file_path, (b"", None))
+        if raw is None:
+            raw = self._open_sequential(vcd_file_path)
+        with raw:
+            stream = PrefixedReader(header, raw) if header else raw
+            if self.engine == "mmap":
+                window_size = FOLLOW_WINDOW_SIZE if self.follow else DEFAULT_WINDOW_SIZE
+                yield from _scan_stream(stream, vcd_file_path, mapped_signals, window_size)
+            else:
+                yield from _tokenize_time_blocks(stream, mapped_signals)
+
+    def _iter_time_window(self, vcd_file_path: str, mapped_signals: List[str],
+                          previous: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Read value changes of mapped signals between start_time and end_time.
+        
+        When a start time is given, the sidecar seek index is used to jump to
+        the last checkpoint before the window; blocks between the checkpoint
+        and the window only update the signal state. The first block handed
+        out carries the complete state of the mapped signals at that point,
+        so the data items of the window are the same as in a full parse.
+        Reading stops at the first timestamp past the end time.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            mapped_signals: VCD signal names to record
+            previous: Filled with the signal state before the window when the
+                first block is handed out, so that a clock edge at the first
+                timestamp of the window can still be detected
+            
+        Yields:
+            (timestamp, {signal: value}) for every timestamp in the window
+        """
+        state: Dict[str, Any] = {}
+        blocks = None
+        if self.start_time is not None and not self._reads_once(vcd_file_path):
+            blocks = self._seek_time_blocks(vcd_file_path, mapped_signals, state)
+        if blocks is None:
+            blocks = self._iter_time_blocks(vcd_file_path, mapped_signals)
+
+        window_started = False
+        for timestamp, changes in blocks:
+            if self.end_time is not None and timestamp > self.end_time:
+                break
+            if self.start_time is not None and timestamp < self.start_time:
+                state.update(changes)
+                continue
+            if not window_started:
+                window_started = True
+                if previous is not None:
+                    previous.update(state)
+                changes = {**state, **changes}
+            yield timestamp, changes
+
+    def _seek_time_blocks(self, vcd_file_path: str, mapped_signals: List[str],
+                          state: Dict[str, Any]) -> Optional[Iterator[Tuple[int, Dict[str, Any]]]]:
+        """
+        Start reading at the index checkpoint closest before start_time.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            mapped_signals: VCD signal names to record
+            state: Filled with the mapped signal values at the checkpoint
+            
+        Returns:
+            Iterator over the blocks from the checkpoint on, or None if the
+            file cannot be indexed (e.g. compressed input)
+        """
+        try:
+            scanner = MmapVCDScanner(vcd_file_path)
+        except ScannerFallback as e:
+            self.logger.info(f"Cannot index {vcd_file_path} ({e}), reading from the start")
+            return None
+
+        with scanner:
+            signal_id_codes = _resolve_id_codes(scanner.header, mapped_signals)
+            index = self._load_index(scanner, signal_id_codes)
+        if index is None or not index.checkpoints:
+            return None
+
+        first = index.seek(self.start_time)
+        checkpoint = index.checkpoints[first]
+        for id_code, signal in signal_id_codes.items():
+            value = checkpoint.values.get(id_code)
+            if value is not None:
+                state[signal] = value
+        self.logger.info(f"Seeking to time {checkpoint.time} at byte {checkpoint.offset}")
+
+        # Checkpoints past the window bound the bytes that need to be read
+        last = index.stop(self.end_time) if self.end_time is not None else len(index.checkpoints)
+        end = index.checkpoints[last].offset if last < len(index.checkpoints) else index.size
+        if self.jobs > 1:
+            bounds = [cp.offset for cp in index.checkpoints[first:last]]
+            step = max(1, len(bounds) // (self.jobs * RANGES_PER_JOB))
+            bounds = bounds[::step] + [end]
+            ranges = list(zip(bounds[:-1], bounds[1:]))
+            return self._iter_time_blocks_parallel(vcd_file_path, signal_id_codes, ranges)
+        return _iter_time_blocks_range(vcd_file_path, signal_id_codes, checkpoint.offset, end, self.engine)
+
+    def _load_index(self, scanner: MmapVCDScanner, signal_id_codes: Dict[str, str]) -> Optional[VCDIndex]:
+        """
+        Load the sidecar index of a file, building it if it is missing or stale.
+        
+        Args:
+            scanner: Open scanner for the VCD file
+            signal_id_codes: id_code -> signal name mapping of the mapped signals
+            
+        Returns:
+            Index covering the mapped signals, or None if it cannot be built
+        """
+        vcd_file_path = scanner.vcd_file_path
+        index_file_path = VCDIndex.index_path(vcd_file_path)
+        index = VCDIndex.load(index_file_path)
+        if index is not None and index.is_current(vcd_file_path) and index.covers(signal_id_codes):
+            return index
+
+        # Keep the signals of a previous index so alternating configs do not rebuild it
+        id_codes = set(signal_id_codes)
+        if index is not None and index.is_current(vcd_file_path):
+            id_codes |= index.id_codes
+        self.logger.info(f"Building seek index {index_file_path}")
+        try:
+            index = _build_index(scanner, id_codes, self.index_interval)
+        except ScannerFallback as e:
+            self.logger.warning(f"Cannot index {vcd_file_path} ({e}), reading from the start")
+            return None
+        index.save(index_file_path)
+        return index
+
+    def _iter_time_blocks_parallel(self, vcd_file_path: str, signal_id_codes: Dict[str, str],
+                                   ranges: List[Tuple[int, int]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Parse byte ranges of the value change section in a process pool.
+        
+        Workers return only the value changes of their range. Results are
+        handed out in range order, so the caller's running signal state at the
+        end of one range is exactly the state at the start of the next, and
+        the stitched stream is identical to a serial parse.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            signal_id_codes: id_code -> signal name mapping from the header
+            ranges: (start, end) byte ranges covering the value change section
+            
+        Yields:
+            (timestamp, {signal: value}) for every timestamp in the file
+        """
+        self.logger.info(f"Parsing {len(ranges)} byte ranges with {self.jobs} worker processes")
+        count = len(ranges)
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            results = pool.map(_parse_byte_range,
+                               [vcd_file_path] * count,
+                               [start for start, _ in ranges],
+                               [end for _, end in ranges],
+                               [signal_id_codes] * count,
+                               [self.engine] * count)
+            for blocks in results:
+                yield from blocks
 
     def filter_transactions(self, data_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -164,6 +457,201 @@ class VCDParser(BaseParser):
         return transactions
 
 
+    def filter_waveform(self, store: WaveformStore) -> List[Dict[str, Any]]:
+        """
+        Filter and extract valid transactions from a columnar waveform store.
+        
+        Args:
+            store: Parsed waveform
+            
+        Returns:
+            List of valid transactions
+        """
+        if self.protocol_parser.clock_signal is None:
+            # Protocols without a sampling clock work on complete data items
+            return self.filter_transactions(self.convert_to_hex(store.to_data_items()))
+
+        protocol = self.protocol_parser
+        positions = self._clock_positions(store)
+        if self.extractor == "numpy":
+            transactions = protocol.filter_clock_columns(store.sample_columns(positions, protocol.layout.signals))
+        elif self.extractor == "numba":
+            transactions = protocol.filter_clock_kernels(store.sample_columns(positions, protocol.layout.signals))
+        else:
+            transactions = protocol.filter_clock_rows(store.sample_rows(positions, protocol.layout.signals))
+        self.logger.info(f"Found {len(transactions)} transactions")
+        return transactions
+
+    def sample_clock(self, store: WaveformStore) -> List[Dict[str, Any]]:
+        """
+        Sample the mapped signals on the protocol clock.
+        
+        In "edge" mode only timestamps at which the clock goes from '0' to
+        '1' are sampled; in "level" mode every timestamp at which the clock
+        is '1', including changes between edges. Only the sampled positions
+        are turned into data items.
+        
+        Args:
+            store: Parsed waveform
+            
+        Returns:
+            Samples keyed by standard signal names plus 'timestamp', with the
+            protocol's hex signals converted to hex strings
+        """
+        protocol = self.protocol_parser
+        layout = protocol.layout
+        return store.rows(self._clock_positions(store), dict(zip(layout.names, layout.signals)),
+                          protocol.get_hex_signals())
+
+    def _clock_positions(self, store: WaveformStore) -> List[int]:
+        """
+        Find the timestamp positions sampled on the protocol clock.
+        
+        Args:
+            store: Parsed waveform
+            
+        Returns:
+            Ascending positions of the sampled timestamps
+        """
+        protocol = self.protocol_parser
+        clock_signal = protocol.signal_mapping.get(protocol.clock_signal, protocol.clock_signal)
+        if self.sampling == "edge":
+            positions = store.rising_edges(clock_signal)
+        else:
+            positions = store.positions_where(clock_signal, '1')
+        self.logger.info(f"Sampled {len(positions)} of {len(store)} timestamps "
+                         f"({self.sampling} sampling on {clock_signal})")
+        return positions
+
+    def iter_clock_samples(self, vcd_file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the mapped signals sampled on the protocol clock.
+        
+        Unlike ``sample_clock``, the waveform is not stored: value changes
+        are applied to the current signal state as they are read and a
+        sample is handed out at every clock edge ("edge" sampling) or every
+        timestamp with the clock high ("level" sampling), so memory does not
+        grow with the length of the waveform. Signals that have not changed
+        yet read as None.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            
+        Yields:
+            Samples keyed by standard signal names plus 'timestamp', with the
+            protocol's hex signals converted to hex strings
+        """
+        name = self.protocol_parser.protocol_name
+        yield from self.iter_interface_samples(vcd_file_path, {name: self.protocol_parser})[name]
+
+    def iter_interface_samples(self, vcd_file_path: str,
+                               interfaces: Dict[str, BaseProtocol]) -> Dict[str, Iterator[Dict[str, Any]]]:
+        """
+        Stream clock samples of several bus interfaces from one pass over a VCD file.
+        
+        The file is read once for the mapped signals of all interfaces; every
+        timestamp is checked against the clock of each interface and the
+        samples are fanned out to one iterator per interface. Samples read
+        ahead for one interface are buffered until its iterator consumes
+        them, so the iterators should be consumed side by side (e.g. merged
+        by time) rather than one after another.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            interfaces: Interface name -> protocol parser with its signal mapping
+            
+        Returns:
+            Interface name -> iterator over its samples (see ``iter_clock_samples``)
+        """
+        rows = self._iter_interface_rows(vcd_file_path, interfaces)
+        return {name: _rows_to_samples(protocol, rows[name]) for name, protocol in interfaces.items()}
+
+    def _iter_interface_rows(self, vcd_file_path: str,
+                             interfaces: Dict[str, BaseProtocol]) -> Dict[str, Iterator[SampleRow]]:
+        """
+        Stream clock sample rows of several bus interfaces from one pass over a VCD file.
+        
+        Rows are laid out by each interface's ``SampleLayout`` and hold raw
+        signal values; they feed transaction extraction without building a
+        sample dict per clock edge.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            interfaces: Interface name -> protocol parser with its signal mapping
+            
+        Returns:
+            Interface name -> iterator over its sample rows
+        """
+        samplers = []
+        for name, protocol in interfaces.items():
+            if protocol.clock_signal is None:
+                raise ValueError(f"Interface {name}: {protocol.protocol_name} does not support clock sampling")
+            samplers.append(_ClockSampler(protocol, self.sampling == "edge"))
+        source = self._iter_interface_samples(vcd_file_path, samplers)
+        if len(samplers) == 1:
+            return dict(zip(interfaces, [map(itemgetter(1), source)]))
+        return dict(zip(interfaces, _fan_out(source, len(samplers))))
+
+    def _iter_interface_samples(self, vcd_file_path: str,
+                                samplers: List["_ClockSampler"]) -> Iterator[Tuple[int, SampleRow]]:
+        """
+        Sample the mapped signals of several interfaces in one pass.
+        
+        Interfaces sampled on the same clock (e.g. the ports of an
+        interconnect) share one clock check per timestamp, so a timestamp
+        costs one check per distinct clock and an edge one row per interface.
+        
+        Args:
+            vcd_file_path: Path to the VCD file
+            samplers: One clock sampler per interface
+            
+        Yields:
+            (sampler position, sample row) in time order
+        """
+        mapped_signals = list(dict.fromkeys(signal for sampler in samplers for signal in sampler.signals
+                                            if signal is not None))
+        if len(samplers) > 1:
+            # Interfaces may name shared variables (e.g. a common clock)
+            # differently; each variable is recorded under one name only
+            aliases = ScopeIndex(self._header_variables(vcd_file_path)).resolve_aliases(mapped_signals)
+            for sampler in samplers:
+                sampler.use_aliases(aliases)
+            mapped_signals = list(dict.fromkeys(aliases.get(signal, signal) for signal in mapped_signals))
+        self.logger.info(f"Streaming VCD file: {vcd_file_path} (engine: {self.engine})")
+
+        # Signal state before a time window, to detect an edge at its first timestamp
+        previous: Dict[str, Any] = {}
+        if self.start_time is not None or self.end_time is not None:
+            blocks = self._iter_time_window(vcd_file_path, mapped_signals, previous)
+        else:
+            blocks = self._iter_time_blocks(vcd_file_path, mapped_signals)
+
+        # Samplers grouped by clock; the first sampler of a group detects its edges
+        clocks: Dict[str, List[Tuple[int, "_ClockSampler"]]] = {}
+        for position, sampler in enumerate(samplers):
+            clocks.setdefault(sampler.clock_signal, []).append((position, sampler))
+        groups = [(group[0][1], group) for group in clocks.values()]
+
+        state: Dict[Optional[str], Any] = dict.fromkeys(mapped_signals)
+        # Optional signals that are not mapped are read under None and never change
+        state[None] = None
+        timestamps = 0
+        for timestamp, changes in _merge_repeated_timestamps(blocks):
+            timestamps += 1
+            if previous:
+                for trigger, _ in groups:
+                    trigger.previous_clock = previous.get(trigger.clock_signal)
+                previous.clear()
+            state.update(changes)
+            for trigger, group in groups:
+                if trigger.triggered(state, changes):
+                    for position, sampler in group:
+                        yield position, sampler.sample(state, timestamp)
+
+        for sampler in samplers:
+            self.logger.info(f"Sampled {sampler.count} of {timestamps} timestamps "
+                             f"({self.sampling} sampling on {sampler.clock_signal})")
+
     def convert_to_hex(self, data_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Convert specified signals to hexadecimal format using protocol-specific signals.
@@ -174,18 +662,23 @@ class VCDParser(BaseParser):
         Returns:
             List of data items with hex-converted signals
         """
-        # Get protocol-specific signals that should be converted to hex
-        hex_signals = self.protocol_parser.get_hex_signals()
+        # Get protocol-specific signals that should be converted to hex;
+        # data items are keyed by the mapped (testbench) signal names
+        signal_mapping = self.protocol_parser.signal_mapping
+        hex_signals = [signal_mapping.get(signal, signal) for signal in self.protocol_parser.get_hex_signals()]
         
         return super().convert_to_hex(data_items, hex_signals)
 
-    def parse_and_save(self, input_file: str, output_file: str) -> None:
+    def parse_and_save(self, input_file: str, output_file: str) -> int:
         """
         Parse VCD file and save transactions to output file.
         
         Args:
             input_file: Path to input VCD file
             output_file: Path to output transactions file
+            
+        Returns:
+            Number of transactions saved
         """
         self.logger.info(f"Parsing {input_file} and saving to {output_file}")
         
@@ -194,38 +687,680 @@ class VCDParser(BaseParser):
             output_file = output_file.rsplit('.', 1)[0] + '.json'
             self.logger.info(f"Output file renamed to: {output_file}")
         
-        # Parse VCD file
-        data_items = self.parse_vcd_file(input_file)
+        protocol = self.protocol_parser
+        if protocol.clock_signal is None or self.extractor in COLUMNAR_EXTRACTORS:
+            # Protocols without a sampling clock work on complete data items;
+            # vectorized extraction works on the columns of the whole waveform
+            transactions: Iterable[Dict[str, Any]] = self.filter_waveform(self.parse_waveform(input_file))
+        else:
+            # Stream samples at clock edges straight into transaction extraction
+            rows = self._iter_interface_rows(input_file, {protocol.protocol_name: protocol})
+            transactions = protocol.iter_row_transactions(rows[protocol.protocol_name])
         
-        # Convert to hex
-        hex_data_items = self.convert_to_hex(data_items)
+        # Save to file
+        count = self._write_transactions_to_file(transactions, output_file, input_file)
         
-        # Filter transactions
-        transactions = self.filter_transactions(hex_data_items)
+        self.logger.info(f"Successfully saved {count} transactions to {output_file}")
+        return count
+
+    def parse_interfaces_and_save(self, input_file: str, interfaces: Dict[str, BaseProtocol],
+                                  output_file: str, merge: bool = False) -> Dict[str, "SavedOutput"]:
+        """
+        Extract several bus interfaces from one pass over a VCD file and save them.
         
-        # Save to file
-        self._write_transactions_to_file(transactions, output_file, input_file)
+        Transactions of all interfaces are produced side by side in time
+        order. They are either written to one file per interface, named
+        ``<output>_<interface>.json``, or to a single merged file in which
+        every transaction carries its interface name.
+        
+        Args:
+            input_file: Path to input VCD file
+            interfaces: Interface name -> protocol parser with its signal mapping
+            output_file: Path to output transactions file
+            merge: Write one merged output file instead of one file per interface
+            
+        Returns:
+            Interface name -> file its transactions were written to and their number
+        """
+        self.logger.info(f"Parsing {len(interfaces)} interfaces of {input_file}")
+        
+        # Ensure output file has .json extension
+        if not output_file.endswith('.json'):
+            output_file = output_file.rsplit('.', 1)[0] + '.json'
+            self.logger.info(f"Output file renamed to: {output_file}")
         
-        self.logger.info(f"Successfully saved {len(transactions)} transactions to {output_file}")
+        if self.extractor in COLUMNAR_EXTRACTORS:
+            raise ValueError(f"The {self.extractor} extractor extracts one interface at a time; "
+                             "use the python extractor for several interfaces")
+        rows = self._iter_interface_rows(input_file, interfaces)
+        streams = [_tag_transactions(name, protocol.iter_row_transactions(rows[name]))
+                   for name, protocol in interfaces.items()]
+        transactions = heapq.merge(*streams, key=lambda transaction: transaction["Time"])
+        
+        if merge:
+            metadata = {
+                "parser_version": "0.1.0",
+                "interfaces": {name: protocol.protocol_name for name, protocol in interfaces.items()},
+                "source_file": input_file
+            }
+            counts = dict.fromkeys(interfaces, 0)
+            with TransactionWriter(output_file, metadata, self._output_flush_interval()) as writer:
+                for transaction in transactions:
+                    writer.write(transaction)
+                    counts[transaction["Interface"]] += 1
+            self.logger.info(f"Successfully saved {writer.count} transactions to {output_file}")
+            return {name: SavedOutput(output_file, count) for name, count in counts.items()}
+        
+        output_files = {name: interface_output_file(output_file, name) for name in interfaces}
+        with ExitStack() as stack:
+            writers = {}
+            for name, protocol in interfaces.items():
+                metadata = {
+                    "parser_version": "0.1.0",
+                    "protocol": protocol.protocol_name,
+                    "interface": name,
+                    "source_file": input_file
+                }
+                writers[name] = stack.enter_context(
+                    TransactionWriter(output_files[name], metadata, self._output_flush_interval()))
+            for transaction in transactions:
+                writers[transaction.pop("Interface")].write(transaction)
+        for name, writer in writers.items():
+            self.logger.info(f"Successfully saved {writer.count} {name} transactions to {writer.output_file}")
+        return {name: SavedOutput(writer.output_file, writer.count) for name, writer in writers.items()}
 
-    def _write_transactions_to_file(self, transactions: List[Dict[str, Any]], output_file: str, source_file: str) -> None:
+    def _write_transactions_to_file(self, transactions: Iterable[Dict[str, Any]], output_file: str,
+                                    source_file: str) -> int:
         """
         Write transactions to output file in structured JSON format.
         
         Args:
-            transactions: List of transactions to write
+            transactions: Transactions to write (any iterable, e.g. a generator)
             output_file: Path to output file
             source_file: Path to source VCD file
+            
+        Returns:
+            Number of transactions written
         """
-        # Create structured output
-        output_data = {
-            "metadata": {
-                "parser_version": "0.1.0",
-                "protocol": self.protocol_parser.protocol_name,
-                "source_file": source_file
-            },
-            "transactions": transactions
+        metadata = {
+            "parser_version": "0.1.0",
+            "protocol": self.protocol_parser.protocol_name,
+            "source_file": source_file
         }
         
-        with open(output_file, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        with TransactionWriter(output_file, metadata, self._output_flush_interval()) as writer:
+            for transaction in transactions:
+                writer.write(transaction)
+        return writer.count
+
+    def _output_flush_interval(self) -> Optional[float]:
+        """
+        Get the interval at which output files are flushed.
+        
+        Returns:
+            The flush interval while following a waveform, otherwise None
+            (output is only flushed when the file is closed)
+        """
+        return self.flush_interval if self.follow else None
+
+
+class SavedOutput(NamedTuple):
+    """Output file written for an interface."""
+    output_file: str
+    count: int                  # Number of transactions of the interface in the file
+
+
+class TransactionWriter:
+    """Incremental writer of a structured transactions JSON file."""
+
+    def __init__(self, output_file: str, metadata: Dict[str, Any],
+                 flush_interval: Optional[float] = None):
+        """
+        Initialize the writer.
+        
+        Transactions are written one by one as they are produced; the file
+        is the same as ``json.dump(..., indent=2)`` of the whole document.
+        
+        Args:
+            output_file: Path to output file
+            metadata: Metadata written before the transactions
+            flush_interval: Flush written transactions to the file at least
+                this often, in seconds (default: only when the file is closed)
+        """
+        self.output_file = output_file
+        self.metadata = metadata
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "TransactionWriter":
+        self._file = open(self.output_file, 'w')
+        self._file.write('{\n  "metadata": ')
+        self._file.write(_indent_json(self.metadata, 2))
+        self._file.write(',\n  "transactions": [')
+        if self.flush_interval is not None:
+            self._file.flush()
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, transaction: Dict[str, Any]) -> None:
+        """
+        Append one transaction.
+        
+        Args:
+            transaction: Transaction to write
+        """
+        text = _indent_json(transaction, 4)
+        with self._lock:
+            self._file.write(',\n    ' if self.count else '\n    ')
+            self._file.write(text)
+            self.count += 1
+            self._dirty = True
+
+    def _flush_periodically(self) -> None:
+        """Thread body: flush newly written transactions every flush interval."""
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                if self._dirty:
+                    self._file.flush()
+                    self._dirty = False
+
+    def close(self) -> None:
+        """Finish the document and close the file."""
+        if self._file is None:
+            return
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        self._file.write('\n  ]\n}' if self.count else ']\n}')
+        self._file.close()
+        self._file = None
+
+
+class _ClockSampler:
+    """Clock sampling state of one interface in a streaming pass."""
+
+    __slots__ = ("signals", "clock_signal", "layout", "read", "edge", "previous_clock", "count")
+
+    def __init__(self, protocol: BaseProtocol, edge: bool):
+        """
+        Initialize the sampler.
+        
+        Args:
+            protocol: Protocol parser with the interface's signal mapping
+            edge: Sample rising clock edges only (otherwise every timestamp with the clock high)
+        """
+        signal_mapping = protocol.signal_mapping
+        self.layout = protocol.layout
+        self.signals = list(self.layout.signals)
+        self.clock_signal = signal_mapping.get(protocol.clock_signal, protocol.clock_signal)
+        self.read = self.layout.reader()
+        self.edge = edge
+        self.previous_clock = None
+        self.count = 0
+
+    def use_aliases(self, aliases: Dict[str, str]) -> None:
+        """
+        Read signals under the names they are recorded with.
+        
+        Args:
+            aliases: Mapped signal name -> name the signal is recorded under
+        """
+        self.signals = [aliases.get(signal, signal) for signal in self.signals]
+        self.clock_signal = aliases.get(self.clock_signal, self.clock_signal)
+        self.read = self.layout.reader(self.signals)
+
+    def triggered(self, state: Dict[str, Any], changes: Dict[str, Any]) -> bool:
+        """
+        Check whether a timestamp is sampled.
+        
+        Args:
+            state: Signal state after the timestamp
+            changes: Value changes of the timestamp
+            
+        Returns:
+            True at rising clock edges ("edge") or while the clock is high ("level")
+        """
+        clock = state.get(self.clock_signal)
+        if not self.edge:
+            return clock == '1'
+        if self.clock_signal not in changes:
+            return False
+        rising = clock == '1' and self.previous_clock == '0'
+        self.previous_clock = clock
+        return rising
+
+    def sample(self, state: Dict[str, Any], timestamp: int) -> SampleRow:
+        """
+        Build the sample row of the interface at a timestamp.
+        
+        Args:
+            state: Signal state at the timestamp
+            timestamp: Sampled timestamp
+            
+        Returns:
+            Row with the raw signal values in the protocol's layout, then the timestamp
+        """
+        self.count += 1
+        return self.read(state) + (timestamp,)
+
+
+def _rows_to_samples(protocol: BaseProtocol, rows: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+    """
+    Convert sample rows into samples keyed by standard signal names.
+    
+    Args:
+        protocol: Protocol parser whose layout the rows follow
+        rows: Sample rows
+        
+    Yields:
+        Samples with the protocol's hex signals converted to hex strings
+    """
+    to_sample = protocol.layout.to_sample
+    hex_signals = protocol.get_hex_signals()
+    for row in rows:
+        yield to_sample(row, hex_signals)
+
+
+def interface_output_file(output_file: str, interface: str) -> str:
+    """
+    Get the output path of one interface from the common output path.
+    
+    Args:
+        output_file: Output path given for all interfaces (e.g. ``out.json``)
+        interface: Interface name
+        
+    Returns:
+        Path with the interface name appended to the file stem (``out_<interface>.json``)
+    """
+    stem, extension = os.path.splitext(output_file)
+    return f"{stem}_{interface}{extension or '.json'}"
+
+
+def _fan_out(source: Iterator[Tuple[int, Any]], count: int) -> List[Iterator[Any]]:
+    """
+    Split a stream of (position, item) pairs into one iterator per position.
+    
+    Items are read from ``source`` only when the requesting iterator has
+    none buffered; items for the other positions are queued meanwhile.
+    
+    Args:
+        source: Stream of (position, item) pairs
+        count: Number of positions
+        
+    Returns:
+        One iterator per position
+    """
+    queues: List[Deque[Any]] = [deque() for _ in range(count)]
+
+    def branch(queue: Deque[Any]) -> Iterator[Any]:
+        while True:
+            while not queue:
+                pair = next(source, None)
+                if pair is None:
+                    return
+                queues[pair[0]].append(pair[1])
+            yield queue.popleft()
+
+    return [branch(queue) for queue in queues]
+
+
+def _tag_transactions(interface: str, transactions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Prefix transactions with the name of their interface.
+    
+    Args:
+        interface: Interface name
+        transactions: Transactions of the interface
+        
+    Yields:
+        Transactions with an 'Interface' key first
+    """
+    for transaction in transactions:
+        yield {"Interface": interface, **transaction}
+
+
+def _indent_json(value: Any, level: int) -> str:
+    """
+    Serialize a value with indent=2 as it appears nested at an indentation level.
+    
+    Args:
+        value: JSON-serializable value
+        level: Number of spaces the value is nested at
+        
+    Returns:
+        JSON text whose continuation lines are indented by ``level`` spaces
+    """
+    return json.dumps(value, indent=2).replace('\n', '\n' + ' ' * level)
+
+
+def _merge_repeated_timestamps(
+        blocks: Iterable[Tuple[int, Dict[str, Any]]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Merge consecutive blocks with the same timestamp, later changes overriding earlier ones.
+    
+    Args:
+        blocks: (timestamp, {signal: value}) blocks in file order
+        
+    Yields:
+        (timestamp, {signal: value}) with no timestamp repeated back to back
+    """
+    pending = None
+    for timestamp, changes in blocks:
+        if pending is not None and timestamp == pending[0]:
+            pending[1].update(changes)
+            continue
+        if pending is not None:
+            yield pending
+        pending = (timestamp, dict(changes))
+    if pending is not None:
+        yield pending
+
+
+def _iter_time_blocks_pyvcd(vcd_file_path: str, mapped_signals: List[str],
+                            signal_id_codes: Optional[Dict[str, str]] = None,
+                            start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read value changes of mapped signals with the pyvcd tokenizer.
+
+    Args:
+        vcd_file_path: Path to the VCD file
+        mapped_signals: VCD signal names to record
+        signal_id_codes: Known id_code -> signal name mapping (when resuming
+            inside the value change section)
+        start: Byte offset to start tokenizing from
+        end: Byte offset to stop tokenizing at (default: end of file)
+
+    Yields:
+        (timestamp, {signal: value}) for every timestamp in the range
+    """
+    # Compressed files are decompressed on the fly
+    with open_waveform(vcd_file_path) as raw:
+        if start:
+            raw.seek(start)
+        yield from _tokenize_time_blocks(raw, mapped_signals, signal_id_codes,
+                                         in_value_changes=start > 0,
+                                         limit=None if end is None else end - start)
+
+
+def _tokenize_time_blocks(raw: BinaryIO, mapped_signals: List[str],
+                          signal_id_codes: Optional[Dict[str, str]] = None,
+                          in_value_changes: bool = False,
+                          limit: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Tokenize a VCD stream with pyvcd and group mapped value changes by timestamp.
+    
+    Args:
+        raw: Binary stream to tokenize
+        mapped_signals: VCD signal names to record
+        signal_id_codes: Known id_code -> signal name mapping (when the stream
+            starts inside the value change section)
+        in_value_changes: True if the stream starts past ``$dumpvars``
+        limit: Maximum number of bytes to read from ``raw``
+        
+    Yields:
+        (timestamp, {signal: value}) for every timestamp in the stream
+    """
+    # Store id_code -> signal name mapping
+    signal_id_codes = dict(signal_id_codes) if signal_id_codes is not None else {}
+
+    # Header declarations, resolved against the mapped signals at $enddefinitions
+    scope: List[str] = []
+    variables: List[VarDeclaration] = []
+
+    # Preprocess the VCD stream on the fly to handle NVC-specific
+    # extensions and compatibility issues (see NVCPreprocessingReader)
+    f = NVCPreprocessingReader(raw, in_value_changes=in_value_changes, limit=limit)
+
+    current_time = None
+    changes = {}
+    for token in tokenize(f):
+        if token.kind in [TokenKind.CHANGE_VECTOR, TokenKind.CHANGE_SCALAR]:
+            # Record changes for protocol signals only
+            if current_time is not None:
+                signal_name = signal_id_codes.get(token.data.id_code)
+                if signal_name is not None:
+                    changes[signal_name] = token.data.value
+
+        elif token.kind is TokenKind.CHANGE_TIME:
+            # Hand out the previous timeframe when a new timestamp is encountered
+            if current_time is not None:
+                yield current_time, changes
+            current_time = token.data
+            changes = {}
+
+        elif token.kind is TokenKind.SCOPE:
+            scope.append(token.data.ident)
+
+        elif token.kind is TokenKind.UPSCOPE:
+            scope.pop()
+
+        elif token.kind is TokenKind.VAR:
+            var = token.data
+            variables.append(VarDeclaration(tuple(scope), var.reference, var.id_code,
+                                            var.size, var.type_.value))
+
+        elif token.kind is TokenKind.ENDDEFINITIONS:
+            # Map signal names to their id_codes
+            signal_id_codes.update(ScopeIndex(variables).resolve(mapped_signals))
+
+    if current_time is not None:
+        yield current_time, changes
+
+
+def _read_header_variables(vcd_file_path: str) -> List[VarDeclaration]:
+    """
+    Read the variable declarations of a VCD file without reading its value changes.
+    
+    Args:
+        vcd_file_path: Path to the VCD file
+        
+    Returns:
+        Variable declarations in header order
+    """
+    with open_waveform(vcd_file_path) as raw:
+        return _read_stream_header_variables(raw)
+
+
+def _read_stream_header_variables(raw: BinaryIO) -> List[VarDeclaration]:
+    """
+    Read the variable declarations from the start of a VCD stream.
+    
+    Args:
+        raw: Binary stream positioned at the start of the VCD
+        
+    Returns:
+        Variable declarations in header order
+    """
+    try:
+        return StreamVCDScanner(raw, window_size=HEADER_READ_SIZE).header.variables
+    except ScannerFallback as e:
+        data = e.data
+
+    # Headers the byte-level parser rejects are read with pyvcd
+    scope: List[str] = []
+    variables: List[VarDeclaration] = []
+    for token in tokenize(NVCPreprocessingReader(PrefixedReader(data, raw))):
+        if token.kind is TokenKind.SCOPE:
+            scope.append(token.data.ident)
+        elif token.kind is TokenKind.UPSCOPE:
+            scope.pop()
+        elif token.kind is TokenKind.VAR:
+            var = token.data
+            variables.append(VarDeclaration(tuple(scope), var.reference, var.id_code,
+                                            var.size, var.type_.value))
+        elif token.kind is TokenKind.ENDDEFINITIONS:
+            break
+    return variables
+
+
+def _resolve_id_codes(header: VCDHeader, mapped_signals: List[str]) -> Dict[str, str]:
+    """
+    Map the id codes of header variables to mapped signal names.
+    
+    Args:
+        header: Parsed VCD header
+        mapped_signals: VCD signal names, dotted paths or glob patterns to record
+        
+    Returns:
+        id_code -> signal name mapping
+    """
+    return ScopeIndex(header.variables).resolve(mapped_signals)
+
+
+def _iter_time_blocks_stream(vcd_file_path: str,
+                             mapped_signals: List[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read value changes of mapped signals from a sequential stream with the byte-level scanner.
+    
+    Used for inputs that cannot be memory-mapped, such as compressed files.
+    If the scanner meets input it cannot handle, the bytes it already read
+    are replayed into the pyvcd tokenizer, followed by the rest of the stream.
+    
+    Args:
+        vcd_file_path: Path to the VCD file
+        mapped_signals: VCD signal names to record
+        
+    Yields:
+        (timestamp, {signal: value}) for every timestamp in the file
+    """
+    with open_waveform(vcd_file_path) as raw:
+        yield from _scan_stream(raw, vcd_file_path, mapped_signals)
+
+
+def _scan_stream(raw: BinaryIO, vcd_file_path: str, mapped_signals: List[str],
+                 window_size: int = DEFAULT_WINDOW_SIZE) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read value changes of mapped signals from an open stream with the byte-level scanner.
+    
+    Args:
+        raw: Binary stream positioned at the start of the VCD
+        vcd_file_path: Path the stream was opened from (for log messages)
+        mapped_signals: VCD signal names to record
+        window_size: Number of bytes read from the stream per window
+        
+    Yields:
+        (timestamp, {signal: value}) for every timestamp in the stream
+    """
+    try:
+        scanner = StreamVCDScanner(raw, window_size=window_size)
+    except ScannerFallback as e:
+        logger.warning(f"Byte-level scanner cannot read {vcd_file_path} ({e}), falling back to pyvcd")
+        yield from _tokenize_time_blocks(PrefixedReader(e.data, raw), mapped_signals)
+        return
+
+    signal_id_codes = _resolve_id_codes(scanner.header, mapped_signals)
+    id_map = {id_code.encode('ascii'): name for id_code, name in signal_id_codes.items()}
+    try:
+        yield from scanner.iter_time_blocks(id_map)
+        return
+    except ScannerFallback as e:
+        logger.warning(f"Byte-level scanner stopped at byte {e.offset} ({e}), continuing with pyvcd")
+        resume = e
+    yield from _tokenize_time_blocks(PrefixedReader(resume.data, raw), mapped_signals,
+                                     signal_id_codes, in_value_changes=True)
+
+
+def _iter_time_blocks_mmap(scanner: MmapVCDScanner, signal_id_codes: Dict[str, str],
+                           start: Optional[int] = None,
+                           end: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read value changes of mapped signals with the mmap scanner.
+    
+    If the scanner meets input it cannot handle, the rest of the range is
+    tokenized with pyvcd, starting at the first block not yet handed out.
+    
+    Args:
+        scanner: Open scanner for the VCD file
+        signal_id_codes: id_code -> signal name mapping
+        start: Byte offset to start scanning from (default: start of the body)
+        end: Byte offset to stop scanning at (default: end of file)
+        
+    Yields:
+        (timestamp, {signal: value}) for every timestamp in the range
+    """
+    id_map = {id_code.encode('ascii'): name for id_code, name in signal_id_codes.items()}
+    try:
+        yield from scanner.iter_time_blocks(id_map, start, end)
+        return
+    except ScannerFallback as e:
+        logger.warning(f"mmap engine stopped at byte {e.offset} ({e}), continuing with pyvcd")
+        resume_offset = e.offset
+    yield from _iter_time_blocks_pyvcd(scanner.vcd_file_path, list(signal_id_codes.values()),
+                                       signal_id_codes, resume_offset, end)
+
+
+def _iter_time_blocks_range(vcd_file_path: str, signal_id_codes: Dict[str, str],
+                            start: int, end: int, engine: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Read value changes of mapped signals from one byte range of the value change section.
+    
+    Args:
+        vcd_file_path: Path to the VCD file
+        signal_id_codes: id_code -> signal name mapping from the header
+        start: First byte of the range (start of the body or of a '#' line)
+        end: End of the range
+        engine: VCD reading engine used inside the range
+        
+    Yields:
+        (timestamp, {signal: value}) for every timestamp in the range
+    """
+    if engine == "pyvcd":
+        yield from _iter_time_blocks_pyvcd(vcd_file_path, list(signal_id_codes.values()),
+                                           signal_id_codes, start, end)
+        return
+    with MmapVCDScanner(vcd_file_path) as scanner:
+        yield from _iter_time_blocks_mmap(scanner, signal_id_codes, start, end)
+
+
+def _build_index(scanner: MmapVCDScanner, id_codes: Iterable[str], interval: int) -> VCDIndex:
+    """
+    Build a seek index with a checkpoint at every ``interval``-th timestamp.
+    
+    Args:
+        scanner: Open scanner for the VCD file
+        id_codes: id codes whose values are stored in the checkpoint snapshots
+        interval: Number of timestamps between two checkpoints
+        
+    Returns:
+        The built index
+    """
+    # Record values under their own id code so snapshots do not depend on signal names
+    identity = {id_code: id_code for id_code in id_codes}
+    stat = os.stat(scanner.vcd_file_path)
+    values: Dict[str, Any] = {}
+    checkpoints = []
+    position = scanner.header.body_offset
+    for time, offset in scanner.iter_timestamps(interval):
+        for _, changes in _iter_time_blocks_mmap(scanner, identity, position, offset):
+            values.update(changes)
+        checkpoints.append(Checkpoint(time, offset, dict(values)))
+        position = offset
+    return VCDIndex(stat.st_size, stat.st_mtime_ns, interval, identity, checkpoints)
+
+
+def _parse_byte_range(vcd_file_path: str, start: int, end: int,
+                      signal_id_codes: Dict[str, str], engine: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Parse one byte range of the value change section (process pool worker).
+    
+    Args:
+        vcd_file_path: Path to the VCD file
+        start: First byte of the range (start of the body or of a '#' line)
+        end: End of the range
+        signal_id_codes: id_code -> signal name mapping from the header
+        engine: VCD reading engine used inside the range
+        
+    Returns:
+        List of (timestamp, {signal: value}) blocks in file order
+    """
+    return list(_iter_time_blocks_range(vcd_file_path, signal_id_codes, start, end, engine))
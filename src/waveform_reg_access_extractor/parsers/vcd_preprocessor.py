@@ -0,0 +1,181 @@
+"""Streaming preprocessing of simulator-specific VCD extensions.
+
+NVC generates VCD files that ``vcd.reader`` cannot consume as-is:
+
+1. ``$attrbegin``/``$attrend`` directives (not supported by vcd.reader)
+2. ``vhdl_architecture`` scope names (some tools expect ``module``)
+3. ``u``/``U`` for uninitialized values (some parsers prefer ``X``)
+
+The reader in this module rewrites those constructs on the fly, one chunk at a
+time, so the tokenizer can pull directly from it without the whole file ever
+being held in memory.
+"""
+
+import io
+import re
+from typing import Any, BinaryIO, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default number of bytes pulled from the underlying stream per refill
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Value part of a value change holding an uninitialized state: a scalar
+# "<state><id_code>" starting with u/U, or the "b<value>"/"r<value>" token of
+# a vector/real change. Identifier codes are never matched, as they are
+# printable characters that may legitimately contain 'u' or 'U'.
+_UNINITIALIZED_VALUE = re.compile(rb"^[ \t]*(?:[uU]|[bBrR][^\s]*[uU][^\s]*)", re.MULTILINE)
+
+
+class NVCPreprocessingReader(io.RawIOBase):
+    """Read-only binary stream that filters NVC extensions from a VCD stream."""
+
+    def __init__(self, raw: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 in_value_changes: bool = False, limit: Optional[int] = None):
+        """
+        Initialize the preprocessing reader.
+
+        Args:
+            raw: Underlying binary stream positioned at the start of the VCD
+            chunk_size: Number of bytes read from ``raw`` per refill
+            in_value_changes: True if ``raw`` is positioned past ``$dumpvars``
+            limit: Maximum number of bytes to read from ``raw`` (None: until EOF)
+        """
+        super().__init__()
+        self._raw = raw
+        self._chunk_size = chunk_size
+        self._carry = b""           # Trailing partial line from the last chunk
+        self._pending = b""         # Filtered bytes not yet handed out
+        self._pending_pos = 0
+        self._eof = False
+        self._dumpvars_found = in_value_changes
+        self._remaining = limit
+
+    def readable(self) -> bool:
+        """Return True; this stream supports reading."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Fill ``buffer`` with filtered bytes.
+
+        Args:
+            buffer: Writable buffer supplied by the caller
+
+        Returns:
+            Number of bytes written, 0 at end of stream
+        """
+        while self._pending_pos >= len(self._pending):
+            if self._eof:
+                return 0
+            self._refill()
+
+        available = len(self._pending) - self._pending_pos
+        count = min(len(buffer), available)
+        buffer[:count] = self._pending[self._pending_pos:self._pending_pos + count]
+        self._pending_pos += count
+        return count
+
+    def _refill(self) -> None:
+        """Read the next chunk from the underlying stream and filter it."""
+        size = self._chunk_size
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        chunk = self._raw.read(size) if size else b""
+        if self._remaining is not None:
+            self._remaining -= len(chunk)
+        if not chunk:
+            # Flush the final line even if it has no trailing newline
+            self._eof = True
+            block, self._carry = self._carry, b""
+        else:
+            data = self._carry + chunk
+            cut = data.rfind(b"\n") + 1
+            block, self._carry = data[:cut], data[cut:]
+
+        self._pending = self._filter_block(block) if block else b""
+        self._pending_pos = 0
+
+    def _filter_block(self, block: bytes) -> bytes:
+        """
+        Filter a block of complete lines.
+
+        Args:
+            block: Bytes ending on a line boundary (or at end of stream)
+
+        Returns:
+            Filtered bytes
+        """
+        out: List[bytes] = []
+        pos = 0
+
+        # Header: filter line by line until $dumpvars has been seen
+        while not self._dumpvars_found and pos < len(block):
+            end = block.find(b"\n", pos) + 1 or len(block)
+            filtered = self._filter_line(block[pos:end])
+            if filtered is not None:
+                out.append(filtered)
+            pos = end
+        if pos:
+            block = block[pos:]
+
+        if b"$attr" in block or b"vhdl_architecture" in block:
+            for line in block.splitlines(keepends=True):
+                filtered = self._filter_line(line)
+                if filtered is not None:
+                    out.append(filtered)
+        elif block:
+            # Fast path: rewrite the whole value change section in one pass
+            out.append(_replace_uninitialized(block))
+        return b"".join(out)
+
+    def _filter_line(self, line: bytes) -> Optional[bytes]:
+        """
+        Filter a single line.
+
+        Args:
+            line: Raw line including its line terminator
+
+        Returns:
+            Filtered line, or None if the line is dropped
+        """
+        stripped = line.strip()
+
+        # Skip $attrbegin and $attrend lines (NVC-specific extensions)
+        if stripped.startswith(b"$attrbegin") or stripped.startswith(b"$attrend"):
+            return None
+
+        # Track when we've seen $dumpvars
+        if b"$dumpvars" in line:
+            self._dumpvars_found = True
+
+        # Replace vhdl_architecture with module (for compatibility)
+        if b"vhdl_architecture" in line:
+            line = line.replace(b"vhdl_architecture", b"module")
+
+        # After $dumpvars, handle uninitialized values in value changes.
+        # Only the value part is rewritten; identifier codes are printable
+        # characters that may legitimately contain 'u' or 'U'.
+        if self._dumpvars_found and stripped and not stripped.startswith(b"$"):
+            line = _replace_uninitialized(line)
+
+        return line
+
+
+def _replace_uninitialized(data: bytes) -> bytes:
+    """
+    Replace ``u``/``U`` states in the values of value change lines with ``X``.
+
+    Args:
+        data: One or more value change lines
+
+    Returns:
+        Lines with uninitialized states mapped to ``X``
+    """
+    return _UNINITIALIZED_VALUE.sub(_unknown_value, data)
+
+
+def _unknown_value(match: "re.Match[bytes]") -> bytes:
+    """Map the uninitialized states of a matched value to ``X``."""
+    return match.group(0).replace(b"U", b"X").replace(b"u", b"X")
@@ -0,0 +1,553 @@
+"""Memory-mapped, byte-level VCD scanner.
+
+The scanner is an alternative to ``vcd.reader.tokenize`` for large dumps. It
+memory-maps the file, parses the header once, and then walks the value change
+section with ``bytes.split``. Only change lines whose id code belongs to a
+mapped signal are decoded; every other change is skipped without building a
+token object.
+
+``StreamVCDScanner`` applies the same scanning to a sequential stream (for
+example a file decompressed on the fly), reading it window by window.
+
+Anything the scanners do not understand raises ``ScannerFallback`` so the
+caller can hand the remainder of the file to the pyvcd tokenizer.
+"""
+
+import io
+import mmap
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+
+from ..utils.file_utils import is_compressed
+
+logger = logging.getLogger(__name__)
+
+# Default size of the byte windows handed to the body scanner
+DEFAULT_WINDOW_SIZE = 16 << 20
+
+# Scalar states accepted by vcd.reader (IEEE 1800 plus VHDL std_logic)
+_SCALAR_STATES = frozenset(b"01xXzZuUwWhHlL-")
+
+# Body keywords that carry no value changes of their own
+_BODY_KEYWORDS = frozenset([b"$dumpvars", b"$dumpall", b"$dumpon", b"$dumpoff", b"$end"])
+
+# Map NVC uninitialized states to 'X', as NVCPreprocessingReader does
+_UNINITIALIZED_TABLE = bytes.maketrans(b"uU", b"XX")
+
+
+class ScannerFallback(Exception):
+    """Raised when the scanner meets input it cannot handle."""
+
+    def __init__(self, message: str, offset: int, data: bytes = b""):
+        """
+        Initialize the fallback signal.
+
+        Args:
+            message: Reason for falling back
+            offset: Byte offset from which the pyvcd tokenizer should resume
+            data: Bytes from ``offset`` onwards that were already read from a
+                non-seekable stream and must be replayed before the rest of it
+        """
+        super().__init__(message)
+        self.offset = offset
+        self.data = data
+
+
+class VarDeclaration(NamedTuple):
+    """Variable declaration from the VCD header."""
+
+    scope: Tuple[str, ...]  #: Enclosing scope names, outermost first
+    reference: str          #: Variable name without bit index
+    id_code: str            #: Identifier code used in value changes
+    size: int               #: Width in bits
+    var_type: str           #: Declared type (wire, reg, logic, ...)
+
+
+class VCDHeader(NamedTuple):
+    """Parsed VCD header."""
+
+    variables: List[VarDeclaration]
+    timescale: Optional[str]
+    body_offset: int        #: Byte offset just past ``$enddefinitions $end``
+
+
+def parse_header(buf: Any) -> VCDHeader:
+    """
+    Parse the declaration section of a VCD file.
+
+    Args:
+        buf: Bytes-like object (or mmap) holding at least the full header
+
+    Returns:
+        Parsed header
+
+    Raises:
+        ScannerFallback: If the header cannot be located or parsed
+    """
+    marker = buf.find(b"$enddefinitions")
+    if marker < 0:
+        raise ScannerFallback("No $enddefinitions found", 0)
+    end = buf.find(b"$end", marker + len(b"$enddefinitions"))
+    if end < 0:
+        raise ScannerFallback("Unterminated $enddefinitions", 0)
+    body_offset = end + len(b"$end")
+
+    tokens = buf[:marker].split()
+    variables: List[VarDeclaration] = []
+    scope: List[str] = []
+    timescale = None
+    i = 0
+    count = len(tokens)
+    while i < count:
+        token = tokens[i]
+        if token == b"$scope":
+            # $scope <type> <name> $end (unnamed scopes have no name)
+            j = _find_end(tokens, i + 1)
+            scope.append(tokens[i + 2].decode("ascii") if j > i + 2 else "")
+            i = j + 1
+        elif token == b"$upscope":
+            if scope:
+                scope.pop()
+            i = _find_end(tokens, i + 1) + 1
+        elif token == b"$var":
+            j = _find_end(tokens, i + 1)
+            if j - i < 5:
+                raise ScannerFallback(f"Malformed $var declaration: {tokens[i:j + 1]!r}", 0)
+            reference = _split_var_reference([t.decode("ascii") for t in tokens[i + 4:j]])
+            variables.append(VarDeclaration(
+                scope=tuple(scope),
+                reference=reference,
+                id_code=tokens[i + 3].decode("ascii"),
+                size=int(tokens[i + 2]),
+                var_type=tokens[i + 1].decode("ascii"),
+            ))
+            i = j + 1
+        elif token == b"$timescale":
+            j = _find_end(tokens, i + 1)
+            timescale = b"".join(tokens[i + 1:j]).decode("ascii")
+            i = j + 1
+        elif token.startswith(b"$"):
+            # $date, $version, $comment, $attrbegin, ... : skip to $end
+            i = _find_end(tokens, i + 1) + 1
+        else:
+            raise ScannerFallback(f"Unexpected header token {token!r}", 0)
+
+    return VCDHeader(variables, timescale, body_offset)
+
+
+def _find_end(tokens: List[bytes], start: int) -> int:
+    """Return the index of the next ``$end`` token at or after ``start``."""
+    try:
+        return tokens.index(b"$end", start)
+    except ValueError:
+        raise ScannerFallback("Unterminated header section", 0) from None
+
+
+def _split_var_reference(parts: List[str]) -> str:
+    """
+    Build a variable reference without its trailing bit index.
+
+    ``paddr[15:0]``, ``paddr [15:0]`` and ``paddr [ 15 : 0 ]`` all yield
+    ``paddr``; ``mem[0] [7:0]`` yields ``mem[0]``. Escaped identifiers are
+    opaque and keep any brackets they contain.
+
+    Args:
+        parts: Whitespace-separated tokens between the id code and ``$end``
+
+    Returns:
+        Variable reference
+    """
+    reference = parts[0]
+    index_start = len(reference) if reference.startswith("\\") else 0
+    reference = reference + "".join(parts[1:])
+    if not reference.endswith("]"):
+        return reference
+
+    open_pos = reference.rfind("[", index_start)
+    if open_pos <= 0:
+        return reference
+    indices = reference[open_pos + 1:-1].split(":")
+    if len(indices) <= 2 and all(index.lstrip("-").isdigit() for index in indices):
+        return reference[:open_pos]
+    return reference
+
+
+def decode_vector(value: bytes) -> Any:
+    """
+    Decode a vector value the way ``vcd.reader`` does.
+
+    Args:
+        value: Value digits without the leading ``b``
+
+    Returns:
+        int if the value is purely binary, otherwise the value string
+    """
+    if not value:
+        # GHDL emits `b` with no value digits for zero-width variables
+        return 0
+    if not value.translate(None, b"01"):
+        return int(value, 2)
+    return value.translate(_UNINITIALIZED_TABLE).decode("ascii")
+
+
+def scan_body(data: bytes, id_map: Dict[bytes, str], base_offset: int = 0,
+              current_time: Optional[int] = None) -> List[Tuple[int, Dict[str, Any]]]:
+    """
+    Scan a slice of the value change section.
+
+    The slice must start on a token boundary. Changes that occur before the
+    first timestamp of the slice are attributed to ``current_time`` (and
+    dropped when it is None).
+
+    Args:
+        data: Bytes of the slice
+        id_map: Mapping of id code bytes to signal names; other ids are skipped
+        base_offset: File offset of ``data[0]`` (for fallback reporting)
+        current_time: Timestamp in effect at the start of the slice
+
+    Returns:
+        List of ``(timestamp, {signal: value})`` blocks in file order
+
+    Raises:
+        ScannerFallback: If the slice contains constructs the scanner does not handle
+    """
+    blocks: List[Tuple[int, Dict[str, Any]]] = []
+    changes: Optional[Dict[str, Any]] = None
+    if current_time is not None:
+        changes = {}
+        blocks.append((current_time, changes))
+
+    get = id_map.get
+    tokens = iter(data.split())
+    for token in tokens:
+        c = token[0]
+        if c == 35:  # '#'
+            try:
+                current_time = int(token[1:])
+            except ValueError:
+                raise ScannerFallback(f"Unsupported time change {token!r}", base_offset) from None
+            changes = {}
+            blocks.append((current_time, changes))
+        elif c in _SCALAR_STATES:
+            signal = get(token[1:])
+            if signal is not None and changes is not None:
+                changes[signal] = "X" if c == 117 or c == 85 else chr(c)
+        elif c == 98 or c == 66:  # 'b' / 'B'
+            id_code = next(tokens, None)
+            if id_code is None:
+                raise ScannerFallback("Truncated vector change", base_offset)
+            signal = get(id_code)
+            if signal is not None and changes is not None:
+                changes[signal] = decode_vector(token[1:])
+        elif c == 36:  # '$'
+            if token not in _BODY_KEYWORDS:
+                raise ScannerFallback(f"Unsupported body keyword {token!r}", base_offset)
+        elif c in b"rRsS":
+            id_code = next(tokens, None)
+            if id_code is None:
+                raise ScannerFallback("Truncated value change", base_offset)
+            if get(id_code) is not None:
+                raise ScannerFallback(f"Unsupported value type for mapped id {id_code!r}", base_offset)
+        else:
+            raise ScannerFallback(f"Unexpected token {token!r}", base_offset)
+
+    return blocks
+
+
+class MmapVCDScanner:
+    """Memory-mapped VCD scanner that decodes only mapped id codes."""
+
+    def __init__(self, vcd_file_path: str, window_size: int = DEFAULT_WINDOW_SIZE):
+        """
+        Open and memory-map a VCD file and parse its header.
+
+        Args:
+            vcd_file_path: Path to the VCD file
+            window_size: Approximate number of bytes scanned per window
+
+        Raises:
+            ScannerFallback: If the file cannot be mapped or its header parsed
+        """
+        if is_compressed(vcd_file_path):
+            raise ScannerFallback(f"Cannot memory-map compressed file {vcd_file_path}", 0)
+        self.vcd_file_path = vcd_file_path
+        self.window_size = window_size
+        self._file = open(vcd_file_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError) as e:
+            self._file.close()
+            raise ScannerFallback(f"Cannot memory-map {vcd_file_path}: {e}", 0) from None
+        try:
+            self.header = parse_header(self._map)
+        except ScannerFallback:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Release the memory map and the underlying file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MmapVCDScanner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Size of the mapped file in bytes."""
+        return len(self._map)
+
+    def iter_windows(self, start: Optional[int] = None,
+                     end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Split a byte range of the body into windows at timestamp boundaries.
+
+        Every window except possibly the first starts on a ``#`` line, so no
+        timestamp block is split between two windows.
+
+        Args:
+            start: First byte of the range (default: start of the body)
+            end: End of the range (default: end of file)
+
+        Yields:
+            ``(window_start, window_end)`` byte offsets
+        """
+        buf = self._map
+        pos = self.header.body_offset if start is None else start
+        end = len(buf) if end is None else end
+        while pos < end:
+            cut = min(pos + self.window_size, end)
+            if cut < end:
+                boundary = buf.rfind(b"\n#", pos, cut)
+                if boundary < 0:
+                    # A single block larger than the window: extend to the next one
+                    boundary = buf.find(b"\n#", cut, end)
+                cut = end if boundary < 0 else boundary + 1
+            yield pos, cut
+            pos = cut
+
+    def split_body(self, count: int) -> List[Tuple[int, int]]:
+        """
+        Split the body into roughly equal byte ranges at timestamp boundaries.
+
+        Args:
+            count: Desired number of ranges
+
+        Returns:
+            List of ``(start, end)`` byte offsets covering the whole body in order
+        """
+        buf = self._map
+        start = self.header.body_offset
+        size = len(buf)
+        bounds = [start]
+        for k in range(1, count):
+            target = start + (size - start) * k // count
+            if target <= bounds[-1]:
+                continue
+            boundary = buf.find(b"\n#", target)
+            if boundary < 0:
+                break
+            if boundary + 1 > bounds[-1]:
+                bounds.append(boundary + 1)
+        bounds.append(size)
+        return [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if lo < hi]
+
+    def iter_timestamps(self, every: int = 1) -> Iterator[Tuple[int, int]]:
+        """
+        Locate timestamp lines in the body without decoding value changes.
+
+        Args:
+            every: Only yield every Nth timestamp, starting with the first
+
+        Yields:
+            ``(timestamp, offset)`` with the byte offset of the ``#``
+
+        Raises:
+            ScannerFallback: If a timestamp line is malformed
+        """
+        buf = self._map
+        pos = self.header.body_offset
+        if buf[pos:pos + 1] != b"#":
+            pos = buf.find(b"\n#", pos)
+            pos = -1 if pos < 0 else pos + 1
+        count = 0
+        while pos >= 0:
+            if count % every == 0:
+                eol = buf.find(b"\n", pos)
+                if eol < 0:
+                    eol = len(buf)
+                try:
+                    yield int(buf[pos + 1:eol]), pos
+                except ValueError:
+                    raise ScannerFallback(f"Malformed timestamp {bytes(buf[pos:eol])!r}", pos) from None
+            count += 1
+            pos = buf.find(b"\n#", pos)
+            if pos >= 0:
+                pos += 1
+
+    def iter_time_blocks(self, id_map: Dict[bytes, str], start: Optional[int] = None,
+                         end: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scan the body and yield value changes of mapped signals per timestamp.
+
+        A window is only yielded once it has been scanned completely, so a
+        ``ScannerFallback`` raised mid-window carries the offset of the first
+        block that has not been handed out yet.
+
+        Args:
+            id_map: Mapping of id code bytes to signal names
+            start: First byte to scan (default: start of the body)
+            end: End of the range to scan (default: end of file)
+
+        Yields:
+            ``(timestamp, {signal: value})`` for every timestamp in the range
+        """
+        for window_start, window_end in self.iter_windows(start, end):
+            yield from scan_body(self._map[window_start:window_end], id_map, window_start)
+
+
+class StreamVCDScanner:
+    """Byte-level VCD scanner reading a sequential (non-seekable) stream."""
+
+    def __init__(self, stream: BinaryIO, window_size: int = DEFAULT_WINDOW_SIZE):
+        """
+        Read and parse the header from a stream.
+
+        Args:
+            stream: Binary stream positioned at the start of the VCD
+            window_size: Number of bytes read from ``stream`` per window
+
+        Raises:
+            ScannerFallback: If the header cannot be parsed; ``data`` holds the
+                bytes consumed so far
+        """
+        self.window_size = window_size
+        self._stream = stream
+        self._eof = False
+        head = bytearray()
+        while True:
+            chunk = stream.read(window_size)
+            head += chunk
+            marker = head.find(b"$enddefinitions")
+            if marker >= 0 and head.find(b"$end", marker + len(b"$enddefinitions")) >= 0:
+                break
+            if not chunk:
+                self._eof = True
+                break
+        try:
+            self.header = parse_header(head)
+        except ScannerFallback as e:
+            raise ScannerFallback(str(e), 0, bytes(head)) from None
+        self._pending = bytes(head[self.header.body_offset:])
+        self._offset = self.header.body_offset
+
+    def iter_time_blocks(self, id_map: Dict[bytes, str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Scan the rest of the stream and yield value changes of mapped signals.
+
+        Windows are cut at timestamp boundaries and only handed out once
+        scanned completely. On ``ScannerFallback`` the exception's ``data``
+        holds the unscanned bytes already read from the stream.
+
+        Args:
+            id_map: Mapping of id code bytes to signal names
+
+        Yields:
+            ``(timestamp, {signal: value})`` for every timestamp in the stream
+        """
+        while self._pending or not self._eof:
+            chunk = b"" if self._eof else self._stream.read(self.window_size)
+            if not chunk:
+                self._eof = True
+            data = self._pending + chunk
+            cut = len(data) if self._eof else data.rfind(b"\n#") + 1
+            if cut <= 0:
+                # No complete timestamp block yet: keep reading
+                self._pending = data
+                continue
+
+            self._pending = data
+            try:
+                blocks = scan_body(data[:cut], id_map, self._offset)
+            except ScannerFallback as e:
+                raise ScannerFallback(str(e), self._offset, data) from None
+            self._pending = data[cut:]
+            self._offset += cut
+            yield from blocks
+
+
+class PrefixedReader(io.RawIOBase):
+    """Read-only stream that replays buffered bytes before reading on from a stream."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        """
+        Initialize the reader.
+
+        Args:
+            prefix: Bytes to hand out first
+            stream: Stream to continue reading from afterwards
+        """
+        super().__init__()
+        self._prefix = prefix
+        self._prefix_pos = 0
+        self._stream = stream
+
+    def readable(self) -> bool:
+        """Return True; this stream supports reading."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Fill ``buffer`` from the prefix, then from the stream.
+
+        Args:
+            buffer: Writable buffer supplied by the caller
+
+        Returns:
+            Number of bytes written, 0 at end of stream
+        """
+        if self._prefix_pos < len(self._prefix):
+            count = min(len(buffer), len(self._prefix) - self._prefix_pos)
+            buffer[:count] = self._prefix[self._prefix_pos:self._prefix_pos + count]
+            self._prefix_pos += count
+            return count
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class RecordingReader(io.RawIOBase):
+    """Read-only stream that keeps a copy of every byte read through it."""
+
+    def __init__(self, stream: BinaryIO):
+        """
+        Initialize the reader.
+
+        Args:
+            stream: Stream to read from
+        """
+        super().__init__()
+        self._stream = stream
+        self.data = bytearray()
+
+    def readable(self) -> bool:
+        """Return True; this stream supports reading."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Fill ``buffer`` from the stream and record the bytes.
+
+        Args:
+            buffer: Writable buffer supplied by the caller
+
+        Returns:
+            Number of bytes written, 0 at end of stream
+        """
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self.data += data
+        return len(data)
@@ -0,0 +1,385 @@
+"""Columnar storage of parsed waveform data.
+
+Instead of one dictionary with the full signal state per timestamp, the store
+keeps one array with all timestamps and, per mapped signal, the positions (in
+the timestamp array) at which the signal changed together with the new
+values. Memory therefore grows with the number of value changes rather than
+with timestamps times signals.
+
+Protocols query the store through sampling methods, e.g. the positions at
+which a clock is high and the values of other signals at those positions.
+NumPy is used for the arrays and for vectorized lookups when it is
+installed; otherwise the store falls back to ``array`` and plain lists.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional accelerator
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Largest timestamp stored in a 64-bit array
+_INT64_MAX = (1 << 63) - 1
+
+
+class SignalColumn:
+    """Value changes of one signal."""
+
+    __slots__ = ("positions", "values")
+
+    def __init__(self):
+        """Initialize an empty column."""
+        self.positions: Any = array('q')    # Timestamp positions of the changes, ascending
+        self.values: Any = []               # Value after each change
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def initial(self) -> Any:
+        """
+        Value of full data items before the first change.
+
+        Data items built by ``VCDParser.parse_vcd_file`` have always started
+        from the final signal values, so a signal that has not changed yet
+        reads as its last value; ``to_data_items`` keeps that behavior.
+        Sampling methods report None before the first change instead, like
+        the streaming extraction, so that no sample reads a later value.
+        """
+        if not len(self.values):
+            return None
+        value = self.values[-1]
+        return value.item() if np is not None and isinstance(value, np.generic) else value
+
+
+class WaveformStore:
+    """Columnar store of mapped signal changes."""
+
+    def __init__(self, signals: Iterable[str]):
+        """
+        Initialize an empty store.
+
+        Args:
+            signals: Mapped signal names stored in this waveform
+        """
+        self.signals = list(dict.fromkeys(signals))
+        self.timestamps: Any = array('q')
+        self.columns: Dict[str, SignalColumn] = {signal: SignalColumn() for signal in self.signals}
+        # Signal values before the first timestamp (the state before a time window)
+        self.previous: Dict[str, Any] = {}
+        self._frozen = False
+
+    def __len__(self) -> int:
+        """Return the number of timestamps."""
+        return len(self.timestamps)
+
+    def append(self, timestamp: int, changes: Dict[str, Any]) -> None:
+        """
+        Record the value changes of one timestamp block.
+
+        Blocks are expected in file order. A timestamp that was already seen
+        is merged into its first occurrence, later changes overriding earlier ones.
+
+        Args:
+            timestamp: Timestamp of the block
+            changes: {signal: value} changes in the block
+        """
+        if self._frozen:
+            raise ValueError("Cannot append to a finished waveform store")
+        timestamps = self.timestamps
+        if not timestamps or timestamp > timestamps[-1]:
+            position = len(timestamps)
+            if timestamp > _INT64_MAX and isinstance(timestamps, array):
+                self.timestamps = timestamps = list(timestamps)
+            timestamps.append(timestamp)
+        elif timestamp == timestamps[-1]:
+            position = len(timestamps) - 1
+        else:
+            # Out-of-order timestamp: merge into its first occurrence
+            try:
+                position = timestamps.index(timestamp)
+            except ValueError:
+                position = len(timestamps)
+                timestamps.append(timestamp)
+
+        columns = self.columns
+        for signal, value in changes.items():
+            column = columns[signal]
+            positions = column.positions
+            if not positions or position > positions[-1]:
+                positions.append(position)
+                column.values.append(value)
+            elif position == positions[-1]:
+                column.values[-1] = value
+            else:
+                index = bisect_left(positions, position)
+                if positions[index] == position:
+                    column.values[index] = value
+                else:
+                    positions.insert(index, position)
+                    column.values.insert(index, value)
+
+    def finish(self) -> "WaveformStore":
+        """
+        Freeze the store and convert its arrays to NumPy when available.
+
+        Returns:
+            The store itself
+        """
+        if self._frozen:
+            return self
+        self._frozen = True
+        if np is not None and isinstance(self.timestamps, array):
+            self.timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+            for column in self.columns.values():
+                column.positions = np.frombuffer(column.positions, dtype=np.int64)
+                column.values = _to_numpy(column.values)
+        return self
+
+    def positions_where(self, signal: str, value: Any) -> List[int]:
+        """
+        Find the timestamp positions at which a signal has a given value.
+
+        Args:
+            signal: Mapped signal name
+            value: Value to compare with (e.g. '1' for a high clock)
+
+        Returns:
+            Ascending timestamp positions
+        """
+        column = self.columns.get(signal)
+        count = len(self.timestamps)
+        if column is None or not len(column):
+            return []
+
+        if np is not None and self._frozen and isinstance(column.positions, np.ndarray):
+            runs = np.searchsorted(column.positions, np.arange(count), side='right') - 1
+            matches = np.asarray(column.values == value)
+            if matches.ndim == 0:
+                return []
+            selected = np.where(runs >= 0, matches[np.maximum(runs, 0)], value is None)
+            return np.nonzero(selected)[0].tolist()
+
+        positions: List[int] = []
+        starts = list(column.positions)
+        ends = starts[1:] + [count]
+        if value is None:
+            positions.extend(range(0, starts[0]))
+        for start, end, current in zip(starts, ends, column.values):
+            if current == value:
+                positions.extend(range(start, end))
+        return positions
+
+    def rising_edges(self, signal: str, low: Any = '0', high: Any = '1') -> List[int]:
+        """
+        Find the timestamp positions at which a signal goes from low to high.
+
+        Only a change from ``low`` directly to ``high`` counts as an edge;
+        transitions from 'x'/'z' do not. The first recorded value is an edge
+        only if it follows a ``low`` value in ``previous``.
+
+        Args:
+            signal: Mapped signal name
+            low: Value before the edge
+            high: Value after the edge
+
+        Returns:
+            Ascending timestamp positions of the edges
+        """
+        column = self.columns.get(signal)
+        if column is None or not len(column):
+            return []
+        first = [int(column.positions[0])] if self.previous.get(signal) == low and column.values[0] == high else []
+
+        if np is not None and isinstance(column.positions, np.ndarray):
+            values = column.values
+            edges = np.asarray((values[1:] == high) & (values[:-1] == low))
+            if edges.ndim == 0:
+                return first
+            return first + column.positions[1:][edges].tolist()
+
+        values = column.values
+        positions = column.positions
+        return first + [positions[k] for k in range(1, len(values))
+                        if values[k] == high and values[k - 1] == low]
+
+    def sample(self, signal: str, positions: Sequence[int]) -> List[Any]:
+        """
+        Get the values of a signal at ascending timestamp positions.
+
+        Args:
+            signal: Mapped signal name
+            positions: Ascending timestamp positions
+
+        Returns:
+            Signal value at every position (None before the signal's first change)
+        """
+        column = self.columns.get(signal)
+        if column is None or not len(column):
+            return [None] * len(positions)
+
+        if np is not None and isinstance(column.positions, np.ndarray):
+            if not len(positions):
+                return []
+            indices = np.searchsorted(column.positions, np.asarray(positions), side='right') - 1
+            values = column.values[np.maximum(indices, 0)].tolist()
+            return [value if index >= 0 else None for index, value in zip(indices.tolist(), values)]
+
+        change_positions = column.positions
+        change_values = column.values
+        last = len(change_positions) - 1
+        index = -1
+        sampled = []
+        for position in positions:
+            while index < last and change_positions[index + 1] <= position:
+                index += 1
+            sampled.append(change_values[index] if index >= 0 else None)
+        return sampled
+
+    def timestamps_at(self, positions: Sequence[int]) -> List[int]:
+        """
+        Get the timestamps of timestamp positions.
+
+        Args:
+            positions: Timestamp positions
+
+        Returns:
+            Timestamps in VCD time units
+        """
+        if np is not None and isinstance(self.timestamps, np.ndarray):
+            return self.timestamps[np.asarray(positions, dtype=np.int64)].tolist()
+        timestamps = self.timestamps
+        return [timestamps[position] for position in positions]
+
+    def sample_rows(self, positions: Sequence[int], signals: Sequence[str]) -> List[Tuple[Any, ...]]:
+        """
+        Build positional sample rows for selected timestamp positions only.
+
+        Args:
+            positions: Ascending timestamp positions
+            signals: Mapped signal names in row order
+
+        Returns:
+            One tuple per position holding the signal values in order, then the timestamp
+        """
+        columns = [self.sample(signal, positions) for signal in signals]
+        columns.append(self.timestamps_at(positions))
+        return list(zip(*columns))
+
+    def sample_columns(self, positions: Sequence[int], signals: Sequence[str]) -> List[Any]:
+        """
+        Get the values of signals at timestamp positions as NumPy arrays.
+
+        Requires NumPy and a finished store.
+
+        Args:
+            positions: Ascending timestamp positions
+            signals: Mapped signal names in column order
+
+        Returns:
+            One array per signal (None before the signal's first change, so
+            typed arrays become object arrays), then the timestamps of the positions
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        columns = []
+        for signal in signals:
+            column = self.columns.get(signal)
+            if column is None or not len(column):
+                columns.append(np.full(len(positions), None, dtype=object))
+                continue
+            indices = np.searchsorted(column.positions, positions, side='right') - 1
+            values = column.values[np.maximum(indices, 0)]
+            if len(indices) and indices[0] < 0:
+                # Before the first change the signal has no value
+                values = values.astype(object)
+                values[indices < 0] = None
+            columns.append(values)
+        columns.append(np.asarray(self.timestamps)[positions])
+        return columns
+
+    def rows(self, positions: Sequence[int], signal_mapping: Dict[str, Optional[str]],
+             hex_signals: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Build data items for selected timestamp positions only.
+
+        Args:
+            positions: Ascending timestamp positions
+            signal_mapping: Mapping of item keys (standard signal names) to mapped signal names (None: not recorded)
+            hex_signals: Item keys whose integer values are converted to hex strings
+
+        Returns:
+            One data item per position, keyed by standard signal names plus 'timestamp'
+        """
+        hex_signals = set(hex_signals or ())
+        columns = {}
+        for name, signal in signal_mapping.items():
+            values = self.sample(signal, positions)
+            if name in hex_signals:
+                values = [hex(value) if isinstance(value, int) else value for value in values]
+            columns[name] = values
+
+        names = list(columns)
+        rows = []
+        for i, timestamp in enumerate(self.timestamps_at(positions)):
+            row = {name: columns[name][i] for name in names}
+            row['timestamp'] = timestamp
+            rows.append(row)
+        return rows
+
+    def to_data_items(self) -> List[Dict[str, Any]]:
+        """
+        Materialize one data item with the full signal state per timestamp.
+
+        Returns:
+            List of data items keyed by mapped signal names plus 'timestamp'
+        """
+        count = len(self.timestamps)
+        state = {signal: column.initial for signal, column in self.columns.items()}
+        pending = []
+        for signal, column in self.columns.items():
+            positions = column.positions.tolist() if np is not None and isinstance(column.positions, np.ndarray) \
+                else list(column.positions)
+            values = column.values.tolist() if np is not None and isinstance(column.values, np.ndarray) \
+                else column.values
+            pending.append((signal, positions, values, [0]))
+
+        data_items = []
+        timestamps = self.timestamps_at(range(count))
+        for position, timestamp in enumerate(timestamps):
+            for signal, positions, values, cursor in pending:
+                index = cursor[0]
+                if index < len(positions) and positions[index] == position:
+                    state[signal] = values[index]
+                    cursor[0] = index + 1
+            data_item = dict(state)
+            data_item['timestamp'] = timestamp
+            data_items.append(data_item)
+        return data_items
+
+
+def _to_numpy(values: List[Any]) -> Any:
+    """
+    Convert a value list to the most compact NumPy array that round-trips it.
+
+    Args:
+        values: Signal values (single-character strings and/or integers)
+
+    Returns:
+        String, int64 or object NumPy array
+    """
+    if not values:
+        return np.array([], dtype=object)
+    if all(type(value) is str for value in values):
+        return np.array(values)
+    if all(type(value) is int for value in values) and \
+            min(values) >= -_INT64_MAX - 1 and max(values) <= _INT64_MAX:
+        return np.array(values, dtype=np.int64)
+    array_values = np.empty(len(values), dtype=object)
+    array_values[:] = values
+    return array_values
@@ -1,7 +1,13 @@
 """AMBA protocol implementations."""
 
-from .base_protocol import BaseProtocol
+from .base_protocol import BaseProtocol, SampleLayout
 from .ahb import AHBProtocol
 from .apb import APBProtocol
+from .axi import AXIProtocol
+from .declarative import DeclarativeProtocol, ProtocolDefinition
 
-__all__ = ["BaseProtocol", "AHBProtocol", "APBProtocol"]
+# Names of the protocols implemented in this package
+BUILTIN_PROTOCOLS = ("ahb", "apb", "axi")
+
+__all__ = ["BaseProtocol", "SampleLayout", "AHBProtocol", "APBProtocol", "AXIProtocol",
+           "DeclarativeProtocol", "ProtocolDefinition", "BUILTIN_PROTOCOLS"]
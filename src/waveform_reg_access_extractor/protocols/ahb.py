@@ -1,23 +1,78 @@
 """AHB protocol implementation."""
 
-from typing import Dict, List, Any, Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 import logging
 
-from .base_protocol import BaseProtocol
+from . import kernels
+from .base_protocol import DEFAULT_BEAT_SIZE, BaseProtocol, SampleRow, burst_beat_addresses, hex_value
+from .kernels import HTRANS_CODES, SCALAR_CODES, encode_column, gather_optional_rows
+from .vectorized import EXTRACTORS, gather_rows, is_ready, matches, np
 
 logger = logging.getLogger(__name__)
 
+# HTRANS values of transfers that carry data: NONSEQ (10) and SEQ (11)
+ACTIVE_HTRANS = (2, 3)
+
+# AHB HRESP encoding, for raw and string values
+HRESP_STATUS = {0: "OKAY", 1: "ERROR", 2: "RETRY", 3: "SPLIT",
+                "0": "OKAY", "1": "ERROR", "2": "RETRY", "3": "SPLIT"}
+
+# AHB HBURST encoding and the number of beats of the fixed-length bursts
+HBURST_TYPES = {0: "SINGLE", 1: "INCR", 2: "WRAP4", 3: "INCR4",
+                4: "WRAP8", 5: "INCR8", 6: "WRAP16", 7: "INCR16"}
+BURST_LENGTHS = {"WRAP4": 4, "INCR4": 4, "WRAP8": 8, "INCR8": 8, "WRAP16": 16, "INCR16": 16}
+
+# Output modes: one transaction per beat, or one record per burst
+AHB_BURST_MODES = ("flat", "grouped")
+
+# Keys of a beat transaction kept in the beats of a burst record
+BEAT_KEYS = ("Time", "Value", "Response", "WaitState")
+
+
+def address_value(haddr: Any) -> Optional[int]:
+    """
+    Read an address given as an integer or a hex string.
+    
+    Args:
+        haddr: HADDR value (raw integer, formatted hex string or unknown value)
+        
+    Returns:
+        Address, or None if it is unknown (e.g. contains x or z bits)
+    """
+    if haddr.__class__ is int:
+        return haddr
+    try:
+        return int(haddr, 16)
+    except (TypeError, ValueError):
+        return None
+
 
 class AHBProtocol(BaseProtocol):
     """AHB (Advanced High-performance Bus) protocol implementation."""
 
-    def __init__(self, signal_mapping: Optional[Dict[str, str]] = None):
+    def __init__(self, signal_mapping: Optional[Dict[str, str]] = None, burst_mode: str = "flat",
+                 masters: Optional[Dict[Any, str]] = None):
         """
         Initialize AHB protocol parser.
         
         Args:
             signal_mapping: Optional mapping of signal names to internal names
+            burst_mode: "flat" for one transaction per beat, "grouped" for
+                one record per burst holding its beats
+            masters: Optional names of the masters by HMASTER value; a
+                transaction is tagged with the name of the master that
+                drove its address phase (the HMASTER value if unnamed)
         """
+        if burst_mode not in AHB_BURST_MODES:
+            raise ValueError(f"Unsupported AHB burst mode: {burst_mode}. "
+                             f"Supported modes: {', '.join(AHB_BURST_MODES)}")
+        self.burst_mode = burst_mode
+        # Master names for raw and string HMASTER values
+        self.masters = {}
+        for value, name in (masters or {}).items():
+            self.masters[value] = self.masters[str(value)] = str(name)
+
         # Default AHB signal mapping (per AHB specification)
         # Maps standard AHB signals to themselves by default
         default_mapping = {
@@ -28,7 +83,14 @@ class AHBProtocol(BaseProtocol):
             "hwdata": "hwdata",
             "hrdata": "hrdata",
             "hresp": "hresp",  # Response signal (OKAY, ERROR, RETRY, SPLIT)
-            "hready": "hready"  # Ready signal (indicates data phase completion)
+            "hready": "hready",  # Ready signal (indicates data phase completion)
+            # Only recorded when mapped explicitly: a bare name would pick up
+            # a signal of that name anywhere in the hierarchy (e.g. the HSEL
+            # of a slave), which changes which transfers are taken
+            "hburst": None,  # Burst type (SINGLE, INCR, WRAP4, INCR4, ...)
+            "hsize": None,  # Beat size (bytes = 2 ** HSIZE)
+            "hsel": None,  # Slave select (slave ports of an interconnect)
+            "hmaster": None  # Master owning the address phase (multi-master buses)
         }
         
         # Merge with provided mapping
@@ -36,6 +98,15 @@ class AHBProtocol(BaseProtocol):
             default_mapping.update(signal_mapping)
             
         super().__init__(default_mapping)
+        if burst_mode == "grouped" and "hburst" not in self.signal_mapping:
+            logger.warning("HBURST is not mapped; bursts are grouped as INCR bursts of undefined length")
+
+        # Signal accessors of the address and data phases, compiled for the sample layout
+        slots = self.layout.slots
+        self._read_address_phase = itemgetter(self.layout.timestamp, slots["haddr"], slots["hwrite"],
+                                              slots["hmaster"])
+        self._read_data_phase = itemgetter(slots["hready"], slots["hresp"], slots["hwdata"], slots["hrdata"])
+        self._read_burst_control = itemgetter(slots["htrans"], slots["hburst"], slots["hsize"], slots["haddr"])
 
     @property
     def protocol_name(self) -> str:
@@ -51,8 +122,18 @@ class AHBProtocol(BaseProtocol):
     @property
     def optional_signals(self) -> List[str]:
         """Return the list of optional signals for enhanced AHB protocol support."""
-        # Optional signals for error detection and wait state handling
-        return ["hresp", "hready"]
+        # Optional signals for error detection, wait state handling, bursts and interconnect ports
+        return ["hresp", "hready", "hburst", "hsize", "hsel", "hmaster"]
+
+    @property
+    def extractors(self) -> Tuple[str, ...]:
+        """Return the transaction extractors that support this protocol."""
+        return EXTRACTORS
+
+    @property
+    def clock_signal(self) -> str:
+        """Return the standard name of the clock transactions are sampled on."""
+        return "hclk"
 
     def get_hex_signals(self) -> List[str]:
         """Get list of signals that should be converted to hexadecimal format."""
@@ -75,10 +156,12 @@ class AHBProtocol(BaseProtocol):
             
         # Check for valid transfer type (NONSEQ or SEQ)
         htrans = self.get_signal_value(data_item, "htrans")
-        if htrans not in [2, 3]:  # NONSEQ (10) or SEQ (11)
+        if htrans not in ACTIVE_HTRANS:
             return False
-            
-        return True
+        
+        # On a slave port, only transfers with HSEL high address the slave
+        hsel = self.get_signal_value(data_item, "hsel")
+        return hsel is None or hsel == '1'
 
     def extract_transaction(self, data_item: Dict[str, Any], 
                           next_data_item: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
@@ -94,32 +177,43 @@ class AHBProtocol(BaseProtocol):
         """
         if not self.is_valid_transaction(data_item):
             return None
+
+        layout = self.layout
+        return self._row_transaction(layout.from_sample(data_item),
+                                     layout.from_sample(next_data_item) if next_data_item else None)
+
+    def _row_transaction(self, address_phase: SampleRow, data_phase: Optional[SampleRow]) -> Dict[str, Any]:
+        """
+        Build the transaction of a transfer from its address and data phase rows.
+        
+        Args:
+            address_phase: Row of the address phase (a valid NONSEQ or SEQ transfer)
+            data_phase: Row at which the data phase completes, or its last
+                wait state (None if unknown)
             
-        # Extract transaction details
+        Returns:
+            Transaction dictionary
+        """
+        timestamp, haddr, hwrite, hmaster = self._read_address_phase(address_phase)
+        write = hwrite == '1'
         transaction = {
-            "Time": data_item.get("timestamp"),
-            "Address": self.get_signal_value(data_item, "haddr"),
-            "Operation": self.get_transaction_type(data_item),
+            "Time": timestamp,
+            "Address": hex_value(haddr),
+            "Operation": "Write" if write else "Read",
         }
+        if hmaster is not None:
+            transaction["Master"] = self.masters.get(hmaster, hmaster)
         
-        # Get data value from next cycle (when HREADY is high)
+        # Get data value from the data phase (when HREADY is high)
         # HRESP is valid when HREADY is high
-        if next_data_item:
-            hready = self.get_signal_value(next_data_item, "hready")
-            hresp = self.get_signal_value(next_data_item, "hresp")
-            
-            # Get response status
-            response_status = self._get_response_status(hresp)
-            transaction["Response"] = response_status
+        if data_phase is not None:
+            hready, hresp, hwdata, hrdata = self._read_data_phase(data_phase)
+            transaction["Response"] = HRESP_STATUS.get(hresp) or self._get_response_status(hresp)
             
             # Only extract data if HREADY is high (transfer completed)
-            # HRESP is only valid when HREADY is high
             # If HREADY is not present, extract data anyway (backward compatibility)
             if hready is None or hready == '1':
-                if transaction["Operation"] == "Write":
-                    transaction["Value"] = self.get_signal_value(next_data_item, "hwdata")
-                else:
-                    transaction["Value"] = self.get_signal_value(next_data_item, "hrdata")
+                transaction["Value"] = hex_value(hwdata if write else hrdata)
             else:
                 # Wait state - data not yet available
                 transaction["Value"] = None
@@ -203,123 +297,255 @@ class AHBProtocol(BaseProtocol):
         self.logger.info(f"Filtering AHB transactions from {len(data_items)} data items")
         
         # Filter for clock high samples only using mapped signal name
-        clock_high_items = []
         clock_signal = self.signal_mapping.get("hclk", "hclk")  # Get custom clock signal name
-        for data_item in data_items:
-            if data_item.get(clock_signal) == '1':
-                clock_high_items.append(data_item)
+        from_data_item = self.layout.from_data_item
+        return self.filter_clock_rows(from_data_item(data_item) for data_item in data_items
+                                      if data_item.get(clock_signal) == '1')
 
-        # Extract transactions using AHB-specific logic
-        # Handle wait states by looking ahead until HREADY is high
-        transactions = []
-        i = 0
-        while i < len(clock_high_items):
-            data_item = clock_high_items[i]
-            mapped_data_item = self._map_data_item_to_standard_signals(data_item)
+    def _iter_extracted_transactions(self, clock_high_items: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract AHB transactions, one per beat or one per burst.
+        
+        Args:
+            clock_high_items: Sample rows at which HCLK is high, in the protocol's layout
             
-            # Check if this is a valid AHB transaction (address phase)
-            if self.is_valid_transaction(mapped_data_item):
-                # Look ahead to find data phase (when HREADY is high)
-                # HRESP is only valid when HREADY is high
-                data_phase_item = None
-                data_phase_idx = i + 1
-                
-                # Check if HREADY signal exists in the VCD
-                hready_signal = self.signal_mapping.get("hready", "hready")
-                has_hready = any(hready_signal in item and item.get(hready_signal) is not None 
-                               for item in clock_high_items[:min(5, len(clock_high_items))])
-                
-                if has_hready and i + 1 < len(clock_high_items):
-                    # HREADY exists - search for data phase (when HREADY is high)
-                    # Limit search to reasonable number of cycles (max 10 wait states)
-                    j = i + 1
-                    max_search = min(i + 11, len(clock_high_items))
-                    while j < max_search:
-                        next_item = clock_high_items[j]
-                        mapped_next_item = self._map_data_item_to_standard_signals(next_item)
-                        hready = self.get_signal_value(mapped_next_item, "hready")
-                        
-                        # If HREADY is high, this is the data phase
-                        if hready == '1':
-                            data_phase_item = mapped_next_item
-                            data_phase_idx = j
-                            break
-                        j += 1
-                    
-                    # If no data phase found after reasonable search, use next item anyway
-                    # (backward compatibility - might be missing HREADY transitions)
-                    if data_phase_item is None and i + 1 < len(clock_high_items):
-                        data_phase_item = self._map_data_item_to_standard_signals(clock_high_items[i + 1])
-                        data_phase_idx = i + 1
-                else:
-                    # HREADY not present - backward compatibility: use next cycle
-                    if i + 1 < len(clock_high_items):
-                        data_phase_item = self._map_data_item_to_standard_signals(clock_high_items[i + 1])
-                        data_phase_idx = i + 1
-                
-                # Extract transaction details
-                transaction = self.extract_transaction(mapped_data_item, data_phase_item)
-                if transaction:
-                    transactions.append(transaction)
-                    # Skip past wait states - next transaction starts after this one completes
-                    i = data_phase_idx + 1
-                else:
-                    i += 1
-            else:
-                i += 1
+        Returns:
+            Iterator of AHB transactions (or burst records) in sample order, including duplicates
+        """
+        return self._beat_transactions(self._iter_beats(clock_high_items))
+
+    def _beat_transactions(self, beats: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Turn beats into the transactions of the burst mode.
+        
+        Args:
+            beats: (address phase row, transaction) pairs of the beats in transfer order
+            
+        Returns:
+            Iterator of beat transactions (flat) or burst records (grouped)
+        """
+        if self.burst_mode == "grouped":
+            return self._group_bursts(beats)
+        return map(itemgetter(1), beats)
 
-        # Remove duplicate transactions
-        unique_transactions = self._remove_duplicate_transactions(transactions)
+    def _iter_beats(self, clock_high_items: Iterable[SampleRow]) -> Iterator[Any]:
+        """
+        Extract AHB transfers with an AHB-Lite pipeline state machine.
         
-        self.logger.info(f"Found {len(unique_transactions)} unique AHB transactions")
-        return unique_transactions
+        Every sample is looked at exactly once. The address phase of a
+        transfer (NONSEQ or SEQ) is taken at a sample with HREADY high; its
+        data phase completes at the next sample with HREADY high, which can
+        take the address phase of the following transfer at the same time.
+        Any number of wait states (samples with HREADY low) may lie in
+        between. Without an HREADY signal every sample is ready. On a slave
+        port (HSEL recorded), only transfers with HSEL high are taken.
+        
+        Args:
+            clock_high_items: Sample rows at which HCLK is high, in the protocol's layout
+            
+        Yields:
+            (address phase row, transaction) pairs in sample order, including duplicates
+        """
+        slots = self.layout.slots
+        hclk, htrans, hready, hsel = slots["hclk"], slots["htrans"], slots["hready"], slots["hsel"]
+        row_transaction = self._row_transaction
+
+        # Address phase row of the transfer in its data phase, and the
+        # last wait state of that data phase
+        address_phase = None
+        wait_state = None
 
-    def _map_data_item_to_standard_signals(self, data_item: Dict[str, Any]) -> Dict[str, Any]:
+        for row in clock_high_items:
+            ready = row[hready]
+            if ready is not None and ready != '1':
+                # Wait state: the data phase and the next address phase are extended
+                if address_phase is not None:
+                    wait_state = row
+                continue
+
+            if address_phase is not None:
+                yield address_phase, row_transaction(address_phase, row)
+                wait_state = None
+            selected = row[hsel]
+            address_phase = row if (row[htrans] in ACTIVE_HTRANS and row[hclk] == '1'
+                                    and (selected is None or selected == '1')) else None
+
+        if address_phase is not None:
+            # The waveform ends during the data phase of the last transfer
+            yield address_phase, row_transaction(address_phase, wait_state)
+
+    def _extract_columns(self, columns: Sequence[Any]) -> Iterator[Dict[str, Any]]:
         """
-        Map data item from custom signal names to standard signal names.
+        Extract AHB transactions from columnar samples, one per beat or one per burst.
         
         Args:
-            data_item: Data item with custom signal names
+            columns: One NumPy array per signal slot, then the timestamps
             
         Returns:
-            Data item with standard signal names
+            Iterator of AHB transactions (or burst records) in sample order, including duplicates
+        """
+        return self._beat_transactions(self._extract_beat_columns(columns))
+
+    def _extract_beat_columns(self, columns: Sequence[Any]) -> Iterator[Any]:
         """
-        mapped_item = {}
-        for standard_signal, custom_signal in self.signal_mapping.items():
-            mapped_item[standard_signal] = data_item.get(custom_signal)
+        Extract AHB transfers from columnar samples with NumPy masks.
         
-        # Preserve timestamp and other metadata
-        if 'timestamp' in data_item:
-            mapped_item['timestamp'] = data_item['timestamp']
+        Address phases are the ready samples with HCLK high, HTRANS NONSEQ
+        or SEQ and HSEL high (or not recorded); each completes at the next ready sample. A transfer
+        whose data phase is still waiting at the end of the samples is
+        reported with its last wait state, as by the state machine.
+        
+        Args:
+            columns: One NumPy array per signal slot, then the timestamps
             
-        return mapped_item
+        Yields:
+            (address phase row, transaction) pairs in sample order, including duplicates
+        """
+        slots = self.layout.slots
+        count = len(columns[self.layout.timestamp])
+        ready = np.flatnonzero(is_ready(columns[slots["hready"]]))
+        htrans = columns[slots["htrans"]]
+        active = ((matches(htrans, 2) | matches(htrans, 3)) & matches(columns[slots["hclk"]], '1')
+                  & is_ready(columns[slots["hsel"]]))
+        address = np.flatnonzero(active[ready])
+
+        # The data phase of the address phase at ready sample k is ready sample k + 1
+        completed = address[address + 1 < len(ready)]
+        address_rows = gather_rows(columns, ready[completed])
+        data_rows = gather_rows(columns, ready[completed + 1])
+        row_transaction = self._row_transaction
+        for address_phase, data_phase in zip(address_rows, data_rows):
+            yield address_phase, row_transaction(address_phase, data_phase)
+
+        if len(address) and address[-1] == len(ready) - 1:
+            # The samples end during the data phase of the last transfer
+            last = ready[-1]
+            address_phase, = gather_rows(columns, [last])
+            wait_state = gather_rows(columns, [count - 1])[0] if last < count - 1 else None
+            yield address_phase, row_transaction(address_phase, wait_state)
 
-    def _remove_duplicate_transactions(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _extract_kernel_columns(self, columns: Sequence[Any]) -> Iterator[Dict[str, Any]]:
         """
-        Remove duplicate AHB transactions based on address, operation, value, and response.
+        Extract AHB transactions from columnar samples with the compiled kernel.
         
         Args:
-            transactions: List of transactions
+            columns: One NumPy array per signal slot, then the timestamps
             
         Returns:
-            List of unique transactions
+            Iterator of AHB transactions (or burst records) in sample order, including duplicates
         """
-        if not transactions:
-            return []
-            
-        unique_transactions = [transactions[0]]  # Start with the first transaction
+        return self._beat_transactions(self._extract_beat_kernels(columns))
+
+    def _extract_beat_kernels(self, columns: Sequence[Any]) -> Iterator[Any]:
+        """
+        Extract AHB transfers from columnar samples with the compiled pipeline state machine.
         
-        for i in range(1, len(transactions)):
-            current = transactions[i]
-            previous = transactions[i - 1]
+        Args:
+            columns: One NumPy array per signal slot, then the timestamps
             
-            # Compare transactions excluding timestamp and WaitState (temporary state)
-            # Include Response status - transactions with different responses are different
-            exclude_keys = {"Time", "WaitState"}
-            current_key = {k: v for k, v in current.items() if k not in exclude_keys}
-            previous_key = {k: v for k, v in previous.items() if k not in exclude_keys}
+        Yields:
+            (address phase row, transaction) pairs in sample order, including duplicates
+        """
+        slots = self.layout.slots
+        address_phases, data_phases = kernels.ahb_transfers(
+            encode_column(columns[slots["hclk"]], SCALAR_CODES),
+            encode_column(columns[slots["htrans"]], HTRANS_CODES),
+            encode_column(columns[slots["hready"]], SCALAR_CODES),
+            encode_column(columns[slots["hsel"]], SCALAR_CODES))
+
+        row_transaction = self._row_transaction
+        for address_phase, data_phase in zip(gather_rows(columns, address_phases),
+                                             gather_optional_rows(columns, data_phases)):
+            yield address_phase, row_transaction(address_phase, data_phase)
+
+    def _group_bursts(self, beats: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Group the beats of AHB bursts into burst records.
+        
+        A NONSEQ transfer starts a burst of the type given by HBURST (INCR
+        of undefined length when HBURST is not recorded). A SEQ transfer
+        continues it when its address is the next beat address and its
+        direction matches; the burst ends after its last beat, at the next
+        NONSEQ transfer or at the end of the waveform. A SEQ transfer that
+        does not continue a burst is logged and reported as a transaction of
+        its own, as are SINGLE transfers and bursts of a single beat.
+        
+        Args:
+            beats: (address phase row, transaction) pairs of the beats in transfer order
             
-            if current_key != previous_key:
-                unique_transactions.append(current)
+        Yields:
+            Transactions and burst records in transfer order
+        """
+        read_burst_control = self._read_burst_control
+        burst_record = self._burst_record
+
+        # Open burst: its type, beat size, start address, beat transactions
+        # and expected beat addresses (None for INCR of undefined length)
+        burst = None
+        size = start = 0
+        transactions = []
+        addresses = None
+
+        for address_phase, transaction in beats:
+            htrans, hburst, hsize, haddr = read_burst_control(address_phase)
+            if haddr.__class__ is not int:
+                haddr = address_value(haddr)
+            if transactions:
+                if htrans == 3 and transaction["Operation"] == transactions[0]["Operation"]:
+                    beat = len(transactions)
+                    expected = addresses[beat] if addresses is not None else start + beat * size
+                    if haddr == expected:
+                        transactions.append(transaction)
+                        if addresses is not None and beat + 1 == len(addresses):
+                            yield burst_record(burst, size, start, transactions)
+                            transactions = []
+                        continue
+                yield burst_record(burst, size, start, transactions)
+                transactions = []
+
+            if htrans != 2:
+                self.logger.warning(f"SEQ transfer at {transaction['Time']} to {transaction['Address']} "
+                                    f"does not continue a burst; reported as a single transfer")
+                yield transaction
+                continue
+
+            burst = HBURST_TYPES.get(hburst, "INCR")
+            if burst == "SINGLE" or haddr is None:
+                yield transaction
+                continue
+            size = 1 << hsize if hsize.__class__ is int else DEFAULT_BEAT_SIZE
+            start = haddr
+            addresses = burst_beat_addresses(start, burst, size) if burst in BURST_LENGTHS else None
+            transactions = [transaction]
+
+        if transactions:
+            # The waveform ends during a burst
+            yield burst_record(burst, size, start, transactions)
+
+    @staticmethod
+    def _burst_record(burst: str, size: int, start: int, transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the record of a burst from its beat transactions.
         
-        return unique_transactions
+        Args:
+            burst: Burst type (HBURST name)
+            size: Beat size in bytes
+            start: Address of the first beat
+            transactions: Beat transactions in transfer order
+            
+        Returns:
+            Burst record, or the transaction itself for a burst of a single beat
+        """
+        first = transactions[0]
+        if len(transactions) == 1:
+            return first
+        response = next((t["Response"] for t in transactions if t["Response"] != "OKAY"), "OKAY")
+        return {
+            "Time": first["Time"],
+            "Address": first["Address"],
+            "Operation": first["Operation"],
+            "Response": response,
+            "Burst": burst,
+            "Size": size,
+            "Beats": [{key: t[key] for key in BEAT_KEYS if key in t} for t in transactions],
+        }
@@ -6,8 +6,20 @@ It uses pclk (peripheral clock) instead of hclk.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
-from .base_protocol import BaseProtocol
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from . import kernels
+from .base_protocol import BaseProtocol, SampleRow, hex_value
+from .kernels import SCALAR_CODES, encode_column, gather_optional_rows
+from .vectorized import EXTRACTORS, gather_rows, is_ready, matches, np, previous
+
+# Phases of an APB transfer
+APB_IDLE = "IDLE"
+APB_SETUP = "SETUP"
+APB_ACCESS = "ACCESS"
+
+# APB PSLVERR encoding, for raw and string values
+PSLVERR_STATUS = {0: "OKAY", 1: "ERROR", "0": "OKAY", "1": "ERROR"}
 
 
 class APBProtocol(BaseProtocol):
@@ -41,6 +53,12 @@ class APBProtocol(BaseProtocol):
         super().__init__(default_mapping)
         self.logger = logging.getLogger(__name__)
 
+        # Signal accessors of the access phase and the completing sample, compiled for the sample layout
+        slots = self.layout.slots
+        self._read_access_phase = itemgetter(self.layout.timestamp, slots["paddr"], slots["pwrite"],
+                                             slots["pwdata"], slots["prdata"])
+        self._read_completion = itemgetter(slots["pready"], slots["pslverr"], slots["prdata"])
+
     @property
     def protocol_name(self) -> str:
         """Return the protocol name."""
@@ -58,6 +76,16 @@ class APBProtocol(BaseProtocol):
         # Optional signals for error detection and wait state handling
         return ["pslverr", "pready"]
 
+    @property
+    def extractors(self) -> Tuple[str, ...]:
+        """Return the transaction extractors that support this protocol."""
+        return EXTRACTORS
+
+    @property
+    def clock_signal(self) -> str:
+        """Return the standard name of the clock transactions are sampled on."""
+        return "pclk"
+
     def get_hex_signals(self) -> List[str]:
         """Get list of signals that should be converted to hexadecimal format."""
         return ["paddr", "pwdata", "prdata"]
@@ -93,44 +121,62 @@ class APBProtocol(BaseProtocol):
         
         Args:
             data_item: Current data item (access phase with PENABLE=1)
-            next_data_item: Next data item (for data phase when PREADY=1)
+            next_data_item: Data item at which the transfer completes (PREADY=1)
             
         Returns:
             Transaction dictionary or None if not a valid transaction
         """
         if not self.is_valid_transaction(data_item):
             return None
+
+        layout = self.layout
+        return self._row_transaction(layout.from_sample(data_item),
+                                     layout.from_sample(next_data_item) if next_data_item else None)
+
+    def _row_transaction(self, access_phase: SampleRow, completion: Optional[SampleRow],
+                         wait_states: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the transaction of a transfer from its access phase and completion rows.
+        
+        Args:
+            access_phase: First ACCESS row of the transfer (PSEL=1, PENABLE=1)
+            completion: Row at which the transfer completes, or its last
+                wait state (None if unknown)
+            wait_states: Number of ACCESS samples with PREADY low, recorded
+                as 'WaitStates' (None if not counted)
             
-        # Extract transaction details
+        Returns:
+            Transaction dictionary
+        """
+        timestamp, paddr, pwrite, pwdata, prdata = self._read_access_phase(access_phase)
+        write = pwrite == '1'
         transaction = {
-            "Time": data_item.get("timestamp"),
-            "Address": self.get_signal_value(data_item, "paddr"),
-            "Operation": self.get_transaction_type(data_item),
+            "Time": timestamp,
+            "Address": hex_value(paddr),
+            "Operation": "Write" if write else "Read",
         }
         
-        # Get response status and data value from data phase (when PREADY is high)
+        # Get response status and data value from the completing sample (when PREADY is high)
         # PSLVERR is valid when PREADY is high
-        if next_data_item:
-            pready = self.get_signal_value(next_data_item, "pready")
-            pslverr = self.get_signal_value(next_data_item, "pslverr")
-            
-            # Get response status
-            response_status = self._get_response_status(pslverr)
-            transaction["Response"] = response_status
+        if completion is not None:
+            pready, pslverr, completion_prdata = self._read_completion(completion)
+            transaction["Response"] = PSLVERR_STATUS.get(pslverr) or self._get_response_status(pslverr)
             
             # Only extract data if PREADY is high (transfer completed)
-            # PSLVERR is only valid when PREADY is high
             # If PREADY is not present, extract data anyway (backward compatibility)
             if pready is None or pready == '1':
-                transaction["Value"] = self._get_transaction_value(data_item, next_data_item)
+                # Write data is driven in the access phase, read data when the transfer completes
+                transaction["Value"] = hex_value(pwdata if write else completion_prdata)
             else:
                 # Wait state - data not yet available
                 transaction["Value"] = None
                 transaction["WaitState"] = True
         else:
-            transaction["Value"] = self._get_transaction_value(data_item, None)
+            transaction["Value"] = hex_value(pwdata if write else prdata)
             transaction["Response"] = "UNKNOWN"
         
+        if wait_states is not None:
+            transaction["WaitStates"] = wait_states
         return transaction
 
     def get_transaction_type(self, data_item: Dict[str, Any]) -> str:
@@ -172,124 +218,120 @@ class APBProtocol(BaseProtocol):
         self.logger.info(f"Filtering APB transactions from {len(data_items)} data items")
         
         # Filter for clock high samples only using mapped signal name
-        clock_high_items = []
         clock_signal = self.signal_mapping.get("pclk", "pclk")  # Get custom clock signal name
-        for data_item in data_items:
-            if data_item.get(clock_signal) == '1':
-                clock_high_items.append(data_item)
-
-        # Extract transactions using APB-specific logic
-        transactions = []
-        i = 0
-        while i < len(clock_high_items):
-            data_item = clock_high_items[i]
-            mapped_data_item = self._map_data_item_to_standard_signals(data_item)
+        from_data_item = self.layout.from_data_item
+        return self.filter_clock_rows(from_data_item(data_item) for data_item in data_items
+                                      if data_item.get(clock_signal) == '1')
+
+    def _iter_extracted_transactions(self, clock_high_items: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract APB transactions with an IDLE -> SETUP -> ACCESS state machine.
+        
+        Every sample is looked at exactly once and only the current transfer
+        is kept, so stalls of any length take constant memory. A transfer
+        enters ACCESS at the first sample with PSEL and PENABLE high and
+        completes at the first ACCESS sample with PREADY high (every ACCESS
+        sample without a PREADY signal), where PRDATA and PSLVERR are read.
+        ACCESS samples with PREADY low are wait states; their number is
+        reported as 'WaitStates'. A transfer that leaves ACCESS, or is still
+        waiting when the waveform ends, is reported without a value.
+        
+        Args:
+            clock_high_items: Sample rows at which PCLK is high, in the protocol's layout
             
-            # Check if this is a valid APB transaction (access phase: PSEL=1, PENABLE=1)
-            if self.is_valid_transaction(mapped_data_item):
-                # Look ahead to find data phase (when PREADY is high)
-                # PSLVERR is only valid when PREADY is high
-                data_phase_item = None
-                data_phase_idx = i + 1
-                
-                # Check if PREADY signal exists in the VCD
-                pready_signal = self.signal_mapping.get("pready", "pready")
-                has_pready = any(pready_signal in item and item.get(pready_signal) is not None 
-                               for item in clock_high_items[:min(5, len(clock_high_items))])
-                
-                if has_pready and i + 1 < len(clock_high_items):
-                    # PREADY exists - search for data phase (when PREADY is high)
-                    # Limit search to reasonable number of cycles (max 10 wait states)
-                    j = i + 1
-                    max_search = min(i + 11, len(clock_high_items))
-                    while j < max_search:
-                        next_item = clock_high_items[j]
-                        mapped_next_item = self._map_data_item_to_standard_signals(next_item)
-                        pready = self.get_signal_value(mapped_next_item, "pready")
-                        
-                        # If PREADY is high, this is the data phase
-                        if pready == '1':
-                            data_phase_item = mapped_next_item
-                            data_phase_idx = j
-                            break
-                        j += 1
-                    
-                    # If no data phase found after reasonable search, use next item anyway
-                    # (backward compatibility - might be missing PREADY transitions)
-                    if data_phase_item is None and i + 1 < len(clock_high_items):
-                        data_phase_item = self._map_data_item_to_standard_signals(clock_high_items[i + 1])
-                        data_phase_idx = i + 1
-                else:
-                    # PREADY not present - backward compatibility: use next cycle
-                    if i + 1 < len(clock_high_items):
-                        data_phase_item = self._map_data_item_to_standard_signals(clock_high_items[i + 1])
-                        data_phase_idx = i + 1
-                
-                # Extract transaction details
-                transaction = self.extract_transaction(mapped_data_item, data_phase_item)
-                if transaction:
-                    transactions.append(transaction)
-                    # Skip past wait states - next transaction starts after this one completes
-                    i = data_phase_idx + 1
-                else:
-                    i += 1
+        Yields:
+            APB transactions in sample order, including duplicates
+        """
+        slots = self.layout.slots
+        pclk, psel, penable, pready = slots["pclk"], slots["psel"], slots["penable"], slots["pready"]
+        row_transaction = self._row_transaction
+
+        access_phase = None     # First ACCESS row of the transfer in progress
+        wait_state = None       # Last wait state of that transfer
+        wait_states = 0
+
+        for row in clock_high_items:
+            if row[psel] != '1' or row[pclk] != '1':
+                phase = APB_IDLE
+            elif row[penable] != '1':
+                phase = APB_SETUP
             else:
-                i += 1
+                phase = APB_ACCESS
 
-        # Remove duplicate transactions
-        unique_transactions = self._remove_duplicate_transactions(transactions)
-        
-        self.logger.info(f"Found {len(unique_transactions)} unique APB transactions")
-        return unique_transactions
+            if phase != APB_ACCESS:
+                if access_phase is not None:
+                    # The transfer left ACCESS without PREADY
+                    yield row_transaction(access_phase, wait_state, wait_states)
+                    access_phase = None
+                continue
+
+            if access_phase is None:
+                access_phase, wait_state, wait_states = row, None, 0
+            ready = row[pready]
+            if ready is not None and ready != '1':
+                wait_state = row
+                wait_states += 1
+                continue
 
-    def _map_data_item_to_standard_signals(self, data_item: Dict[str, Any]) -> Dict[str, Any]:
+            yield row_transaction(access_phase, row, wait_states)
+            access_phase = None
+
+        if access_phase is not None:
+            # The waveform ends while the transfer is waiting
+            yield row_transaction(access_phase, wait_state, wait_states)
+
+    def _extract_columns(self, columns: Sequence[Any]) -> Iterator[Dict[str, Any]]:
         """
-        Map data item from custom signal names to standard signal names.
+        Extract APB transactions from columnar samples with NumPy masks.
+        
+        ACCESS samples have PCLK, PSEL and PENABLE high. A transfer starts at
+        the first sample of a run of ACCESS samples or after a completed
+        transfer, and ends at the next ACCESS sample with PREADY high or at
+        the last sample of the run (a transfer left, or still waiting at the
+        end of the samples). Starts and ends alternate, so they pair up in order.
         
         Args:
-            data_item: Data item with custom signal names
+            columns: One NumPy array per signal slot, then the timestamps
             
-        Returns:
-            Data item with standard signal names
+        Yields:
+            APB transactions in sample order, including duplicates
         """
-        mapped_item = {}
-        for standard_signal, custom_signal in self.signal_mapping.items():
-            mapped_item[standard_signal] = data_item.get(custom_signal)
-        
-        # Preserve timestamp and other metadata
-        if 'timestamp' in data_item:
-            mapped_item['timestamp'] = data_item['timestamp']
-            
-        return mapped_item
+        slots = self.layout.slots
+        access = (matches(columns[slots["pclk"]], '1') & matches(columns[slots["psel"]], '1')
+                  & matches(columns[slots["penable"]], '1'))
+        done = access & is_ready(columns[slots["pready"]])
+        last_access = access.copy()
+        last_access[:-1] &= ~access[1:]
+
+        starts = np.flatnonzero(access & (~previous(access) | previous(done)))
+        ends = np.flatnonzero(done | (last_access & ~done))
+        # Samples with PREADY low from the start to the end of each transfer
+        wait_states = (ends - starts + ~done[ends]).tolist()
 
-    def _remove_duplicate_transactions(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        row_transaction = self._row_transaction
+        for access_phase, completion, waited in zip(gather_rows(columns, starts),
+                                                    gather_rows(columns, ends), wait_states):
+            yield row_transaction(access_phase, completion, waited)
+
+    def _extract_kernel_columns(self, columns: Sequence[Any]) -> Iterator[Dict[str, Any]]:
         """
-        Remove duplicate APB transactions based on address, operation, and value.
+        Extract APB transactions from columnar samples with the compiled kernel.
         
         Args:
-            transactions: List of transactions
+            columns: One NumPy array per signal slot, then the timestamps
             
-        Returns:
-            List of unique transactions
+        Yields:
+            APB transactions in sample order, including duplicates
         """
-        if not transactions:
-            return []
-            
-        unique_transactions = [transactions[0]]  # Start with the first transaction
-        
-        for i in range(1, len(transactions)):
-            current = transactions[i]
-            previous = transactions[i - 1]
-            
-            # Compare transactions excluding timestamp and WaitState
-            # Include Response in comparison to distinguish error vs okay responses
-            current_key = {k: v for k, v in current.items() if k not in ["Time", "WaitState"]}
-            previous_key = {k: v for k, v in previous.items() if k not in ["Time", "WaitState"]}
-            
-            if current_key != previous_key:
-                unique_transactions.append(current)
-        
-        return unique_transactions
+        slots = self.layout.slots
+        access_phases, completions, wait_states = kernels.apb_transfers(
+            *(encode_column(columns[slots[name]], SCALAR_CODES) for name in ("pclk", "psel", "penable", "pready")))
+
+        row_transaction = self._row_transaction
+        for access_phase, completion, waited in zip(gather_rows(columns, access_phases),
+                                                    gather_optional_rows(columns, completions),
+                                                    wait_states.tolist()):
+            yield row_transaction(access_phase, completion, waited)
 
     def _get_response_status(self, pslverr: Any) -> str:
         """
@@ -319,26 +361,3 @@ class APBProtocol(BaseProtocol):
             return "ERROR"
         else:
             return "UNKNOWN"
-    
-    def _get_transaction_value(self, data_item: Dict[str, Any], next_data_item: Optional[Dict[str, Any]]) -> Any:
-        """
-        Get the transaction value (write data or read data).
-        
-        Args:
-            data_item: Current data item (access phase)
-            next_data_item: Next data item for data phase (when PREADY=1)
-            
-        Returns:
-            Transaction value
-        """
-        pwrite = self.get_signal_value(data_item, "pwrite")
-        if pwrite == '1':
-            # Write transaction - get write data from access phase (current cycle)
-            return self.get_signal_value(data_item, "pwdata")
-        else:
-            # Read transaction - get read data from data phase (when PREADY=1)
-            if next_data_item:
-                return self.get_signal_value(next_data_item, "prdata")
-            else:
-                # Fallback: try to get from current cycle if next is not available
-                return self.get_signal_value(data_item, "prdata")
@@ -0,0 +1,367 @@
+"""
+AXI4 and AXI4-Lite protocol implementation.
+
+AXI has five independent channels: write address (AW), write data (W),
+write response (B), read address (AR) and read data (R). A transfer on a
+channel happens at a rising clock edge with both VALID and READY high.
+AXI4-Lite is AXI4 without IDs, burst signals and LAST: every transfer is
+a single beat of ID 0.
+"""
+
+import logging
+from collections import defaultdict, deque
+from operator import itemgetter
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from .base_protocol import DEFAULT_BEAT_SIZE, BaseProtocol, SampleRow, hex_value
+
+# AXI BRESP/RRESP encoding, for raw and string values
+AXI_RESPONSES = {0: "OKAY", 1: "EXOKAY", 2: "SLVERR", 3: "DECERR",
+                 "0": "OKAY", "1": "EXOKAY", "2": "SLVERR", "3": "DECERR"}
+
+# AXI AWBURST/ARBURST encoding
+AXI_BURST_TYPES = {0: "FIXED", 1: "INCR", 2: "WRAP"}
+
+# Address handshake of a transfer: time, ID, address, length, size and burst type
+AddressPhase = Tuple[Any, Any, Any, Any, Any, Any]
+
+
+def axi_response(value: Any) -> str:
+    """
+    Get the response of a completed BRESP or RRESP handshake.
+    
+    Args:
+        value: BRESP or RRESP value (None if the signal is not recorded)
+    
+    Returns:
+        Response name; 'OKAY' when the handshake happened without a response signal
+    """
+    return "OKAY" if value is None else AXI_RESPONSES.get(value, "UNKNOWN")
+
+
+class AXIProtocol(BaseProtocol):
+    """AXI4 / AXI4-Lite (Advanced eXtensible Interface) protocol implementation."""
+
+    def __init__(self, signal_mapping: Optional[Dict[str, str]] = None):
+        """
+        Initialize AXI protocol parser.
+        
+        Args:
+            signal_mapping: Optional mapping of signal names to internal names
+        """
+        # Default AXI signal mapping (per AXI specification)
+        # Maps standard AXI signals to themselves by default
+        default_mapping = {
+            "aclk": "aclk",        # Global clock
+            # Write address channel
+            "awvalid": "awvalid",
+            "awready": "awready",
+            "awaddr": "awaddr",
+            "awid": "awid",        # Transaction ID (AXI4 only)
+            "awlen": "awlen",      # Beats - 1 (AXI4 only)
+            "awsize": "awsize",    # Beat size (bytes = 2 ** AWSIZE, AXI4 only)
+            "awburst": "awburst",  # FIXED, INCR or WRAP (AXI4 only)
+            # Write data channel
+            "wvalid": "wvalid",
+            "wready": "wready",
+            "wdata": "wdata",
+            "wlast": "wlast",      # Last beat of a burst (AXI4 only)
+            # Write response channel
+            "bvalid": "bvalid",
+            "bready": "bready",
+            "bid": "bid",
+            "bresp": "bresp",      # OKAY, EXOKAY, SLVERR, DECERR
+            # Read address channel
+            "arvalid": "arvalid",
+            "arready": "arready",
+            "araddr": "araddr",
+            "arid": "arid",
+            "arlen": "arlen",
+            "arsize": "arsize",
+            "arburst": "arburst",
+            # Read data channel
+            "rvalid": "rvalid",
+            "rready": "rready",
+            "rdata": "rdata",
+            "rid": "rid",
+            "rresp": "rresp",
+            "rlast": "rlast"
+        }
+
+        # Merge with provided mapping
+        if signal_mapping:
+            default_mapping.update(signal_mapping)
+
+        super().__init__(default_mapping)
+        self.logger = logging.getLogger(__name__)
+
+        # Signal accessors of the channel payloads, compiled for the sample layout
+        slots = self.layout.slots
+        timestamp = self.layout.timestamp
+        self._handshakes = tuple(
+            (slots[f"{channel}valid"], slots[f"{channel}ready"]) for channel in ("aw", "w", "b", "ar", "r")
+        )
+        self._read_write_address = itemgetter(timestamp, slots["awid"], slots["awaddr"], slots["awlen"],
+                                              slots["awsize"], slots["awburst"])
+        self._read_write_data = itemgetter(timestamp, slots["wdata"], slots["wlast"])
+        self._read_write_response = itemgetter(slots["bid"], slots["bresp"])
+        self._read_read_address = itemgetter(timestamp, slots["arid"], slots["araddr"], slots["arlen"],
+                                             slots["arsize"], slots["arburst"])
+        self._read_read_data = itemgetter(timestamp, slots["rid"], slots["rdata"], slots["rresp"], slots["rlast"])
+
+    @property
+    def protocol_name(self) -> str:
+        """Return the protocol name."""
+        return "AXI"
+
+    @property
+    def required_signals(self) -> List[str]:
+        """Get list of required signals for AXI protocol."""
+        # Handshakes and payloads of the five channels (AXI4-Lite)
+        return ["aclk", "awvalid", "awready", "awaddr", "wvalid", "wready", "wdata",
+                "bvalid", "bready", "arvalid", "arready", "araddr", "rvalid", "rready", "rdata"]
+
+    @property
+    def optional_signals(self) -> List[str]:
+        """Get list of optional signals for AXI4 bursts, IDs and responses."""
+        return ["awid", "awlen", "awsize", "awburst", "wlast", "bid", "bresp",
+                "arid", "arlen", "arsize", "arburst", "rid", "rresp", "rlast"]
+
+    @property
+    def clock_signal(self) -> str:
+        """Return the standard name of the clock transactions are sampled on."""
+        return "aclk"
+
+    def get_hex_signals(self) -> List[str]:
+        """Get list of signals that should be converted to hexadecimal format."""
+        return ["awaddr", "wdata", "araddr", "rdata"]
+
+    def is_valid_transaction(self, data_item: Dict[str, Any]) -> bool:
+        """
+        Check if a data item holds the address handshake of an AXI transaction.
+        
+        Args:
+            data_item: Data item to validate
+        
+        Returns:
+            True if a write or read address is transferred, False otherwise
+        """
+        if data_item.get("aclk") != '1':
+            return False
+        return ((data_item.get("awvalid") == '1' and data_item.get("awready") == '1')
+                or (data_item.get("arvalid") == '1' and data_item.get("arready") == '1'))
+
+    def extract_transaction(self, data_item: Dict[str, Any],
+                          next_data_item: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract the first AXI transaction completed in one or two data items.
+        
+        AXI transactions usually span more samples; use ``iter_transactions``
+        for a stream of samples.
+        
+        Args:
+            data_item: Current data item
+            next_data_item: Next data item
+        
+        Returns:
+            Transaction dictionary or None if no transaction completes
+        """
+        samples = [data_item] if next_data_item is None else [data_item, next_data_item]
+        return next(self._iter_extracted_transactions(map(self.layout.from_sample, samples)), None)
+
+    def get_transaction_type(self, data_item: Dict[str, Any]) -> str:
+        """
+        Get the AXI transaction type.
+        
+        Args:
+            data_item: Data item to analyze
+        
+        Returns:
+            'Write' for a write address handshake, 'Read' otherwise
+        """
+        if data_item.get("awvalid") == '1' and data_item.get("awready") == '1':
+            return "Write"
+        return "Read"
+
+    def filter_transactions(self, data_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filter and extract valid AXI transactions from parsed data.
+        
+        Args:
+            data_items: List of parsed data items
+        
+        Returns:
+            List of valid AXI transactions
+        """
+        self.logger.info(f"Filtering AXI transactions from {len(data_items)} data items")
+
+        # Filter for clock high samples only using mapped signal name
+        clock_signal = self.signal_mapping.get("aclk", "aclk")
+        from_data_item = self.layout.from_data_item
+        return self.filter_clock_rows(from_data_item(data_item) for data_item in data_items
+                                      if data_item.get(clock_signal) == '1')
+
+    def _iter_extracted_transactions(self, clock_high_items: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract AXI transactions by following the five channels independently.
+        
+        Write addresses and write data bursts arrive in the same order (data
+        may come first) and are paired up in order. Completed writes then
+        wait in a FIFO per AWID for their response, and reads in a FIFO per
+        ARID for their data, so responses to different IDs can come back in
+        any order while those of one ID stay in order. Every handshake is a
+        constant number of deque operations, however many transactions are
+        outstanding. Transactions are reported when they complete (at BVALID
+        or the last RVALID handshake); those still outstanding when the
+        waveform ends are reported last, with an 'UNKNOWN' response.
+        
+        Args:
+            clock_high_items: Sample rows at which ACLK is high, in the protocol's layout
+        
+        Yields:
+            AXI transactions in completion order, including duplicates
+        """
+        aclk, timestamp_slot = self.layout.slots["aclk"], self.layout.timestamp
+        (awvalid, awready), (wvalid, wready), (bvalid, bready), (arvalid, arready), (rvalid, rready) = \
+            self._handshakes
+        read_write_address, read_write_data = self._read_write_address, self._read_write_data
+        read_write_response = self._read_write_response
+        read_read_address, read_read_data = self._read_read_address, self._read_read_data
+        write_transaction, read_transaction = self._write_transaction, self._read_transaction
+
+        write_addresses: Deque[AddressPhase] = deque()  # Write addresses waiting for their data
+        write_bursts: Deque[List[Tuple[Any, Any]]] = deque()  # Write data bursts waiting for their address
+        write_beats: List[Tuple[Any, Any]] = []  # Beats of the write data burst in progress
+        writes: Dict[Any, Deque] = defaultdict(deque)  # Per AWID: writes waiting for their response
+        reads: Dict[Any, Deque] = defaultdict(deque)  # Per ARID: reads waiting for their data
+
+        for row in clock_high_items:
+            if row[aclk] != '1':
+                continue
+
+            if row[awvalid] == '1' and row[awready] == '1':
+                write_addresses.append(read_write_address(row))
+            if row[wvalid] == '1' and row[wready] == '1':
+                timestamp, wdata, wlast = read_write_data(row)
+                write_beats.append((timestamp, wdata))
+                # Without WLAST (AXI4-Lite) every beat is a complete burst
+                if wlast is None or wlast == '1':
+                    write_bursts.append(write_beats)
+                    write_beats = []
+            while write_addresses and write_bursts:
+                address_phase = write_addresses.popleft()
+                writes[address_phase[1]].append((address_phase, write_bursts.popleft()))
+
+            if row[bvalid] == '1' and row[bready] == '1':
+                bid, bresp = read_write_response(row)
+                pending = writes.get(bid)
+                if pending:
+                    yield write_transaction(*pending.popleft(), bresp)
+                else:
+                    self.logger.warning(f"Write response at {row[timestamp_slot]} for ID {bid} "
+                                        f"without an outstanding write")
+
+            if row[arvalid] == '1' and row[arready] == '1':
+                address_phase = read_read_address(row)
+                reads[address_phase[1]].append((address_phase, []))
+            if row[rvalid] == '1' and row[rready] == '1':
+                timestamp, rid, rdata, rresp, rlast = read_read_data(row)
+                pending = reads.get(rid)
+                if not pending:
+                    self.logger.warning(f"Read data at {timestamp} for ID {rid} without an outstanding read")
+                    continue
+                address_phase, beats = pending[0]
+                beats.append((timestamp, rdata, rresp))
+                # Without RLAST the read completes after ARLEN + 1 beats (one beat for AXI4-Lite)
+                if rlast == '1' or (rlast is None and len(beats) > (address_phase[3] or 0)):
+                    pending.popleft()
+                    yield read_transaction(address_phase, beats)
+
+        # The waveform ends while transactions are outstanding
+        outstanding = [write_transaction(address_phase, beats, None, complete=False)
+                       for pending in writes.values() for address_phase, beats in pending]
+        if write_beats:
+            # A write data burst without WLAST yet belongs to the first write address waiting for data
+            if write_addresses:
+                outstanding.append(write_transaction(write_addresses.popleft(), write_beats, None, complete=False))
+            else:
+                write_bursts.append(write_beats)
+        outstanding += [write_transaction(address_phase, [], None, complete=False)
+                        for address_phase in write_addresses]
+        for beats in write_bursts:
+            self.logger.warning(f"Write data at {beats[0][0]} without a write address")
+        outstanding += [read_transaction(address_phase, beats, complete=False)
+                        for pending in reads.values() for address_phase, beats in pending]
+        yield from sorted(outstanding, key=itemgetter("Time"))
+
+    def _write_transaction(self, address_phase: AddressPhase, beats: List[Tuple[Any, Any]],
+                           bresp: Any, complete: bool = True) -> Dict[str, Any]:
+        """
+        Build the transaction of a write from its address, data beats and response.
+        
+        Args:
+            address_phase: Write address handshake
+            beats: (time, WDATA) of the write data beats
+            bresp: BRESP value (None if BRESP is not recorded)
+            complete: False if the waveform ends before the write response
+        
+        Returns:
+            Transaction dictionary, or burst record for a write of several beats
+        """
+        transaction = self._address_transaction(address_phase, "Write", beats)
+        transaction["Response"] = axi_response(bresp) if complete else "UNKNOWN"
+        if len(beats) > 1:
+            transaction["Beats"] = [{"Time": timestamp, "Value": hex_value(wdata)} for timestamp, wdata in beats]
+        return transaction
+
+    def _read_transaction(self, address_phase: AddressPhase, beats: List[Tuple[Any, Any, Any]],
+                          complete: bool = True) -> Dict[str, Any]:
+        """
+        Build the transaction of a read from its address and data beats.
+        
+        Args:
+            address_phase: Read address handshake
+            beats: (time, RDATA, RRESP) of the read data beats
+            complete: False if the waveform ends before the last read data beat
+        
+        Returns:
+            Transaction dictionary, or burst record for a read of several beats
+        """
+        transaction = self._address_transaction(address_phase, "Read", beats)
+        responses = [axi_response(rresp) for _, _, rresp in beats]
+        if complete:
+            transaction["Response"] = next((response for response in responses if response != "OKAY"), "OKAY")
+        else:
+            transaction["Response"] = "UNKNOWN"
+        if len(beats) > 1:
+            transaction["Beats"] = [{"Time": timestamp, "Value": hex_value(rdata), "Response": response}
+                                    for (timestamp, rdata, _), response in zip(beats, responses)]
+        return transaction
+
+    def _address_transaction(self, address_phase: AddressPhase, operation: str,
+                             beats: List[Tuple[Any, ...]]) -> Dict[str, Any]:
+        """
+        Start the transaction of an address handshake.
+        
+        Args:
+            address_phase: Address handshake
+            operation: 'Write' or 'Read'
+            beats: Data beats, each starting with its time and value
+        
+        Returns:
+            Transaction with time, address, operation and ID, plus the value
+            of a single beat or the burst type and beat size of several beats
+        """
+        timestamp, axid, addr, length, size, burst = address_phase
+        transaction = {
+            "Time": timestamp,
+            "Address": hex_value(addr),
+            "Operation": operation,
+        }
+        if axid is not None:
+            transaction["ID"] = axid
+        if len(beats) > 1:
+            transaction["Burst"] = AXI_BURST_TYPES.get(burst, "INCR")
+            transaction["Size"] = 1 << size if size.__class__ is int else DEFAULT_BEAT_SIZE
+        else:
+            transaction["Value"] = hex_value(beats[0][1]) if beats else None
+        return transaction
@@ -1,23 +1,195 @@
 """Base protocol class for AMBA protocols."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Transaction keys ignored when comparing consecutive transactions for duplicates
+DUPLICATE_EXCLUDED_KEYS = frozenset({"Time", "WaitState", "WaitStates"})
+
+# A clock sample in positional form: one value per signal slot, then the timestamp
+SampleRow = Tuple[Any, ...]
+
+# Beat size in bytes of a burst when the transfer size is not recorded (32-bit bus)
+DEFAULT_BEAT_SIZE = 4
+
+
+def hex_value(value: Any) -> Any:
+    """
+    Format a raw vector value as a hex string.
+    
+    Args:
+        value: Signal value (integer, or an already formatted or unknown value)
+        
+    Returns:
+        Hex string for integers, the value unchanged otherwise
+    """
+    return hex(value) if value.__class__ is int else value
+
+
+def burst_beat_addresses(start: int, burst: str, size: int, count: Optional[int] = None) -> List[int]:
+    """
+    Generate the beat addresses of a burst.
+    
+    INCR bursts increment the address by the beat size and FIXED bursts
+    keep it. WRAP bursts wrap at the boundary of the total burst size
+    (beats x beat size), e.g. a WRAP4 burst of words starting at 0x38
+    accesses 0x38, 0x3C, 0x30, 0x34. A number at the end of the burst type
+    (AHB INCR4, WRAP8, ...) gives the length of the burst.
+    
+    Args:
+        start: Address of the first beat
+        burst: Burst type ("INCR", "WRAP", "FIXED", or an AHB type such as "INCR4")
+        size: Beat size in bytes
+        count: Number of beats (defaults to the length of a fixed-length burst)
+        
+    Returns:
+        Beat addresses in transfer order
+    """
+    kind = burst.rstrip("0123456789")
+    length = int(burst[len(kind):]) if kind != burst else count
+    if count is None:
+        if length is None:
+            raise ValueError(f"Burst type {burst} has no fixed length; give the number of beats")
+        count = length
+    if kind == "FIXED":
+        return [start] * count
+    if kind == "WRAP":
+        span = length * size
+        base = start - start % span
+        offset = start - base
+        return [base + (offset + beat * size) % span for beat in range(count)]
+    return [start + beat * size for beat in range(count)]
+
+
+def unique_transactions(transactions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Drop transactions equal to the one before them.
+    
+    A transaction equal to the one before it (ignoring its time and wait
+    states) is a repeated sample of the same transfer.
+    
+    Args:
+        transactions: Transactions in time order
+        
+    Yields:
+        Unique transactions in time order
+    """
+    previous_key = None
+    for transaction in transactions:
+        # Include Response status - transactions with different responses are different
+        key = transaction.copy()
+        for excluded in DUPLICATE_EXCLUDED_KEYS:
+            key.pop(excluded, None)
+        if key != previous_key:
+            yield transaction
+        previous_key = key
+
+
+class SampleLayout:
+    """Positional layout of the clock samples of a protocol.
+    
+    The signal mapping is compiled once into a fixed signal order. A sample
+    row is a tuple holding the value of every standard signal at its slot,
+    followed by the timestamp, so protocols read signals by index instead
+    of building and looking up a dict at every clock edge. Rows hold raw
+    values: vectors are integers until a transaction formats them. A
+    standard signal mapped to None keeps its slot, which always reads None.
+    """
+
+    def __init__(self, signal_mapping: Dict[str, Optional[str]]):
+        """
+        Compile a signal mapping.
+        
+        Args:
+            signal_mapping: Standard signal name -> mapped signal name (None
+                for an optional signal that is not recorded)
+        """
+        self.names = tuple(signal_mapping)
+        self.signals = tuple(signal_mapping.values())
+        self.slots = {name: slot for slot, name in enumerate(self.names)}
+        self.timestamp = len(self.names)
+        self._sample_keys = self.names + ('timestamp',)
+        self._data_item_keys = self.signals + ('timestamp',)
+
+    def reader(self, signals: Optional[Sequence[str]] = None) -> Callable[[Dict[str, Any]], SampleRow]:
+        """
+        Compile a getter reading the signal slots of a row from a signal state.
+        
+        Args:
+            signals: Names the signals are recorded under, in slot order
+                (default: the mapped signal names)
+            
+        Returns:
+            Function taking a state that holds every signal and returning
+            the values in slot order (without the timestamp)
+        """
+        signals = tuple(signals or self.signals)
+        if len(signals) == 1:
+            getter = itemgetter(signals[0])
+            return lambda state: (getter(state),)
+        return itemgetter(*signals)
+
+    def from_sample(self, sample: Dict[str, Any]) -> SampleRow:
+        """
+        Convert a sample keyed by standard signal names into a row.
+        
+        Args:
+            sample: Sample keyed by standard signal names plus 'timestamp'
+            
+        Returns:
+            Row with None for signals missing from the sample
+        """
+        return tuple(map(sample.get, self._sample_keys))
+
+    def from_data_item(self, data_item: Dict[str, Any]) -> SampleRow:
+        """
+        Convert a data item keyed by mapped signal names into a row.
+        
+        Args:
+            data_item: Data item keyed by mapped signal names plus 'timestamp'
+            
+        Returns:
+            Row with None for signals missing from the data item
+        """
+        return tuple(map(data_item.get, self._data_item_keys))
+
+    def to_sample(self, row: SampleRow, hex_signals: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Convert a row into a sample keyed by standard signal names.
+        
+        Args:
+            row: Sample row
+            hex_signals: Standard signal names whose integer values are formatted as hex strings
+            
+        Returns:
+            Sample keyed by standard signal names plus 'timestamp'
+        """
+        sample = dict(zip(self.names, row))
+        for name in hex_signals:
+            if name in sample:
+                sample[name] = hex_value(sample[name])
+        sample['timestamp'] = row[self.timestamp]
+        return sample
+
 
 class BaseProtocol(ABC):
     """Abstract base class for AMBA protocol implementations."""
 
-    def __init__(self, signal_mapping: Optional[Dict[str, str]] = None):
+    def __init__(self, signal_mapping: Optional[Dict[str, Optional[str]]] = None):
         """
         Initialize the protocol parser.
         
         Args:
-            signal_mapping: Optional mapping of signal names to internal names
+            signal_mapping: Optional mapping of signal names to internal names;
+                optional signals mapped to None are not recorded
         """
-        self.signal_mapping = signal_mapping or {}
+        signal_mapping = signal_mapping or {}
+        self.signal_mapping = {name: signal for name, signal in signal_mapping.items() if signal is not None}
+        self.layout = SampleLayout(signal_mapping)
         self.logger = logger
 
     @property
@@ -32,6 +204,11 @@ class BaseProtocol(ABC):
         """Return the list of required signals for this protocol."""
         pass
 
+    @property
+    def extractors(self) -> Tuple[str, ...]:
+        """Return the transaction extractors that support this protocol."""
+        return ("python",)
+
     @abstractmethod
     def is_valid_transaction(self, data_item: Dict[str, Any]) -> bool:
         """
@@ -86,6 +263,143 @@ class BaseProtocol(ABC):
         """
         pass
 
+    @property
+    def clock_signal(self) -> Optional[str]:
+        """
+        Return the standard name of the clock transactions are sampled on.
+        
+        The parser samples the waveform on this clock and streams the
+        samples to ``iter_transactions``. Protocols that return None get fully
+        materialized data items through ``filter_transactions`` instead.
+        """
+        return None
+
+    def filter_clock_samples(self, clock_high_items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract transactions from the samples at which the clock is high.
+        
+        Args:
+            clock_high_items: Samples keyed by standard signal names
+            
+        Returns:
+            List of unique transactions
+        """
+        return self.filter_clock_rows(map(self.layout.from_sample, clock_high_items))
+
+    def filter_clock_rows(self, rows: Iterable[SampleRow]) -> List[Dict[str, Any]]:
+        """
+        Extract transactions from the sample rows at which the clock is high.
+        
+        Args:
+            rows: Sample rows in the protocol's layout
+            
+        Returns:
+            List of unique transactions
+        """
+        transactions = list(self.iter_row_transactions(rows))
+        self.logger.info(f"Found {len(transactions)} unique {self.protocol_name} transactions")
+        return transactions
+
+    def iter_transactions(self, clock_high_items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream unique transactions from a stream of clock-high samples.
+        
+        A transaction equal to the one before it (ignoring its time and
+        wait states) is a repeated sample of the same transfer and dropped.
+        
+        Args:
+            clock_high_items: Samples keyed by standard signal names, in time order
+            
+        Returns:
+            Iterator over unique transactions in time order
+        """
+        return self.iter_row_transactions(map(self.layout.from_sample, clock_high_items))
+
+    def iter_row_transactions(self, rows: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream unique transactions from a stream of clock-high sample rows.
+        
+        Args:
+            rows: Sample rows in the protocol's layout, in time order
+            
+        Returns:
+            Iterator over unique transactions in time order
+        """
+        return unique_transactions(self._iter_extracted_transactions(rows))
+
+    def filter_clock_columns(self, columns: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Extract transactions from columnar clock samples with NumPy.
+        
+        Gives the same transactions as ``filter_clock_rows`` over the same
+        samples; the Python state machine is the reference implementation.
+        
+        Args:
+            columns: One NumPy array per signal slot of the protocol's layout,
+                then the timestamps, with the values at every sampled clock edge
+            
+        Returns:
+            List of unique transactions
+        """
+        transactions = list(unique_transactions(self._extract_columns(columns)))
+        self.logger.info(f"Found {len(transactions)} unique {self.protocol_name} transactions (vectorized)")
+        return transactions
+
+    def filter_clock_kernels(self, columns: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Extract transactions from columnar clock samples with compiled kernels.
+        
+        Gives the same transactions as ``filter_clock_rows`` over the same
+        samples; the kernels run the protocol's state machine over
+        integer-encoded control signals.
+        
+        Args:
+            columns: One NumPy array per signal slot of the protocol's layout,
+                then the timestamps, with the values at every sampled clock edge
+            
+        Returns:
+            List of unique transactions
+        """
+        transactions = list(unique_transactions(self._extract_kernel_columns(columns)))
+        self.logger.info(f"Found {len(transactions)} unique {self.protocol_name} transactions (compiled)")
+        return transactions
+
+    def _iter_extracted_transactions(self, rows: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract transactions from a stream of clock-high sample rows.
+        
+        Args:
+            rows: Sample rows in the protocol's layout, in time order
+            
+        Yields:
+            Transactions in time order, including repeated ones
+        """
+        raise NotImplementedError(f"{self.protocol_name} does not support clock sampling")
+
+    def _extract_columns(self, columns: Sequence[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract transactions from columnar clock samples with NumPy.
+        
+        Args:
+            columns: One NumPy array per signal slot, then the timestamps
+            
+        Yields:
+            Transactions in time order, including repeated ones
+        """
+        raise NotImplementedError(f"{self.protocol_name} does not support vectorized extraction")
+
+    def _extract_kernel_columns(self, columns: Sequence[Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract transactions from columnar clock samples with compiled kernels.
+        
+        Args:
+            columns: One NumPy array per signal slot, then the timestamps
+            
+        Yields:
+            Transactions in time order, including repeated ones
+        """
+        raise NotImplementedError(f"{self.protocol_name} has no compiled kernels")
+
     def get_hex_signals(self) -> List[str]:
         """
         Get list of signals that should be converted to hexadecimal format.
@@ -0,0 +1,473 @@
+"""
+Declarative protocol descriptions.
+
+A protocol description lists the signals of a bus and:
+- the condition under which the request of a transfer is sampled (its
+  handshake)
+- the condition at which the transfer completes
+- the phase each transaction field is sampled in
+- the encoding of the response
+
+``ProtocolDefinition`` compiles a description once into the Python source of
+a state machine specialized for it. Conditions become inline comparisons at
+fixed row positions, so the generated loop does the same per-sample work as
+the hand-written AHB/APB state machines. ``DeclarativeProtocol`` runs that
+state machine for one signal mapping.
+
+A description, e.g. in the ``protocol_definitions`` section of a signal
+mapping configuration::
+
+    simple_bus:
+      clock: clk
+      signals: [clk, req, ack, we, addr, wdata, rdata, err]
+      request: "req"
+      response: "ack"
+      write: "we"
+      address: addr
+      write_data: wdata
+      read_data: rdata
+      response_status:
+        signal: err
+        values: {0: OKAY, 1: ERROR}
+"""
+
+import ast
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from .base_protocol import BaseProtocol, SampleRow, hex_value
+
+logger = logging.getLogger(__name__)
+
+# Phases a field can be sampled in: at the request, or at the sample that completes the transfer
+PHASE_REQUEST = "request"
+PHASE_RESPONSE = "response"
+PHASES = (PHASE_REQUEST, PHASE_RESPONSE)
+
+# Keys a description may have
+DESCRIPTION_KEYS = frozenset({"clock", "signals", "optional", "request", "response", "pipelined", "write",
+                              "address", "write_data", "read_data", "response_status", "fields"})
+
+# Comparison operators allowed in conditions, as Python source
+CONDITION_OPERATORS = {ast.Eq: "in", ast.NotEq: "not in", ast.In: "in", ast.NotIn: "not in"}
+
+
+class FieldSource(NamedTuple):
+    """Signal a transaction field is read from, and the phase it is sampled in."""
+    signal: str
+    phase: str
+
+
+def _alternatives(value: Any) -> Tuple[Any, ...]:
+    """
+    Get the raw values a constant of a condition matches.
+    
+    Scalar signals are recorded as '0'/'1' and vectors as integers, so the
+    constants 0 and 1 match both forms.
+    
+    Args:
+        value: Constant of a condition
+    
+    Returns:
+        Values equal to the constant
+    """
+    if value.__class__ is int and value in (0, 1):
+        return (value, str(value))
+    if value in ('0', '1'):
+        return (value, int(value))
+    return (value,)
+
+
+class ProtocolDefinition:
+    """Protocol description compiled into a specialized state machine."""
+
+    def __init__(self, name: str, description: Dict[str, Any]):
+        """
+        Validate and compile a protocol description.
+        
+        Args:
+            name: Protocol name
+            description: Protocol description (see the module documentation)
+        """
+        if not isinstance(description, dict):
+            raise ValueError(f"Protocol {name}: the description must be a mapping")
+        unknown = set(description) - DESCRIPTION_KEYS
+        if unknown:
+            raise ValueError(f"Protocol {name}: unknown keys {sorted(unknown)}")
+        for key in ("clock", "signals", "request", "write", "address"):
+            if description.get(key) is None:
+                raise ValueError(f"Protocol {name}: '{key}' is required")
+
+        self.name = name
+        self.description = description
+        self.signals = tuple(str(signal) for signal in description["signals"])
+        self.slots = {signal: slot for slot, signal in enumerate(self.signals)}
+        self.optional = tuple(self._signal(signal) for signal in description.get("optional") or ())
+        self.clock = self._signal(description["clock"])
+        self.request = str(description["request"])
+        self.response = None if description.get("response") is None else str(description["response"])
+        self.pipelined = bool(description.get("pipelined", False))
+        if self.pipelined and self.response is None:
+            raise ValueError(f"Protocol {name}: a pipelined protocol needs a 'response' condition")
+        self.write = str(description["write"])
+        self.address = self._field("address", description["address"], PHASE_REQUEST)
+        self.write_data = self._field("write_data", description.get("write_data"), PHASE_REQUEST)
+        self.read_data = self._field("read_data", description.get("read_data"), PHASE_RESPONSE)
+
+        status = description.get("response_status")
+        self.response_status = None
+        self.status_values: Dict[Any, str] = {}
+        if status is not None:
+            if not isinstance(status, dict) or not isinstance(status.get("values"), dict):
+                raise ValueError(f"Protocol {name}: 'response_status' needs a signal and its values")
+            self.response_status = self._field("response_status", status, PHASE_RESPONSE)
+            for value, status_name in status["values"].items():
+                self.status_values[value] = str(status_name)
+                self.status_values[str(value)] = str(status_name)
+
+        self.fields = {str(key): self._field(str(key), source, PHASE_REQUEST)
+                       for key, source in (description.get("fields") or {}).items()}
+
+        self.source = self._generate_source()
+        logger.debug(f"Compiled protocol {name}:\n{self.source}")
+        namespace = {"hex_value": hex_value, "STATUS": self.status_values}
+        exec(compile(self.source, f"<protocol {name}>", "exec"), namespace)
+        self.extract = namespace["extract"]
+        self.is_request = namespace["is_request"]
+        self.is_write = namespace["is_write"]
+
+    def __reduce__(self):
+        """Pickle the description; the state machine is compiled again when unpickled."""
+        return ProtocolDefinition, (self.name, self.description)
+
+    @property
+    def hex_signals(self) -> List[str]:
+        """Signals whose values are formatted as hex strings (address and data)."""
+        sources = (self.address, self.write_data, self.read_data)
+        return list(dict.fromkeys(source.signal for source in sources if source is not None))
+
+    def _signal(self, signal: Any) -> str:
+        """
+        Check that a signal is one of the protocol's signals.
+        
+        Args:
+            signal: Signal name
+        
+        Returns:
+            Signal name
+        """
+        signal = str(signal)
+        if signal not in self.slots:
+            raise ValueError(f"Protocol {self.name}: {signal} is not one of its signals {list(self.signals)}")
+        return signal
+
+    def _field(self, key: str, source: Any, default_phase: str) -> Optional[FieldSource]:
+        """
+        Parse the source of a transaction field.
+        
+        Args:
+            key: Description key of the field
+            source: Signal name, or a mapping with 'signal' and 'phase' (None if not given)
+            default_phase: Phase the field is sampled in unless given
+        
+        Returns:
+            Field source, or None if no source is given
+        """
+        if source is None:
+            return None
+        if self.response is None:
+            # Without a response every transfer completes at its request
+            default_phase = PHASE_REQUEST
+        if isinstance(source, dict):
+            phase = str(source.get("phase", default_phase))
+            if phase not in PHASES:
+                raise ValueError(f"Protocol {self.name}: phase of {key} must be one of {PHASES}")
+            if phase == PHASE_RESPONSE and self.response is None:
+                raise ValueError(f"Protocol {self.name}: {key} is sampled at a response, "
+                                 f"but no 'response' condition is given")
+            return FieldSource(self._signal(source.get("signal")), phase)
+        return FieldSource(self._signal(source), default_phase)
+
+    def _condition(self, expression: str, row: str) -> str:
+        """
+        Compile a condition into a Python expression over a sample row.
+        
+        Conditions combine signal tests with ``and``, ``or`` and ``not``. A
+        test is a signal name (the signal is 1) or a comparison of a signal
+        with a constant or a tuple of constants (``==``, ``!=``, ``in``,
+        ``not in``). A signal that is not recorded is None, so it fails
+        ``valid`` but passes ``ready != 0``.
+        
+        Args:
+            expression: Condition of the description
+            row: Name of the row variable in the generated source
+        
+        Returns:
+            Python expression
+        """
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Protocol {self.name}: invalid condition {expression!r}: {e}") from None
+
+        def invalid() -> ValueError:
+            return ValueError(f"Protocol {self.name}: unsupported condition {expression!r}")
+
+        def constants(node: ast.AST) -> Tuple[Any, ...]:
+            if isinstance(node, (ast.Tuple, ast.List)):
+                return tuple(value for element in node.elts for value in constants(element))
+            if isinstance(node, ast.Constant) and node.value.__class__ in (int, str):
+                return _alternatives(node.value)
+            raise invalid()
+
+        def slot(node: ast.AST) -> str:
+            if not isinstance(node, ast.Name):
+                raise invalid()
+            return f"{row}[{self.slots[self._signal(node.id)]}]"
+
+        def emit(node: ast.AST) -> str:
+            if isinstance(node, ast.BoolOp):
+                operator = " and " if isinstance(node.op, ast.And) else " or "
+                return "(" + operator.join(emit(value) for value in node.values) + ")"
+            if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+                return f"(not {emit(node.operand)})"
+            if isinstance(node, ast.Name):
+                return f"({slot(node)} in {_alternatives(1)!r})"
+            if isinstance(node, ast.Compare) and len(node.ops) == 1:
+                operator = CONDITION_OPERATORS.get(type(node.ops[0]))
+                if operator is None:
+                    raise invalid()
+                return f"({slot(node.left)} {operator} {constants(node.comparators[0])!r})"
+            raise invalid()
+
+        return emit(tree.body)
+
+    def _read(self, source: Optional[FieldSource]) -> str:
+        """
+        Compile the read of a field in the generated transaction builder.
+        
+        Args:
+            source: Field source (None for a field the protocol does not have)
+        
+        Returns:
+            Python expression, None for response fields of unfinished transfers
+        """
+        if source is None:
+            return "None"
+        if source.phase == PHASE_REQUEST:
+            return f"request[{self.slots[source.signal]}]"
+        return f"(None if response is None else response[{self.slots[source.signal]}])"
+
+    def _generate_source(self) -> str:
+        """
+        Generate the source of the state machine.
+        
+        ``extract(rows)`` yields the transactions of a stream of sample rows,
+        ``is_request(row)`` and ``is_write(row)`` test single rows.
+        
+        Returns:
+            Python source
+        """
+        clock = self.slots[self.clock]
+        timestamp = len(self.signals)
+        request = self._condition(self.request, "row")
+        lines = [
+            "def is_request(row):",
+            f"    return row[{clock}] == '1' and {request}",
+            "",
+            "def is_write(row):",
+            f"    return {self._condition(self.write, 'row')}",
+            "",
+            "def transaction(request, response, waited):",
+            f"    write = {self._condition(self.write, 'request')}",
+            "    return {",
+            f"        'Time': request[{timestamp}],",
+            f"        'Address': hex_value({self._read(self.address)}),",
+            "        'Operation': 'Write' if write else 'Read',",
+            f"        'Value': hex_value({self._read(self.write_data)} if write else {self._read(self.read_data)}),",
+        ]
+        if self.response_status is not None:
+            lines.append(f"        'Response': STATUS.get({self._read(self.response_status)}, 'UNKNOWN'),")
+        else:
+            lines.append("        'Response': 'UNKNOWN' if response is None else 'OKAY',")
+        if self.response is not None:
+            lines.append("        'WaitStates': waited,")
+        lines += [f"        {key!r}: {self._read(source)}," for key, source in self.fields.items()]
+        lines += ["    }", "", "def extract(rows):"]
+
+        if self.response is None:
+            # Every request completes at once
+            lines += [
+                "    for row in rows:",
+                f"        if row[{clock}] == '1' and {request}:",
+                "            yield transaction(row, row, None)",
+            ]
+            return "\n".join(lines) + "\n"
+
+        response = self._condition(self.response, "row")
+        lines += [
+            "    pending = None",
+            "    waited = 0",
+            "    for row in rows:",
+            f"        if row[{clock}] != '1':",
+            "            continue",
+        ]
+        if self.pipelined:
+            # The completing sample can carry the request of the next transfer
+            lines += [
+                "        if pending is not None:",
+                f"            if {response}:",
+                "                yield transaction(pending, row, waited)",
+                "                pending = None",
+                "            else:",
+                "                waited += 1",
+                "                continue",
+                f"        if {request}:",
+                "            pending, waited = row, 0",
+            ]
+        else:
+            # The request is held until the response; a dropped request ends the transfer
+            lines += [
+                f"        if not {request}:",
+                "            if pending is not None:",
+                "                yield transaction(pending, None, waited)",
+                "                pending = None",
+                f"        elif {response}:",
+                "            if pending is None:",
+                "                yield transaction(row, row, 0)",
+                "            else:",
+                "                yield transaction(pending, row, waited)",
+                "                pending = None",
+                "        elif pending is None:",
+                "            pending, waited = row, 1",
+                "        else:",
+                "            waited += 1",
+            ]
+        lines += [
+            "    if pending is not None:",
+            "        yield transaction(pending, None, waited)",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class DeclarativeProtocol(BaseProtocol):
+    """Protocol described by a ``ProtocolDefinition``."""
+
+    def __init__(self, definition: ProtocolDefinition, signal_mapping: Optional[Dict[str, str]] = None):
+        """
+        Initialize a parser of a described protocol.
+        
+        Args:
+            definition: Compiled protocol description
+            signal_mapping: Optional mapping of signal names to internal names
+        """
+        # The described signals map to themselves by default; rows keep their order
+        default_mapping = {signal: signal for signal in definition.signals}
+        if signal_mapping:
+            unknown = set(signal_mapping) - set(default_mapping)
+            if unknown:
+                raise ValueError(f"Signals {sorted(unknown)} are not signals of protocol {definition.name}")
+            default_mapping.update(signal_mapping)
+
+        super().__init__(default_mapping)
+        self.definition = definition
+
+    @property
+    def protocol_name(self) -> str:
+        """Return the protocol name."""
+        return self.definition.name
+
+    @property
+    def required_signals(self) -> List[str]:
+        """Get list of required signals of the described protocol."""
+        return [signal for signal in self.definition.signals if signal not in self.definition.optional]
+
+    @property
+    def optional_signals(self) -> List[str]:
+        """Get list of signals the described protocol works without."""
+        return list(self.definition.optional)
+
+    @property
+    def clock_signal(self) -> str:
+        """Return the standard name of the clock transactions are sampled on."""
+        return self.definition.clock
+
+    def get_hex_signals(self) -> List[str]:
+        """Get list of signals that should be converted to hexadecimal format."""
+        return self.definition.hex_signals
+
+    def is_valid_transaction(self, data_item: Dict[str, Any]) -> bool:
+        """
+        Check if a data item holds the request of a transfer.
+        
+        Args:
+            data_item: Data item to validate
+        
+        Returns:
+            True if the clock is high and the request condition holds, False otherwise
+        """
+        return self.definition.is_request(self.layout.from_sample(data_item))
+
+    def extract_transaction(self, data_item: Dict[str, Any],
+                          next_data_item: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract the first transaction of one or two data items.
+        
+        Args:
+            data_item: Current data item
+            next_data_item: Next data item (for a response after the request)
+        
+        Returns:
+            Transaction dictionary or None if no transfer is requested
+        """
+        samples = [data_item] if next_data_item is None else [data_item, next_data_item]
+        return next(self._iter_extracted_transactions(map(self.layout.from_sample, samples)), None)
+
+    def get_transaction_type(self, data_item: Dict[str, Any]) -> str:
+        """
+        Get the transaction type.
+        
+        Args:
+            data_item: Data item to analyze
+        
+        Returns:
+            'Write' if the write condition holds, 'Read' otherwise
+        """
+        return "Write" if self.definition.is_write(self.layout.from_sample(data_item)) else "Read"
+
+    def filter_transactions(self, data_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filter and extract valid transactions from parsed data.
+        
+        Args:
+            data_items: List of parsed data items
+        
+        Returns:
+            List of valid transactions
+        """
+        self.logger.info(f"Filtering {self.protocol_name} transactions from {len(data_items)} data items")
+
+        clock_signal = self.signal_mapping[self.definition.clock]
+        from_data_item = self.layout.from_data_item
+        return self.filter_clock_rows(from_data_item(data_item) for data_item in data_items
+                                      if data_item.get(clock_signal) == '1')
+
+    def _iter_extracted_transactions(self, clock_high_items: Iterable[SampleRow]) -> Iterator[Dict[str, Any]]:
+        """
+        Extract transactions with the compiled state machine.
+        
+        A transfer starts at a sample meeting the request condition and
+        completes at the first sample meeting the response condition: the
+        request sample itself, or a later one for pipelined protocols, whose
+        completing sample can also start the next transfer. Samples in
+        between are wait states, reported as 'WaitStates'. A non-pipelined
+        request is held until the response; a transfer whose request drops,
+        or that is still waiting when the waveform ends, is reported without
+        its response fields.
+        
+        Args:
+            clock_high_items: Sample rows at which the clock is high, in the protocol's layout
+        
+        Yields:
+            Transactions in sample order, including duplicates
+        """
+        return self.definition.extract(clock_high_items)
@@ -0,0 +1,174 @@
+"""Compiled transfer detection kernels for very long waveforms.
+
+The kernels run the AHB and APB state machines over integer-encoded
+columnar samples. Every control signal the state machine looks at is
+encoded once into an int64 array with NumPy, and the per-edge loop runs
+in machine code compiled by Numba. The kernels only return the sample
+indices of the transfers: the protocols gather those rows and build the
+transactions in Python, exactly as the vectorized extractor does.
+
+Without Numba the kernels are plain Python functions over the same arrays,
+so their results can still be compared with the state machines; the
+``numba`` extractor itself requires Numba.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from numba import njit
+except ImportError:  # Numba is an optional accelerator
+    njit = None
+
+from .base_protocol import SampleRow
+from .vectorized import gather_rows, matches, np
+
+# Codes of encoded control signals: the signal is '1', not recorded (None) or anything else
+LOW = 0
+HIGH = 1
+ABSENT = -1
+
+# Encoding of 1-bit control signals
+SCALAR_CODES = {'1': HIGH, None: ABSENT}
+
+# Encoding of HTRANS: NONSEQ and SEQ keep their values, IDLE and BUSY are LOW
+HTRANS_CODES = {2: 2, 3: 3, None: ABSENT}
+
+
+def _jit(function):
+    """Compile a kernel with Numba when it is installed."""
+    return function if njit is None else njit(cache=True, nogil=True)(function)
+
+
+def encode_column(values: Any, codes: Dict[Any, int]) -> Any:
+    """
+    Encode a column of signal values as integers.
+
+    Args:
+        values: Column of raw signal values (object or typed NumPy array)
+        codes: Value -> code; values not listed are encoded as LOW
+
+    Returns:
+        int64 array of codes
+    """
+    encoded = np.zeros(len(values), dtype=np.int64)
+    for value, code in codes.items():
+        encoded[matches(values, value)] = code
+    return encoded
+
+
+def gather_optional_rows(columns: Sequence[Any], indices: Any) -> List[Optional[SampleRow]]:
+    """
+    Gather the sample rows at sample indices, None where the index is -1.
+
+    Args:
+        columns: One array per signal slot, then the timestamps
+        indices: Sample indices, -1 for no sample
+
+    Returns:
+        Rows in the protocol's layout, or None
+    """
+    rows = gather_rows(columns, np.maximum(indices, 0))
+    return [row if index >= 0 else None for row, index in zip(rows, indices.tolist())]
+
+
+def _ahb_transfers(hclk, htrans, hready, hsel):
+    """
+    Find AHB transfers with the AHB-Lite pipeline state machine.
+
+    Args:
+        hclk: Encoded HCLK
+        htrans: Encoded HTRANS
+        hready: Encoded HREADY
+        hsel: Encoded HSEL
+
+    Returns:
+        (address phases, data phases): sample indices of the address phase
+        of every transfer and of the sample that completes its data phase
+        (its last wait state, or -1, if the samples end first)
+    """
+    count = len(hclk)
+    address_phases = np.empty(count, dtype=np.int64)
+    data_phases = np.empty(count, dtype=np.int64)
+    transfers = 0
+    address_phase = -1
+    wait_state = -1
+    for sample in range(count):
+        if hready[sample] == LOW:
+            # Wait state: the data phase and the next address phase are extended
+            if address_phase >= 0:
+                wait_state = sample
+            continue
+        if address_phase >= 0:
+            address_phases[transfers] = address_phase
+            data_phases[transfers] = sample
+            transfers += 1
+            wait_state = -1
+        transfer = htrans[sample]
+        if (transfer == 2 or transfer == 3) and hclk[sample] == HIGH and hsel[sample] != LOW:
+            address_phase = sample
+        else:
+            address_phase = -1
+    if address_phase >= 0:
+        address_phases[transfers] = address_phase
+        data_phases[transfers] = wait_state
+        transfers += 1
+    return address_phases[:transfers], data_phases[:transfers]
+
+
+def _apb_transfers(pclk, psel, penable, pready):
+    """
+    Find APB transfers with the IDLE -> SETUP -> ACCESS state machine.
+
+    Args:
+        pclk: Encoded PCLK
+        psel: Encoded PSEL
+        penable: Encoded PENABLE
+        pready: Encoded PREADY
+
+    Returns:
+        (access phases, completions, wait states): sample indices of the
+        first ACCESS sample of every transfer and of the sample at which it
+        completes (its last wait state, or -1, if it ends first), and the
+        number of its wait states
+    """
+    count = len(pclk)
+    access_phases = np.empty(count, dtype=np.int64)
+    completions = np.empty(count, dtype=np.int64)
+    wait_states = np.empty(count, dtype=np.int64)
+    transfers = 0
+    access_phase = -1
+    wait_state = -1
+    waited = 0
+    for sample in range(count):
+        if psel[sample] != HIGH or pclk[sample] != HIGH or penable[sample] != HIGH:
+            if access_phase >= 0:
+                # The transfer left ACCESS without PREADY
+                access_phases[transfers] = access_phase
+                completions[transfers] = wait_state
+                wait_states[transfers] = waited
+                transfers += 1
+                access_phase = -1
+            continue
+        if access_phase < 0:
+            access_phase = sample
+            wait_state = -1
+            waited = 0
+        if pready[sample] == LOW:
+            wait_state = sample
+            waited += 1
+            continue
+        access_phases[transfers] = access_phase
+        completions[transfers] = sample
+        wait_states[transfers] = waited
+        transfers += 1
+        access_phase = -1
+    if access_phase >= 0:
+        access_phases[transfers] = access_phase
+        completions[transfers] = wait_state
+        wait_states[transfers] = waited
+        transfers += 1
+    return access_phases[:transfers], completions[:transfers], wait_states[:transfers]
+
+
+ahb_transfers = _jit(_ahb_transfers)
+apb_transfers = _jit(_apb_transfers)
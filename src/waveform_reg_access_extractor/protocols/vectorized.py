@@ -0,0 +1,86 @@
+"""NumPy helpers for vectorized transaction extraction.
+
+Vectorized extraction works on columnar samples: one NumPy array per signal
+slot of a protocol's ``SampleLayout`` (plus the timestamps), holding the
+signal values at every sampled clock edge. Transfers are found with boolean
+masks over whole arrays and only the samples of actual transfers are
+gathered into rows, so the per-edge work runs in NumPy instead of Python.
+"""
+
+from typing import Any, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional accelerator
+    np = None
+
+from .base_protocol import SampleRow
+
+# Transaction extraction engines: the Python state machines (reference), NumPy masks
+# and the state machines compiled by Numba (see ``kernels``)
+EXTRACTORS = ("python", "numpy", "numba")
+
+# Extraction engines working on the columns of the whole waveform
+COLUMNAR_EXTRACTORS = ("numpy", "numba")
+
+
+def matches(values: Any, value: Any) -> Any:
+    """
+    Compare every element of a column with a value.
+
+    Args:
+        values: Column of signal values
+        value: Value to compare with (e.g. '1')
+
+    Returns:
+        Boolean array, False where the element has another type
+    """
+    result = np.asarray(values == value)
+    if result.ndim == 0:
+        return np.full(len(values), bool(result))
+    return result
+
+
+def is_ready(values: Any) -> Any:
+    """
+    Find the samples at which an optional ready signal lets a transfer complete.
+
+    Args:
+        values: Column of ready signal values
+
+    Returns:
+        Boolean array, True where the signal is '1' or not recorded (None)
+    """
+    ready = matches(values, '1')
+    if values.dtype == object:
+        ready |= matches(values, None)
+    return ready
+
+
+def previous(mask: Any) -> Any:
+    """
+    Shift a mask by one sample, so that every element holds the value of the sample before it.
+
+    Args:
+        mask: Boolean array
+
+    Returns:
+        Boolean array, False at the first sample
+    """
+    shifted = np.zeros_like(mask)
+    shifted[1:] = mask[:-1]
+    return shifted
+
+
+def gather_rows(columns: Sequence[Any], indices: Any) -> List[SampleRow]:
+    """
+    Gather the sample rows at selected sample indices.
+
+    Args:
+        columns: One array per signal slot, then the timestamps
+        indices: Sample indices
+
+    Returns:
+        Rows in the protocol's layout with plain Python values
+    """
+    return list(zip(*(column[indices].tolist() for column in columns)))
@@ -1,11 +1,213 @@
 """Base register map class for different register map formats."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Register width in bits when the register map does not give one
+DEFAULT_REGISTER_SIZE = 32
+
+
+def register_bytes(register_info: Dict[str, Any]) -> int:
+    """
+    Get the number of bytes a register occupies.
+    
+    Args:
+        register_info: Register information dictionary
+        
+    Returns:
+        Register width in bytes (at least 1)
+    """
+    return max(1, -(-register_info.get("size", DEFAULT_REGISTER_SIZE) // 8))
+
+
+class RegisterAddressIndex:
+    """Address index of the registers of a register map.
+    
+    Built once when a register map is loaded. Exact register addresses are
+    looked up in a dict. The byte ranges of all registers, and of register
+    arrays as a whole, are kept sorted by start address and searched with
+    bisect, so lookups take O(log n) time however large the map. Ranges may
+    overlap (aliased registers, nested or interleaved register arrays): a
+    lookup then also checks the earlier ranges that still reach the address,
+    which only costs extra time where ranges actually overlap. When several
+    registers match, the one with the nearest start wins, and among those
+    the first in map order, as the linear scans did before.
+    
+    A register array is a register info with a "dim" (number of elements)
+    and a "stride" (bytes between elements). Its elements are built when
+    they are first looked up and then kept in the exact address dict.
+    """
+
+    def __init__(self, registers: Iterable[Dict[str, Any]] = ()):
+        """
+        Index registers.
+        
+        Args:
+            registers: Register information dictionaries with 'full_address'
+                (and 'size' in bits, 'dim' and 'stride' for register arrays)
+        """
+        self._by_address: Dict[int, Dict[str, Any]] = {}
+        ranges = []
+        arrays = []
+        for order, register_info in enumerate(registers):
+            start = register_info["full_address"]
+            dim = register_info.get("dim")
+            if dim is None:
+                if start in self._by_address:
+                    continue
+                self._by_address[start] = register_info
+                ranges.append((start, order, start + register_bytes(register_info), register_info))
+            else:
+                end = start + dim * register_info["stride"]
+                ranges.append((start, order, end, register_info))
+                arrays.append((start, order, end, register_info))
+        self._ranges = _SortedRanges(ranges)
+        self._arrays = _SortedRanges(arrays)
+
+    def __len__(self) -> int:
+        """Return the number of indexed registers and register arrays."""
+        return len(self._ranges)
+
+    def find(self, address: int) -> Optional[Dict[str, Any]]:
+        """
+        Find the register at an address.
+        
+        Args:
+            address: Register address
+            
+        Returns:
+            Register information dictionary or None if no register starts at the address
+        """
+        register_info = self._by_address.get(address)
+        if register_info is not None:
+            return register_info
+        return self._arrays.search(address, self._element_at)
+
+    def find_covering(self, address: int) -> Optional[Dict[str, Any]]:
+        """
+        Find the register that covers a byte address.
+        
+        Args:
+            address: Byte address
+            
+        Returns:
+            Register information dictionary of the register whose bytes
+            include the address, or None if no register covers it
+        """
+        return self._ranges.search(address, self._covering)
+
+    def _element_at(self, start: int, array_info: Dict[str, Any], address: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the element of a register array that starts at an address.
+        
+        Args:
+            start: Address of the first element
+            array_info: Register array information dictionary
+            address: Address within the array's range
+            
+        Returns:
+            Register information dictionary of the element, or None if the
+            address is not the start of an element
+        """
+        element, remainder = divmod(address - start, array_info["stride"])
+        return None if remainder else self._array_element(start, array_info, element)
+
+    def _covering(self, start: int, register_info: Dict[str, Any], address: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the register of a range whose bytes include an address.
+        
+        Args:
+            start: Start address of the range
+            register_info: Register or register array information dictionary
+            address: Byte address within the range
+            
+        Returns:
+            Register information dictionary (of the array element for a
+            register array), or None if the address is in the gap between
+            two elements
+        """
+        if register_info.get("dim") is None:
+            return register_info
+        element = self._array_element(start, register_info, (address - start) // register_info["stride"])
+        if address >= element["full_address"] + register_bytes(element):
+            return None
+        return element
+
+    def _array_element(self, start: int, array_info: Dict[str, Any], element: int) -> Dict[str, Any]:
+        """
+        Get an element of a register array, building it on first use.
+        
+        Args:
+            start: Address of the first element
+            array_info: Register array information dictionary
+            element: Element number
+            
+        Returns:
+            Register information dictionary of the element
+        """
+        address = start + element * array_info["stride"]
+        register_info = self._by_address.get(address)
+        if register_info is None:
+            register_info = {key: value for key, value in array_info.items() if key not in ("dim", "stride")}
+            register_info["name"] = f"{array_info['name']}[{element}]"
+            register_info["full_address"] = address
+            register_info["offset"] = array_info.get("offset", 0) + element * array_info["stride"]
+            self._by_address[address] = register_info
+        return register_info
+
+
+class _SortedRanges:
+    """Address ranges sorted by start, with the furthest end reached so far."""
+
+    def __init__(self, ranges: List[Tuple[int, int, int, Dict[str, Any]]]):
+        """
+        Sort ranges.
+        
+        Args:
+            ranges: (start, map order, end, register info) of every range
+        """
+        ranges = sorted(ranges, key=lambda entry: entry[:2])
+        self._starts = [start for start, _, _, _ in ranges]
+        self._ranges = [(start, end, register_info) for start, _, end, register_info in ranges]
+        # Furthest end of the ranges up to each position: the search stops where it no longer reaches the address
+        self._reach = list(accumulate((end for _, _, end, _ in ranges), max))
+
+    def __len__(self) -> int:
+        """Return the number of ranges."""
+        return len(self._ranges)
+
+    def search(self, address: int, match: Callable[[int, Dict[str, Any], int], Optional[Dict[str, Any]]]
+               ) -> Optional[Dict[str, Any]]:
+        """
+        Find the register of the range nearest below an address that matches it.
+        
+        Args:
+            address: Address
+            match: (start, register info, address) -> register information
+                dictionary, or None if the range does not match the address
+                
+        Returns:
+            Register information dictionary of the first matching range in
+            map order among those with the nearest start, or None
+        """
+        position = bisect_right(self._starts, address) - 1
+        found = found_start = None
+        while position >= 0 and self._reach[position] > address:
+            start, end, register_info = self._ranges[position]
+            if found is not None and start != found_start:
+                break
+            if address < end:
+                candidate = match(start, register_info, address)
+                if candidate is not None:
+                    found, found_start = candidate, start
+            position -= 1
+        return found
+
 
 class BaseRegisterMap(ABC):
     """Abstract base class for register map implementations."""
@@ -14,6 +216,7 @@ class BaseRegisterMap(ABC):
         """Initialize the register map."""
         self.logger = logger
         self._register_map: Dict[str, Any] = {}
+        self._address_index = RegisterAddressIndex()
 
     @abstractmethod
     def load_from_file(self, file_path: str) -> None:
@@ -25,7 +228,6 @@ class BaseRegisterMap(ABC):
         """
         pass
 
-    @abstractmethod
     def find_register_by_address(self, address: int) -> Optional[Dict[str, Any]]:
         """
         Find register information by address.
@@ -36,7 +238,32 @@ class BaseRegisterMap(ABC):
         Returns:
             Register information dictionary or None if not found
         """
-        pass
+        return self._address_index.find(address)
+
+    def find_register_covering(self, address: int) -> Optional[Dict[str, Any]]:
+        """
+        Find the register whose bytes include a byte address.
+        
+        Unlike ``find_register_by_address`` this also finds the register of
+        an access to a byte or halfword inside it.
+        
+        Args:
+            address: Byte address
+            
+        Returns:
+            Register information dictionary or None if no register covers the address
+        """
+        return self._address_index.find_covering(address)
+
+    def _index_registers(self, registers: Iterable[Dict[str, Any]]) -> None:
+        """
+        Build the address index of the loaded registers.
+        
+        Args:
+            registers: Register information dictionaries in map order
+        """
+        self._address_index = RegisterAddressIndex(registers)
+        self.logger.debug(f"Indexed {len(self._address_index)} registers and register arrays")
 
     @abstractmethod
     def get_register_fields(self, register_info: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -1,14 +1,45 @@
 """IP-XACT register map implementation."""
 
-from typing import Dict, List, Any, Optional
+from math import prod
+from typing import Dict, List, Any
 import xml.etree.ElementTree as ET
 import logging
 
-from .base_register_map import BaseRegisterMap
+from .base_register_map import BaseRegisterMap, register_bytes
 
 logger = logging.getLogger(__name__)
 
 
+# Radix of Verilog-style literals such as 'h10 or 32'd16
+_LITERAL_RADIXES = {"h": 16, "d": 10, "o": 8, "b": 2}
+
+
+def _parse_integer(text: str, base: int) -> int:
+    """
+    Parse an integer value of an IP-XACT element.
+    
+    Args:
+        text: Element text: a Verilog-style literal with optional width
+            ('h10, 32'H10, 'd16, 'b10000), a 0x hexadecimal number, or a
+            bare number
+        base: Radix of bare numbers
+        
+    Returns:
+        Integer value
+    """
+    text = text.strip()
+    if "'" in text:
+        # Drop the optional width, and the signed marker
+        literal = text.split("'", 1)[1].lstrip("sS")
+        radix = _LITERAL_RADIXES.get(literal[:1].lower())
+        if radix is None:
+            raise ValueError(f"Unsupported integer literal: {text}")
+        return int(literal[1:].replace("_", ""), radix)
+    if text.lower().startswith("0x"):
+        return int(text, 16)
+    return int(text, base)
+
+
 class IPXACTRegisterMap(BaseRegisterMap):
     """IP-XACT XML register map implementation."""
 
@@ -39,8 +70,8 @@ class IPXACTRegisterMap(BaseRegisterMap):
                     block_name = address_block.find("ipxact:name", namespace).text
                     base_address_str = address_block.find("ipxact:baseAddress", namespace).text
 
-                    # Convert 'h' hex format to standard hex
-                    base_address = int(base_address_str.replace("'h", "0x"), 16)
+                    # Addresses are hexadecimal unless given as a Verilog-style literal
+                    base_address = _parse_integer(base_address_str, 16)
                     
                     # Extract address block width (data width for all registers in this block)
                     # This is typically 32 or 64 bits. Default to 32 if not specified.
@@ -51,7 +82,7 @@ class IPXACTRegisterMap(BaseRegisterMap):
                     for register in address_block.findall(".//ipxact:register", namespace):
                         reg_name = register.find("ipxact:name", namespace).text
                         reg_offset_str = register.find("ipxact:addressOffset", namespace).text
-                        reg_offset = int(reg_offset_str.replace("'h", "0x"), 16)
+                        reg_offset = _parse_integer(reg_offset_str, 16)
 
                         # Calculate the full address for the register
                         full_address = base_address + reg_offset
@@ -80,14 +111,24 @@ class IPXACTRegisterMap(BaseRegisterMap):
                             }
 
                         # Store the register info
-                        self._register_map[memory_map_name][reg_name] = {
+                        register_info = {
                             "full_address": full_address,
                             "offset": reg_offset,
                             "name": reg_name,
                             "size": register_size,  # Register width in bits (32 or 64)
                             "fields": fields,
                         }
+
+                        # Register arrays: one dim element per dimension, elements packed by default;
+                        # a dim is a count, so bare numbers are decimal
+                        dims = [_parse_integer(dim.text, 10) for dim in register.findall("ipxact:dim", namespace)]
+                        if dims:
+                            register_info["dim"] = prod(dims)
+                            register_info["stride"] = register_bytes(register_info)
+                        self._register_map[memory_map_name][reg_name] = register_info
             
+            self._index_registers(register_info for memory_map in self._register_map.values()
+                                  for register_info in memory_map.values())
             self.logger.info(f"Loaded {sum(len(regs) for regs in self._register_map.values())} registers from IP-XACT file")
             
         except ET.ParseError as e:
@@ -97,28 +138,6 @@ class IPXACTRegisterMap(BaseRegisterMap):
             self.logger.error(f"Failed to load IP-XACT file {file_path}: {e}")
             raise
 
-    def find_register_by_address(self, address: int) -> Optional[Dict[str, Any]]:
-        """
-        Find register information by address.
-        
-        Args:
-            address: Register address to search for
-            
-        Returns:
-            Register information dictionary or None if not found
-        """
-        self.logger.debug(f"Looking up register at address 0x{address:X}")
-        
-        # Search through all memory maps and registers
-        for memory_map_name, memory_map in self._register_map.items():
-            for reg_name, reg_info in memory_map.items():
-                if address == reg_info["full_address"]:
-                    self.logger.debug(f"Found register {reg_name} at address 0x{address:X}")
-                    return reg_info
-        
-        self.logger.debug(f"No register found at address 0x{address:X}")
-        return None
-
     def get_register_fields(self, register_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Get field information for a register.
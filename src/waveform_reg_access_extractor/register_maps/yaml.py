@@ -1,10 +1,10 @@
 """YAML register map implementation."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any
 import yaml
 import logging
 
-from .base_register_map import BaseRegisterMap
+from .base_register_map import BaseRegisterMap, register_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +31,7 @@ class YAMLRegisterMap(BaseRegisterMap):
                 if "registers" in block:
                     total_registers += len(block["registers"])
             
+            self._index_registers(self._register_infos())
             self.logger.info(f"Loaded {total_registers} registers from YAML file")
                 
         except yaml.YAMLError as e:
@@ -40,41 +41,32 @@ class YAMLRegisterMap(BaseRegisterMap):
             self.logger.error(f"Failed to load YAML file {file_path}: {e}")
             raise
 
-    def find_register_by_address(self, address: int) -> Optional[Dict[str, Any]]:
+    def _register_infos(self) -> Iterator[Dict[str, Any]]:
         """
-        Find register information by address.
+        Build the register information of every register in the map.
         
-        Args:
-            address: Register address to search for
-            
-        Returns:
-            Register information dictionary or None if not found
+        Yields:
+            Register information dictionaries in map order
         """
-        self.logger.debug(f"Looking up register at address 0x{address:X}")
-        
-        # Search through all blocks and their registers
         for block_key, block in self._register_map.items():
             if "registers" in block:
                 block_offset = block.get("offset", 0)
                 
                 for reg_key, reg in block["registers"].items():
                     reg_offset = reg.get("offset", 0)
-                    full_address = block_offset + reg_offset
-                    
-                    if address == full_address:
-                        self.logger.debug(f"Found register {reg_key} at address 0x{address:X}")
-                        # Get register size from register definition, block definition, or default to 32
-                        register_size = reg.get("size", block.get("width", 32))
-                        return {
-                            "full_address": full_address,
-                            "offset": reg_offset,
-                            "name": reg.get("name", reg_key),
-                            "size": register_size,  # Register width in bits (32 or 64)
-                            "fields": reg.get("fields", {}),
-                        }
-        
-        self.logger.debug(f"No register found at address 0x{address:X}")
-        return None
+                    # Get register size from register definition, block definition, or default to 32
+                    register_info = {
+                        "full_address": block_offset + reg_offset,
+                        "offset": reg_offset,
+                        "name": reg.get("name", reg_key),
+                        "size": reg.get("size", block.get("width", 32)),  # Register width in bits (32 or 64)
+                        "fields": reg.get("fields", {}),
+                    }
+                    if "dim" in reg:
+                        # Register array, elements packed unless a stride in bytes is given
+                        register_info["dim"] = reg["dim"]
+                        register_info["stride"] = reg.get("stride", register_bytes(register_info))
+                    yield register_info
 
     def get_register_fields(self, register_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -1,6 +1,6 @@
 """Utility functions and helpers."""
 
 from .logging_config import setup_logging
-from .file_utils import ensure_directory, validate_file
+from .file_utils import ensure_directory, validate_file, open_waveform, is_compressed
 
-__all__ = ["setup_logging", "ensure_directory", "validate_file"]
+__all__ = ["setup_logging", "ensure_directory", "validate_file", "open_waveform", "is_compressed"]
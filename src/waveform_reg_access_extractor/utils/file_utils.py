@@ -1,11 +1,39 @@
 """File utility functions."""
 
+import bz2
+import gzip
+import io
+import lzma
 import os
-from typing import Optional
+import queue
+import stat
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Optional
 import logging
 
+try:
+    import zstandard
+except ImportError:  # zstd support is an optional extra
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Compression suffixes accepted for waveform files
+COMPRESSED_EXTENSIONS = ('.gz', '.xz', '.bz2', '.zst')
+
+# Waveform path that stands for standard input
+STDIN_PATH = '-'
+
+# Chunk size and queue depth of the background decompression thread
+DECOMPRESS_CHUNK_SIZE = 1 << 20
+DECOMPRESS_QUEUE_DEPTH = 8
+
+# Bytes read at a time and seconds between polls when following a growing file
+FOLLOW_READ_SIZE = 1 << 20
+FOLLOW_POLL_INTERVAL = 0.1
+
 
 def ensure_directory(directory_path: str) -> bool:
     """
@@ -25,13 +53,17 @@ def ensure_directory(directory_path: str) -> bool:
         return False
 
 
-def validate_file(file_path: str, required_extensions: Optional[list] = None) -> bool:
+def validate_file(file_path: str, required_extensions: Optional[list] = None,
+                  allow_compressed: bool = False, allow_pipe: bool = False) -> bool:
     """
     Validate that a file exists and has the required extension.
     
     Args:
         file_path: Path to the file
         required_extensions: List of required file extensions (e.g., ['.vcd', '.xml'])
+        allow_compressed: Also accept the required extensions followed by a
+            compression suffix (e.g., '.vcd.gz')
+        allow_pipe: Also accept named pipes, whatever their name
         
     Returns:
         True if file is valid, False otherwise
@@ -40,12 +72,22 @@ def validate_file(file_path: str, required_extensions: Optional[list] = None) ->
         logger.error(f"File does not exist: {file_path}")
         return False
     
+    if allow_pipe and is_pipe(file_path):
+        return True
+    
     if not os.path.isfile(file_path):
         logger.error(f"Path is not a file: {file_path}")
         return False
     
     if required_extensions:
-        file_ext = os.path.splitext(file_path)[1].lower()
+        base_path, file_ext = os.path.splitext(file_path)
+        file_ext = file_ext.lower()
+        if allow_compressed and file_ext in COMPRESSED_EXTENSIONS:
+            if file_ext == '.zst' and zstandard is None:
+                logger.error(f"Reading {file_path} requires the optional 'zstandard' package "
+                             f"(pip install waveform-reg-access-extractor[zstd])")
+                return False
+            file_ext = os.path.splitext(base_path)[1].lower()
         if file_ext not in required_extensions:
             logger.error(f"File extension {file_ext} not in required extensions: {required_extensions}")
             return False
@@ -68,3 +110,261 @@ def get_file_size(file_path: str) -> Optional[int]:
     except OSError as e:
         logger.error(f"Failed to get file size for {file_path}: {e}")
         return None
+
+
+def is_compressed(file_path: str) -> bool:
+    """
+    Check whether a file name carries a supported compression suffix.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        True if the file is compressed, False otherwise
+    """
+    return os.path.splitext(file_path)[1].lower() in COMPRESSED_EXTENSIONS
+
+
+def is_pipe(file_path: str) -> bool:
+    """
+    Check whether a path is a named pipe (FIFO).
+    
+    Args:
+        file_path: Path to check
+        
+    Returns:
+        True if the path exists and is a named pipe
+    """
+    try:
+        return stat.S_ISFIFO(os.stat(file_path).st_mode)
+    except OSError:
+        return False
+
+
+def is_stream_input(file_path: str) -> bool:
+    """
+    Check whether a waveform can only be read once, from start to end.
+    
+    Args:
+        file_path: Waveform path
+        
+    Returns:
+        True for standard input ('-') and named pipes
+    """
+    return file_path == STDIN_PATH or is_pipe(file_path)
+
+
+def open_waveform(file_path: str) -> BinaryIO:
+    """
+    Open a waveform file for binary reading, decompressing on the fly.
+    
+    Compressed files are decompressed in a background thread, so
+    decompression overlaps with whatever consumes the returned stream.
+    
+    Args:
+        file_path: Path to a plain or compressed (.gz, .xz, .bz2, .zst) file,
+            or '-' for standard input
+        
+    Returns:
+        Binary stream of the uncompressed content
+    """
+    if file_path == STDIN_PATH:
+        return open(sys.stdin.fileno(), 'rb', closefd=False)
+    file_ext = os.path.splitext(file_path)[1].lower()
+    if file_ext == '.gz':
+        source = gzip.open(file_path, 'rb')
+    elif file_ext == '.xz':
+        source = lzma.open(file_path, 'rb')
+    elif file_ext == '.bz2':
+        source = bz2.open(file_path, 'rb')
+    elif file_ext == '.zst':
+        if zstandard is None:
+            raise ValueError(f"Reading {file_path} requires the optional 'zstandard' package "
+                             f"(pip install waveform-reg-access-extractor[zstd])")
+        source = zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    else:
+        return open(file_path, 'rb')
+
+    logger.debug(f"Decompressing {file_path} in a background thread")
+    return io.BufferedReader(BackgroundReader(source))
+
+
+class BackgroundReader(io.RawIOBase):
+    """Read-only stream that reads its source ahead in a background thread."""
+
+    def __init__(self, source: BinaryIO, chunk_size: int = DECOMPRESS_CHUNK_SIZE,
+                 queue_depth: int = DECOMPRESS_QUEUE_DEPTH):
+        """
+        Start reading ``source`` in a background thread.
+        
+        Args:
+            source: Binary stream to read (closed together with this reader)
+            chunk_size: Number of bytes read from ``source`` per chunk
+            queue_depth: Maximum number of chunks buffered ahead of the consumer
+        """
+        super().__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_depth)
+        self._stop = threading.Event()
+        self._chunk = b""
+        self._chunk_pos = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self._thread.start()
+
+    def _read_ahead(self) -> None:
+        """Thread body: push chunks (then None, or the raised exception) into the queue."""
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self._chunk_size)
+                if not chunk:
+                    break
+                self._put(chunk)
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item: Any) -> None:
+        """Queue an item, giving up if the reader is closed meanwhile."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        """Return True; this stream supports reading."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Fill ``buffer`` with the next bytes of the source.
+        
+        Args:
+            buffer: Writable buffer supplied by the caller
+            
+        Returns:
+            Number of bytes written, 0 at end of stream
+        """
+        if self._chunk_pos >= len(self._chunk):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._eof = True
+                return 0
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            self._chunk, self._chunk_pos = item, 0
+
+        count = min(len(buffer), len(self._chunk) - self._chunk_pos)
+        buffer[:count] = self._chunk[self._chunk_pos:self._chunk_pos + count]
+        self._chunk_pos += count
+        return count
+
+    def close(self) -> None:
+        """Stop the background thread and close the source."""
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+class FollowReader(io.RawIOBase):
+    """Read-only stream over a waveform that another process is still writing.
+    
+    At the current end of a regular file the reader polls for more data
+    instead of reporting end of stream, like ``tail -f``. Only complete lines
+    are handed out, so a consumer never sees a line the writer is still in
+    the middle of. The stream ends when the writer of a named pipe closes
+    it, or when a regular file has not grown for ``idle_timeout`` seconds;
+    an incomplete last line is then dropped.
+    """
+
+    def __init__(self, file_path: str, poll_interval: float = FOLLOW_POLL_INTERVAL,
+                 idle_timeout: Optional[float] = None):
+        """
+        Open a file or named pipe for following.
+        
+        Args:
+            file_path: Path to the file or named pipe, or '-' for standard input
+            poll_interval: Seconds to wait before checking a regular file for new data
+            idle_timeout: Seconds without new data after which a regular file
+                is considered finished (default: follow until interrupted)
+        """
+        super().__init__()
+        self.file_path = file_path
+        self._poll_interval = poll_interval
+        self._idle_timeout = idle_timeout
+        if file_path == STDIN_PATH:
+            self._file = open(sys.stdin.fileno(), 'rb', buffering=0, closefd=False)
+        else:
+            self._file = open(file_path, 'rb', buffering=0)
+        self._pipe = stat.S_ISFIFO(os.fstat(self._file.fileno()).st_mode)
+        self._lines = b""           # Complete lines not yet handed out
+        self._lines_pos = 0
+        self._partial = b""         # Trailing line the writer has not finished
+        self._eof = False
+
+    def readable(self) -> bool:
+        """Return True; this stream supports reading."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Fill ``buffer`` with complete lines, waiting for the writer if needed.
+        
+        Args:
+            buffer: Writable buffer supplied by the caller
+            
+        Returns:
+            Number of bytes written, 0 once the followed file is finished
+        """
+        while self._lines_pos >= len(self._lines):
+            if self._eof:
+                return 0
+            self._read_lines()
+
+        count = min(len(buffer), len(self._lines) - self._lines_pos)
+        buffer[:count] = self._lines[self._lines_pos:self._lines_pos + count]
+        self._lines_pos += count
+        return count
+
+    def _read_lines(self) -> None:
+        """Wait until at least one more complete line is available or the file is finished."""
+        idle_since = None
+        while True:
+            data = self._file.read(FOLLOW_READ_SIZE)
+            if data:
+                idle_since = None
+                data = self._partial + data
+                cut = data.rfind(b"\n") + 1
+                self._partial = data[cut:]
+                if cut:
+                    self._lines, self._lines_pos = data[:cut], 0
+                    return
+                continue
+            if self._pipe:
+                # All writers closed the pipe
+                break
+            now = time.monotonic()
+            if idle_since is None:
+                idle_since = now
+            elif self._idle_timeout is not None and now - idle_since >= self._idle_timeout:
+                logger.info(f"{self.file_path} has not grown for {self._idle_timeout}s, stopping")
+                break
+            time.sleep(self._poll_interval)
+
+        self._eof = True
+        if self._partial.strip():
+            logger.warning(f"Ignoring incomplete last line of {self.file_path}: {self._partial[:80]!r}")
+
+    def close(self) -> None:
+        """Close the followed file."""
+        if not self.closed:
+            self._file.close()
+        super().close()
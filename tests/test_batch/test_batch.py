@@ -0,0 +1,114 @@
+"""Tests for batch extraction over many waveforms."""
+
+import gzip
+import json
+import os
+import shutil
+import pytest
+
+from waveform_reg_access_extractor.batch import BatchSettings, collect_waveforms, run_batch, schedule
+
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+AHB_WAVE = os.path.join(EXAMPLES_DIR, "vcd_files", "ahb_wave.vcd")
+AHB_CONFIG = os.path.join(EXAMPLES_DIR, "config", "ahb_custom_signals.yaml")
+REGISTER_MAP = os.path.join(EXAMPLES_DIR, "register_description", "test_bank_ipxact.xml")
+
+
+@pytest.fixture
+def regression(tmp_path):
+    """Lay out waveforms the way a regression run leaves them."""
+    (tmp_path / "run1").mkdir()
+    (tmp_path / "run2").mkdir()
+    shutil.copy(AHB_WAVE, tmp_path / "run1" / "ahb_wave.vcd")
+    shutil.copy(AHB_WAVE, tmp_path / "run2" / "ahb_wave.vcd")
+    with open(AHB_WAVE, 'rb') as src, gzip.open(tmp_path / "run2" / "long.vcd.gz", 'wb') as dst:
+        dst.write(src.read())
+    (tmp_path / "run2" / "broken.vcd").write_text("not a waveform\n")
+    (tmp_path / "run2" / "notes.txt").write_text("ignored\n")
+    return tmp_path
+
+
+class TestBatch:
+    """Test cases for batch mode."""
+
+    def test_collect_waveforms(self, regression):
+        """Test collecting from directories, globs and manifests without duplicates."""
+        manifest = regression / "nightly.lst"
+        manifest.write_text("# nightly runs\nrun1/ahb_wave.vcd\n\nrun2/broken.vcd\n")
+
+        from_dir = collect_waveforms([str(regression / "run2")])
+        assert [os.path.basename(path) for path in from_dir] == ["ahb_wave.vcd", "broken.vcd", "long.vcd.gz"]
+
+        from_all = collect_waveforms([str(regression / "run*" / "ahb_wave.vcd"), str(manifest)])
+        assert from_all == [str(regression / "run1" / "ahb_wave.vcd"),
+                            str(regression / "run2" / "ahb_wave.vcd"),
+                            str(regression / "run2" / "broken.vcd")]
+
+        with pytest.raises(ValueError):
+            collect_waveforms([str(regression / "missing")])
+
+    def test_schedule_biggest_first(self, regression):
+        """Test that the biggest files are processed first."""
+        waveforms = collect_waveforms([str(regression)])
+        ordered = schedule(waveforms)
+        sizes = [os.path.getsize(path) for path in ordered]
+        assert sizes == sorted(sizes, reverse=True)
+        assert sorted(ordered) == sorted(waveforms)
+
+    def test_run_batch(self, regression):
+        """Test per-file outputs, decoding and the summary of a batch with a failing file."""
+        waveforms = collect_waveforms([str(regression / "run1"), str(regression / "run2")])
+        output_dir = str(regression / "out")
+        settings = BatchSettings(config_file=AHB_CONFIG, register_map_file=REGISTER_MAP)
+        summary = run_batch(waveforms, output_dir, settings, workers=2)
+
+        totals = summary["totals"]
+        assert (totals["files"], totals["succeeded"], totals["failed"]) == (4, 3, 1)
+        assert [result["waveform"] for result in summary["files"]] == waveforms
+
+        results = {os.path.relpath(r["waveform"], str(regression)): r for r in summary["files"]}
+        assert results["run2/broken.vcd"]["status"] == "error"
+        assert results["run2/broken.vcd"]["outputs"] == []
+        assert not os.path.exists(os.path.join(output_dir, "run2", "broken.json"))
+
+        # Equally named waveforms from different runs do not overwrite each other
+        outputs = [os.path.join(output_dir, run, "ahb_wave.json") for run in ("run1", "run2")]
+        assert results["run1/ahb_wave.vcd"]["outputs"][0] == outputs[0]
+        assert results["run2/ahb_wave.vcd"]["outputs"][0] == outputs[1]
+        with open(outputs[0]) as f:
+            transactions = json.load(f)["transactions"]
+        assert results["run1/ahb_wave.vcd"]["transactions"] == len(transactions) > 0
+        assert os.path.exists(os.path.join(output_dir, "run1", "ahb_wave_decoded.json"))
+        assert os.path.exists(os.path.join(output_dir, "run2", "long_decoded.json"))
+        assert totals["transactions"] == sum(r["transactions"] for r in summary["files"])
+
+        with open(os.path.join(output_dir, "batch_summary.json")) as f:
+            assert json.load(f) == summary
+
+    def test_output_name_collisions(self, tmp_path):
+        """Test that waveforms differing only in their extension get separate outputs."""
+        shutil.copy(AHB_WAVE, tmp_path / "x.vcd")
+        shutil.copy(os.path.splitext(AHB_WAVE)[0] + ".fst", tmp_path / "x.fst")
+        with open(AHB_WAVE, 'rb') as src, gzip.open(tmp_path / "x.vcd.gz", 'wb') as dst:
+            dst.write(src.read())
+        shutil.copy(AHB_WAVE, tmp_path / "y.vcd")
+        waveforms = collect_waveforms([str(tmp_path)])
+        output_dir = tmp_path / "out"
+        summary = run_batch(waveforms, str(output_dir), BatchSettings(config_file=AHB_CONFIG), workers=2)
+
+        assert summary["totals"]["failed"] == 0
+        outputs = {os.path.basename(r["waveform"]): os.path.basename(r["outputs"][0]) for r in summary["files"]}
+        assert outputs == {"x.fst": "x.fst.json", "x.vcd": "x.vcd.json", "x.vcd.gz": "x.vcd.gz.json",
+                           "y.vcd": "y.json"}
+        assert all((output_dir / name).exists() for name in outputs.values())
+
+    def test_missing_waveform(self, regression):
+        """Test that a waveform that cannot be read fails on its own."""
+        waveforms = [str(regression / "run1" / "ahb_wave.vcd"), str(regression / "run1" / "gone.vcd")]
+        summary = run_batch(waveforms, str(regression / "out"), BatchSettings(config_file=AHB_CONFIG), workers=2)
+
+        assert (summary["totals"]["succeeded"], summary["totals"]["failed"]) == (1, 1)
+        missing = summary["files"][1]
+        assert (missing["status"], missing["size"], missing["outputs"]) == ("error", 0, [])
+        assert missing["error"].startswith("FileNotFoundError")
@@ -0,0 +1,108 @@
+"""Tests for the signal mapping configuration."""
+
+import os
+import tempfile
+import pytest
+
+from waveform_reg_access_extractor.config.signal_mapping import SignalMappingConfig
+
+
+INTERFACES_CONFIG = """
+protocols:
+  ahb:
+    signal_mappings:
+      hclk: "clk"
+interfaces:
+  uart:
+    protocol: APB
+    signal_mappings:
+      pclk: "soc.clk"
+  cpu:
+    protocol: ahb
+"""
+
+
+INTERCONNECT_CONFIG = """
+interconnects:
+  matrix:
+    protocol: AHB
+    signal_mappings:
+      hclk: "soc.hclk"
+      haddr: "soc.matrix.{port}_haddr"
+      hsel: "soc.matrix.{port}_hsel"
+    ports:
+      s_sram:
+      s_rom:
+        hsel: "soc.rom_cs"
+    masters:
+      0: cpu
+"""
+
+
+def create_config_file(content: str) -> str:
+    """Create a temporary configuration file for testing."""
+    fd, path = tempfile.mkstemp(suffix='.yaml')
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    return path
+
+
+class TestSignalMappingConfig:
+    """Test cases for protocol mappings and named interfaces."""
+
+    def test_load_interfaces(self):
+        """Test that interfaces are loaded in configuration order next to protocol mappings."""
+        config_file = create_config_file(INTERFACES_CONFIG)
+        try:
+            config = SignalMappingConfig(config_file)
+            assert config.get_signal_mapping("AHB") == {"hclk": "clk"}
+            assert config.has_interfaces()
+            uart, cpu = config.get_interfaces()
+            assert (uart.name, uart.protocol, uart.signal_mappings) == ("uart", "apb", {"pclk": "soc.clk"})
+            assert (cpu.name, cpu.protocol, cpu.signal_mappings) == ("cpu", "ahb", {})
+            assert [i.name for i in config.get_interfaces(["cpu"])] == ["cpu"]
+        finally:
+            os.unlink(config_file)
+
+    def test_unknown_interface_selected(self):
+        """Test that selecting an interface missing from the configuration fails."""
+        config_file = create_config_file(INTERFACES_CONFIG)
+        try:
+            with pytest.raises(ValueError):
+                SignalMappingConfig(config_file).get_interfaces(["gpio"])
+        finally:
+            os.unlink(config_file)
+
+    def test_interface_without_protocol(self):
+        """Test that an interface without a protocol is rejected."""
+        config_file = create_config_file("interfaces:\n  cpu:\n    signal_mappings: {}\n")
+        try:
+            with pytest.raises(ValueError):
+                SignalMappingConfig(config_file)
+        finally:
+            os.unlink(config_file)
+
+    def test_load_interconnect(self):
+        """Test that the ports of an interconnect become interfaces with expanded signal names."""
+        config_file = create_config_file(INTERCONNECT_CONFIG)
+        try:
+            sram, rom = SignalMappingConfig(config_file).get_interfaces()
+        finally:
+            os.unlink(config_file)
+        assert (sram.name, sram.protocol, sram.masters) == ("s_sram", "ahb", {0: "cpu"})
+        assert sram.signal_mappings == {"hclk": "soc.hclk", "haddr": "soc.matrix.s_sram_haddr",
+                                        "hsel": "soc.matrix.s_sram_hsel"}
+        assert rom.signal_mappings["hsel"] == "soc.rom_cs"
+
+    @pytest.mark.parametrize("content", [
+        "interconnects:\n  matrix:\n    protocol: ahb\n",
+        "interfaces:\n  sram:\n    protocol: ahb\ninterconnects:\n  matrix:\n    protocol: ahb\n    ports: [sram]\n",
+    ])
+    def test_invalid_interconnect(self, content):
+        """Test that interconnects without ports, or with ports named like an interface, are rejected."""
+        config_file = create_config_file(content)
+        try:
+            with pytest.raises(ValueError):
+                SignalMappingConfig(config_file)
+        finally:
+            os.unlink(config_file)
@@ -309,3 +309,80 @@ class TestTransactionDecoder:
         assert "normal_field" in fields
         assert fields["normal_field"]["is_reserved"] is False
 
+
+    def test_decode_burst(self, tmp_path):
+        """Test decoding the beats of a WRAP4 burst at their generated addresses."""
+        mock_map, _ = self.create_mock_register_map()
+        decoder = TransactionDecoder(mock_map)
+        
+        burst = {
+            "Time": 1000,
+            "Address": "0x1008",
+            "Operation": "Read",
+            "Response": "OKAY",
+            "Burst": "WRAP4",
+            "Size": 4,
+            "Beats": [{"Time": 1000 + 10 * k, "Value": f"0x{k + 1:X}", "Response": "OKAY"} for k in range(4)]
+        }
+        
+        decoded = decoder.decode_transaction(burst)
+        beats = decoded["Beats"]
+        assert [beat["Address"] for beat in beats] == ["0x1008", "0x100c", "0x1000", "0x1004"]
+        assert [beat["register_info"]["name"] for beat in beats] == [
+            "unidentified", "unidentified", "TestRegister", "unidentified"
+        ]
+        assert beats[2]["register_info"]["fields"][0]["value"] == "0x3"
+        
+        output_file = tmp_path / "decoded.txt"
+        decoder.save_decoded_transactions_txt([decoded], str(output_file))
+        text = output_file.read_text()
+        assert "Burst: WRAP4, 4 beats of 4 bytes" in text
+        assert text.count("Decoded Registers:") == 4
+
+    def test_register_plan_cached(self):
+        """Test that a register is looked up and compiled once, and its plan reused."""
+        mock_map, _ = self.create_mock_register_map()
+        decoder = TransactionDecoder(mock_map)
+        
+        values = ["0x00AA11FF", "0xFF000000", "0x0"]
+        decoded = [decoder.decode_transaction({"Time": 10 * k, "Address": "0x1000", "Operation": "Read",
+                                               "Value": value, "Response": "OKAY"})
+                   for k, value in enumerate(values)]
+        decoder.decode_transaction({"Time": 40, "Address": "0x2000", "Operation": "Read", "Value": "0x1"})
+        decoder.decode_transaction({"Time": 50, "Address": "0x2000", "Operation": "Read", "Value": "0x2"})
+        
+        assert mock_map.find_register_by_address.call_count == 2
+        assert mock_map.get_register_name.call_count == 1
+        assert [[field["value"] for field in d["register_info"]["fields"]] for d in decoded] == [
+            ["0xFF", "0x11", "0xAA", "0x0"],
+            ["0x0", "0x0", "0x0", "0xFF"],
+            ["0x0", "0x0", "0x0", "0x0"],
+        ]
+
+    def test_compile_register_plan(self):
+        """Test the plan of a register with unordered, overlapping and empty fields."""
+        mock_map = Mock()
+        mock_map.get_register_name = Mock(side_effect=lambda reg_info: reg_info["name"])
+        decoder = TransactionDecoder(mock_map)
+        
+        plan = decoder.compile_register_plan({
+            "name": "MixedRegister",
+            "size": 16,
+            "fields": {
+                "high": {"bitoffset": 12, "width": 8},
+                "empty": {"bitoffset": 2, "width": 0},
+                "low": {"bitoffset": 4, "width": 4, "is_reserved": True},
+                "overlap": {"bitoffset": 6, "width": 3},
+            }
+        })
+        
+        assert plan.name == "MixedRegister"
+        assert [tuple(field) for field in plan.fields] == [
+            ("high", 12, 0xFF, False, None),
+            ("empty", 2, 0x0, False, None),
+            ("low", 4, 0xF, True, None),
+            ("overlap", 6, 0x7, False, None),
+            ("unidentified[0:3]", 0, 0xF, None, "0:3"),
+            ("unidentified[9:11]", 9, 0x7, None, "9:11"),
+        ]
+        assert decoder.compile_register_plan(None).fields is None
@@ -0,0 +1,102 @@
+"""Tests for the native FST reader."""
+
+import json
+import os
+import pytest
+
+from waveform_reg_access_extractor.cli import get_waveform_parser
+from waveform_reg_access_extractor.config.signal_mapping import SignalMappingConfig
+from waveform_reg_access_extractor.parsers.fst_parser import FSTParser
+from waveform_reg_access_extractor.parsers.fst_reader import (FSTError, FSTReader, _fastlz_decompress,
+                                                              _read_chain_index, _timescale)
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+WAVEFORMS = {
+    "ahb": (AHBProtocol, os.path.join(EXAMPLES_DIR, "vcd_files", "ahb_wave")),
+    "apb": (APBProtocol, os.path.join(EXAMPLES_DIR, "vcd_files", "apb_wave")),
+}
+
+
+def protocol_parser(protocol):
+    """Build a protocol parser with the example signal mapping."""
+    protocol_class, _ = WAVEFORMS[protocol]
+    config = SignalMappingConfig(os.path.join(EXAMPLES_DIR, "config", f"{protocol}_custom_signals.yaml"))
+    return protocol_class(config.get_signal_mapping(protocol))
+
+
+def saved_transactions(parser, waveform, output_file):
+    """Extract transactions to a file and load them back."""
+    parser.parse_and_save(waveform, str(output_file))
+    with open(output_file) as f:
+        return json.load(f)["transactions"]
+
+
+class TestFSTReader:
+    """Test cases for reading FST files."""
+
+    def test_header(self):
+        """Test reading declarations, aliases and the timescale of an FST file."""
+        with FSTReader(WAVEFORMS["ahb"][1] + ".fst") as reader:
+            header = reader.header
+            assert reader.block_count == 3
+        assert header.timescale == "1fs"
+        variables = {".".join(var.scope + (var.reference,)): var for var in header.variables}
+        assert variables["tb_top.haddr"].size == 16
+        # Signals connected through the hierarchy share one handle
+        assert variables["tb_top.clk"].id_code == variables["tb_top.dut.clk"].id_code
+        assert variables["tb_top.hrdata"].id_code != variables["tb_top.dut.hrdata"].id_code
+
+    def test_not_fst(self, tmp_path):
+        """Test that a file in another format is rejected."""
+        path = tmp_path / "wave.fst"
+        path.write_text("$timescale 1ns $end\n")
+        with pytest.raises(FSTError):
+            FSTReader(str(path))
+
+    def test_chain_index(self):
+        """Test decoding chain offsets, skipped handles and aliases of a block index."""
+        # Handle 1 at offset 1, handles 2-3 without changes, handle 4 at offset 11,
+        # handle 5 aliasing handle 1 and handle 6 repeating that alias
+        index = bytes([0x03, 0x04, 0x15, 0x7F, 0x01])
+        chains = _read_chain_index(index, 6, 20)
+        assert chains == [(1, 10), None, None, (11, 9), (1, 10), (1, 10)]
+
+    def test_fastlz(self):
+        """Test FastLZ literal runs and overlapping back references."""
+        # Literal "ab", then a match of length 5 at distance 2
+        data = bytes([0x01, 0x61, 0x62, 0x60, 0x01])
+        assert _fastlz_decompress(data, 7) == b"abababa"
+
+    @pytest.mark.parametrize("exponent,timescale", [(-9, "1ns"), (-10, "100ps"), (-15, "1fs"), (0, "1s")])
+    def test_timescale(self, exponent, timescale):
+        """Test formatting timescale exponents."""
+        assert _timescale(exponent) == timescale
+
+
+class TestFSTParser:
+    """Test cases for extracting transactions from FST files."""
+
+    @pytest.mark.parametrize("protocol", ["ahb", "apb"])
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_matches_vcd(self, tmp_path, protocol, jobs):
+        """Test that an FST dump yields the same transactions as the VCD dump."""
+        waveform = WAVEFORMS[protocol][1]
+        expected = saved_transactions(VCDParser(protocol_parser(protocol)), waveform + ".vcd",
+                                      tmp_path / "vcd.json")
+        parser = get_waveform_parser(waveform + ".fst", protocol_parser(protocol), jobs=jobs)
+        assert isinstance(parser, FSTParser)
+        assert saved_transactions(parser, waveform + ".fst", tmp_path / "fst.json") == expected
+        assert expected
+
+    def test_time_window(self):
+        """Test that a window starting in a later block matches the full parse."""
+        waveform = WAVEFORMS["ahb"][1] + ".fst"
+        full = FSTParser(protocol_parser("ahb")).parse_vcd_file(waveform)
+        timestamps = [item["timestamp"] for item in full]
+        start, end = timestamps[30], timestamps[45]
+        parser = FSTParser(protocol_parser("ahb"), start_time=start, end_time=end)
+        assert parser.parse_vcd_file(waveform) == [item for item in full if start <= item["timestamp"] <= end]
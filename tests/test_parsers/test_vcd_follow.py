@@ -0,0 +1,70 @@
+"""Tests for extracting transactions from a VCD that is still being written."""
+
+import json
+import os
+import threading
+import time
+import pytest
+
+from waveform_reg_access_extractor.config.signal_mapping import SignalMappingConfig
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+AHB_VCD = os.path.join(EXAMPLES_DIR, "vcd_files", "ahb_wave.vcd")
+AHB_CONFIG = os.path.join(EXAMPLES_DIR, "config", "ahb_custom_signals.yaml")
+
+
+def ahb_protocol():
+    """Build an AHB protocol parser with the example signal mapping."""
+    return AHBProtocol(SignalMappingConfig(AHB_CONFIG).get_signal_mapping("ahb"))
+
+
+def saved_transactions(output_file):
+    """Load the transactions of an output file."""
+    with open(output_file) as f:
+        return json.load(f)["transactions"]
+
+
+class TestVCDFollow:
+    """Test cases for the live tail mode."""
+
+    @pytest.mark.parametrize("engine", ["pyvcd", "mmap"])
+    def test_follow_matches_full_parse(self, tmp_path, engine):
+        """Test that following a VCD written in pieces gives the same transactions as a full parse."""
+        VCDParser(ahb_protocol()).parse_and_save(AHB_VCD, str(tmp_path / "full.json"))
+        with open(AHB_VCD, "rb") as f:
+            content = f.read()
+        waveform = tmp_path / "wave.vcd"
+        waveform.write_bytes(b"")
+        parser = VCDParser(ahb_protocol(), engine=engine, follow=True, flush_interval=0.05,
+                           follow_timeout=0.5)
+        follower = threading.Thread(target=parser.parse_and_save,
+                                    args=(str(waveform), str(tmp_path / "follow.json")))
+        follower.start()
+        with open(waveform, "ab") as f:
+            # Pieces end in the middle of lines
+            for start in range(0, len(content), 997):
+                f.write(content[start:start + 997])
+                f.flush()
+                time.sleep(0.01)
+        follower.join()
+        assert saved_transactions(tmp_path / "follow.json") == saved_transactions(tmp_path / "full.json")
+
+    def test_transactions_flushed_while_following(self, tmp_path):
+        """Test that transactions reach the output file while the waveform is still followed."""
+        output_file = tmp_path / "follow.json"
+        parser = VCDParser(ahb_protocol(), follow=True, flush_interval=0.05, follow_timeout=2)
+        follower = threading.Thread(target=parser.parse_and_save, args=(AHB_VCD, str(output_file)))
+        follower.start()
+        try:
+            deadline = time.monotonic() + 5
+            while '"Time"' not in (output_file.read_text() if output_file.exists() else ""):
+                assert time.monotonic() < deadline, "no transaction flushed while following"
+                time.sleep(0.05)
+            # The waveform is still followed while it is idle
+            assert follower.is_alive()
+        finally:
+            follower.join()
+        assert saved_transactions(output_file)
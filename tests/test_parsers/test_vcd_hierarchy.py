@@ -0,0 +1,105 @@
+"""Tests for scope-aware signal resolution."""
+
+import os
+import tempfile
+import pytest
+
+from waveform_reg_access_extractor.parsers.vcd_hierarchy import ScopeIndex
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.parsers.vcd_scanner import VarDeclaration
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+
+VARIABLES = [
+    VarDeclaration(("tb_top", "dut"), "clk", "!", 1, "wire"),
+    VarDeclaration(("tb_top",), "clk", '"', 1, "wire"),
+    VarDeclaration(("tb_top", "dut"), "paddr", "#", 16, "wire"),
+    VarDeclaration(("tb_top", "bus"), "paddr", "$", 16, "wire"),
+    VarDeclaration(("tb_top",), "prdata", "%", 32, "wire"),
+]
+
+SCOPED_VCD = """$timescale 1ns $end
+$scope module tb_top $end
+$var wire 1 ! pclk $end
+$var wire 1 " psel $end
+$var wire 1 # penable $end
+$var wire 1 $ pwrite $end
+$var wire 16 % paddr [15:0] $end
+$var wire 32 & pwdata[31:0] $end
+$scope module dut $end
+$var wire 16 ' paddr [15:0] $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+0#
+0$
+b0 %
+b0 &
+b0 '
+$end
+#5
+1!
+1"
+1$
+b1000 %
+b1111 '
+b10101010 &
+#10
+0!
+1#
+#15
+1!
+"""
+
+
+class TestScopeIndex:
+    """Test cases for the scope index."""
+
+    def test_bare_name_prefers_shallowest(self):
+        """Test that an ambiguous bare name resolves to the shallowest declaration."""
+        assert ScopeIndex(VARIABLES).resolve(["clk"]) == {'"': "clk"}
+
+    def test_bare_name_first_among_equals(self):
+        """Test that equally deep declarations resolve to the first one."""
+        assert ScopeIndex(VARIABLES).resolve(["paddr"]) == {"#": "paddr"}
+
+    def test_dotted_path(self):
+        """Test that a dotted path selects exactly one declaration."""
+        resolved = ScopeIndex(VARIABLES).resolve(["tb_top.dut.clk", "tb_top.bus.paddr"])
+        assert resolved == {"!": "tb_top.dut.clk", "$": "tb_top.bus.paddr"}
+
+    @pytest.mark.parametrize("pattern,id_code", [
+        ("*.bus.paddr", "$"),
+        ("tb_top.*.clk", "!"),
+        ("prd*", "%"),
+    ])
+    def test_glob_patterns(self, pattern, id_code):
+        """Test glob patterns against paths and bare names."""
+        assert ScopeIndex(VARIABLES).resolve([pattern]) == {id_code: pattern}
+
+    def test_unknown_signal_ignored(self):
+        """Test that signals missing from the header are left unresolved."""
+        assert ScopeIndex(VARIABLES).resolve(["pready", "*.nothing"]) == {}
+
+    @pytest.mark.parametrize("engine", ["pyvcd", "mmap"])
+    def test_parse_with_dotted_path(self, engine):
+        """Test that the parser reads the selected declaration of a duplicate name."""
+        fd, test_file = tempfile.mkstemp(suffix='.vcd')
+        with os.fdopen(fd, 'w') as f:
+            f.write(SCOPED_VCD)
+        try:
+            shallow = VCDParser(APBProtocol(), engine=engine).parse_vcd_file(test_file)
+            assert shallow[1]['paddr'] == 8
+
+            protocol = APBProtocol({'paddr': 'tb_top.dut.paddr'})
+            parser = VCDParser(protocol, engine=engine)
+            items = parser.parse_vcd_file(test_file)
+            assert items[1]['tb_top.dut.paddr'] == 15
+            # Hex conversion follows the mapped name
+            assert parser.convert_to_hex(items)[1]['tb_top.dut.paddr'] == '0xf'
+        finally:
+            os.unlink(test_file)
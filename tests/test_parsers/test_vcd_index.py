@@ -0,0 +1,131 @@
+"""Tests for the timestamp seek index."""
+
+import json
+import os
+import tempfile
+import pytest
+
+from waveform_reg_access_extractor.parsers.vcd_index import Checkpoint, VCDIndex
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+from waveform_reg_access_extractor.protocols.vectorized import np
+
+
+def make_apb_vcd(cycles: int) -> str:
+    """Build an APB VCD with one write per clock cycle."""
+    lines = [
+        "$timescale 1ns $end",
+        "$scope module tb_top $end",
+        "$var wire 1 ! pclk $end",
+        "$var wire 1 \" psel $end",
+        "$var wire 1 # penable $end",
+        "$var wire 1 $ pwrite $end",
+        "$var wire 16 % paddr [15:0] $end",
+        "$var wire 32 & pwdata[31:0] $end",
+        "$upscope $end",
+        "$enddefinitions $end",
+        "#0",
+        "$dumpvars",
+        "0!", "0\"", "0#", "0$", "b0 %", "b0 &",
+        "$end",
+    ]
+    for cycle in range(cycles):
+        time = 10 + cycle * 20
+        lines += [f"#{time}", "1!", "1\"", "1$", f"b{cycle * 4:b} %", f"b{cycle:b} &"]
+        lines += [f"#{time + 5}", "0!", "1#"]
+        lines += [f"#{time + 10}", "1!"]
+        lines += [f"#{time + 15}", "0!", "0\"", "0#"]
+    return "\n".join(lines) + "\n"
+
+
+class TestVCDIndex:
+    """Test cases for time-windowed extraction through the seek index."""
+
+    def setup_method(self):
+        """Create a temporary VCD file for every test."""
+        fd, self.vcd_file = tempfile.mkstemp(suffix='.vcd')
+        with os.fdopen(fd, 'w') as f:
+            f.write(make_apb_vcd(20))
+        self.index_file = VCDIndex.index_path(self.vcd_file)
+
+    def teardown_method(self):
+        """Remove the VCD file and its index."""
+        for path in (self.vcd_file, self.index_file):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def parse_window(self, start_time, end_time, **kwargs):
+        """Parse a time window with a small checkpoint interval."""
+        parser = VCDParser(APBProtocol(), start_time=start_time, end_time=end_time, **kwargs)
+        parser.index_interval = 8
+        return parser.parse_vcd_file(self.vcd_file)
+
+    @pytest.mark.parametrize("engine", ["pyvcd", "mmap"])
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_window_matches_full_parse(self, engine, jobs):
+        """Test that a window holds the same data items as a full parse."""
+        full_items = VCDParser(APBProtocol()).parse_vcd_file(self.vcd_file)
+        window_items = self.parse_window(203, 311, engine=engine, jobs=jobs)
+
+        assert window_items == [item for item in full_items if 203 <= item['timestamp'] <= 311]
+        # The first item carries the complete signal state restored from the index
+        assert window_items[0]['paddr'] == 36
+
+    @pytest.mark.parametrize("extractor", [
+        "python",
+        pytest.param("numpy", marks=pytest.mark.skipif(np is None, reason="NumPy is not installed")),
+    ])
+    @pytest.mark.parametrize("start_time", [16, 20])
+    def test_window_starting_before_edge(self, extractor, start_time):
+        """Test that a rising clock edge at the first timestamp of a window is sampled."""
+        output_file = self.vcd_file.replace(".vcd", ".json")
+        transactions = {}
+        try:
+            for window_start in (None, start_time):
+                parser = VCDParser(APBProtocol(), start_time=window_start, end_time=100, extractor=extractor)
+                parser.parse_and_save(self.vcd_file, output_file)
+                with open(output_file) as f:
+                    transactions[window_start] = json.load(f)["transactions"]
+        finally:
+            os.unlink(output_file)
+        # The clock rises at 20, right after the pre-window falling edge at 15
+        assert transactions[start_time][0]["Time"] == 20
+        assert transactions[start_time] == [t for t in transactions[None] if t["Time"] >= start_time]
+
+    def test_index_built_lazily(self):
+        """Test that the index is only built when a start time is given."""
+        self.parse_window(None, 100)
+        assert not os.path.exists(self.index_file)
+
+        self.parse_window(100, None)
+        index = VCDIndex.load(self.index_file)
+        assert index is not None
+        assert index.is_current(self.vcd_file)
+        assert index.checkpoints[0].time == 0
+        assert [cp.time for cp in index.checkpoints[1:3]] == [45, 85]
+
+    def test_stale_index_rebuilt(self):
+        """Test that an index whose file changed is not used."""
+        self.parse_window(100, None)
+        with open(self.vcd_file, 'a') as f:
+            f.write("#1000\n1!\n")
+        assert not VCDIndex.load(self.index_file).is_current(self.vcd_file)
+
+        full_items = VCDParser(APBProtocol()).parse_vcd_file(self.vcd_file)
+        assert self.parse_window(390, None) == [item for item in full_items if item['timestamp'] >= 390]
+        assert VCDIndex.load(self.index_file).is_current(self.vcd_file)
+
+    def test_seek_and_stop(self):
+        """Test checkpoint lookup for window bounds."""
+        index = VCDIndex(0, 0, 1, [], [Checkpoint(t, t, {}) for t in (0, 10, 20, 30)])
+
+        assert index.seek(0) == 0
+        assert index.seek(20) == 1
+        assert index.seek(25) == 2
+        assert index.stop(20) == 3
+        assert index.stop(35) == 4
+
+    def test_invalid_window(self):
+        """Test that a start time after the end time is rejected."""
+        with pytest.raises(ValueError):
+            VCDParser(APBProtocol(), start_time=20, end_time=10)
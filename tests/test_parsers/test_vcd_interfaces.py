@@ -0,0 +1,314 @@
+"""Tests for extracting several bus interfaces in one pass."""
+
+import json
+import os
+import tempfile
+import threading
+import pytest
+
+from waveform_reg_access_extractor.cli import get_protocol_parser
+from waveform_reg_access_extractor.config.signal_mapping import SignalMappingConfig
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser, interface_output_file
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+
+# An AHB and an APB interface sharing one clock, declared in two scopes
+SOC_VCD = """$timescale 1ns $end
+$scope module soc $end
+$var wire 1 ! clk $end
+$scope module cpu $end
+$var wire 2 " htrans[1:0] $end
+$var wire 32 # haddr[31:0] $end
+$var wire 1 $ hwrite $end
+$var wire 32 % hwdata[31:0] $end
+$var wire 32 & hrdata[31:0] $end
+$var wire 1 ' hready $end
+$upscope $end
+$scope module uart $end
+$var wire 1 ! clk $end
+$var wire 1 ( psel $end
+$var wire 1 ) penable $end
+$var wire 1 * pwrite $end
+$var wire 16 + paddr[15:0] $end
+$var wire 32 , pwdata[31:0] $end
+$var wire 32 - prdata[31:0] $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+b0 "
+b0 #
+0$
+b0 %
+b0 &
+1'
+0(
+0)
+0*
+b0 +
+b0 ,
+b0 -
+$end
+#5
+1!
+b10 "
+b100 #
+1$
+1(
+1*
+b10000 +
+b10101010 ,
+#10
+0!
+b0 "
+b11011110 %
+1)
+#15
+1!
+#20
+0!
+b10 "
+b1000 #
+0$
+0(
+0)
+#25
+1!
+#30
+0!
+b0 "
+b10111110 &
+1(
+0*
+b10100 +
+#35
+1!
+#40
+0!
+1)
+b1010101 -
+#45
+1!
+#50
+0!
+0(
+0)
+#55
+1!
+"""
+
+# A shared AHB bus with two masters (HMASTER) and two slave ports (HSEL)
+MATRIX_VCD = """$timescale 1ns $end
+$scope module mx $end
+$var wire 1 ! hclk $end
+$var wire 2 " htrans[1:0] $end
+$var wire 16 # haddr[15:0] $end
+$var wire 1 $ hwrite $end
+$var wire 8 % hwdata[7:0] $end
+$var wire 8 & hrdata[7:0] $end
+$var wire 2 ' hmaster[1:0] $end
+$var wire 1 ( hsel_sram $end
+$var wire 1 ) hsel_uart $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+b0 "
+b0 #
+0$
+b0 %
+b0 &
+b0 '
+0(
+0)
+$end
+#5
+b10 "
+b100000000 #
+1$
+1(
+#10
+1!
+#20
+0!
+#25
+b10000000000000 #
+0$
+b10101010 %
+b1 '
+0(
+1)
+#30
+1!
+#40
+0!
+#45
+b0 "
+0)
+b10111011 &
+#50
+1!
+#60
+0!
+"""
+
+MATRIX_CONFIG = """
+interconnects:
+  matrix:
+    protocol: ahb
+    signal_mappings:
+      hclk: "mx.hclk"
+      htrans: "mx.htrans"
+      haddr: "mx.haddr"
+      hwrite: "mx.hwrite"
+      hwdata: "mx.hwdata"
+      hrdata: "mx.hrdata"
+      hmaster: "mx.hmaster"
+      hsel: "mx.hsel_{port}"
+    ports: [sram, uart]
+    masters:
+      0: cpu
+      1: dma
+"""
+
+AHB_MAPPING = {"hclk": "soc.clk"}
+APB_MAPPING = {"pclk": "soc.uart.clk"}
+
+
+@pytest.fixture
+def soc_vcd():
+    """Write the two-interface VCD to a temporary file."""
+    fd, path = tempfile.mkstemp(suffix='.vcd')
+    with os.fdopen(fd, 'w') as f:
+        f.write(SOC_VCD)
+    yield path
+    for leftover in (path, path + ".idx"):
+        if os.path.exists(leftover):
+            os.unlink(leftover)
+
+
+def single_interface_transactions(protocol, path):
+    """Extract the transactions of one protocol on its own."""
+    parser = VCDParser(protocol)
+    return list(protocol.iter_transactions(parser.iter_clock_samples(path)))
+
+
+def interfaces():
+    """Build the protocol parsers of both interfaces."""
+    return {"cpu": AHBProtocol(AHB_MAPPING), "uart": APBProtocol(APB_MAPPING)}
+
+
+class TestInterfaceExtraction:
+    """Test cases for multi-interface extraction."""
+
+    @pytest.mark.parametrize("engine,jobs", [("pyvcd", 1), ("mmap", 1), ("mmap", 2)])
+    def test_interfaces_match_single_runs(self, soc_vcd, engine, jobs):
+        """Test that one pass per interface file matches extracting each interface alone."""
+        output_file = soc_vcd.replace(".vcd", ".json")
+        parser = VCDParser(AHBProtocol(AHB_MAPPING), engine=engine, jobs=jobs)
+        outputs = parser.parse_interfaces_and_save(soc_vcd, interfaces(), output_file)
+        try:
+            for name, protocol in interfaces().items():
+                assert outputs[name].output_file == interface_output_file(output_file, name)
+                with open(outputs[name].output_file) as f:
+                    data = json.load(f)
+                expected = single_interface_transactions(protocol, soc_vcd)
+                assert data["metadata"]["interface"] == name
+                assert data["transactions"] == expected
+                assert outputs[name].count == len(expected) > 0
+        finally:
+            for output in outputs.values():
+                os.unlink(output.output_file)
+
+    def test_merged_output_tagged_in_time_order(self, soc_vcd):
+        """Test that merged output tags every transaction and keeps time order."""
+        output_file = soc_vcd.replace(".vcd", ".json")
+        parser = VCDParser(AHBProtocol(AHB_MAPPING))
+        outputs = parser.parse_interfaces_and_save(soc_vcd, interfaces(), output_file, merge=True)
+        try:
+            with open(output_file) as f:
+                data = json.load(f)
+        finally:
+            os.unlink(output_file)
+        transactions = data["transactions"]
+        assert data["metadata"]["interfaces"] == {"cpu": "AHB", "uart": "APB"}
+        assert [t["Time"] for t in transactions] == sorted(t["Time"] for t in transactions)
+        assert {t["Interface"] for t in transactions} == {"cpu", "uart"}
+        assert {name: output.count for name, output in outputs.items()} == {
+            name: sum(t["Interface"] == name for t in transactions) for name in ("cpu", "uart")}
+        assert len(transactions) == sum(len(single_interface_transactions(p, soc_vcd))
+                                        for p in interfaces().values())
+
+    def test_aliased_clock_sampled_for_both(self, soc_vcd):
+        """Test that two names of the same clock variable both sample their interface."""
+        parser = VCDParser(AHBProtocol(AHB_MAPPING), start_time=10)
+        samples = parser.iter_interface_samples(soc_vcd, interfaces())
+        cpu = list(samples["cpu"])
+        uart = list(samples["uart"])
+        assert [s["timestamp"] for s in cpu] == [15, 25, 35, 45, 55]
+        assert [s["timestamp"] for s in uart] == [15, 25, 35, 45, 55]
+        assert uart[0]["paddr"] == "0x10"
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes not supported")
+    @pytest.mark.parametrize("engine", ["pyvcd", "mmap"])
+    def test_interfaces_from_named_pipe(self, soc_vcd, tmp_path, engine):
+        """Test that all interfaces are extracted from a named pipe that can only be read once."""
+        pipe = str(tmp_path / "soc.pipe")
+        os.mkfifo(pipe)
+
+        def write():
+            with open(pipe, "w") as f:
+                f.write(SOC_VCD)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        parser = VCDParser(AHBProtocol(AHB_MAPPING), engine=engine, jobs=2)
+        samples = parser.iter_interface_samples(pipe, interfaces())
+        transactions = {name: list(protocol.iter_transactions(samples[name]))
+                        for name, protocol in interfaces().items()}
+        writer.join()
+        for name, protocol in interfaces().items():
+            assert transactions[name] == single_interface_transactions(protocol, soc_vcd)
+
+    def test_interconnect_ports_tagged(self, tmp_path):
+        """Test that the slave ports of an interconnect are extracted in one pass and tagged with their master."""
+        waveform = tmp_path / "matrix.vcd"
+        waveform.write_text(MATRIX_VCD)
+        config_file = tmp_path / "matrix.yaml"
+        config_file.write_text(MATRIX_CONFIG)
+        ports = {port.name: get_protocol_parser(port.protocol, port.signal_mappings, masters=port.masters)
+                 for port in SignalMappingConfig(str(config_file)).get_interfaces()}
+        output_file = str(tmp_path / "matrix.json")
+        parser = VCDParser(next(iter(ports.values())))
+        outputs = parser.parse_interfaces_and_save(str(waveform), ports, output_file, merge=True)
+        with open(output_file) as f:
+            transactions = json.load(f)["transactions"]
+        assert [(t["Interface"], t["Time"], t["Address"], t["Operation"], t["Master"], t["Value"])
+                for t in transactions] == [
+            ("sram", 10, "0x100", "Write", "cpu", "0xaa"),
+            ("uart", 30, "0x2000", "Read", "dma", "0xbb"),
+        ]
+        assert {name: output.count for name, output in outputs.items()} == {"sram": 1, "uart": 1}
+
+    @pytest.mark.parametrize("mapped", [False, True])
+    def test_hsel_and_hmaster_only_when_mapped(self, tmp_path, mapped):
+        """Test that HSEL and HMASTER found in the hierarchy are only used when mapped explicitly."""
+        waveform = tmp_path / "matrix.vcd"
+        waveform.write_text(MATRIX_VCD.replace("hsel_sram", "hsel"))
+        mapping = {signal: f"mx.{signal}" for signal in ("hclk", "htrans", "haddr", "hwrite", "hwdata", "hrdata")}
+        if mapped:
+            mapping.update(hsel="hsel", hmaster="hmaster")
+        protocol = AHBProtocol(mapping)
+        parser = VCDParser(protocol)
+        transactions = single_interface_transactions(protocol, str(waveform))
+        assert transactions == list(protocol.iter_transactions(parser.sample_clock(
+            parser.parse_waveform(str(waveform)))))
+        if mapped:
+            assert [(t["Address"], t["Master"]) for t in transactions] == [("0x100", 0)]
+        else:
+            assert [t["Address"] for t in transactions] == ["0x100", "0x2000"]
+            assert all("Master" not in t for t in transactions)
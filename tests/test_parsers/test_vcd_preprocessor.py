@@ -0,0 +1,85 @@
+"""Tests for the streaming NVC preprocessing reader."""
+
+import io
+import pytest
+from vcd.reader import tokenize, TokenKind
+
+from waveform_reg_access_extractor.parsers.vcd_preprocessor import NVCPreprocessingReader
+
+
+NVC_VCD = b"""$timescale
+	1fs
+$end
+$attrbegin misc 03 tb_top.vhd 1 $end
+$scope vhdl_architecture tb_top $end
+$attrbegin misc 02 STD_LOGIC 1030 $end
+$var logic 1 ! clk $end
+$var logic 4 U data[3:0] $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+u!
+bUU00 U
+$end
+#5
+1!
+b0101 U
+"""
+
+
+class TestNVCPreprocessingReader:
+    """Test cases for NVC preprocessing reader."""
+
+    def read_all(self, data: bytes, chunk_size: int = 1 << 20) -> bytes:
+        """Run data through the reader and return the filtered bytes."""
+        reader = NVCPreprocessingReader(io.BytesIO(data), chunk_size=chunk_size)
+        return reader.read()
+
+    def test_strips_attr_directives(self):
+        """Test that $attrbegin lines are removed."""
+        filtered = self.read_all(NVC_VCD)
+        assert b"$attrbegin" not in filtered
+
+    def test_renames_vhdl_architecture(self):
+        """Test that vhdl_architecture scopes become module scopes."""
+        filtered = self.read_all(NVC_VCD)
+        assert b"vhdl_architecture" not in filtered
+        assert b"$scope module tb_top $end" in filtered
+
+    def test_replaces_uninitialized_values_only(self):
+        """Test that u/U values become X while id codes are left untouched."""
+        filtered = self.read_all(NVC_VCD)
+        assert b"X!\n" in filtered
+        assert b"bXX00 U\n" in filtered
+        # Header lines are not rewritten
+        assert b"$var logic 4 U data[3:0] $end" in filtered
+
+    @pytest.mark.parametrize("chunk_size", [1, 16, 1 << 20])
+    def test_id_codes_with_u(self, chunk_size):
+        """Test that value changes of ids containing u/U keep their id codes."""
+        data = b"#10\n0u\n1U\nUu\nb1 u\nbu1 U\nr1.5 uU\n#20\nb01 Uu\n"
+        reader = NVCPreprocessingReader(io.BytesIO(data), chunk_size=chunk_size,
+                                        in_value_changes=True)
+        assert reader.read() == (
+            b"#10\n0u\n1U\nXu\nb1 u\nbX1 U\nr1.5 uU\n#20\nb01 Uu\n"
+        )
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_chunk_boundaries(self, chunk_size):
+        """Test that output does not depend on how the input is chunked."""
+        assert self.read_all(NVC_VCD, chunk_size) == self.read_all(NVC_VCD)
+
+    def test_missing_trailing_newline(self):
+        """Test that a final line without newline is still emitted."""
+        filtered = self.read_all(NVC_VCD + b"#10")
+        assert filtered.endswith(b"#10")
+
+    def test_tokenizer_reads_from_reader(self):
+        """Test that vcd.reader can tokenize the filtered stream directly."""
+        reader = NVCPreprocessingReader(io.BytesIO(NVC_VCD), chunk_size=16)
+        changes = [token.data for token in tokenize(reader)
+                   if token.kind in (TokenKind.CHANGE_SCALAR, TokenKind.CHANGE_VECTOR)]
+        assert changes[0].value == "X"
+        assert changes[1].value == "XX00"
+        assert changes[-1].value == 5
@@ -0,0 +1,161 @@
+"""Tests for the memory-mapped VCD scanner."""
+
+import pytest
+import tempfile
+import os
+
+from waveform_reg_access_extractor.parsers.vcd_scanner import (
+    MmapVCDScanner,
+    ScannerFallback,
+    parse_header,
+    scan_body,
+)
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+
+APB_VCD = """$timescale 1ns $end
+$scope module tb_top $end
+$var wire 1 ! pclk $end
+$var wire 1 " psel $end
+$var wire 1 # penable $end
+$var wire 1 $ pwrite $end
+$var wire 16 % paddr [15:0] $end
+$var wire 32 & pwdata[31:0] $end
+$var wire 32 ' prdata[31:0] $end
+$var wire 8 ( unrelated[7:0] $end
+$scope module dut $end
+$var wire 1 ) internal $end
+$upscope $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+0#
+0$
+bx %
+b0 &
+b0 '
+b0 (
+u)
+$end
+#5
+1!
+1"
+1$
+b1000 %
+b10101010 &
+b11 (
+#10
+0!
+1#
+#15
+1!
+b111 (
+#20
+0!
+0"
+0#
+"""
+
+
+class TestMmapVCDScanner:
+    """Test cases for the mmap scanner."""
+
+    def create_test_vcd_file(self, content: str) -> str:
+        """Create a temporary VCD file for testing."""
+        fd, path = tempfile.mkstemp(suffix='.vcd')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            return path
+        except Exception:
+            os.close(fd)
+            raise
+
+    def test_parse_header(self):
+        """Test header parsing including scopes and bit indices."""
+        header = parse_header(APB_VCD.encode())
+        names = {var.reference: var for var in header.variables}
+
+        assert header.timescale == "1ns"
+        assert names["paddr"].size == 16
+        assert names["pwdata"].id_code == "&"
+        assert names["internal"].scope == ("tb_top", "dut")
+        assert APB_VCD.encode()[header.body_offset:].startswith(b"\n#0")
+
+    def test_scan_body_decodes_mapped_ids_only(self):
+        """Test that only mapped id codes are recorded."""
+        data = b"#0\nb101 %\nb11 (\n1!\n#5\nux\n"
+        blocks = scan_body(data, {b"%": "paddr", b"!": "pclk"})
+
+        assert blocks == [(0, {"paddr": 5, "pclk": "1"}), (5, {})]
+
+    def test_scan_body_non_binary_vector(self):
+        """Test that vectors with x/z/u states are kept as strings."""
+        blocks = scan_body(b"#0\nbx1u %\n", {b"%": "paddr"})
+        assert blocks == [(0, {"paddr": "x1X"})]
+
+    def test_scan_body_fallback_on_comment(self):
+        """Test that unsupported body constructs request a fallback."""
+        with pytest.raises(ScannerFallback):
+            scan_body(b"#0\n$comment hello $end\n", {})
+
+    def test_windows_split_at_timestamps(self):
+        """Test that scan windows never split a timestamp block."""
+        test_file = self.create_test_vcd_file(APB_VCD)
+        try:
+            with MmapVCDScanner(test_file, window_size=8) as scanner:
+                for start, end in scanner.iter_windows():
+                    if start != scanner.header.body_offset:
+                        assert scanner._map[start:start + 1] == b"#"
+        finally:
+            os.unlink(test_file)
+
+    @pytest.mark.parametrize("content", [
+        APB_VCD,
+        # A comment in the value change section forces a pyvcd fallback
+        APB_VCD.replace("#15\n", "#15\n$comment mid-run note $end\n"),
+    ])
+    def test_engines_produce_identical_items(self, content):
+        """Test that the mmap engine matches the pyvcd engine."""
+        test_file = self.create_test_vcd_file(content)
+        try:
+            pyvcd_items = VCDParser(APBProtocol(), engine="pyvcd").parse_vcd_file(test_file)
+            mmap_items = VCDParser(APBProtocol(), engine="mmap").parse_vcd_file(test_file)
+            assert mmap_items == pyvcd_items
+            assert len(mmap_items) == 5
+        finally:
+            os.unlink(test_file)
+
+    def test_split_body_covers_body(self):
+        """Test that body ranges are contiguous and start on timestamps."""
+        test_file = self.create_test_vcd_file(APB_VCD)
+        try:
+            with MmapVCDScanner(test_file) as scanner:
+                ranges = scanner.split_body(4)
+                assert ranges[0][0] == scanner.header.body_offset
+                assert ranges[-1][1] == scanner.size
+                for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                    assert end == start
+                    assert scanner._map[start:start + 1] == b"#"
+        finally:
+            os.unlink(test_file)
+
+    @pytest.mark.parametrize("engine", ["pyvcd", "mmap"])
+    def test_parallel_parse_matches_serial(self, engine):
+        """Test that parsing byte ranges in worker processes matches a serial parse."""
+        test_file = self.create_test_vcd_file(APB_VCD)
+        try:
+            serial_items = VCDParser(APBProtocol(), engine="pyvcd").parse_vcd_file(test_file)
+            parallel_items = VCDParser(APBProtocol(), engine=engine, jobs=2).parse_vcd_file(test_file)
+            assert parallel_items == serial_items
+        finally:
+            os.unlink(test_file)
+
+    def test_invalid_engine(self):
+        """Test that unknown engines are rejected."""
+        with pytest.raises(ValueError):
+            VCDParser(APBProtocol(), engine="unknown")
@@ -0,0 +1,288 @@
+"""Tests for the columnar waveform store."""
+
+import json
+import os
+import tempfile
+import pytest
+
+from waveform_reg_access_extractor.parsers import waveform_store
+from waveform_reg_access_extractor.parsers.waveform_store import WaveformStore
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+
+AHB_VCD = """$timescale 1ns $end
+$scope module tb_top $end
+$var wire 1 ! hclk $end
+$var wire 2 " htrans[1:0] $end
+$var wire 32 # haddr[31:0] $end
+$var wire 1 $ hwrite $end
+$var wire 32 % hwdata[31:0] $end
+$var wire 32 & hrdata[31:0] $end
+$var wire 1 ' hready $end
+$var wire 1 ( hresp $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+b0 "
+b0 #
+0$
+b0 %
+b0 &
+1'
+0(
+$end
+#5
+1!
+b10 "
+b100 #
+1$
+#10
+0!
+b0 "
+b11011110 %
+#15
+1!
+#20
+0!
+b10 "
+b1000 #
+0$
+#25
+1!
+#30
+0!
+b0 "
+0'
+#35
+1!
+#40
+0!
+1'
+b10111110 &
+#45
+1!
+"""
+
+APB_VCD = """$timescale 1ns $end
+$scope module tb_top $end
+$var wire 1 ! pclk $end
+$var wire 1 " psel $end
+$var wire 1 # penable $end
+$var wire 1 $ pwrite $end
+$var wire 16 % paddr [15:0] $end
+$var wire 32 & pwdata[31:0] $end
+$var wire 32 ' prdata[31:0] $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+0#
+0$
+b0 %
+b0 &
+b0 '
+$end
+#5
+1!
+1"
+1$
+b1000 %
+b10101010 &
+#10
+0!
+1#
+#15
+1!
+#20
+0!
+0"
+0#
+#25
+1!
+#30
+0!
+1"
+0$
+b1100 %
+#35
+1!
+#40
+0!
+1#
+b1111 '
+#45
+1!
+"""
+
+
+def create_test_vcd_file(content: str) -> str:
+    """Create a temporary VCD file for testing."""
+    fd, path = tempfile.mkstemp(suffix='.vcd')
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    return path
+
+
+class TestWaveformStore:
+    """Test cases for the columnar waveform store."""
+
+    @pytest.fixture(params=["numpy", "python"], autouse=True)
+    def backend(self, request, monkeypatch):
+        """Run every test with and without the NumPy backing."""
+        if request.param == "numpy" and waveform_store.np is None:
+            pytest.skip("NumPy is not installed")
+        if request.param == "python":
+            monkeypatch.setattr(waveform_store, "np", None)
+        return request.param
+
+    def build_store(self) -> WaveformStore:
+        """Build a small store with a clock and a data bus."""
+        store = WaveformStore(["clk", "data", "unused"])
+        store.append(0, {"clk": "0", "data": 1})
+        store.append(5, {"clk": "1"})
+        store.append(7, {"data": 2})
+        store.append(10, {"clk": "0", "data": 3})
+        store.append(15, {"clk": "1"})
+        return store.finish()
+
+    def test_positions_where(self):
+        """Test that runs of a value expand to every timestamp they cover."""
+        store = self.build_store()
+        assert store.positions_where("clk", "1") == [1, 2, 4]
+        assert store.positions_where("unused", "1") == []
+
+    def test_sample(self):
+        """Test sampling values at timestamp positions."""
+        store = self.build_store()
+        assert store.sample("data", [1, 2, 4]) == [1, 2, 3]
+        assert store.sample("unused", [0, 1]) == [None, None]
+        assert store.timestamps_at([1, 2, 4]) == [5, 7, 15]
+
+    def test_rising_edges(self):
+        """Test that only 0 -> 1 transitions count as rising edges."""
+        store = WaveformStore(["clk"])
+        for time, value in enumerate(["1", "0", "1", "1", "x", "1", "0", "1"]):
+            store.append(time, {"clk": value})
+        store.finish()
+        assert store.rising_edges("clk") == [2, 7]
+        assert store.rising_edges("unused") == []
+
+    def test_duplicate_timestamps_merged(self):
+        """Test that repeated timestamps merge into their first occurrence."""
+        store = WaveformStore(["a"])
+        store.append(0, {"a": "0"})
+        store.append(5, {"a": "1"})
+        store.append(5, {"a": "x"})
+        store.append(0, {"a": "z"})
+        store.finish()
+        assert len(store) == 2
+        assert store.sample("a", [0, 1]) == ["z", "x"]
+
+    def test_initial_value_is_final_value(self):
+        """Test that a signal reads as its final value before its first change."""
+        store = WaveformStore(["a", "b"])
+        store.append(0, {"a": "0"})
+        store.append(5, {"b": 7})
+        store.finish()
+        assert store.to_data_items() == [
+            {"a": "0", "b": 7, "timestamp": 0},
+            {"a": "0", "b": 7, "timestamp": 5},
+        ]
+
+    def test_wide_vectors_round_trip(self):
+        """Test that values wider than 64 bits are kept exactly."""
+        store = WaveformStore(["wide"])
+        store.append(0, {"wide": 1 << 80})
+        store.append(5, {"wide": "x"})
+        store.finish()
+        assert store.sample("wide", [0, 1]) == [1 << 80, "x"]
+
+    @pytest.mark.parametrize("protocol_class,content", [
+        (AHBProtocol, AHB_VCD),
+        (APBProtocol, APB_VCD),
+    ])
+    def test_filter_waveform_matches_data_items(self, protocol_class, content):
+        """Test that sampling the store finds the same transactions as full data items."""
+        test_file = create_test_vcd_file(content)
+        try:
+            parser = VCDParser(protocol_class())
+            expected = parser.filter_transactions(parser.convert_to_hex(parser.parse_vcd_file(test_file)))
+            transactions = parser.filter_waveform(parser.parse_waveform(test_file))
+            assert transactions == expected
+            assert transactions
+        finally:
+            os.unlink(test_file)
+
+    @pytest.mark.parametrize("sampling,count", [("edge", 5), ("level", 6)])
+    def test_sampling_modes(self, sampling, count):
+        """Test that edge sampling skips changes while the clock stays high."""
+        # hwdata changes at #7, between the rising edge at #5 and the falling edge at #10
+        test_file = create_test_vcd_file(AHB_VCD.replace("#10\n", "#7\nb1 %\n#10\n"))
+        try:
+            parser = VCDParser(AHBProtocol(), sampling=sampling)
+            samples = parser.sample_clock(parser.parse_waveform(test_file))
+            assert len(samples) == count
+            assert samples[0]['timestamp'] == 5
+            assert samples[0]['htrans'] == 2
+        finally:
+            os.unlink(test_file)
+
+    def test_invalid_sampling_mode(self):
+        """Test that unknown sampling modes are rejected."""
+        with pytest.raises(ValueError):
+            VCDParser(AHBProtocol(), sampling="falling")
+
+
+class TestStreamingPipeline:
+    """Test cases for streaming samples and transactions without a store."""
+
+    @pytest.mark.parametrize("sampling", ["edge", "level"])
+    @pytest.mark.parametrize("protocol_class,content", [
+        (AHBProtocol, AHB_VCD),
+        (APBProtocol, APB_VCD),
+    ])
+    def test_streamed_samples_match_store(self, protocol_class, content, sampling):
+        """Test that streamed clock samples equal the samples taken from the store."""
+        test_file = create_test_vcd_file(content.replace("#10\n", "#7\nb1 %\n#10\n"))
+        try:
+            parser = VCDParser(protocol_class(), sampling=sampling)
+            expected = parser.sample_clock(parser.parse_waveform(test_file))
+            assert list(parser.iter_clock_samples(test_file)) == expected
+        finally:
+            os.unlink(test_file)
+
+    def test_iter_transactions_drops_repeats(self):
+        """Test that only back-to-back repeats of a transaction are dropped."""
+        protocol = APBProtocol()
+        read = {"Operation": "Read", "Address": "0x8", "Value": "0x0", "Time": 15}
+        write = {"Operation": "Write", "Address": "0x8", "Value": "0x1", "Time": 35}
+        extracted = [read, dict(read, Time=25, WaitState=1), write, dict(read, Time=55)]
+        protocol._iter_extracted_transactions = lambda samples: iter(extracted)
+        transactions = list(protocol.iter_transactions([]))
+        assert [t["Time"] for t in transactions] == [15, 35, 55]
+
+    @pytest.mark.parametrize("content", [AHB_VCD, AHB_VCD.replace("b10 \"", "b0 \"")])
+    def test_saved_json_matches_json_dump(self, content):
+        """Test that the incremental writer produces the same file as json.dump."""
+        test_file = create_test_vcd_file(content)
+        output_file = test_file.replace(".vcd", ".json")
+        try:
+            parser = VCDParser(AHBProtocol())
+            transactions = parser.filter_waveform(parser.parse_waveform(test_file))
+            parser.parse_and_save(test_file, output_file)
+            expected = {
+                "metadata": {"parser_version": "0.1.0", "protocol": "AHB", "source_file": test_file},
+                "transactions": transactions,
+            }
+            with open(output_file) as f:
+                assert f.read() == json.dumps(expected, indent=2)
+        finally:
+            os.unlink(test_file)
+            if os.path.exists(output_file):
+                os.unlink(output_file)
@@ -0,0 +1,56 @@
+"""Clock samples of AHB and APB transfers shared by the protocol conformance tests."""
+
+
+def ahb(timestamp, htrans=0, haddr=0, hwrite="0", hwdata=0, hrdata=0, hready="1", hresp=0, hburst=1, hsize=2):
+    """Build a raw AHB clock sample."""
+    return {"hclk": "1", "htrans": htrans, "haddr": haddr, "hwrite": hwrite, "hwdata": hwdata,
+            "hrdata": hrdata, "hready": hready, "hresp": hresp, "hburst": hburst, "hsize": hsize,
+            "timestamp": timestamp}
+
+
+def apb(timestamp, psel="1", penable="1", paddr=0, pwrite="0", pwdata=0, prdata=0, pready="1", pslverr="0"):
+    """Build a raw APB clock sample."""
+    return {"pclk": "1", "psel": psel, "penable": penable, "paddr": paddr, "pwrite": pwrite,
+            "pwdata": pwdata, "prdata": prdata, "pready": pready, "pslverr": pslverr,
+            "timestamp": timestamp}
+
+
+AHB_CASES = {
+    "back_to_back": [ahb(10, 2, 0x10, "1"), ahb(20, 2, 0x14, hwdata=0x11), ahb(30, hrdata=0x22)],
+    "wait_states": [ahb(0, 2, 0x20)] + [ahb(10 * k, hready="0") for k in range(1, 40)]
+                   + [ahb(400, hrdata=0xcafe, hresp=1), ahb(410)],
+    "extended_address": [ahb(10, 2, 0x30), ahb(20, 2, 0x34, hready="0"), ahb(30, 2, 0x34, hrdata=0x30),
+                         ahb(40, hrdata=0x34)],
+    "ends_in_data_phase": [ahb(10, 3, 0x40), ahb(20, hready="0"), ahb(30, hready="0")],
+    "ends_at_address_phase": [ahb(10), ahb(20, 2, 0x50)],
+    "repeated": [ahb(10, 2, 0x60), ahb(20, 2, 0x60, hrdata=7), ahb(30, hrdata=7)],
+    "idle": [ahb(10 * k) for k in range(5)],
+    "bursts": [ahb(10, 2, 0x38, hburst=2), ahb(20, 3, 0x3C, hburst=2, hrdata=1),
+               ahb(30, 3, 0x30, hburst=2, hrdata=2, hready="0"), ahb(40, 3, 0x30, hburst=2, hrdata=2),
+               ahb(50, 3, 0x34, hburst=2, hrdata=3), ahb(60, 2, 0x80, "1", hburst=3, hrdata=4),
+               ahb(70, 3, 0x84, "1", hburst=3, hwdata=5), ahb(80, 3, 0x90, "1", hburst=3, hwdata=6),
+               ahb(90, hwdata=7)],
+}
+
+APB_CASES = {
+    "back_to_back": [apb(10, penable="0", paddr=0x10, pwrite="1", pwdata=0x11),
+                     apb(20, paddr=0x10, pwrite="1", pwdata=0x11),
+                     apb(30, penable="0", paddr=0x14), apb(40, paddr=0x14, prdata=0x22)],
+    "long_stall": [apb(0, penable="0", paddr=0x20)] + [apb(10 * k, paddr=0x20, pready="0") for k in range(1, 300)]
+                  + [apb(3000, paddr=0x20, prdata=0xcafe, pslverr="1"), apb(3010, psel="0")],
+    "consecutive_access": [apb(10, paddr=0x30, prdata=1), apb(20, paddr=0x34, prdata=2),
+                           apb(30, paddr=0x38, pready="0"), apb(40, paddr=0x38, prdata=3)],
+    "left_while_waiting": [apb(10, paddr=0x40, pready="0"), apb(20, paddr=0x40, pready="0"),
+                           apb(30, psel="0"), apb(40, paddr=0x44, prdata=4)],
+    "ends_in_wait_state": [apb(10, penable="0"), apb(20, paddr=0x50, pready="0")],
+    "idle": [apb(10 * k, psel="0", penable="0") for k in range(5)],
+}
+
+
+def to_columns(protocol, samples, dtype):
+    """Turn samples into sample rows and NumPy columns of the protocol's layout."""
+    import numpy as np
+
+    rows = [protocol.layout.from_sample(sample) for sample in samples]
+    columns = [np.array(column, dtype=dtype) for column in zip(*rows)]
+    return rows, columns
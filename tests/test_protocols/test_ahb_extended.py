@@ -1,7 +1,7 @@
 """Extended tests for AHB protocol implementation."""
 
 import pytest
-from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol, burst_beat_addresses
 
 
 class TestAHBProtocolExtended:
@@ -193,3 +193,192 @@ class TestAHBProtocolExtended:
         
         assert protocol.is_valid_transaction(data_item) is True
 
+
+
+def ahb_sample(timestamp, htrans=0, haddr="0x0", hwrite="0", hwdata="0x0", hrdata="0x0",
+               hready="1", hresp=0, hburst=None, hsize=None, hsel=None, hmaster=None):
+    """Build a clock sample keyed by standard AHB signal names."""
+    return {"hclk": "1", "htrans": htrans, "haddr": haddr, "hwrite": hwrite, "hwdata": hwdata,
+            "hrdata": hrdata, "hready": hready, "hresp": hresp, "hburst": hburst, "hsize": hsize,
+            "hsel": hsel, "hmaster": hmaster, "timestamp": timestamp}
+
+
+def burst_samples(start_time, addresses, hburst, hsize=2, hwrite="0", data=0x100):
+    """Build the pipelined samples of a burst; beat k carries data + k."""
+    samples = []
+    for beat, address in enumerate(addresses):
+        value = hex(data + beat - 1) if beat else "0x0"
+        samples.append(ahb_sample(start_time + 10 * beat, htrans=3 if beat else 2, haddr=hex(address),
+                                  hwrite=hwrite, hwdata=value, hrdata=value, hburst=hburst, hsize=hsize))
+    return samples
+
+
+class TestAHBPipeline:
+    """Test cases for the AHB-Lite pipeline state machine."""
+
+    def test_back_to_back_transfers(self):
+        """Test that an address phase overlapping the previous data phase is extracted."""
+        samples = [
+            ahb_sample(10, htrans=2, haddr="0x10", hwrite="1"),
+            ahb_sample(20, htrans=2, haddr="0x14", hwdata="0x1111"),
+            ahb_sample(30, hrdata="0x2222"),
+        ]
+        transactions = list(AHBProtocol().iter_transactions(samples))
+        assert [(t["Time"], t["Address"], t["Operation"], t["Value"]) for t in transactions] == [
+            (10, "0x10", "Write", "0x1111"),
+            (20, "0x14", "Read", "0x2222"),
+        ]
+
+    def test_unbounded_wait_states(self):
+        """Test that the data phase is found after any number of wait states."""
+        samples = [ahb_sample(0, htrans=2, haddr="0x20")]
+        samples += [ahb_sample(10 * k, hready="0", hrdata="0xbad") for k in range(1, 21)]
+        samples.append(ahb_sample(210, hrdata="0xcafe", hresp=1))
+        transactions = list(AHBProtocol().iter_transactions(samples))
+        assert len(transactions) == 1
+        assert transactions[0]["Value"] == "0xcafe"
+        assert transactions[0]["Response"] == "ERROR"
+
+    def test_address_phase_extended_by_wait_state(self):
+        """Test that an address phase is only taken once HREADY is high."""
+        samples = [
+            ahb_sample(10, htrans=2, haddr="0x30"),
+            ahb_sample(20, htrans=2, haddr="0x34", hready="0"),
+            ahb_sample(30, htrans=2, haddr="0x34", hrdata="0x3030"),
+            ahb_sample(40, hrdata="0x3434"),
+        ]
+        transactions = list(AHBProtocol().iter_transactions(samples))
+        assert [(t["Time"], t["Address"], t["Value"]) for t in transactions] == [
+            (10, "0x30", "0x3030"),
+            (30, "0x34", "0x3434"),
+        ]
+
+    def test_waveform_ends_in_data_phase(self):
+        """Test that a transfer still waiting at the end of the waveform is reported as a wait state."""
+        samples = [ahb_sample(10, htrans=2, haddr="0x40"), ahb_sample(20, hready="0")]
+        transactions = list(AHBProtocol().iter_transactions(samples))
+        assert len(transactions) == 1
+        assert transactions[0]["Value"] is None
+        assert transactions[0]["WaitState"] is True
+
+
+class TestAHBPorts:
+    """Test cases for the slave and master tagging of interconnect ports."""
+
+    def test_unselected_transfers_ignored(self):
+        """Test that a slave port only takes transfers with HSEL high."""
+        samples = [
+            ahb_sample(10, htrans=2, haddr="0x10", hsel="1"),
+            ahb_sample(20, htrans=2, haddr="0x14", hsel="0", hrdata="0x1010"),
+            ahb_sample(30, hsel="0", hrdata="0x1414"),
+        ]
+        transactions = list(AHBProtocol().iter_transactions(samples))
+        assert [(t["Address"], t["Value"]) for t in transactions] == [("0x10", "0x1010")]
+        assert not AHBProtocol().is_valid_transaction(samples[1])
+
+    def test_master_names(self):
+        """Test tagging transactions with the master that drove their address phase."""
+        samples = [
+            ahb_sample(10, htrans=2, haddr="0x10", hmaster=1),
+            ahb_sample(20, htrans=2, haddr="0x14", hmaster=2),
+            ahb_sample(30, htrans=2, haddr="0x18", hmaster=3),
+            ahb_sample(40),
+        ]
+        transactions = list(AHBProtocol(masters={1: "cpu", 2: "dma"}).iter_transactions(samples))
+        assert [t["Master"] for t in transactions] == ["cpu", "dma", 3]
+
+
+class TestSampleLayout:
+    """Test cases for the positional sample layout of a protocol."""
+
+    def test_rows_from_mapped_data_items(self):
+        """Test converting data items with custom signal names into rows and back."""
+        protocol = AHBProtocol(signal_mapping={"hclk": "clk", "haddr": "ahb_addr"})
+        layout = protocol.layout
+        row = layout.from_data_item({"clk": "1", "htrans": 2, "ahb_addr": 0x40, "hwrite": "1", "timestamp": 10})
+        assert len(row) == len(layout.names) + 1
+        assert row[layout.slots["haddr"]] == 0x40
+        assert row[layout.slots["hready"]] is None
+        assert row[layout.timestamp] == 10
+        sample = layout.to_sample(row, protocol.get_hex_signals())
+        assert sample["haddr"] == "0x40"
+        assert sample["htrans"] == 2
+        assert layout.from_sample(sample)[layout.slots["haddr"]] == "0x40"
+
+    def test_rows_match_samples(self):
+        """Test that raw rows and hex-formatted samples give the same transactions."""
+        samples = [
+            ahb_sample(10, htrans=2, haddr=0x10, hwrite="1"),
+            ahb_sample(20, htrans=2, haddr=0x14, hwdata=0x1111),
+            ahb_sample(30, hrdata=0x2222, hresp=1),
+        ]
+        protocol = AHBProtocol()
+        rows = [protocol.layout.from_sample(sample) for sample in samples]
+        hex_samples = [protocol.layout.to_sample(row, protocol.get_hex_signals()) for row in rows]
+        transactions = list(protocol.iter_row_transactions(rows))
+        assert transactions == list(protocol.iter_transactions(hex_samples))
+        assert [(t["Address"], t["Value"], t["Response"]) for t in transactions] == [
+            ("0x10", "0x1111", "OKAY"),
+            ("0x14", "0x2222", "ERROR"),
+        ]
+
+
+class TestAHBBursts:
+    """Test cases for AHB burst decoding."""
+
+    @pytest.mark.parametrize("start,burst,size,expected", [
+        (0x38, "INCR4", 4, [0x38, 0x3C, 0x40, 0x44]),
+        (0x38, "WRAP4", 4, [0x38, 0x3C, 0x30, 0x34]),
+        (0x34, "WRAP8", 2, [0x34, 0x36, 0x38, 0x3A, 0x3C, 0x3E, 0x30, 0x32]),
+    ])
+    def test_beat_addresses(self, start, burst, size, expected):
+        """Test generating incrementing and wrapping beat addresses."""
+        assert burst_beat_addresses(start, burst, size) == expected
+
+    def test_grouped_bursts(self):
+        """Test grouping an INCR4 write burst and a WRAP4 read burst into burst records."""
+        samples = burst_samples(10, [0x10, 0x14, 0x18, 0x1C], hburst=3, hwrite="1")
+        samples += burst_samples(50, [0x38, 0x3C, 0x30, 0x34], hburst=2, data=0x200)
+        samples.append(ahb_sample(90, hwdata="0x203", hrdata="0x203"))
+        records = list(AHBProtocol(burst_mode="grouped").iter_transactions(samples))
+        assert [(r["Time"], r["Address"], r["Operation"], r["Burst"], r["Size"]) for r in records] == [
+            (10, "0x10", "Write", "INCR4", 4),
+            (50, "0x38", "Read", "WRAP4", 4),
+        ]
+        assert [beat["Value"] for beat in records[1]["Beats"]] == ["0x200", "0x201", "0x202", "0x203"]
+        assert records[0]["Beats"][0] == {"Time": 10, "Value": "0x100", "Response": "OKAY"}
+
+    def test_flat_mode(self):
+        """Test that flat mode reports every beat as a transaction of its own."""
+        samples = burst_samples(10, [0x38, 0x3C, 0x30, 0x34], hburst=2)
+        samples.append(ahb_sample(50, hrdata="0x103"))
+        transactions = list(AHBProtocol().iter_transactions(samples))
+        assert [(t["Address"], t["Value"]) for t in transactions] == [
+            ("0x38", "0x100"), ("0x3c", "0x101"), ("0x30", "0x102"), ("0x34", "0x103"),
+        ]
+
+    def test_unexpected_beat_address(self, caplog):
+        """Test that a SEQ beat at an unexpected address ends the burst and is reported on its own."""
+        samples = burst_samples(10, [0x10, 0x14, 0x24], hburst=3)
+        samples.append(ahb_sample(40, hrdata="0x102"))
+        records = list(AHBProtocol(burst_mode="grouped").iter_transactions(samples))
+        assert len(records) == 2
+        assert [beat["Value"] for beat in records[0]["Beats"]] == ["0x100", "0x101"]
+        assert records[1]["Address"] == "0x24"
+        assert "does not continue a burst" in caplog.text
+
+    def test_undefined_length_without_hburst(self):
+        """Test that beats following a NONSEQ transfer are grouped when HBURST is not recorded."""
+        samples = burst_samples(10, [0x100, 0x104, 0x108], hburst=None, hsize=None)
+        samples.append(ahb_sample(40, htrans=2, haddr="0x200", hrdata="0x102"))
+        samples.append(ahb_sample(50, hrdata="0x300"))
+        records = list(AHBProtocol(burst_mode="grouped").iter_transactions(samples))
+        assert records[0]["Burst"] == "INCR"
+        assert len(records[0]["Beats"]) == 3
+        assert "Beats" not in records[1]
+        assert records[1]["Value"] == "0x300"
+
+    def test_invalid_burst_mode(self):
+        """Test that an unknown burst mode is rejected."""
+        with pytest.raises(ValueError):
+            AHBProtocol(burst_mode="nested")
@@ -211,3 +211,59 @@ class TestAPBProtocol:
         expected_hex = ["paddr", "pwdata", "prdata"]
         assert protocol.get_hex_signals() == expected_hex
 
+
+
+def apb_sample(timestamp, psel="1", penable="1", paddr="0x0", pwrite="0", pwdata="0x0",
+               prdata="0x0", pready="1", pslverr="0"):
+    """Build a clock sample keyed by standard APB signal names."""
+    return {"pclk": "1", "psel": psel, "penable": penable, "paddr": paddr, "pwrite": pwrite,
+            "pwdata": pwdata, "prdata": prdata, "pready": pready, "pslverr": pslverr,
+            "timestamp": timestamp}
+
+
+class TestAPBStateMachine:
+    """Test cases for the APB SETUP/ACCESS state machine."""
+
+    def test_back_to_back_transfers(self):
+        """Test transfers whose SETUP follows the previous ACCESS directly."""
+        samples = [
+            apb_sample(10, penable="0", paddr="0x10", pwrite="1", pwdata="0x1111"),
+            apb_sample(20, paddr="0x10", pwrite="1", pwdata="0x1111"),
+            apb_sample(30, penable="0", paddr="0x14"),
+            apb_sample(40, paddr="0x14", prdata="0x2222"),
+        ]
+        transactions = list(APBProtocol().iter_transactions(samples))
+        assert [(t["Time"], t["Address"], t["Operation"], t["Value"], t["WaitStates"])
+                for t in transactions] == [
+            (20, "0x10", "Write", "0x1111", 0),
+            (40, "0x14", "Read", "0x2222", 0),
+        ]
+
+    def test_long_stall(self):
+        """Test that a transfer completes after hundreds of wait states."""
+        samples = [apb_sample(0, penable="0", paddr="0x20")]
+        samples += [apb_sample(10 * k, paddr="0x20", pready="0", prdata="0xbad") for k in range(1, 301)]
+        samples.append(apb_sample(3010, paddr="0x20", prdata="0xcafe", pslverr="1"))
+        transactions = list(APBProtocol().iter_transactions(samples))
+        assert len(transactions) == 1
+        assert transactions[0]["Time"] == 10
+        assert transactions[0]["Value"] == "0xcafe"
+        assert transactions[0]["Response"] == "ERROR"
+        assert transactions[0]["WaitStates"] == 300
+
+    def test_waveform_ends_in_wait_state(self):
+        """Test that a transfer still waiting at the end of the waveform is reported as a wait state."""
+        samples = [apb_sample(10, penable="0", paddr="0x40"), apb_sample(20, paddr="0x40", pready="0")]
+        transactions = list(APBProtocol().iter_transactions(samples))
+        assert len(transactions) == 1
+        assert transactions[0]["Value"] is None
+        assert transactions[0]["WaitState"] is True
+        assert transactions[0]["WaitStates"] == 1
+
+    def test_without_pready(self):
+        """Test that every ACCESS sample completes a transfer when PREADY is not dumped."""
+        samples = [apb_sample(10, penable="0", paddr="0x50"), apb_sample(20, paddr="0x50", prdata="0x5050")]
+        for sample in samples:
+            del sample["pready"]
+        transactions = list(APBProtocol().iter_transactions(samples))
+        assert [(t["Time"], t["Value"], t["WaitStates"]) for t in transactions] == [(20, "0x5050", 0)]
@@ -0,0 +1,259 @@
+"""Tests for AXI4 / AXI4-Lite protocol implementation."""
+
+import json
+import pytest
+from unittest.mock import Mock
+
+from waveform_reg_access_extractor.decoders.transaction_decoder import TransactionDecoder
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.axi import AXIProtocol
+
+
+AXI_LITE_VCD = """$timescale 1ns $end
+$scope module tb_top $end
+$var wire 1 ! aclk $end
+$var wire 1 " awvalid $end
+$var wire 1 # awready $end
+$var wire 16 $ awaddr [15:0] $end
+$var wire 1 % wvalid $end
+$var wire 1 & wready $end
+$var wire 32 ' wdata [31:0] $end
+$var wire 1 ( bvalid $end
+$var wire 1 ) bready $end
+$var wire 2 * bresp [1:0] $end
+$var wire 1 + arvalid $end
+$var wire 1 , arready $end
+$var wire 16 - araddr [15:0] $end
+$var wire 1 . rvalid $end
+$var wire 1 / rready $end
+$var wire 32 0 rdata [31:0] $end
+$var wire 2 1 rresp [1:0] $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+1#
+b0 $
+0%
+1&
+b0 '
+0(
+1)
+b0 *
+0+
+1,
+b0 -
+0.
+1/
+b0 0
+b0 1
+$end
+#5
+1"
+b10000 $
+1%
+b10101011 '
+#10
+1!
+#15
+0"
+0%
+1(
+#20
+0!
+#30
+1!
+#35
+0(
+1+
+b10100 -
+#40
+0!
+#50
+1!
+#55
+0+
+1.
+b11001101 0
+b10 1
+#60
+0!
+#70
+1!
+#75
+0.
+#80
+0!
+"""
+
+
+def axi(timestamp, **signals):
+    """Build a clock sample with every handshake low, overridden by ``signals``."""
+    sample = {"aclk": "1", "timestamp": timestamp}
+    for channel in ("aw", "w", "b", "ar", "r"):
+        sample[f"{channel}valid"] = "0"
+        sample[f"{channel}ready"] = "1"
+    sample.update(signals)
+    return sample
+
+
+def write_address(addr, awid=None, awlen=None, awsize=None, awburst=None):
+    """Signals of a write address handshake."""
+    return dict(awvalid="1", awaddr=addr, awid=awid, awlen=awlen, awsize=awsize, awburst=awburst)
+
+
+def read_address(addr, arid=None, arlen=None, arsize=None, arburst=None):
+    """Signals of a read address handshake."""
+    return dict(arvalid="1", araddr=addr, arid=arid, arlen=arlen, arsize=arsize, arburst=arburst)
+
+
+class TestAXIProtocol:
+    """Test cases for AXI protocol."""
+
+    def test_protocol_name(self):
+        """Test protocol name and clock."""
+        protocol = AXIProtocol()
+        assert protocol.protocol_name == "AXI"
+        assert protocol.clock_signal == "aclk"
+
+    def test_lite_write_and_read(self):
+        """Test an AXI4-Lite write with data before its address, and a read with a wait for RREADY."""
+        samples = [
+            axi(10, wvalid="1", wdata=0x1234),
+            axi(20, **write_address(0x1000)),
+            axi(30, bvalid="1", bresp=0),
+            axi(40, **read_address(0x1004)),
+            axi(50, rvalid="1", rready="0", rdata=0x5678, rresp=0),
+            axi(60, rvalid="1", rdata=0x5678, rresp=2),
+        ]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert transactions == [
+            {"Time": 20, "Address": "0x1000", "Operation": "Write", "Value": "0x1234", "Response": "OKAY"},
+            {"Time": 40, "Address": "0x1004", "Operation": "Read", "Value": "0x5678", "Response": "SLVERR"},
+        ]
+
+    def test_out_of_order_responses(self):
+        """Test matching responses to outstanding transactions per ID, in order within an ID."""
+        samples = [
+            axi(10, **write_address(0x10, awid=1), wvalid="1", wdata=0xA, wlast="1"),
+            axi(20, **write_address(0x20, awid=2), wvalid="1", wdata=0xB, wlast="1"),
+            axi(30, **write_address(0x30, awid=1), wvalid="1", wdata=0xC, wlast="1",
+                **read_address(0x40, arid=5)),
+            axi(40, bvalid="1", bid=2, bresp=0, **read_address(0x44, arid=6)),
+            axi(50, bvalid="1", bid=1, bresp=0, rvalid="1", rid=6, rdata=0x66, rresp=0, rlast="1"),
+            axi(60, bvalid="1", bid=1, bresp=3, rvalid="1", rid=5, rdata=0x55, rresp=0, rlast="1"),
+        ]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert [(t["Operation"], t["ID"], t["Address"], t["Value"], t["Response"]) for t in transactions] == [
+            ("Write", 2, "0x20", "0xb", "OKAY"),
+            ("Write", 1, "0x10", "0xa", "OKAY"),
+            ("Read", 6, "0x44", "0x66", "OKAY"),
+            ("Write", 1, "0x30", "0xc", "DECERR"),
+            ("Read", 5, "0x40", "0x55", "OKAY"),
+        ]
+
+    def test_burst_records(self):
+        """Test that AXI4 bursts become burst records the decoder expands at their beat addresses."""
+        samples = [
+            axi(10, **read_address(0x1008, arid=0, arlen=3, arsize=2, arburst=2)),
+        ]
+        samples += [axi(20 + 10 * k, rvalid="1", rid=0, rdata=k, rresp=0, rlast="1" if k == 3 else "0")
+                    for k in range(4)]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert len(transactions) == 1
+        burst = transactions[0]
+        assert (burst["Burst"], burst["Size"], burst["Response"]) == ("WRAP", 4, "OKAY")
+        assert [beat["Value"] for beat in burst["Beats"]] == ["0x0", "0x1", "0x2", "0x3"]
+
+        register_map = Mock()
+        register_map.find_register_by_address = Mock(return_value=None)
+        decoded = TransactionDecoder(register_map).decode_transaction(burst)
+        assert [beat["Address"] for beat in decoded["Beats"]] == ["0x1008", "0x100c", "0x1000", "0x1004"]
+
+    def test_many_outstanding_reads(self):
+        """Test many outstanding reads on several IDs, completed in reverse ID order."""
+        ids = range(8)
+        samples = [axi(10 * (8 * beat + k), **read_address(0x100 * k + beat, arid=k))
+                   for beat in range(4) for k in ids]
+        samples += [axi(1000 + 10 * step, rvalid="1", rid=k, rdata=0x100 * k + beat, rresp=0, rlast="1")
+                    for step, (beat, k) in enumerate((beat, k) for beat in range(4) for k in reversed(ids))]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert len(transactions) == 32
+        assert all(t["Address"] == t["Value"] for t in transactions)
+
+    def test_outstanding_at_end(self, caplog):
+        """Test reporting transactions still outstanding at the end, and unmatched responses."""
+        samples = [
+            axi(10, bvalid="1", bid=None),
+            axi(20, **read_address(0x50)),
+            axi(30, **write_address(0x60), wvalid="1", wdata=0x6),
+        ]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert [(t["Time"], t["Operation"], t["Value"], t["Response"]) for t in transactions] == [
+            (20, "Read", None, "UNKNOWN"),
+            (30, "Write", "0x6", "UNKNOWN"),
+        ]
+        assert "without an outstanding write" in caplog.text
+
+    def test_write_data_at_end(self, caplog):
+        """Test that a partial write data burst is reported with its address, and data without an address is logged."""
+        samples = [
+            axi(10, **write_address(0x70, awlen=3), wvalid="1", wdata=0x1, wlast="0"),
+            axi(20, wvalid="1", wdata=0x2, wlast="0"),
+        ]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert [(t["Address"], t["Response"], len(t["Beats"])) for t in transactions] == [("0x70", "UNKNOWN", 2)]
+        
+        samples = [axi(10, wvalid="1", wdata=0x1, wlast="1"), axi(20, wvalid="1", wdata=0x2, wlast="0")]
+        assert list(AXIProtocol().iter_transactions(samples)) == []
+        assert "Write data at 10 without a write address" in caplog.text
+        assert "Write data at 20 without a write address" in caplog.text
+
+    def test_without_response_signals(self):
+        """Test that completed handshakes read as OKAY, and outstanding transactions as UNKNOWN, without BRESP/RRESP."""
+        samples = [
+            axi(10, **write_address(0x10), wvalid="1", wdata=0x1),
+            axi(20, bvalid="1", **read_address(0x14)),
+            axi(30, rvalid="1", rdata=0x2),
+            axi(40, **read_address(0x18)),
+        ]
+        transactions = list(AXIProtocol().iter_transactions(samples))
+        assert [(t["Time"], t["Operation"], t["Response"]) for t in transactions] == [
+            (10, "Write", "OKAY"),
+            (20, "Read", "OKAY"),
+            (40, "Read", "UNKNOWN"),
+        ]
+
+    def test_vcd_file(self, tmp_path):
+        """Test extracting an AXI4-Lite write and read from a VCD file."""
+        waveform = tmp_path / "axi_lite.vcd"
+        waveform.write_text(AXI_LITE_VCD)
+        output_file = tmp_path / "transactions.json"
+        VCDParser(AXIProtocol()).parse_and_save(str(waveform), str(output_file))
+        with open(output_file) as f:
+            transactions = json.load(f)["transactions"]
+        assert transactions == [
+            {"Time": 10, "Address": "0x10", "Operation": "Write", "Value": "0xab", "Response": "OKAY"},
+            {"Time": 50, "Address": "0x14", "Operation": "Read", "Value": "0xcd", "Response": "SLVERR"},
+        ]
+
+    @pytest.mark.parametrize("extractor", ["numpy", "numba"])
+    def test_columnar_extractors_rejected(self, extractor):
+        """Test that extractors without AXI support are rejected before the waveform is read."""
+        assert AXIProtocol().extractors == ("python",)
+        with pytest.raises(ValueError, match="does not support"):
+            VCDParser(AXIProtocol(), extractor=extractor)
+
+    @pytest.mark.parametrize("signals,expected", [
+        (write_address(0x10), "Write"),
+        (read_address(0x10), "Read"),
+    ])
+    def test_transaction_type(self, signals, expected):
+        """Test detecting address handshakes."""
+        sample = axi(10, **signals)
+        protocol = AXIProtocol()
+        assert protocol.is_valid_transaction(sample)
+        assert protocol.get_transaction_type(sample) == expected
+        assert not protocol.is_valid_transaction(axi(10))
@@ -0,0 +1,217 @@
+"""Tests for declarative protocol descriptions."""
+
+import json
+import pickle
+import pytest
+import yaml
+
+from waveform_reg_access_extractor.cli import get_protocol_parser
+from waveform_reg_access_extractor.config.signal_mapping import SignalMappingConfig
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+from waveform_reg_access_extractor.protocols.declarative import DeclarativeProtocol, ProtocolDefinition
+
+from protocol_cases import AHB_CASES, APB_CASES
+
+
+DESCRIPTIONS = yaml.safe_load("""
+apb_like:
+  clock: pclk
+  signals: [pclk, psel, penable, paddr, pwrite, pwdata, prdata, pslverr, pready]
+  optional: [pslverr, pready]
+  request: "psel and penable"
+  response: "pready != 0"
+  write: "pwrite"
+  address: paddr
+  write_data: pwdata
+  read_data: prdata
+  response_status: {signal: pslverr, values: {0: OKAY, 1: ERROR}}
+ahb_like:
+  clock: hclk
+  signals: [hclk, htrans, haddr, hwrite, hwdata, hrdata, hready, hresp]
+  pipelined: true
+  request: "htrans in (2, 3) and hready != 0"
+  response: "hready != 0"
+  write: "hwrite"
+  address: haddr
+  write_data: {signal: hwdata, phase: response}
+  read_data: hrdata
+  response_status: {signal: hresp, values: {0: OKAY, 1: ERROR, 2: RETRY, 3: SPLIT}}
+strobe_bus:
+  clock: clk
+  signals: [clk, valid, ready, we, addr, data, tag]
+  request: "valid == 1 and ready != 0"
+  write: "we"
+  address: addr
+  write_data: data
+  read_data: data
+  fields:
+    Tag: tag
+""")
+
+# APB and AHB cases whose transfers all complete (unfinished transfers are reported differently)
+UNFINISHED_CASES = {"left_while_waiting", "ends_in_wait_state", "ends_in_data_phase"}
+
+STROBE_VCD = """$timescale 1ns $end
+$scope module tb $end
+$var wire 1 ! bus_clk $end
+$var wire 1 " valid $end
+$var wire 1 # ready $end
+$var wire 1 $ we $end
+$var wire 16 % addr [15:0] $end
+$var wire 32 & data [31:0] $end
+$var wire 4 ' tag [3:0] $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+1#
+0$
+b0 %
+b0 &
+b0 '
+$end
+#5
+1"
+1$
+b100 %
+b10101011 &
+b11 '
+#10
+1!
+#15
+0$
+b1000 %
+b11001101 &
+#20
+0!
+#25
+0#
+#30
+1!
+#35
+1#
+#40
+0!
+#50
+1!
+#55
+0"
+#60
+0!
+#70
+1!
+"""
+
+STROBE_CONFIG = """
+protocols:
+  strobe_bus:
+    signal_mappings:
+      clk: "bus_clk"
+protocol_definitions:
+  strobe_bus:
+""" + "\n".join("    " + line for line in yaml.safe_dump(DESCRIPTIONS["strobe_bus"]).splitlines())
+
+
+def strobe(timestamp, valid="1", ready="1", we="0", addr=0, data=0, tag=None):
+    """Build a clock sample of the strobe bus."""
+    return dict(clk="1", valid=valid, ready=ready, we=we, addr=addr, data=data, tag=tag, timestamp=timestamp)
+
+
+def protocol(name):
+    """Compile a description of this module into a protocol parser."""
+    return DeclarativeProtocol(ProtocolDefinition(name, DESCRIPTIONS[name]))
+
+
+class TestDeclarativeProtocol:
+    """Test cases for protocols compiled from descriptions."""
+
+    @pytest.mark.parametrize("samples", [pytest.param(samples, id=name) for name, samples in APB_CASES.items()
+                                         if name not in UNFINISHED_CASES])
+    def test_matches_apb(self, samples):
+        """Test that an APB description gives the transactions of the APB state machine."""
+        assert list(protocol("apb_like").iter_transactions(samples)) == list(APBProtocol().iter_transactions(samples))
+
+    @pytest.mark.parametrize("samples", [pytest.param(samples, id=name) for name, samples in AHB_CASES.items()
+                                         if name not in UNFINISHED_CASES])
+    def test_matches_ahb(self, samples):
+        """Test that a pipelined AHB description gives the transactions of the AHB state machine."""
+        transactions = list(protocol("ahb_like").iter_transactions(samples))
+        for transaction in transactions:
+            assert transaction.pop("WaitStates") >= 0
+        assert transactions == list(AHBProtocol().iter_transactions(samples))
+
+    def test_unfinished_transfers(self):
+        """Test reporting transfers whose request drops, or that still wait at the end, without response."""
+        samples = APB_CASES["left_while_waiting"] + [dict(sample, timestamp=100)
+                                                     for sample in APB_CASES["ends_in_wait_state"]]
+        transactions = list(protocol("apb_like").iter_transactions(samples))
+        assert [(t["Time"], t["Value"], t["Response"], t["WaitStates"]) for t in transactions] == [
+            (10, None, "UNKNOWN", 2),
+            (40, "0x4", "OKAY", 0),
+            (100, None, "UNKNOWN", 1),
+        ]
+
+    def test_single_cycle_handshake(self):
+        """Test a protocol without a response condition, with an extra field."""
+        samples = [strobe(10, we="1", addr=0x10, data=0xA, tag=1), strobe(20, ready="0", addr=0x14),
+                   strobe(30, addr=0x14, data=0xB, tag=2), strobe(40, valid="0")]
+        bus = protocol("strobe_bus")
+        assert list(bus.iter_transactions(samples)) == [
+            {"Time": 10, "Address": "0x10", "Operation": "Write", "Value": "0xa", "Response": "OKAY", "Tag": 1},
+            {"Time": 30, "Address": "0x14", "Operation": "Read", "Value": "0xb", "Response": "OKAY", "Tag": 2},
+        ]
+        assert bus.is_valid_transaction(samples[0]) and not bus.is_valid_transaction(samples[1])
+        assert bus.get_transaction_type(samples[0]) == "Write"
+        assert bus.get_hex_signals() == ["addr", "data"]
+
+    @pytest.mark.parametrize("changes", [
+        {"request": "valid and nready"},
+        {"request": "__import__('os').system('true')"},
+        {"request": "valid < 1"},
+        {"write": "we =="},
+        {"pipelined": True},
+        {"address": {"signal": "addr", "phase": "response"}},
+        {"address": None},
+        {"timeout": 10},
+    ], ids=["unknown-signal", "call", "operator", "syntax", "pipelined-without-response",
+            "response-phase-without-response", "missing-address", "unknown-key"])
+    def test_invalid_descriptions(self, changes):
+        """Test that invalid descriptions are rejected when they are compiled."""
+        with pytest.raises(ValueError):
+            ProtocolDefinition("strobe_bus", dict(DESCRIPTIONS["strobe_bus"], **changes))
+
+    def test_pickled_definition(self):
+        """Test that a definition is compiled again when unpickled."""
+        definition = ProtocolDefinition("apb_like", DESCRIPTIONS["apb_like"])
+        assert pickle.loads(pickle.dumps(definition)).source == definition.source
+
+    def test_vcd_file_from_config(self, tmp_path):
+        """Test extracting a described protocol, loaded with its signal mapping from a configuration file."""
+        config_file = tmp_path / "signals.yaml"
+        config_file.write_text(STROBE_CONFIG)
+        waveform = tmp_path / "strobe.vcd"
+        waveform.write_text(STROBE_VCD)
+        output_file = tmp_path / "transactions.json"
+
+        config = SignalMappingConfig(str(config_file))
+        parser = get_protocol_parser("strobe_bus", config.get_signal_mapping("strobe_bus"),
+                                     definitions=config.protocol_definitions)
+        VCDParser(parser).parse_and_save(str(waveform), str(output_file))
+        with open(output_file) as f:
+            transactions = json.load(f)["transactions"]
+        assert transactions == [
+            {"Time": 10, "Address": "0x4", "Operation": "Write", "Value": "0xab", "Response": "OKAY", "Tag": 3},
+            {"Time": 50, "Address": "0x8", "Operation": "Read", "Value": "0xcd", "Response": "OKAY", "Tag": 3},
+        ]
+
+    def test_builtin_name_rejected(self, tmp_path):
+        """Test that a description cannot replace a built-in protocol."""
+        config_file = tmp_path / "signals.yaml"
+        config_file.write_text(STROBE_CONFIG.replace("protocol_definitions:\n  strobe_bus:",
+                                                     "protocol_definitions:\n  apb:"))
+        with pytest.raises(ValueError):
+            SignalMappingConfig(str(config_file))
@@ -0,0 +1,87 @@
+"""Conformance tests of the compiled kernels against the protocol state machines."""
+
+import json
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from waveform_reg_access_extractor.config.signal_mapping import SignalMappingConfig
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols import kernels
+from waveform_reg_access_extractor.protocols.ahb import AHBProtocol
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+from protocol_cases import AHB_CASES, APB_CASES, to_columns
+
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "examples")
+
+requires_numba = pytest.mark.skipif(kernels.njit is None, reason="Numba is not installed")
+
+
+@pytest.fixture(params=[False, pytest.param(True, marks=requires_numba)], ids=["interpreted", "compiled"])
+def compiled(request, monkeypatch):
+    """Run the kernels as plain Python functions, or compiled by Numba."""
+    if not request.param:
+        monkeypatch.setattr(kernels, "ahb_transfers", kernels._ahb_transfers)
+        monkeypatch.setattr(kernels, "apb_transfers", kernels._apb_transfers)
+    return request.param
+
+
+class TestKernelConformance:
+    """The kernels give the same transactions as the state machines."""
+
+    @pytest.mark.parametrize("dtype", [object, None])
+    @pytest.mark.parametrize("protocol_class,options,samples", [
+        *[pytest.param(AHBProtocol, {}, samples, id=f"ahb-{name}") for name, samples in AHB_CASES.items()],
+        *[pytest.param(AHBProtocol, {"burst_mode": "grouped"}, samples, id=f"ahb-grouped-{name}")
+          for name, samples in AHB_CASES.items()],
+        *[pytest.param(APBProtocol, {}, samples, id=f"apb-{name}") for name, samples in APB_CASES.items()],
+    ])
+    def test_matches_state_machine(self, compiled, protocol_class, options, samples, dtype):
+        """Test synthetic transfers, with object and typed column arrays."""
+        protocol = protocol_class(**options)
+        rows, columns = to_columns(protocol, samples, dtype)
+        assert protocol.filter_clock_kernels(columns) == protocol.filter_clock_rows(rows)
+
+    @pytest.mark.parametrize("protocol_class,absent", [(AHBProtocol, ("hready", "hsel")),
+                                                       (APBProtocol, ("pready",))])
+    def test_without_optional_signals(self, compiled, protocol_class, absent):
+        """Test that signals that are not recorded are encoded as absent, not low."""
+        cases = AHB_CASES if protocol_class is AHBProtocol else APB_CASES
+        samples = [dict(sample, **dict.fromkeys(absent)) for sample in cases["back_to_back"]]
+        protocol = protocol_class()
+        rows, columns = to_columns(protocol, samples, None)
+        transactions = protocol.filter_clock_kernels(columns)
+        assert transactions == protocol.filter_clock_rows(rows)
+        assert transactions
+
+    def test_encode_column(self):
+        """Test encoding scalar and HTRANS values, telling '1' from a vector of value 1."""
+        values = np.array(['1', '0', None, 'x', 1, 2, 3], dtype=object)
+        assert kernels.encode_column(values, kernels.SCALAR_CODES).tolist() == [1, 0, -1, 0, 0, 0, 0]
+        assert kernels.encode_column(values, kernels.HTRANS_CODES).tolist() == [0, 0, -1, 0, 0, 2, 3]
+
+    @requires_numba
+    @pytest.mark.parametrize("protocol_class,protocol", [(AHBProtocol, "ahb"), (APBProtocol, "apb")])
+    def test_example_waveforms(self, tmp_path, protocol_class, protocol):
+        """Test that the numba and python extractors write the same transactions for the example waveforms."""
+        config = SignalMappingConfig(os.path.join(EXAMPLES_DIR, "config", f"{protocol}_custom_signals.yaml"))
+        waveform = os.path.join(EXAMPLES_DIR, "vcd_files", f"{protocol}_wave.vcd")
+        outputs = {}
+        for extractor in ("python", "numba"):
+            parser = VCDParser(protocol_class(config.get_signal_mapping(protocol)), extractor=extractor)
+            parser.parse_and_save(waveform, str(tmp_path / f"{extractor}.json"))
+            with open(tmp_path / f"{extractor}.json") as f:
+                outputs[extractor] = json.load(f)["transactions"]
+        assert outputs["numba"] == outputs["python"]
+        assert outputs["python"]
+
+    def test_invalid_options(self):
+        """Test that following with the numba extractor, or using it without Numba, is rejected."""
+        with pytest.raises(ValueError):
+            VCDParser(AHBProtocol(), extractor="numba", follow=True)
+        if kernels.njit is None:
+            with pytest.raises(ValueError, match="requires Numba"):
+                VCDParser(AHBProtocol(), extractor="numba")
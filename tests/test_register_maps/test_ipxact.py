@@ -239,6 +239,103 @@ class TestIPXACTRegisterMap:
         finally:
             os.unlink(test_file)
 
+    def test_register_array(self):
+        """Test finding the elements of a register array and the registers covering byte addresses."""
+        ipxact_content = """<?xml version="1.0" encoding="UTF-8"?>
+<ipxact:component xmlns:ipxact="http://www.accellera.org/XMLSchema/IPXACT/1685-2014">
+  <ipxact:vendor>test</ipxact:vendor>
+  <ipxact:library>test</ipxact:library>
+  <ipxact:name>TEST_BANK</ipxact:name>
+  <ipxact:version>1.0</ipxact:version>
+  <ipxact:memoryMaps>
+    <ipxact:memoryMap>
+      <ipxact:name>TEST_BANK</ipxact:name>
+      <ipxact:addressBlock>
+        <ipxact:name>TEST_BANK</ipxact:name>
+        <ipxact:baseAddress>0x100</ipxact:baseAddress>
+        <ipxact:range>0x100</ipxact:range>
+        <ipxact:width>32</ipxact:width>
+        <ipxact:register>
+          <ipxact:name>STATUS</ipxact:name>
+          <ipxact:addressOffset>0x00</ipxact:addressOffset>
+          <ipxact:size>64</ipxact:size>
+        </ipxact:register>
+        <ipxact:register>
+          <ipxact:name>LUT</ipxact:name>
+          <ipxact:dim>2</ipxact:dim>
+          <ipxact:dim>3</ipxact:dim>
+          <ipxact:addressOffset>0x10</ipxact:addressOffset>
+          <ipxact:size>32</ipxact:size>
+        </ipxact:register>
+      </ipxact:addressBlock>
+    </ipxact:memoryMap>
+  </ipxact:memoryMaps>
+</ipxact:component>"""
+        
+        test_file = self.create_test_ipxact_file(ipxact_content)
+        try:
+            register_map = IPXACTRegisterMap()
+            register_map.load_from_file(test_file)
+            
+            # 2 x 3 elements, packed at the register size
+            reg = register_map.find_register_by_address(0x124)
+            assert reg["name"] == "LUT[5]"
+            assert reg["offset"] == 0x24
+            assert register_map.find_register_by_address(0x128) is None
+            assert register_map.find_register_covering(0x127) is reg
+            
+            # Bytes of a 64-bit register
+            assert register_map.find_register_covering(0x107)["name"] == "STATUS"
+            assert register_map.find_register_covering(0x108) is None
+            assert register_map.find_register_covering(0xFF) is None
+        finally:
+            os.unlink(test_file)
+
+    def test_verilog_literals(self):
+        """Test sized and upper-case Verilog literals, hexadecimal bare addresses and decimal bare dims."""
+        ipxact_content = """<?xml version="1.0" encoding="UTF-8"?>
+<ipxact:component xmlns:ipxact="http://www.accellera.org/XMLSchema/IPXACT/1685-2014">
+  <ipxact:vendor>test</ipxact:vendor>
+  <ipxact:library>test</ipxact:library>
+  <ipxact:name>TEST_BANK</ipxact:name>
+  <ipxact:version>1.0</ipxact:version>
+  <ipxact:memoryMaps>
+    <ipxact:memoryMap>
+      <ipxact:name>TEST_BANK</ipxact:name>
+      <ipxact:addressBlock>
+        <ipxact:name>TEST_BANK</ipxact:name>
+        <ipxact:baseAddress>32'H1000</ipxact:baseAddress>
+        <ipxact:range>0x100</ipxact:range>
+        <ipxact:width>32</ipxact:width>
+        <ipxact:register>
+          <ipxact:name>CTRL</ipxact:name>
+          <ipxact:addressOffset>10</ipxact:addressOffset>
+          <ipxact:size>32</ipxact:size>
+        </ipxact:register>
+        <ipxact:register>
+          <ipxact:name>LUT</ipxact:name>
+          <ipxact:dim>'d2</ipxact:dim>
+          <ipxact:dim>10</ipxact:dim>
+          <ipxact:addressOffset>8'h20</ipxact:addressOffset>
+          <ipxact:size>32</ipxact:size>
+        </ipxact:register>
+      </ipxact:addressBlock>
+    </ipxact:memoryMap>
+  </ipxact:memoryMaps>
+</ipxact:component>"""
+        
+        test_file = self.create_test_ipxact_file(ipxact_content)
+        try:
+            register_map = IPXACTRegisterMap()
+            register_map.load_from_file(test_file)
+            
+            assert register_map.find_register_by_address(0x1010)["name"] == "CTRL"
+            # 2 x 10 elements from 0x1020
+            assert register_map.find_register_by_address(0x106C)["name"] == "LUT[19]"
+            assert register_map.find_register_by_address(0x1070) is None
+        finally:
+            os.unlink(test_file)
+
     def test_get_register_name(self):
         """Test getting register name."""
         ipxact_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -129,6 +129,142 @@ class TestYAMLRegisterMap:
         finally:
             os.unlink(test_file)
 
+    def test_find_register_covering(self):
+        """Test finding the register that covers a byte address."""
+        yaml_content = """block1:
+  offset: 0x1000
+  width: 32
+  registers:
+    reg0:
+      name: Register0
+      offset: 0x0
+    reg1:
+      name: Register1
+      offset: 0x8
+      size: 64
+    reg2:
+      name: Register2
+      offset: 0x14
+      size: 16
+"""
+        
+        test_file = self.create_test_yaml_file(yaml_content)
+        try:
+            register_map = YAMLRegisterMap()
+            register_map.load_from_file(test_file)
+            
+            covering = {address: register_map.find_register_covering(address)
+                        for address in (0xFFF, 0x1000, 0x1003, 0x1004, 0x100F, 0x1015, 0x1016)}
+            assert {address: reg and reg["name"] for address, reg in covering.items()} == {
+                0xFFF: None,
+                0x1000: "Register0",
+                0x1003: "Register0",
+                0x1004: None,  # Gap between registers
+                0x100F: "Register1",
+                0x1015: "Register2",
+                0x1016: None,
+            }
+            
+            # Only the start address of a register is an exact match
+            assert register_map.find_register_by_address(0x1003) is None
+            # The same register information is returned every time
+            assert register_map.find_register_by_address(0x1000) is covering[0x1000]
+        finally:
+            os.unlink(test_file)
+
+    def test_register_array(self):
+        """Test finding the elements of a register array."""
+        yaml_content = """block1:
+  offset: 0x2000
+  width: 32
+  registers:
+    ctrl:
+      name: CTRL
+      offset: 0x0
+    chan:
+      name: CHAN
+      offset: 0x10
+      dim: 4
+      stride: 0x8
+      fields:
+        enable:
+          bitoffset: 0
+          width: 1
+"""
+        
+        test_file = self.create_test_yaml_file(yaml_content)
+        try:
+            register_map = YAMLRegisterMap()
+            register_map.load_from_file(test_file)
+            
+            reg = register_map.find_register_by_address(0x2028)
+            assert reg["name"] == "CHAN[3]"
+            assert reg["full_address"] == 0x2028
+            assert reg["offset"] == 0x28
+            assert "enable" in reg["fields"]
+            assert "dim" not in reg
+            assert register_map.find_register_covering(0x202B) is reg
+            
+            # Between elements, past the last element and in the gap of the stride
+            assert register_map.find_register_by_address(0x2014) is None
+            assert register_map.find_register_by_address(0x2030) is None
+            assert register_map.find_register_covering(0x2016) is None
+            assert register_map.find_register_covering(0x2000)["name"] == "CTRL"
+        finally:
+            os.unlink(test_file)
+
+    def test_overlapping_ranges(self):
+        """Test lookups in nested, interleaved and aliased register ranges."""
+        yaml_content = """block1:
+  offset: 0x0
+  width: 32
+  registers:
+    big:
+      name: BIG
+      offset: 0x0
+      dim: 4
+    small:
+      name: SMALL
+      offset: 0x4
+      size: 8
+    even:
+      name: EVEN
+      offset: 0x100
+      dim: 4
+      stride: 8
+    odd:
+      name: ODD
+      offset: 0x104
+      dim: 4
+      stride: 8
+    first:
+      name: FIRST
+      offset: 0x200
+    alias:
+      name: ALIAS
+      offset: 0x200
+      dim: 2
+"""
+        
+        test_file = self.create_test_yaml_file(yaml_content)
+        try:
+            register_map = YAMLRegisterMap()
+            register_map.load_from_file(test_file)
+            
+            # A smaller register starting in between ends before the address
+            assert register_map.find_register_covering(0x9)["name"] == "BIG[2]"
+            assert register_map.find_register_covering(0x4)["name"] == "SMALL"
+            # Interleaved register arrays
+            assert register_map.find_register_by_address(0x108)["name"] == "EVEN[1]"
+            assert register_map.find_register_by_address(0x11C)["name"] == "ODD[3]"
+            assert register_map.find_register_covering(0x10D)["name"] == "ODD[1]"
+            # Registers sharing a start: the first in map order wins
+            assert register_map.find_register_covering(0x202)["name"] == "FIRST"
+            assert register_map.find_register_by_address(0x204)["name"] == "ALIAS[1]"
+            assert register_map.find_register_covering(0x208) is None
+        finally:
+            os.unlink(test_file)
+
     def test_get_register_name(self):
         """Test getting register name."""
         yaml_content = """block1:
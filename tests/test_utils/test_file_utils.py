@@ -0,0 +1,168 @@
+"""Tests for file utility functions."""
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import pytest
+
+from waveform_reg_access_extractor.utils.file_utils import FollowReader, open_waveform, validate_file
+from waveform_reg_access_extractor.parsers.vcd_parser import VCDParser
+from waveform_reg_access_extractor.protocols.apb import APBProtocol
+
+
+APB_VCD = b"""$timescale 1ns $end
+$scope module tb_top $end
+$var wire 1 ! pclk $end
+$var wire 1 " psel $end
+$var wire 1 # penable $end
+$var wire 1 $ pwrite $end
+$var wire 16 % paddr [15:0] $end
+$var wire 32 & pwdata[31:0] $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+0"
+0#
+0$
+bx %
+b0 &
+$end
+#5
+1!
+1"
+1$
+b1000 %
+b10101010 &
+#10
+0!
+1#
+#15
+1!
+#20
+0!
+0"
+0#
+"""
+
+COMPRESSORS = {
+    '.gz': gzip.compress,
+    '.xz': lzma.compress,
+    '.bz2': bz2.compress,
+}
+
+
+class TestCompressedWaveforms:
+    """Test cases for compressed waveform input."""
+
+    def create_test_file(self, content: bytes, suffix: str) -> str:
+        """Create a temporary file for testing."""
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            return path
+        except Exception:
+            os.close(fd)
+            raise
+
+    def test_validate_file_compressed_extension(self):
+        """Test that compressed files are validated by their inner extension."""
+        test_file = self.create_test_file(gzip.compress(APB_VCD), '.vcd.gz')
+        try:
+            assert validate_file(test_file, ['.vcd'], allow_compressed=True)
+            assert not validate_file(test_file, ['.vcd'])
+            assert not validate_file(test_file, ['.fst'], allow_compressed=True)
+        finally:
+            os.unlink(test_file)
+
+    @pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+    def test_open_waveform_decompresses(self, suffix):
+        """Test that open_waveform returns the decompressed bytes."""
+        test_file = self.create_test_file(COMPRESSORS[suffix](APB_VCD), '.vcd' + suffix)
+        try:
+            with open_waveform(test_file) as f:
+                assert f.read() == APB_VCD
+        finally:
+            os.unlink(test_file)
+
+    @pytest.mark.parametrize("engine", ["pyvcd", "mmap"])
+    def test_compressed_parse_matches_plain(self, engine):
+        """Test that a compressed VCD parses to the same items as the plain file."""
+        plain_file = self.create_test_file(APB_VCD, '.vcd')
+        compressed_file = self.create_test_file(gzip.compress(APB_VCD), '.vcd.gz')
+        try:
+            plain_items = VCDParser(APBProtocol()).parse_vcd_file(plain_file)
+            compressed_items = VCDParser(APBProtocol(), engine=engine, jobs=2).parse_vcd_file(compressed_file)
+            assert compressed_items == plain_items
+        finally:
+            os.unlink(plain_file)
+            os.unlink(compressed_file)
+
+
+class TestFollowReader:
+    """Test cases for following waveforms that are still being written."""
+
+    def test_follow_growing_file(self, tmp_path):
+        """Test that appended lines are read and an incomplete last line is dropped."""
+        path = tmp_path / "wave.vcd"
+        path.write_bytes(APB_VCD[:100])
+
+        def append():
+            with open(path, "ab") as f:
+                for start in range(100, len(APB_VCD), 50):
+                    time.sleep(0.05)
+                    f.write(APB_VCD[start:start + 50])
+                    f.flush()
+                f.write(b"#25\n1")
+
+        writer = threading.Thread(target=append)
+        writer.start()
+        with FollowReader(str(path), poll_interval=0.01, idle_timeout=0.5) as reader:
+            data = reader.read()
+        writer.join()
+        assert data == APB_VCD + b"#25\n"
+
+    def test_extract_from_stdin(self, tmp_path):
+        """Test that '-' reads the waveform from standard input."""
+        waveform = tmp_path / "wave.vcd"
+        waveform.write_bytes(APB_VCD)
+        VCDParser(APBProtocol()).parse_and_save(str(waveform), str(tmp_path / "file.json"))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        with open(waveform, "rb") as stdin:
+            subprocess.run([sys.executable, "-m", "waveform_reg_access_extractor", "--protocol", "apb",
+                            "--waveform", "-", "--output", str(tmp_path / "stdin.json")],
+                           stdin=stdin, env=env, check=True, capture_output=True)
+        transactions = {}
+        for name in ("file", "stdin"):
+            with open(tmp_path / f"{name}.json") as f:
+                transactions[name] = json.load(f)["transactions"]
+        assert transactions["stdin"] == transactions["file"]
+        assert transactions["file"]
+
+    @pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="named pipes not supported")
+    def test_follow_named_pipe(self, tmp_path):
+        """Test that a named pipe is read until its writer closes it."""
+        path = str(tmp_path / "wave.pipe")
+        os.mkfifo(path)
+        assert validate_file(path, ['.vcd'], allow_pipe=True)
+        assert not validate_file(path, ['.vcd'])
+
+        def write():
+            with open(path, "wb") as f:
+                f.write(APB_VCD)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        with FollowReader(path) as reader:
+            data = reader.read()
+        writer.join()
+        assert data == APB_VCD